@@ -1,11 +1,21 @@
-from typing import Union
+import asyncio
+import copy
+from typing import Dict, Optional, Tuple, Union, get_type_hints
 
-from aries_cloudcontroller import AcaPyClient
+import aiohttp
+from aries_cloudcontroller import AcaPyClient, ApiClient, Configuration, rest
 from fastapi import HTTPException
 
 from app.dependencies.auth import AcaPyAuth, AcaPyAuthVerified
-from app.dependencies.role import Role
-from shared.constants import GOVERNANCE_LABEL
+from app.dependencies.role import AgentType, Role
+from shared.constants import (
+    ACAPY_CLIENT_KEEPALIVE_SECONDS,
+    ACAPY_CLIENT_POOL_SIZE,
+    GOVERNANCE_LABEL,
+)
+from shared.log_config import get_logger
+
+logger = get_logger(__name__)
 
 # todo: remove these defaults by migrating relevant methods to endorser service
 # and refactoring methods using tenant-admin internally
@@ -21,27 +31,134 @@ TENANT_ADMIN_AUTHED = AcaPyAuthVerified(
 )
 
 
+# The API modules of an AcaPyClient, e.g. `connection: ConnectionApi`
+ACAPY_CLIENT_APIS = get_type_hints(AcaPyClient)
+
+# The connection pool per agent role and base url, with the task that closes it when the
+# event loop it belongs to shuts down, and the default session that it replaced
+_pools: Dict[Tuple[str, str], Tuple[asyncio.Task, ApiClient, aiohttp.ClientSession]] = (
+    {}
+)
+
+
+class PooledAcaPyClient(AcaPyClient):
+    """
+    An AcaPyClient that sends its requests over the connection pool of its agent, rather
+    than opening a new one.
+
+    The pool is shared by the clients of all requests to the agent for the lifetime of the
+    app, so that connections (and TLS sessions) are reused. Each client has its own headers,
+    so the API key and tenant JWT are those of its request.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        pool: ApiClient,
+        *,
+        api_key: str,
+        tenant_jwt: Optional[str] = None,
+    ) -> None:
+        # AcaPyClient.__init__ would create a new ApiClient, with a new connection pool.
+        # Its other attributes are set as it sets them, which a test asserts
+        self.api_key = api_key
+        self.tenant_jwt = tenant_jwt
+        self.configuration = pool.configuration
+
+        # A copy of the pool's ApiClient, built by its own constructor, with its own headers
+        self.api_client = copy.copy(pool)
+        self.api_client.default_headers = {**pool.default_headers, "x-api-key": api_key}
+        if tenant_jwt:
+            self.api_client.default_headers["Authorization"] = f"Bearer {tenant_jwt}"
+
+        for name, api_class in ACAPY_CLIENT_APIS.items():
+            setattr(self, name, api_class(self.api_client))
+
+    async def close(self) -> None:
+        # The pool outlives the client; it is closed by close_acapy_clients
+        pass
+
+
+async def _close_on_shutdown(
+    pool: ApiClient, replaced_session: aiohttp.ClientSession
+) -> None:
+    """
+    Close the session that the pool's own was replaced with, and close the pool once
+    cancelled, e.g. by the shutdown of its event loop.
+    """
+    try:
+        await replaced_session.close()
+        await asyncio.Future()
+    finally:
+        await replaced_session.close()  # In case it was cancelled while closing it
+        await pool.close()
+
+
+def get_pool(agent_type: AgentType) -> ApiClient:
+    """
+    Get the connection pool to an agent, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    key = (agent_type.name, agent_type.base_url)
+    close_task, pool, _ = _pools.get(key, (None, None, None))
+    if pool is not None and close_task.get_loop() is loop:
+        return pool
+
+    if pool is not None and not close_task.get_loop().is_closed():
+        # A pool can't be used outside of its event loop, e.g. across tests
+        close_task.get_loop().call_soon_threadsafe(close_task.cancel)
+
+    logger.debug("Creating connection pool to {} agent", agent_type.name)
+    pool = ApiClient(Configuration(host=agent_type.base_url))
+    # Swap in a session with a tuned connector, before the default one is used
+    replaced_session = pool.rest_client.pool_manager
+    pool.rest_client.pool_manager = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=ACAPY_CLIENT_POOL_SIZE,
+            keepalive_timeout=ACAPY_CLIENT_KEEPALIVE_SECONDS,
+            ssl=rest.default_ssl_context,
+        ),
+        trust_env=True,
+    )
+    close_task = loop.create_task(
+        _close_on_shutdown(pool, replaced_session),
+        name=f"Close {agent_type.name} connection pool",
+    )
+    _pools[key] = (close_task, pool, replaced_session)
+    return pool
+
+
+async def close_acapy_clients() -> None:
+    """
+    Close the connection pools to the agents.
+    """
+    loop = asyncio.get_running_loop()
+    pools = list(_pools.values())
+    _pools.clear()
+    for close_task, pool, replaced_session in pools:
+        if close_task.get_loop() is loop:
+            # The close task may not have run yet, so close the sessions here as well
+            close_task.cancel()
+            await replaced_session.close()
+            await pool.close()
+        elif not close_task.get_loop().is_closed():
+            close_task.get_loop().call_soon_threadsafe(close_task.cancel)
+
+
 def get_governance_controller(
     auth: AcaPyAuthVerified = GOVERNANCE_AUTHED,
 ) -> AcaPyClient:
-    return AcaPyClient(
-        base_url=Role.GOVERNANCE.agent_type.base_url,
-        api_key=auth.token,
-    )
+    return PooledAcaPyClient(get_pool(Role.GOVERNANCE.agent_type), api_key=auth.token)
 
 
 def get_tenant_admin_controller(
     auth: AcaPyAuthVerified = TENANT_ADMIN_AUTHED,
 ) -> AcaPyClient:
-    return AcaPyClient(
-        base_url=Role.TENANT_ADMIN.agent_type.base_url,
-        api_key=auth.token,
-    )
+    return PooledAcaPyClient(get_pool(Role.TENANT_ADMIN.agent_type), api_key=auth.token)
 
 
 def get_tenant_controller(auth_token: str) -> AcaPyClient:
-    return AcaPyClient(
-        base_url=Role.TENANT.agent_type.base_url,
+    return PooledAcaPyClient(
+        get_pool(Role.TENANT.agent_type),
         api_key=Role.TENANT.agent_type.x_api_key,
         tenant_jwt=auth_token,
     )
@@ -59,8 +176,8 @@ def client_from_auth(auth: Union[AcaPyAuth, AcaPyAuthVerified]) -> AcaPyClient:
     else:
         x_api_key = auth.token
 
-    client = AcaPyClient(
-        base_url=auth.role.agent_type.base_url,
+    client = PooledAcaPyClient(
+        get_pool(auth.role.agent_type),
         api_key=x_api_key,
         tenant_jwt=tenant_jwt,
     )
@@ -10,6 +10,7 @@ from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 
+from app.dependencies.acapy_clients import close_acapy_clients
 from app.exceptions import CloudApiException
 from app.routes import (
     connections,
@@ -30,10 +31,12 @@ from app.routes.wallet import dids as wallet_dids
 from app.routes.wallet import jws as wallet_jws
 from app.routes.wallet import sd_jws as wallet_sd_jws
 from app.services.event_handling.websocket_manager import WebsocketManager
+from app.services.trust_registry.snapshot import trust_registry_snapshot
 from app.util.extract_validation_error import extract_validation_error_msg
 from shared.constants import PROJECT_VERSION
 from shared.exceptions import CloudApiValueError
 from shared.log_config import get_logger
+from shared.util.rich_async_client import close_rich_async_clients
 
 OPENAPI_NAME = os.getenv("OPENAPI_NAME", "OpenAPI")
 ROLE = os.getenv("ROLE", "*")
@@ -79,10 +82,14 @@ debug = not prod
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     # Startup logic occurs before yield
+    trust_registry_snapshot.start()
     yield
     # Shutdown logic occurs after yield
     logger.info("Calling WebsocketManager shutdown")
+    await trust_registry_snapshot.stop()
     await WebsocketManager.disconnect_all()
+    await close_rich_async_clients()
+    await close_acapy_clients()
 
 
 webhook_routes = [webhooks, sse, websocket_endpoint]
@@ -33,7 +33,7 @@ from app.routes.trust_registry import (
     get_schema_by_id as get_trust_registry_schema_by_id,
 )
 from app.routes.trust_registry import get_schemas as get_trust_registry_schemas
-from app.services import acapy_wallet
+from app.services import acapy_wallet, ledger_cache
 from app.services.revocation_registry import wait_for_active_registry
 from app.services.trust_registry.schemas import register_schema
 from app.services.trust_registry.util.issuer import assert_valid_issuer
@@ -303,11 +303,7 @@ async def get_schemas(
         # We now have schema_ids; the following logic is the same whether called by governance or tenant.
         # Now fetch relevant schemas from ledger:
         get_schema_futures = [
-            handle_acapy_call(
-                logger=bound_logger,
-                acapy_call=aries_controller.schema.get_schema,
-                schema_id=schema_id,
-            )
+            ledger_cache.get_schema(aries_controller, schema_id)
             for schema_id in schema_ids
         ]
 
@@ -381,11 +377,7 @@ async def get_schema(
     bound_logger.info("GET request received: Get schema by id")
 
     async with client_from_auth(auth) as aries_controller:
-        schema = await handle_acapy_call(
-            logger=bound_logger,
-            acapy_call=aries_controller.schema.get_schema,
-            schema_id=schema_id,
-        )
+        schema = await ledger_cache.get_schema(aries_controller, schema_id)
 
     if not schema.var_schema:
         bound_logger.info("Bad request: schema id not found.")
@@ -566,10 +558,15 @@ async def create_credential_definition(
     # We want consistent return types across all endpoints, so retrieving the credential
     # definition here.
 
+    async def fetch_credential_definition() -> CredentialDefinition:
+        # Don't let a cached 404 from a previous attempt stop the retry
+        ledger_cache.discard_credential_definition_not_found(credential_definition_id)
+        return await get_credential_definition_by_id(credential_definition_id, auth)
+
     # Retry logic to avoid race condition, as it can return 404
     result = await coroutine_with_retry(
-        coroutine_func=get_credential_definition_by_id,
-        args=(credential_definition_id, auth),
+        coroutine_func=fetch_credential_definition,
+        args=(),
         logger=bound_logger,
         max_attempts=3,
         retry_delay=0.5,
@@ -644,10 +641,8 @@ async def get_credential_definitions(
         # Initiate retrieving all credential definitions
         credential_definition_ids = response.credential_definition_ids or []
         get_credential_definition_futures = [
-            handle_acapy_call(
-                logger=bound_logger,
-                acapy_call=aries_controller.credential_definition.get_cred_def,
-                cred_def_id=credential_definition_id,
+            ledger_cache.get_credential_definition(
+                aries_controller, credential_definition_id
             )
             for credential_definition_id in credential_definition_ids
         ]
@@ -711,10 +706,8 @@ async def get_credential_definition_by_id(
 
     async with client_from_auth(auth) as aries_controller:
         bound_logger.debug("Getting credential definition")
-        credential_definition = await handle_acapy_call(
-            logger=bound_logger,
-            acapy_call=aries_controller.credential_definition.get_cred_def,
-            cred_def_id=credential_definition_id,
+        credential_definition = await ledger_cache.get_credential_definition(
+            aries_controller, credential_definition_id
         )
 
         if not credential_definition.credential_definition:
@@ -732,11 +725,16 @@ async def get_credential_definition_by_id(
         # We need to update the schema_id on the returned credential definition as
         # ACA-Py returns the schema_id as the seq_no
         bound_logger.debug("Fetching schema associated with definition's schema id")
-        schema = await get_schema(
-            schema_id=cloudapi_credential_definition.schema_id,
-            auth=auth,
+        schema = await ledger_cache.get_schema(
+            aries_controller, cloudapi_credential_definition.schema_id
         )
-        cloudapi_credential_definition.schema_id = schema.id
+        if not schema.var_schema:
+            bound_logger.info("Bad request: schema id not found.")
+            raise HTTPException(
+                404,
+                f"Schema with id {cloudapi_credential_definition.schema_id} not found.",
+            )
+        cloudapi_credential_definition.schema_id = schema.var_schema.id
 
     bound_logger.info("Successfully fetched credential definition.")
     return cloudapi_credential_definition
@@ -1,19 +1,22 @@
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 
 from app.dependencies.auth import (
     AcaPyAuthVerified,
+    acapy_auth_tenant_admin,
     acapy_auth_verified,
     verify_wallet_access,
 )
+from app.exceptions import CloudApiException
 from app.services.event_handling.sse import (
     sse_subscribe_event_with_field_and_state,
     sse_subscribe_event_with_state,
     sse_subscribe_stream_with_fields,
     sse_subscribe_wallet,
     sse_subscribe_wallet_topic,
+    sse_subscribe_wallets,
 )
 from shared.constants import MAX_EVENT_AGE_SECONDS
 from shared.log_config import get_logger
@@ -42,6 +45,85 @@ group_id_query: Optional[str] = Query(
 )
 
 
+@router.get(
+    "/wallets",
+    response_class=StreamingResponse,
+    name="Subscribe to Events of Multiple Wallets",
+)
+async def get_sse_subscribe_wallets(
+    request: Request,
+    wallet_ids: Optional[List[str]] = Query(
+        default=None,
+        description="The IDs of the wallets to subscribe to. "
+        "Required, unless a group ID is passed: then defaults to all wallets of that group",
+    ),
+    topic: Optional[str] = Query(
+        default=None, description="Only stream events on this topic"
+    ),
+    field: Optional[str] = Query(
+        default=None, description="Only stream events with this field in the payload"
+    ),
+    field_id: Optional[str] = Query(
+        default=None, description="The value that the payload field must have"
+    ),
+    desired_state: Optional[str] = Query(
+        default=None, description="Only stream events with this state"
+    ),
+    look_back: float = look_back_field,
+    group_id: Optional[str] = group_id_query,
+    auth: AcaPyAuthVerified = Depends(acapy_auth_tenant_admin),
+) -> StreamingResponse:
+    """
+    Subscribe to the server-side events of multiple wallets over a single stream.
+
+    Streams the events of the given wallets. Without wallet IDs, the events of all wallets of
+    the given group ID are streamed; if no group ID is passed either, a 400 error is returned.
+    When both are passed, all wallets must belong to the group. Events can be filtered by
+    topic, by a field and field ID in their payload, and by state, as for the single wallet
+    streams.
+
+    Parameters:
+    -----------
+        wallet_ids: The IDs of the wallets subscribing to the events. Defaults to the
+            wallets of group_id.
+        topic: The topic to which the wallets are subscribing.
+        field: The field to which the wallets are subscribing.
+        field_id: The ID of the field subscribing to the events.
+        desired_state: The desired state to be reached.
+        look_back: Specifies the look back window in seconds, to include events before connection established.
+    """
+    logger.bind(
+        body={
+            "group_id": group_id,
+            "num_wallets": len(wallet_ids or []),
+            "topic": topic,
+            "field": field,
+            "field_id": field_id,
+            "desired_state": desired_state,
+            "look_back": look_back,
+        }
+    ).info("GET request received: Subscribe to events of multiple wallets")
+
+    if not wallet_ids and not group_id:
+        raise CloudApiException(
+            "Specify the wallet IDs to subscribe to.", status_code=400
+        )
+
+    return StreamingResponse(
+        sse_subscribe_wallets(
+            request=request,
+            group_id=group_id,
+            wallet_ids=wallet_ids,
+            topic=topic,
+            field=field,
+            field_id=field_id,
+            desired_state=desired_state,
+            look_back=look_back,
+        ),
+        media_type="text/event-stream",
+    )
+
+
 @router.get(
     "/{wallet_id}",
     response_class=StreamingResponse,
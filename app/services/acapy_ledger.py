@@ -11,6 +11,7 @@ from aries_cloudcontroller import (
 )
 
 from app.exceptions import CloudApiException, handle_acapy_call
+from app.services import ledger_cache
 from shared.log_config import get_logger
 
 logger = get_logger(__name__)
@@ -188,9 +189,7 @@ async def schema_id_from_credential_definition_id(
     seq_no = tokens[3]
 
     bound_logger.debug("Fetching schema using sequence number: `{}`", seq_no)
-    schema: SchemaGetResult = await handle_acapy_call(
-        logger=logger, acapy_call=controller.schema.get_schema, schema_id=seq_no
-    )
+    schema: SchemaGetResult = await ledger_cache.get_schema(controller, seq_no)
 
     if not schema.var_schema or not schema.var_schema.id:
         bound_logger.warning("No schema found with sequence number: `{}`.", seq_no)
@@ -4,6 +4,7 @@ from aries_cloudcontroller import DID, AcaPyClient, DIDCreate
 
 from app.exceptions import CloudApiException, handle_acapy_call
 from app.util.did import qualified_did_sov
+from app.util.single_flight import handle_acapy_read
 from shared.log_config import get_logger
 
 logger = get_logger(__name__)
@@ -112,7 +113,7 @@ async def get_public_did(controller: AcaPyClient) -> DID:
         DID: the public did
     """
     logger.info("Fetching public DID")
-    did_response = await handle_acapy_call(
+    did_response = await handle_acapy_read(
         logger=logger, acapy_call=controller.wallet.get_public_did
     )
 
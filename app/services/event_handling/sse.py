@@ -1,12 +1,12 @@
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Dict, List, Optional
 
 from fastapi import Request
-from httpx import HTTPError, Response, Timeout
+from httpx import HTTPError, Limits, Response, Timeout
 
 from shared import WEBHOOKS_URL
-from shared.constants import MAX_EVENT_AGE_SECONDS
+from shared.constants import MAX_EVENT_AGE_SECONDS, SSE_PROXY_MAX_KEEPALIVE_CONNECTIONS
 from shared.log_config import get_logger
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import RichAsyncClient, get_rich_async_client
 
 logger = get_logger(__name__)
 SSE_PING_PERIOD = 15
@@ -15,14 +15,43 @@ default_timeout = Timeout(SSE_PING_PERIOD, read=3600.0)  # 1 hour read timeout
 event_timeout = Timeout(SSE_PING_PERIOD, read=180)  # 3 minute timeout
 
 
-async def yield_lines_with_disconnect_check(
-    request: Request, response: Response
-) -> AsyncGenerator[str, None]:
-    async for line in response.aiter_lines():
-        if await request.is_disconnected():
-            logger.bind(body=request).debug("SSE Client disconnected.")
-            break  # Client has disconnected, stop sending events
-        yield line + "\n"
+def get_sse_client() -> RichAsyncClient:
+    """
+    Get the client that proxies SSE streams from the webhooks service.
+
+    This is the shared client for the "SSE" upstream, kept for the lifetime of the app. As
+    every open stream holds a connection, the number of connections is not limited; only
+    the number of idle connections kept alive is.
+    """
+    return get_rich_async_client(
+        "SSE",
+        limits=Limits(
+            max_connections=None,
+            max_keepalive_connections=SSE_PROXY_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=default_timeout,
+    )
+
+
+async def yield_chunks(response: Response) -> AsyncGenerator[bytes, None]:
+    """
+    Yield the upstream SSE stream as it is received, without splitting it into lines.
+
+    Client disconnects are not polled for: the StreamingResponse listens for the ASGI
+    `http.disconnect` message and cancels this generator as soon as it is received, which
+    closes the upstream stream.
+    """
+    async for chunk in response.aiter_bytes():
+        yield chunk
+
+
+def resume_headers(request: Request) -> Dict[str, str]:
+    """
+    Get the headers to forward to the webhooks service, so that a client reconnecting with
+    a `Last-Event-ID` header resumes its stream from the last event it received.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    return {"Last-Event-ID": last_event_id} if last_event_id else {}
 
 
 async def sse_subscribe_wallet(
@@ -31,7 +60,7 @@ async def sse_subscribe_wallet(
     group_id: Optional[str],
     wallet_id: str,
     look_back: float = MAX_EVENT_AGE_SECONDS,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Subscribe to server-side events for a specific wallet ID.
 
@@ -54,13 +83,16 @@ async def sse_subscribe_wallet(
         params["group_id"] = group_id
 
     try:
-        async with RichAsyncClient(timeout=default_timeout) as client:
-            bound_logger.debug("Connecting stream to /sse/wallet_id")
-            async with client.stream(
-                "GET", f"{WEBHOOKS_URL}/sse/{wallet_id}", params=params
-            ) as response:
-                async for line in yield_lines_with_disconnect_check(request, response):
-                    yield line
+        bound_logger.debug("Connecting stream to /sse/wallet_id")
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}",
+            params=params,
+            headers=resume_headers(request),
+            timeout=default_timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
@@ -73,7 +105,7 @@ async def sse_subscribe_wallet_topic(
     wallet_id: str,
     topic: str,
     look_back: float = MAX_EVENT_AGE_SECONDS,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Subscribe to server-side events for a specific wallet ID and topic.
 
@@ -98,13 +130,16 @@ async def sse_subscribe_wallet_topic(
         params["group_id"] = group_id
 
     try:
-        async with RichAsyncClient(timeout=default_timeout) as client:
-            bound_logger.debug("Connecting stream to /sse/wallet_id/topic")
-            async with client.stream(
-                "GET", f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}", params=params
-            ) as response:
-                async for line in yield_lines_with_disconnect_check(request, response):
-                    yield line
+        bound_logger.debug("Connecting stream to /sse/wallet_id/topic")
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}",
+            params=params,
+            headers=resume_headers(request),
+            timeout=default_timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
@@ -118,7 +153,7 @@ async def sse_subscribe_event_with_state(
     topic: str,
     desired_state: str,
     look_back: float = MAX_EVENT_AGE_SECONDS,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Subscribe to server-side events for a specific wallet ID and topic.
 
@@ -145,17 +180,16 @@ async def sse_subscribe_event_with_state(
         params["group_id"] = group_id
 
     try:
-        async with RichAsyncClient(timeout=event_timeout) as client:
-            bound_logger.debug(
-                "Connecting stream to /sse/wallet_id/topic/desired_state"
-            )
-            async with client.stream(
-                "GET",
-                f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{desired_state}",
-                params=params,
-            ) as response:
-                async for line in yield_lines_with_disconnect_check(request, response):
-                    yield line
+        bound_logger.debug("Connecting stream to /sse/wallet_id/topic/desired_state")
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{desired_state}",
+            params=params,
+            headers=resume_headers(request),
+            timeout=event_timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
@@ -170,7 +204,7 @@ async def sse_subscribe_stream_with_fields(
     field: str,
     field_id: str,
     look_back: float = MAX_EVENT_AGE_SECONDS,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Subscribe to server-side events for a specific wallet ID and topic.
 
@@ -198,17 +232,16 @@ async def sse_subscribe_stream_with_fields(
         params["group_id"] = group_id
 
     try:
-        async with RichAsyncClient(timeout=default_timeout) as client:
-            bound_logger.debug(
-                "Connecting stream to /sse/wallet_id/topic/field/field_id"
-            )
-            async with client.stream(
-                "GET",
-                f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}",
-                params=params,
-            ) as response:
-                async for line in yield_lines_with_disconnect_check(request, response):
-                    yield line
+        bound_logger.debug("Connecting stream to /sse/wallet_id/topic/field/field_id")
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}",
+            params=params,
+            headers=resume_headers(request),
+            timeout=default_timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
@@ -224,7 +257,7 @@ async def sse_subscribe_event_with_field_and_state(
     field_id: str,
     desired_state: str,
     look_back: float = MAX_EVENT_AGE_SECONDS,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Subscribe to server-side events for a specific wallet ID and topic.
 
@@ -254,17 +287,84 @@ async def sse_subscribe_event_with_field_and_state(
         params["group_id"] = group_id
 
     try:
-        async with RichAsyncClient(timeout=event_timeout) as client:
-            bound_logger.debug(
-                "Connecting stream to /sse/wallet_id/topic/field/field_id/desired_state"
-            )
-            async with client.stream(
-                "GET",
-                f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{desired_state}",
-                params=params,
-            ) as response:
-                async for line in yield_lines_with_disconnect_check(request, response):
-                    yield line
+        bound_logger.debug(
+            "Connecting stream to /sse/wallet_id/topic/field/field_id/desired_state"
+        )
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{desired_state}",
+            params=params,
+            headers=resume_headers(request),
+            timeout=event_timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
+    except HTTPError as e:
+        bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
+        raise e
+
+
+async def sse_subscribe_wallets(
+    *,
+    request: Request,
+    group_id: Optional[str],
+    wallet_ids: Optional[List[str]] = None,
+    topic: Optional[str] = None,
+    field: Optional[str] = None,
+    field_id: Optional[str] = None,
+    desired_state: Optional[str] = None,
+    look_back: float = MAX_EVENT_AGE_SECONDS,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Subscribe to the server-side events of multiple wallets over one stream.
+
+    Args:
+        group_id: The group to which the wallets belong.
+        wallet_ids: The IDs of the wallets subscribing to the events. All wallets in the
+            group if not specified.
+        topic: The topic to which the wallets are subscribing. All topics if not specified.
+        field: The field of interest that field_id will match on (e.g. connection_id, thread_id, etc).
+        field_id: The identifier of the field that the webhook event will match on.
+        desired_state: The state that the webhook event will match on.
+    """
+    bound_logger = logger.bind(
+        body={
+            "group_id": group_id,
+            "num_wallets": len(wallet_ids or []),
+            "topic": topic,
+            "field": field,
+            "field_id": field_id,
+            "state": desired_state,
+            "look_back": look_back,
+        }
+    )
+
+    # Required param
+    params = {"look_back": look_back}
+
+    # Optional params
+    optional_params = {
+        "group_id": group_id,
+        "wallet_ids": wallet_ids,
+        "topic": topic,
+        "field": field,
+        "field_id": field_id,
+        "desired_state": desired_state,
+    }
+    params.update({key: value for key, value in optional_params.items() if value})
+
+    timeout = event_timeout if desired_state else default_timeout
+    try:
+        bound_logger.debug("Connecting stream to /sse/wallets")
+        async with get_sse_client().stream(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/wallets",
+            params=params,
+            headers=resume_headers(request),
+            timeout=timeout,
+        ) as response:
+            async for chunk in yield_chunks(response):
+                yield chunk
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
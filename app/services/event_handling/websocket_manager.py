@@ -1,22 +1,59 @@
 import asyncio
-from typing import Dict
+from typing import Dict, NamedTuple, Optional, Set
 from uuid import uuid4
 
 from fastapi import WebSocket
 from fastapi_websocket_pubsub import PubSubClient
+from fastapi_websocket_pubsub.rpc_event_methods import RpcEventClientMethods
+from fastapi_websocket_rpc import RpcChannel
 
 from shared import WEBHOOKS_URL
+from shared.constants import WEBSOCKET_MAX_QUEUE_SIZE, WEBSOCKET_MAX_STALE_TOPICS
 from shared.log_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class Subscriber(NamedTuple):
+    """
+    A websocket subscribed to a pubsub topic, with the queue of events to send to it and the
+    task that sends them.
+    """
+
+    websocket: WebSocket
+    topic: str
+    queue: asyncio.Queue
+    sender_task: asyncio.Task
+
+
 class WebsocketManager:
     """
-    A class for managing websocket connections and establishing PubSub callbacks
+    A class for managing websocket connections and routing webhook events to them.
+
+    All websockets share one PubSubClient, i.e. one websocket to the Webhooks pubsub
+    endpoint. The client is subscribed to the topics that at least one websocket is
+    subscribed to, and its events are fanned out locally: each event is put on the queue of
+    every websocket subscribed to its topic, from which it is sent by a task per websocket,
+    so that a slow websocket does not hold up the others. A websocket whose queue is full
+    is disconnected, rather than buffering events for it without bound.
     """
 
-    _clients: Dict[str, PubSubClient] = {}
+    _client: Optional[PubSubClient] = None
+    _channel: Optional[RpcChannel] = None  # the client's connection, when connected
+    # Created on first use in an event loop, as a lock can only be used in one loop
+    _lock: Optional[asyncio.Lock] = None
+    _lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    _subscribers: Dict[str, Subscriber] = {}
+    _routes: Dict[str, Set[str]] = {}  # subscriber uuids per topic
+    # Topics that the client is subscribed to on the current connection. The pubsub
+    # protocol can't unsubscribe, so this includes topics that no websocket subscribes to
+    # anymore, until the client reconnects
+    _upstream_topics: Set[str] = set()
+
+    _closing_tasks: Set[asyncio.Task] = set()
+    _num_events_routed = 0
+    _num_evicted = 0
 
     @staticmethod
     async def subscribe(
@@ -38,35 +75,173 @@ class WebsocketManager:
         if topic:
             subscribed_topic += f":{topic}"
 
-        async def callback(data: str, topic: str) -> None:
-            """
-            Callback function for handling received webhook events.
-            """
-            logger.debug("Handling Websocket callback on topic: {}", topic)
-            await websocket.send_text(data)
+        uuid = uuid4().hex
+        queue = asyncio.Queue(maxsize=WEBSOCKET_MAX_QUEUE_SIZE)
+        sender_task = asyncio.create_task(
+            WebsocketManager._send_events(websocket, queue)
+        )
 
-        client = PubSubClient()
-        logger.debug("Subscribing PubSubClient to `{}`", subscribed_topic)
+        async with WebsocketManager._get_lock():
+            try:
+                await WebsocketManager._ensure_client()
 
-        client.subscribe(subscribed_topic, callback)
-        await WebsocketManager.start_pubsub_client(client)
+                WebsocketManager._subscribers[uuid] = Subscriber(
+                    websocket, subscribed_topic, queue, sender_task
+                )
+                WebsocketManager._routes.setdefault(subscribed_topic, set()).add(uuid)
 
-        uuid = uuid4().hex
-        WebsocketManager._clients[uuid] = client
-        logger.debug(
-            "Successfully started PubSubClient, listening to `{}`", subscribed_topic
-        )
+                channel = WebsocketManager._channel
+                if (
+                    channel
+                    and subscribed_topic not in WebsocketManager._upstream_topics
+                ):
+                    # Otherwise, the topic is subscribed to once the client (re)connects
+                    logger.debug("Subscribing PubSubClient to `{}`", subscribed_topic)
+                    await channel.other.subscribe(topics=[subscribed_topic])
+                    WebsocketManager._upstream_topics.add(subscribed_topic)
+            except BaseException:
+                # No uuid is returned to unsubscribe with, so undo the subscription here
+                WebsocketManager._subscribers.pop(uuid, None)
+                WebsocketManager._remove_route(subscribed_topic, uuid)
+                sender_task.cancel()
+                raise
 
+        logger.debug("Successfully subscribed websocket to `{}`", subscribed_topic)
         return uuid
 
+    @staticmethod
+    def _get_lock() -> asyncio.Lock:
+        """
+        Get the lock of the running event loop, creating it on first use in the loop.
+        """
+        loop = asyncio.get_running_loop()
+        if WebsocketManager._lock is None or WebsocketManager._lock_loop is not loop:
+            WebsocketManager._lock = asyncio.Lock()
+            WebsocketManager._lock_loop = loop
+        return WebsocketManager._lock
+
     @staticmethod
     async def unsubscribe(uuid: str) -> None:
         logger.info("Unsubscribing a client")
-        client = WebsocketManager._clients[uuid]
-        await WebsocketManager.disconnect(client)
-        WebsocketManager._clients.pop(uuid)
+        async with WebsocketManager._get_lock():
+            subscriber = WebsocketManager._subscribers.pop(uuid, None)
+            if subscriber is None:
+                return  # Already cleared by disconnect_all
+            subscriber.sender_task.cancel()
+
+            WebsocketManager._remove_route(subscriber.topic, uuid)
+
+            stale_topics = WebsocketManager._upstream_topics.difference(
+                WebsocketManager._routes
+            )
+            if len(stale_topics) > WEBSOCKET_MAX_STALE_TOPICS:
+                # Reconnect, to stop receiving events that no websocket subscribes to
+                logger.info(
+                    "Restarting PubSubClient to drop {} stale topics", len(stale_topics)
+                )
+                await WebsocketManager._stop_client()
+                if WebsocketManager._routes:
+                    await WebsocketManager._ensure_client()
         logger.info("Successfully unsubscribed client")
 
+    @staticmethod
+    async def route_event(topic: str, data: str) -> None:
+        """
+        Put an event received from the Webhooks pubsub endpoint on the queue of every
+        websocket subscribed to its topic.
+        """
+        uuids = list(WebsocketManager._routes.get(topic, ()))
+        logger.trace("Routing event on topic `{}` to {} websockets", topic, len(uuids))
+        for uuid in uuids:
+            subscriber = WebsocketManager._subscribers[uuid]
+            if subscriber.sender_task.done():
+                continue  # The websocket has failed, and is yet to be unsubscribed
+            try:
+                subscriber.queue.put_nowait(data)
+                WebsocketManager._num_events_routed += 1
+            except asyncio.QueueFull:
+                WebsocketManager._evict(uuid, subscriber)
+
+    @staticmethod
+    def _evict(uuid: str, subscriber: Subscriber) -> None:
+        """
+        Disconnect a websocket that can't keep up with its events. It is unsubscribed once
+        its session sees the disconnect.
+        """
+        logger.warning(
+            "Websocket queue is full; disconnecting slow websocket on `{}`",
+            subscriber.topic,
+        )
+        WebsocketManager._num_evicted += 1
+        WebsocketManager._remove_route(subscriber.topic, uuid)
+        subscriber.sender_task.cancel()
+
+        # 1013: Try Again Later
+        closing_task = asyncio.create_task(subscriber.websocket.close(code=1013))
+        WebsocketManager._closing_tasks.add(closing_task)
+        closing_task.add_done_callback(WebsocketManager._closing_tasks.discard)
+
+    @staticmethod
+    def _remove_route(topic: str, uuid: str) -> None:
+        uuids = WebsocketManager._routes.get(topic)
+        if uuids is not None:
+            uuids.discard(uuid)
+            if not uuids:
+                del WebsocketManager._routes[topic]
+
+    @staticmethod
+    async def _send_events(websocket: WebSocket, queue: asyncio.Queue) -> None:
+        while True:
+            data = await queue.get()
+            logger.debug("Sending event to websocket")
+            await websocket.send_text(data)
+
+    @staticmethod
+    async def _ensure_client() -> None:
+        """
+        Start the shared PubSubClient, if it is not running.
+        """
+        if WebsocketManager._client is not None:
+            return
+
+        client = PubSubClient(
+            methods_class=RoutingClientMethods,
+            on_connect=[WebsocketManager._on_connect],
+            on_disconnect=[WebsocketManager._on_disconnect],
+        )
+        await WebsocketManager.start_pubsub_client(client)
+        WebsocketManager._client = client
+
+    @staticmethod
+    async def _stop_client() -> None:
+        client = WebsocketManager._client
+        WebsocketManager._client = None
+        WebsocketManager._channel = None
+        WebsocketManager._upstream_topics.clear()
+        if client is not None:
+            try:
+                await WebsocketManager.disconnect(client)
+            except WebsocketTimeout:
+                pass
+
+    @staticmethod
+    async def _on_connect(_: PubSubClient, channel: RpcChannel) -> None:
+        """
+        Subscribe the client to the topics of the websockets, whenever it (re)connects.
+        """
+        async with WebsocketManager._get_lock():
+            topics = list(WebsocketManager._routes)
+            if topics:
+                logger.debug("Subscribing PubSubClient to {} topics", len(topics))
+                await channel.other.subscribe(topics=topics)
+            WebsocketManager._upstream_topics = set(topics)
+            WebsocketManager._channel = channel
+
+    @staticmethod
+    async def _on_disconnect(_: RpcChannel) -> None:
+        WebsocketManager._channel = None
+        WebsocketManager._upstream_topics = set()
+
     @staticmethod
     async def start_pubsub_client(client: PubSubClient, timeout: float = 5) -> None:
         """
@@ -82,7 +257,7 @@ class WebsocketManager:
             await client.wait_until_ready()
 
         try:
-            logger.debug("Starting PubSubClient for new websocket connection")
+            logger.debug("Starting PubSubClient for websocket connections")
             await asyncio.wait_for(ensure_connection_ready(), timeout=timeout)
         except asyncio.TimeoutError as e:
             logger.warning("Starting a PubSubClient has timed out after {}s.", timeout)
@@ -110,19 +285,43 @@ class WebsocketManager:
     @staticmethod
     async def disconnect_all() -> None:
         """
-        Disconnect all Websocket clients and clear the connections.
+        Disconnect the PubSubClient and clear the websocket subscriptions.
         """
-        if WebsocketManager._clients:
+        if WebsocketManager._subscribers:
             logger.debug(
-                "Disconnecting {} Websocket clients", len(WebsocketManager._clients)
+                "Disconnecting {} Websocket clients", len(WebsocketManager._subscribers)
             )
-            for client in WebsocketManager._clients.values():
-                try:
-                    await WebsocketManager.disconnect(client)
-                except WebsocketTimeout:
-                    continue
+            for subscriber in WebsocketManager._subscribers.values():
+                subscriber.sender_task.cancel()
+
+            WebsocketManager._subscribers.clear()
+            WebsocketManager._routes.clear()
+
+        await WebsocketManager._stop_client()
+
+    @staticmethod
+    def get_metrics() -> Dict[str, int]:
+        """
+        Returns the number of websockets and topics subscribed to, and the number of events
+        routed and slow websockets disconnected since startup.
+        """
+        return {
+            "websockets": len(WebsocketManager._subscribers),
+            "topics": len(WebsocketManager._routes),
+            "upstream_topics": len(WebsocketManager._upstream_topics),
+            "events_routed": WebsocketManager._num_events_routed,
+            "evicted_websockets": WebsocketManager._num_evicted,
+        }
+
+
+class RoutingClientMethods(RpcEventClientMethods):
+    """
+    The RPC methods of the shared PubSubClient, routing the events it is notified of to the
+    subscribed websockets.
+    """
 
-            WebsocketManager._clients.clear()
+    async def notify(self, subscription=None, data=None) -> None:
+        await WebsocketManager.route_event(subscription["topic"], data)
 
 
 class WebsocketTimeout(Exception):
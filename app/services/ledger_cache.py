@@ -0,0 +1,227 @@
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+from aries_cloudcontroller import (
+    AcaPyClient,
+    CredentialDefinitionGetResult,
+    SchemaGetResult,
+)
+
+from app.exceptions import CloudApiException, handle_acapy_call
+from app.util.single_flight import get_single_flight
+from shared.constants import LEDGER_CACHE_NEGATIVE_TTL_SECONDS, LEDGER_CACHE_SIZE
+from shared.log_config import get_logger
+from shared.util.lru_cache import LRUCache
+
+logger = get_logger(__name__)
+
+# Ledger objects are cached by kind and id, e.g. ("schema", schema_id)
+CacheKey = Tuple[str, str]
+LedgerObject = Union[SchemaGetResult, CredentialDefinitionGetResult]
+
+SCHEMA = "schema"
+CREDENTIAL_DEFINITION = "credential_definition"
+
+
+class LedgerCache:
+    """
+    An in-process cache of the schemas and credential definitions read from the ledger.
+
+    These objects never change once written to the ledger, so they are cached without expiry,
+    and only evicted when the cache is full. A lookup of an object that is not found is
+    cached for a short time only (negative caching), as the object may still be written.
+    """
+
+    def __init__(
+        self,
+        max_size: int = LEDGER_CACHE_SIZE,
+        negative_ttl: float = LEDGER_CACHE_NEGATIVE_TTL_SECONDS,
+    ) -> None:
+        self.negative_ttl = negative_ttl
+        self._objects: LRUCache[CacheKey, LedgerObject] = LRUCache(max_size)
+        # Expiry (monotonic time) and the error detail, if any, of lookups not found
+        self._not_found: LRUCache[CacheKey, Tuple[float, Optional[str]]] = LRUCache(
+            max_size
+        )
+        self._num_hits = 0
+        self._num_misses = 0
+
+    def get(self, key: CacheKey) -> Optional[LedgerObject]:
+        obj = self._objects.get(key)
+        if obj is not None:
+            self._num_hits += 1
+        return obj
+
+    def get_not_found(self, key: CacheKey) -> Optional[Tuple[float, Optional[str]]]:
+        """
+        Get the cached not-found lookup of a key, if it has not expired.
+        """
+        not_found = self._not_found.get(key)
+        if not_found is None:
+            return None
+        if not_found[0] < time.monotonic():
+            self._not_found.pop(key)
+            return None
+        self._num_hits += 1
+        return not_found
+
+    def set(self, key: CacheKey, obj: LedgerObject) -> None:
+        self._objects.set(key, obj)
+        self._not_found.pop(key)
+
+    def set_not_found(self, key: CacheKey, detail: Optional[str] = None) -> None:
+        """
+        Cache that a key was not found, with the detail of the 404 error if one was raised.
+        """
+        self._not_found.set(key, (time.monotonic() + self.negative_ttl, detail))
+
+    def discard_not_found(self, key: CacheKey) -> None:
+        self._not_found.pop(key)
+
+    def record_miss(self) -> None:
+        self._num_misses += 1
+
+    def clear(self) -> None:
+        self._objects.clear()
+        self._not_found.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the number of cached objects and not-found lookups, and the number of cache
+        hits and misses since startup.
+        """
+        return {
+            "objects": len(self._objects),
+            "not_found": len(self._not_found),
+            "hits": self._num_hits,
+            "misses": self._num_misses,
+        }
+
+
+ledger_cache = LedgerCache()
+_ledger_reads = get_single_flight("ledger")
+
+
+async def _get_ledger_object(
+    key: CacheKey, acapy_call, not_found_result: LedgerObject, **kwargs
+) -> Tuple[LedgerObject, bool]:
+    """
+    Get a ledger object from the cache, or else with the ACA-Py call.
+
+    Returns:
+        The object, and whether it was fetched (and is yet to be cached) rather than cached.
+    """
+    obj = ledger_cache.get(key)
+    if obj is not None:
+        return obj, False
+
+    not_found = ledger_cache.get_not_found(key)
+    if not_found is not None:
+        _, detail = not_found
+        if detail is not None:
+            raise CloudApiException(detail, 404)
+        return not_found_result, False
+
+    ledger_cache.record_miss()
+    logger.debug("Fetching {} `{}` from the ledger", *key)
+    started = False
+
+    def fetch():
+        nonlocal started
+        started = True
+        return handle_acapy_call(logger=logger, acapy_call=acapy_call, **kwargs)
+
+    try:
+        # Concurrent lookups of the same object share one call, made with the controller
+        # of the caller that started it
+        obj = await _ledger_reads.run(key, fetch)
+    except Exception as e:  # pylint: disable=broad-except
+        if isinstance(e, CloudApiException) and e.status_code == 404:
+            ledger_cache.set_not_found(key, e.detail)
+            raise
+        if started:
+            raise
+        # Only the object, or that it is not found, is shared: other errors may be those
+        # of the other caller's controller (e.g. its auth), so look up with our own
+        obj = await _fetch_with_own_controller(key, acapy_call, **kwargs)
+    return obj, True
+
+
+async def _fetch_with_own_controller(
+    key: CacheKey, acapy_call, **kwargs
+) -> LedgerObject:
+    logger.debug("Shared lookup of {} `{}` failed; fetching it again", *key)
+    try:
+        return await handle_acapy_call(logger=logger, acapy_call=acapy_call, **kwargs)
+    except CloudApiException as e:
+        if e.status_code == 404:
+            ledger_cache.set_not_found(key, e.detail)
+        raise
+
+
+async def get_schema(controller: AcaPyClient, schema_id: str) -> SchemaGetResult:
+    """
+    Get a schema from the ledger, or from the cache.
+
+    Args:
+        controller: The client to fetch the schema with, if it is not cached.
+        schema_id: The schema id, or the sequence number of the schema on the ledger.
+
+    Returns:
+        The schema. Its `var_schema` is None if the schema was not found.
+    """
+    key = (SCHEMA, schema_id)
+    result, fetched = await _get_ledger_object(
+        key,
+        controller.schema.get_schema,
+        not_found_result=SchemaGetResult(),
+        schema_id=schema_id,
+    )
+
+    schema = result.var_schema
+    if fetched and schema is None:
+        ledger_cache.set_not_found(key)
+    elif fetched:
+        # Cache the schema by both its id and its sequence number
+        ledger_cache.set(key, result)
+        if schema.id:
+            ledger_cache.set((SCHEMA, schema.id), result)
+        if schema.seq_no:
+            ledger_cache.set((SCHEMA, str(schema.seq_no)), result)
+    return result
+
+
+async def get_credential_definition(
+    controller: AcaPyClient, credential_definition_id: str
+) -> CredentialDefinitionGetResult:
+    """
+    Get a credential definition from the ledger, or from the cache.
+
+    Args:
+        controller: The client to fetch the credential definition with, if it is not cached.
+        credential_definition_id: The credential definition id.
+
+    Returns:
+        The credential definition. Its `credential_definition` is None if it was not found.
+    """
+    key = (CREDENTIAL_DEFINITION, credential_definition_id)
+    result, fetched = await _get_ledger_object(
+        key,
+        controller.credential_definition.get_cred_def,
+        not_found_result=CredentialDefinitionGetResult(),
+        cred_def_id=credential_definition_id,
+    )
+
+    if fetched and result.credential_definition is None:
+        ledger_cache.set_not_found(key)
+    elif fetched:
+        ledger_cache.set(key, result)
+    return result
+
+
+def discard_credential_definition_not_found(credential_definition_id: str) -> None:
+    """
+    Forget that a credential definition was not found, e.g. when it was just written to the
+    ledger, but may not be readable yet.
+    """
+    ledger_cache.discard_not_found((CREDENTIAL_DEFINITION, credential_definition_id))
@@ -1,10 +1,12 @@
 from typing import List, Optional
 
 from app.exceptions import TrustRegistryException
+from app.services.trust_registry.snapshot import trust_registry_snapshot
+from app.util.single_flight import coalesce
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.models.trustregistry import Actor, TrustRegistryRole
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -20,10 +22,11 @@ async def register_actor(actor: Actor) -> None:
     """
     bound_logger = logger.bind(body={"actor": actor})
     bound_logger.info("Registering actor on trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actor_response = await client.post(
-            f"{TRUST_REGISTRY_URL}/registry/actors", json=actor.model_dump()
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actor_response = await client.post(
+        f"{TRUST_REGISTRY_URL}/registry/actors", json=actor.model_dump()
+    )
+    trust_registry_snapshot.invalidate()
 
     if actor_response.status_code == 422:
         bound_logger.error(
@@ -51,11 +54,12 @@ async def register_actor(actor: Actor) -> None:
 async def update_actor(actor: Actor) -> None:
     bound_logger = logger.bind(body={"actor": actor})
     bound_logger.info("Updating actor on trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        update_response = await client.put(
-            f"{TRUST_REGISTRY_URL}/registry/actors/{actor.id}",
-            json=actor.model_dump(),
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    update_response = await client.put(
+        f"{TRUST_REGISTRY_URL}/registry/actors/{actor.id}",
+        json=actor.model_dump(),
+    )
+    trust_registry_snapshot.invalidate()
 
     if update_response.status_code == 422:
         bound_logger.error(
@@ -88,8 +92,8 @@ async def fetch_all_actors() -> List[Actor]:
         List[Actor]: List of actors
     """
     logger.info("Fetching all actors from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
 
     if actors_response.is_error:
         logger.error(
@@ -112,6 +116,7 @@ async def fetch_all_actors() -> List[Actor]:
     return actors
 
 
+@coalesce
 async def fetch_actor_by_did(did: str) -> Optional[Actor]:
     """Retrieve actor by did from trust registry
 
@@ -126,10 +131,8 @@ async def fetch_actor_by_did(did: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"did": did})
     bound_logger.info("Fetching actor by DID from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actor_response = await client.get(
-            f"{TRUST_REGISTRY_URL}/registry/actors/did/{did}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actor_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors/did/{did}")
 
     if actor_response.status_code == 404:
         bound_logger.info("Bad request: Actor not found.")
@@ -163,10 +166,10 @@ async def fetch_actor_by_id(actor_id: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.info("Fetching actor by ID from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actor_response = await client.get(
-            f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actor_response = await client.get(
+        f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
+    )
 
     if actor_response.status_code == 404:
         bound_logger.info("Bad request: actor not found.")
@@ -200,10 +203,10 @@ async def fetch_actor_by_name(actor_name: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"actor_id": actor_name})
     bound_logger.info("Fetching actor by NAME from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actor_response = await client.get(
-            f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actor_response = await client.get(
+        f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
+    )
 
     if actor_response.status_code == 404:
         bound_logger.info("Bad request: Actor with name not found in registry.")
@@ -237,8 +240,8 @@ async def fetch_actors_with_role(role: TrustRegistryRole) -> List[Actor]:
     """
     bound_logger = logger.bind(body={"role": role})
     bound_logger.info("Fetching all actors with requested role from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
 
     if actors_response.is_error:
         bound_logger.error(
@@ -273,10 +276,11 @@ async def remove_actor_by_id(actor_id: str) -> None:
     """
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.info("Removing actor from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        remove_response = await client.delete(
-            f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    remove_response = await client.delete(
+        f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
+    )
+    trust_registry_snapshot.invalidate()
 
     if remove_response.status_code == 404:
         bound_logger.info(
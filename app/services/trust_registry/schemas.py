@@ -1,10 +1,12 @@
 from typing import List, Optional
 
 from app.exceptions import TrustRegistryException
+from app.services.trust_registry.snapshot import trust_registry_snapshot
+from app.util.single_flight import coalesce
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.models.trustregistry import Schema
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -20,10 +22,11 @@ async def register_schema(schema_id: str) -> None:
     """
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.info("Registering schema on trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        schema_res = await client.post(
-            f"{TRUST_REGISTRY_URL}/registry/schemas", json={"schema_id": schema_id}
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    schema_res = await client.post(
+        f"{TRUST_REGISTRY_URL}/registry/schemas", json={"schema_id": schema_id}
+    )
+    trust_registry_snapshot.invalidate()
 
     if schema_res.is_error:
         bound_logger.error(
@@ -39,6 +42,7 @@ async def register_schema(schema_id: str) -> None:
     bound_logger.info("Successfully registered schema on trust registry.")
 
 
+@coalesce
 async def fetch_schemas() -> List[Schema]:
     """Retrieve all schemas from the trust registry
 
@@ -49,8 +53,8 @@ async def fetch_schemas() -> List[Schema]:
         A list of schemas
     """
     logger.info("Fetching all schemas from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        schemas_res = await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas")
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    schemas_res = await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas")
 
     if schemas_res.is_error:
         logger.error(
@@ -79,10 +83,10 @@ async def get_schema_by_id(schema_id: str) -> Optional[Schema]:
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.info("Fetching schema from trust registry")
 
-    async with RichAsyncClient(raise_status_error=False) as client:
-        schema_response = await client.get(
-            f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    schema_response = await client.get(
+        f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}"
+    )
 
     if schema_response.status_code == 404:
         bound_logger.info("Bad request: Schema not found.")
@@ -114,10 +118,11 @@ async def remove_schema_by_id(schema_id: str) -> None:
     """
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.info("Removing schema from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        remove_response = await client.delete(
-            f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    remove_response = await client.delete(
+        f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}"
+    )
+    trust_registry_snapshot.invalidate()
 
     if remove_response.is_error:
         bound_logger.error(
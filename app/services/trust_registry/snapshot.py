@@ -0,0 +1,167 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+from app.exceptions import TrustRegistryException
+from shared.constants import (
+    TRUST_REGISTRY_SNAPSHOT_MAX_STALENESS_SECONDS,
+    TRUST_REGISTRY_SNAPSHOT_REFRESH_SECONDS,
+    TRUST_REGISTRY_URL,
+)
+from shared.log_config import get_logger
+from shared.models.trustregistry import Actor, Schema
+from shared.util.rich_async_client import get_rich_async_client
+
+logger = get_logger(__name__)
+
+
+class TrustRegistrySnapshot:
+    """
+    A read-only copy of the actors and schemas in the trust registry, held in-process so that
+    authorization checks are dictionary lookups rather than requests to the trust registry.
+
+    The snapshot is refreshed by polling the trust registry every `refresh_interval` seconds.
+    Lookups only use it while it is at most `max_staleness` seconds old; otherwise, e.g. when
+    the trust registry can't be reached, they return None, and callers fall back to the trust
+    registry API. As the snapshot may not have an actor or schema that was just registered,
+    callers also fall back to the API when a lookup finds nothing.
+
+    Writes to the trust registry from this app invalidate the snapshot, and trigger a refresh.
+    Only those of this process do, though: as an actor or schema found in the snapshot is not
+    checked with the API, one removed by another replica stays authorized until the snapshot
+    is refreshed, for up to `max_staleness` seconds (by default, the refresh interval).
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = TRUST_REGISTRY_SNAPSHOT_REFRESH_SECONDS,
+        max_staleness: float = TRUST_REGISTRY_SNAPSHOT_MAX_STALENESS_SECONDS,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+
+        self._actors_by_id: Dict[str, Actor] = {}
+        self._actors_by_did: Dict[str, Actor] = {}
+        self._actors_by_name: Dict[str, Actor] = {}
+        self._schemas_by_id: Dict[str, Schema] = {}
+        self._refreshed_at: Optional[float] = None  # monotonic time, None when stale
+        self._num_invalidations = 0
+
+        self._poll_task: Optional[asyncio.Task] = None
+        self._refresh_requested = asyncio.Event()
+
+    def start(self) -> None:
+        """
+        Start polling the trust registry. A max_staleness of 0 disables the snapshot.
+        """
+        if self.max_staleness > 0 and self._poll_task is None:
+            self._poll_task = asyncio.create_task(
+                self._poll(), name="Poll trust registry snapshot"
+            )
+
+    async def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        self._refreshed_at = None
+
+    def invalidate(self) -> None:
+        """
+        Stop using the snapshot until it is refreshed, e.g. after writing to the trust registry.
+        """
+        self._refreshed_at = None
+        self._num_invalidations += 1
+        self._refresh_requested.set()
+
+    def is_fresh(self) -> bool:
+        return (
+            self._refreshed_at is not None
+            and time.monotonic() - self._refreshed_at <= self.max_staleness
+        )
+
+    def get_actor_by_id(self, actor_id: str) -> Optional[Actor]:
+        return self._actors_by_id.get(actor_id) if self.is_fresh() else None
+
+    def get_actor_by_did(self, did: str) -> Optional[Actor]:
+        return self._actors_by_did.get(did) if self.is_fresh() else None
+
+    def get_actor_by_name(self, name: str) -> Optional[Actor]:
+        return self._actors_by_name.get(name) if self.is_fresh() else None
+
+    def has_schema(self, schema_id: str) -> bool:
+        """
+        Whether the snapshot is fresh and has the schema.
+        """
+        return self.is_fresh() and schema_id in self._schemas_by_id
+
+    def get_schema_ids(self) -> Optional[Set[str]]:
+        """
+        Get the ids of the schemas in the snapshot, or None if it is not fresh.
+        """
+        return set(self._schemas_by_id) if self.is_fresh() else None
+
+    async def refresh(self) -> None:
+        """
+        Replace the snapshot with the current actors and schemas in the trust registry.
+
+        Raises:
+            TrustRegistryException: If the actors or schemas could not be fetched.
+        """
+        started_at = time.monotonic()
+        num_invalidations = self._num_invalidations
+        actors = await self._fetch("actors")
+        schemas = await self._fetch("schemas")
+
+        self._actors_by_id = {
+            actor["id"]: Actor.model_validate(actor) for actor in actors
+        }
+        self._actors_by_did = {
+            actor.did: actor for actor in self._actors_by_id.values() if actor.did
+        }
+        self._actors_by_name = {
+            actor.name: actor for actor in self._actors_by_id.values() if actor.name
+        }
+        self._schemas_by_id = {
+            schema["id"]: Schema.model_validate(schema) for schema in schemas
+        }
+        # Measured from before fetching, as the snapshot is as old as its oldest part. If it
+        # was invalidated meanwhile, it may not have the latest write, and stays stale
+        if num_invalidations == self._num_invalidations:
+            self._refreshed_at = started_at
+        logger.debug(
+            "Refreshed trust registry snapshot: {} actors and {} schemas",
+            len(self._actors_by_id),
+            len(self._schemas_by_id),
+        )
+
+    async def _fetch(self, kind: str) -> List[Dict]:
+        client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+        response = await client.get(f"{TRUST_REGISTRY_URL}/registry/{kind}")
+        if response.is_error:
+            raise TrustRegistryException(
+                f"Unable to fetch {kind} for snapshot: `{response.text}`.",
+                response.status_code,
+            )
+        return response.json()
+
+    async def _poll(self) -> None:
+        while True:
+            self._refresh_requested.clear()
+            try:
+                await self.refresh()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Could not refresh trust registry snapshot")
+
+            try:
+                await asyncio.wait_for(
+                    self._refresh_requested.wait(), timeout=self.refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+trust_registry_snapshot = TrustRegistrySnapshot()
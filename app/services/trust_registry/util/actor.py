@@ -3,7 +3,7 @@ from app.services.trust_registry.actors import fetch_actor_by_id
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.models.trustregistry import TrustRegistryRole
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -49,10 +49,10 @@ async def assert_actor_name(actor_name: str) -> bool:
     bound_logger = logger.bind(body={"actor_name": actor_name})
     bound_logger.info("Fetching actor by name from trust registry")
 
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actor_response = await client.get(
-            f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
-        )
+    client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    actor_response = await client.get(
+        f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
+    )
 
     if actor_response.status_code == 404:
         return False
@@ -2,6 +2,7 @@ from typing import Optional
 
 from app.exceptions import TrustRegistryException
 from app.services.trust_registry.actors import fetch_actor_by_did
+from app.services.trust_registry.snapshot import trust_registry_snapshot
 from app.services.trust_registry.util.schema import registry_has_schema
 from shared.log_config import get_logger
 
@@ -29,7 +30,9 @@ async def assert_valid_issuer(did: str, schema_id: Optional[str] = None) -> None
     """
     bound_logger = logger.bind(body={"did": did, "schema_id": schema_id})
     bound_logger.info("Asserting issuer DID and schema_id is registered")
-    actor = await fetch_actor_by_did(did)
+    actor = trust_registry_snapshot.get_actor_by_did(did)
+    if not actor:
+        actor = await fetch_actor_by_did(did)
 
     if not actor:
         bound_logger.info("DID not registered in the trust registry.")
@@ -43,7 +46,9 @@ async def assert_valid_issuer(did: str, schema_id: Optional[str] = None) -> None
     bound_logger.info("Issuer DID is valid")
 
     if schema_id:
-        has_schema = await registry_has_schema(schema_id)
+        has_schema = trust_registry_snapshot.has_schema(schema_id)
+        if not has_schema:
+            has_schema = await registry_has_schema(schema_id)
         if not has_schema:
             bound_logger.info("Schema is not registered in the trust registry.")
             raise TrustRegistryException(
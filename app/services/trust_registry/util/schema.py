@@ -2,7 +2,7 @@ from fastapi import HTTPException
 
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -24,9 +24,9 @@ async def registry_has_schema(schema_id: str) -> bool:
         "Asserting if schema is registered. Fetching schema by ID from trust registry"
     )
     try:
-        async with RichAsyncClient() as client:
-            bound_logger.debug("Fetch schema from trust registry")
-            await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
+        client = get_rich_async_client("TrustRegistry")
+        bound_logger.debug("Fetch schema from trust registry")
+        await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
     except HTTPException as http_err:
         if http_err.status_code == 404:
             bound_logger.info("Schema id not registered in trust registry.")
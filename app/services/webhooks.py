@@ -5,7 +5,7 @@ from httpx import HTTPError
 from shared import WEBHOOKS_URL
 from shared.log_config import get_logger
 from shared.models.webhook_events import CloudApiTopics
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -17,9 +17,9 @@ async def get_hooks_for_wallet(wallet_id: str) -> List:
     bound_logger = logger.bind(body={"wallet_id": wallet_id})
     bound_logger.info("Fetching webhooks events from /webhooks/wallet_id")
     try:
-        async with RichAsyncClient() as client:
-            hooks = (await client.get(f"{WEBHOOKS_URL}/webhooks/{wallet_id}")).json()
-            return hooks if hooks else []
+        client = get_rich_async_client("Webhooks")
+        hooks = (await client.get(f"{WEBHOOKS_URL}/webhooks/{wallet_id}")).json()
+        return hooks if hooks else []
     except HTTPError as e:
         bound_logger.error("HTTP Error caught when fetching webhooks: {}.", e)
         raise e
@@ -29,11 +29,11 @@ async def get_hooks_for_wallet_by_topic(wallet_id: str, topic: CloudApiTopics) -
     bound_logger = logger.bind(body={"wallet_id": wallet_id, "topic": topic})
     bound_logger.info("Fetching webhooks events from /webhooks/wallet_id/topic")
     try:
-        async with RichAsyncClient() as client:
-            hooks = (
-                await client.get(f"{WEBHOOKS_URL}/webhooks/{wallet_id}/{topic}")
-            ).json()
-            return hooks if hooks else []
+        client = get_rich_async_client("Webhooks")
+        hooks = (
+            await client.get(f"{WEBHOOKS_URL}/webhooks/{wallet_id}/{topic}")
+        ).json()
+        return hooks if hooks else []
     except HTTPError as e:
         bound_logger.error("HTTP Error caught when fetching webhooks: {}.", e)
         raise e
@@ -1,5 +1,3 @@
-import asyncio
-
 from fastapi import Depends, HTTPException, WebSocket, WebSocketDisconnect
 
 from app.dependencies.auth import (
@@ -12,8 +10,6 @@ from shared.log_config import get_logger
 
 logger = get_logger(__name__)
 
-DISCONNECT_CHECK_PERIOD = 0.1
-
 
 async def get_websocket_api_key(websocket: WebSocket) -> str:
     for header, value in websocket.headers.items():
@@ -78,14 +74,28 @@ async def handle_websocket(
             websocket, group_id=group_id, wallet_id=wallet_id, topic=topic
         )
 
-        # Keep the connection open until the client disconnects
-        while True:
-            await asyncio.sleep(DISCONNECT_CHECK_PERIOD)
+        # Events are sent by the WebsocketManager; wait until the client disconnects
+        await wait_for_disconnect(websocket)
+        bound_logger.info("WebSocket connection closed.")
     except WebSocketDisconnect:
         bound_logger.info("WebSocket connection closed.")
-        if uuid:
-            await WebsocketManager.unsubscribe(uuid)
     except Exception:  # pylint: disable=W0718
         bound_logger.exception("Exception caught while handling websocket.")
+    finally:
         if uuid:
             await WebsocketManager.unsubscribe(uuid)
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """
+    Wait for the ASGI `websocket.disconnect` message, ignoring messages from the client.
+
+    The session task sleeps until a message arrives, so an idle websocket costs no wakeups.
+    Keepalive pings, and closing connections whose pongs time out, are handled by the
+    server (see uvicorn's `--ws-ping-interval` and `--ws-ping-timeout`). Such a close, or
+    one by the WebsocketManager when a client is too slow, arrives here as a disconnect.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
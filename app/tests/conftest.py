@@ -3,6 +3,7 @@
 import mockito
 import pytest
 
+from app.services.ledger_cache import ledger_cache
 from app.tests.fixtures.dids import register_issuer_key_bbs, register_issuer_key_ed25519
 from app.tests.fixtures.member_acapy_clients import (
     acme_acapy_client,
@@ -79,3 +80,14 @@ def unstub_mockito():
 
     # Teardown phase: After each test, unstub all stubbed methods
     mockito.unstub()
+
+
+@pytest.fixture(autouse=True)
+def clear_ledger_cache():
+    """
+    Clear the ledger cache after each test, so that ledger objects mocked in one test are
+    not returned in another.
+    """
+    yield
+
+    ledger_cache.clear()
@@ -1,13 +1,17 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import Mock
 
 import pytest
-from aries_cloudcontroller import AcaPyClient
+from aries_cloudcontroller import AcaPyClient, ApiClient
 from fastapi import HTTPException
 
 from app.dependencies.acapy_clients import (
     AcaPyAuthVerified,
+    PooledAcaPyClient,
     client_from_auth,
+    close_acapy_clients,
     get_governance_controller,
+    get_pool,
     get_tenant_admin_controller,
     get_tenant_controller,
 )
@@ -44,33 +48,98 @@ async def test_tenant_admin_agent(tenant_admin_acapy_client):
     assert "Authorization" not in tenant_admin_acapy_client.api_client.default_headers
 
 
-def test_get_governance_controller():
-    with patch("app.dependencies.acapy_clients.AcaPyClient") as mock_acapy_client:
-        get_governance_controller()
-        mock_acapy_client.assert_called_with(
-            base_url=Role.GOVERNANCE.agent_type.base_url,
-            api_key=Role.GOVERNANCE.agent_type.x_api_key,
-        )
+@pytest.mark.anyio
+async def test_get_governance_controller():
+    client = get_governance_controller()
+
+    assert client.configuration.host == Role.GOVERNANCE.agent_type.base_url
+    assert client.api_key == Role.GOVERNANCE.agent_type.x_api_key
+    assert "Authorization" not in client.api_client.default_headers
 
 
-def test_get_tenant_admin_controller():
-    with patch("app.dependencies.acapy_clients.AcaPyClient") as mock_acapy_client:
-        get_tenant_admin_controller()
-        mock_acapy_client.assert_called_with(
-            base_url=Role.TENANT_ADMIN.agent_type.base_url,
-            api_key=Role.TENANT_ADMIN.agent_type.x_api_key,
-        )
+@pytest.mark.anyio
+async def test_get_tenant_admin_controller():
+    client = get_tenant_admin_controller()
+
+    assert client.configuration.host == Role.TENANT_ADMIN.agent_type.base_url
+    assert client.api_key == Role.TENANT_ADMIN.agent_type.x_api_key
+    assert "Authorization" not in client.api_client.default_headers
 
 
-def test_get_tenant_controller():
+@pytest.mark.anyio
+async def test_get_tenant_controller():
     auth_token = "fake-jwt-token"
-    with patch("app.dependencies.acapy_clients.AcaPyClient") as mock_acapy_client:
-        get_tenant_controller(auth_token)
-        mock_acapy_client.assert_called_with(
-            base_url=Role.TENANT.agent_type.base_url,
-            api_key=Role.TENANT.agent_type.x_api_key,
-            tenant_jwt=auth_token,
-        )
+    client = get_tenant_controller(auth_token)
+
+    assert client.configuration.host == Role.TENANT.agent_type.base_url
+    assert client.api_client.default_headers["x-api-key"] == (
+        Role.TENANT.agent_type.x_api_key
+    )
+    assert client.api_client.default_headers["Authorization"] == f"Bearer {auth_token}"
+
+
+@pytest.mark.anyio
+async def test_clients_share_pool():
+    async with get_tenant_controller("jwt1") as client1:
+        pass  # Closing a client leaves the pool open
+    client2 = get_tenant_controller("jwt2")
+
+    # The clients share the connection pool, but not their headers
+    assert client1.api_client.rest_client is client2.api_client.rest_client
+    assert not client1.api_client.rest_client.pool_manager.closed
+    assert client1.api_client.default_headers["Authorization"] == "Bearer jwt1"
+    assert client2.api_client.default_headers["Authorization"] == "Bearer jwt2"
+    assert client2.connection.api_client is client2.api_client
+
+    # Roles have their own pools
+    assert (
+        get_tenant_admin_controller().api_client.rest_client
+        is not client2.api_client.rest_client
+    )
+
+    await close_acapy_clients()
+    assert client2.api_client.rest_client.pool_manager.closed
+
+
+@pytest.mark.anyio
+async def test_pooled_client_attributes_match_acapy_client():
+    pooled_client = get_tenant_controller("jwt")
+    acapy_client = AcaPyClient(
+        Role.TENANT.agent_type.base_url, api_key="key", tenant_jwt="jwt"
+    )
+
+    # PooledAcaPyClient sets the attributes that AcaPyClient.__init__ sets, and the
+    # ApiClient is one built by its own constructor
+    assert vars(pooled_client).keys() == vars(acapy_client).keys()
+    assert vars(pooled_client.api_client).keys() == vars(acapy_client.api_client).keys()
+    assert pooled_client.api_client.user_agent == acapy_client.api_client.user_agent
+
+    await acapy_client.close()
+    await close_acapy_clients()
+
+
+async def create_tenant_pool() -> ApiClient:
+    return get_pool(Role.TENANT.agent_type)
+
+
+def test_pool_closed_with_its_event_loop():
+    # The pools of an event loop are closed when it shuts down, e.g. at the end of a test
+    pool = asyncio.run(create_tenant_pool())
+    assert pool.rest_client.pool_manager.closed
+
+
+def test_pool_of_other_event_loop_closed_on_that_loop():
+    other_loop = asyncio.new_event_loop()
+    other_loop_pool = other_loop.run_until_complete(create_tenant_pool())
+
+    # A pool can't be used on another loop; it is replaced, and closed on its own loop
+    pool = asyncio.run(create_tenant_pool())
+    assert pool is not other_loop_pool
+    assert not other_loop_pool.rest_client.pool_manager.closed
+
+    other_loop.run_until_complete(asyncio.sleep(0.01))
+    assert other_loop_pool.rest_client.pool_manager.closed
+    other_loop.close()
 
 
 @pytest.mark.parametrize(
@@ -92,7 +161,8 @@ async def test_client_from_auth(is_multitenant, is_admin):
     assert isinstance(client, AcaPyClient)
 
 
-def test_client_from_auth_missing_auth():
+@pytest.mark.anyio
+async def test_client_from_auth_missing_auth():
     with pytest.raises(HTTPException) as exc_info:
         client_from_auth(None)
     assert exc_info.value.status_code == 403
@@ -85,13 +85,13 @@ async def meld_co_client(
 
 @pytest.fixture
 def mock_async_client(mocker: MockerFixture, request) -> Mock:
-    """Patching RichAsyncClient in variable modules"""
+    """Patching the shared RichAsyncClient in variable modules"""
     module_path = request.param
-    patch_async_client = mocker.patch(f"{module_path}.RichAsyncClient")
+    patch_async_client = mocker.patch(f"{module_path}.get_rich_async_client")
 
     mocked_async_client = Mock()
     response = Response(status_code=200)
     mocked_async_client.get = AsyncMock(return_value=response)
-    patch_async_client.return_value.__aenter__.return_value = mocked_async_client
+    patch_async_client.return_value = mocked_async_client
 
     return mocked_async_client
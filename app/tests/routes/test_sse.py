@@ -3,12 +3,14 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from app.exceptions import CloudApiException
 from app.routes.sse import (
     get_sse_subscribe_event_with_field_and_state,
     get_sse_subscribe_event_with_state,
     get_sse_subscribe_stream_with_fields,
     get_sse_subscribe_wallet,
     get_sse_subscribe_wallet_topic,
+    get_sse_subscribe_wallets,
 )
 from shared.constants import MAX_EVENT_AGE_SECONDS
 
@@ -239,3 +241,62 @@ async def test_get_sse_subscribe_event_with_field_and_state(
         desired_state=state,
         look_back=look_back,
     )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "group_id, wallet_ids", [("some_group", None), (None, ["wallet1", "wallet2"])]
+)
+async def test_get_sse_subscribe_wallets(
+    mock_request,  # pylint: disable=redefined-outer-name
+    mock_auth,  # pylint: disable=redefined-outer-name
+    group_id: Optional[str],
+    wallet_ids: Optional[list],
+):
+    sse_subscribe_wallets_mock = Mock()
+
+    with patch("app.routes.sse.sse_subscribe_wallets", new=sse_subscribe_wallets_mock):
+        response = await get_sse_subscribe_wallets(
+            request=mock_request,
+            wallet_ids=wallet_ids,
+            topic=topic,
+            field=None,
+            field_id=None,
+            desired_state=state,
+            look_back=MAX_EVENT_AGE_SECONDS,
+            group_id=group_id,
+            auth=mock_auth,
+        )
+
+        assert response.media_type == "text/event-stream"
+        sse_subscribe_wallets_mock.assert_called_with(
+            request=mock_request,
+            group_id=group_id,
+            wallet_ids=wallet_ids,
+            topic=topic,
+            field=None,
+            field_id=None,
+            desired_state=state,
+            look_back=MAX_EVENT_AGE_SECONDS,
+        )
+
+
+@pytest.mark.anyio
+async def test_get_sse_subscribe_wallets_requires_wallets_or_group(
+    mock_request,  # pylint: disable=redefined-outer-name
+    mock_auth,  # pylint: disable=redefined-outer-name
+):
+    with pytest.raises(CloudApiException) as exc:
+        await get_sse_subscribe_wallets(
+            request=mock_request,
+            wallet_ids=None,
+            topic=None,
+            field=None,
+            field_id=None,
+            desired_state=None,
+            look_back=MAX_EVENT_AGE_SECONDS,
+            group_id=None,
+            auth=mock_auth,
+        )
+
+    assert exc.value.status_code == 400
@@ -6,15 +6,20 @@ from fastapi import Request
 from httpx import HTTPError, Response
 
 from app.services.event_handling.sse import (
+    default_timeout,
+    event_timeout,
+    get_sse_client,
+    resume_headers,
     sse_subscribe_event_with_field_and_state,
     sse_subscribe_event_with_state,
     sse_subscribe_stream_with_fields,
     sse_subscribe_wallet,
     sse_subscribe_wallet_topic,
-    yield_lines_with_disconnect_check,
+    sse_subscribe_wallets,
+    yield_chunks,
 )
 from shared.constants import MAX_EVENT_AGE_SECONDS, WEBHOOKS_URL
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import RichAsyncClient, close_rich_async_clients
 
 wallet_id = "some_wallet"
 topic = "some_topic"
@@ -26,15 +31,15 @@ state = "some_state"
 stream_exception_msg = "Stream method exception"
 
 
-line1 = "data: test\n"
-line2 = "\n"
-line3 = "data: done\n"
+line1 = b"data: test\n"
+line2 = b"\n"
+line3 = b"data: done\n"
 lines_list = [line1, line2, line3]
 
 
 # Fixture for async generator lines
 @pytest.fixture
-def async_lines() -> AsyncGenerator[str, Any]:
+def async_lines() -> AsyncGenerator[bytes, Any]:
     async def _lines():
         yield line1
         yield line2
@@ -46,10 +51,10 @@ def async_lines() -> AsyncGenerator[str, Any]:
 # Fixture for the mock response
 @pytest.fixture
 def response_mock(
-    async_lines: AsyncGenerator[str, Any]  # pylint: disable=redefined-outer-name
+    async_lines: AsyncGenerator[bytes, Any]  # pylint: disable=redefined-outer-name
 ) -> AsyncMock:
     response = AsyncMock(spec=Response)
-    response.aiter_lines.return_value = async_lines()
+    response.aiter_bytes.return_value = async_lines()
     return response
 
 
@@ -57,7 +62,7 @@ def response_mock(
 @pytest.fixture
 def mock_request() -> AsyncMock:
     request = AsyncMock(spec=Request)
-    request.is_disconnected.return_value = False
+    request.headers = {}
     return request
 
 
@@ -82,45 +87,37 @@ def exception_async_context_manager_mock(
     return configured_async_context_manager_mock
 
 
-# Patching the yield_lines_with_disconnect_check globally for all tests
+# Patching the yield_chunks globally for all tests
 @pytest.fixture(autouse=True)
-def patch_yield_lines_with_disconnect_check(
+def patch_yield_chunks(
     async_lines,  # pylint: disable=redefined-outer-name
 ) -> Generator[AsyncMock, Any, None]:
     with patch(
-        "app.services.event_handling.sse.yield_lines_with_disconnect_check",
+        "app.services.event_handling.sse.yield_chunks",
         return_value=async_lines(),
     ) as mocked_yield:
         yield mocked_yield
 
 
 @pytest.mark.anyio
-async def test_yield_lines_with_disconnect_check_success(
-    response_mock, mock_request  # pylint: disable=redefined-outer-name
-):
-    # Execute yield_lines_with_disconnect_check and collect results
-    results = [
-        line
-        async for line in yield_lines_with_disconnect_check(mock_request, response_mock)
-    ]
-    # Assert that all lines were yielded correctly
-    assert results == [line1 + "\n", line2 + "\n", line3 + "\n"]
+async def test_get_sse_client_is_shared():
+    client = get_sse_client()
+    assert get_sse_client() is client
+
+    await close_rich_async_clients()
+    assert client.is_closed
+
+    # A new client is created after the shared one is closed
+    new_client = get_sse_client()
+    assert new_client is not client
+    await close_rich_async_clients()
 
 
 @pytest.mark.anyio
-async def test_yield_lines_with_disconnect_check_disconnects(
-    response_mock, mock_request  # pylint: disable=redefined-outer-name
-):
-    # Override the mock request to simulate a disconnection after the first yield
-    mock_request.is_disconnected.side_effect = [False, True]
+async def test_yield_chunks(response_mock):  # pylint: disable=redefined-outer-name
+    results = [chunk async for chunk in yield_chunks(response_mock)]
 
-    # Execute yield_lines_with_disconnect_check and collect results
-    results = [
-        line
-        async for line in yield_lines_with_disconnect_check(mock_request, response_mock)
-    ]
-    # Assert that only the first line was yielded before disconnection
-    assert results == [line1 + "\n"]
+    assert results == lines_list
 
 
 @pytest.mark.anyio
@@ -134,7 +131,7 @@ async def test_sse_subscribe_wallet_exception(
         return_value=exception_async_context_manager_mock,
     ):
         mock_request = AsyncMock(spec=Request)
-        mock_request.is_disconnected.return_value = False
+        mock_request.headers = {}
 
         # Execute the function and handle the exception
         with pytest.raises(HTTPError) as e:
@@ -153,7 +150,7 @@ async def test_sse_subscribe_wallet_exception(
 async def test_sse_subscribe_wallet_success(
     configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
     mock_request,  # pylint: disable=redefined-outer-name
-    patch_yield_lines_with_disconnect_check,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
     group_id: Optional[str],
     look_back: float,
 ):
@@ -178,8 +175,8 @@ async def test_sse_subscribe_wallet_success(
 
         # Verify the collected lines
         assert results == lines_list
-        # Ensure the patched yield_lines_with_disconnect_check was called
-        patch_yield_lines_with_disconnect_check.assert_called()
+        # Ensure the patched yield_chunks was called
+        patch_yield_chunks.assert_called()
 
         # Additionally, assert that the stream was opened with the correct parameters
         configured_async_context_manager_mock.__aenter__.assert_called()
@@ -187,6 +184,45 @@ async def test_sse_subscribe_wallet_success(
             "GET",
             f"{WEBHOOKS_URL}/sse/{wallet_id}",
             params=expected_params,
+            headers={},
+            timeout=default_timeout,
+        )
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [({}, {}), ({"last-event-id": "123"}, {"Last-Event-ID": "123"})],
+)
+def test_resume_headers(headers, expected):
+    request = AsyncMock(spec=Request)
+    request.headers = headers
+
+    assert resume_headers(request) == expected
+
+
+@pytest.mark.anyio
+async def test_sse_subscribe_wallet_forwards_last_event_id(
+    configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
+    mock_request,  # pylint: disable=redefined-outer-name
+):
+    mock_request.headers = {"last-event-id": "123"}
+
+    with patch.object(
+        RichAsyncClient,
+        "stream",
+        return_value=configured_async_context_manager_mock,
+    ) as mock_stream:
+        async for _ in sse_subscribe_wallet(
+            request=mock_request, group_id=None, wallet_id=wallet_id
+        ):
+            pass
+
+        mock_stream.assert_called_with(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/{wallet_id}",
+            params={"look_back": MAX_EVENT_AGE_SECONDS},
+            headers={"Last-Event-ID": "123"},
+            timeout=default_timeout,
         )
 
 
@@ -201,7 +237,7 @@ async def test_sse_subscribe_wallet_topic_exception(
         return_value=exception_async_context_manager_mock,
     ):
         mock_request = AsyncMock(spec=Request)
-        mock_request.is_disconnected.return_value = False
+        mock_request.headers = {}
 
         # Execute the function and handle the exception
         with pytest.raises(HTTPError) as e:
@@ -223,7 +259,7 @@ async def test_sse_subscribe_wallet_topic_exception(
 async def test_sse_subscribe_wallet_topic_success(
     configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
     mock_request,  # pylint: disable=redefined-outer-name
-    patch_yield_lines_with_disconnect_check,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
     group_id: Optional[str],
     look_back: float,
 ):
@@ -249,8 +285,8 @@ async def test_sse_subscribe_wallet_topic_success(
 
         # Verify the collected lines
         assert results == lines_list
-        # Ensure the patched yield_lines_with_disconnect_check was called
-        patch_yield_lines_with_disconnect_check.assert_called()
+        # Ensure the patched yield_chunks was called
+        patch_yield_chunks.assert_called()
 
         # Additionally, assert that the stream was opened with the correct parameters
         configured_async_context_manager_mock.__aenter__.assert_called()
@@ -258,6 +294,8 @@ async def test_sse_subscribe_wallet_topic_success(
             "GET",
             f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}",
             params=expected_params,
+            headers={},
+            timeout=default_timeout,
         )
 
 
@@ -272,7 +310,7 @@ async def test_sse_subscribe_event_with_state_exception(
         return_value=exception_async_context_manager_mock,
     ):
         mock_request = AsyncMock(spec=Request)
-        mock_request.is_disconnected.return_value = False
+        mock_request.headers = {}
 
         # Execute the function and handle the exception
         with pytest.raises(HTTPError) as e:
@@ -295,7 +333,7 @@ async def test_sse_subscribe_event_with_state_exception(
 async def test_sse_subscribe_event_with_state_success(
     configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
     mock_request,  # pylint: disable=redefined-outer-name
-    patch_yield_lines_with_disconnect_check,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
     group_id: Optional[str],
     look_back: float,
 ):
@@ -322,8 +360,8 @@ async def test_sse_subscribe_event_with_state_success(
 
         # Verify the collected lines
         assert results == lines_list
-        # Ensure the patched yield_lines_with_disconnect_check was called
-        patch_yield_lines_with_disconnect_check.assert_called()
+        # Ensure the patched yield_chunks was called
+        patch_yield_chunks.assert_called()
 
         # Additionally, assert that the stream was opened with the correct parameters
         configured_async_context_manager_mock.__aenter__.assert_called()
@@ -331,6 +369,8 @@ async def test_sse_subscribe_event_with_state_success(
             "GET",
             f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{state}",
             params=expected_params,
+            headers={},
+            timeout=event_timeout,
         )
 
 
@@ -345,7 +385,7 @@ async def test_sse_subscribe_stream_with_fields_exception(
         return_value=exception_async_context_manager_mock,
     ):
         mock_request = AsyncMock(spec=Request)
-        mock_request.is_disconnected.return_value = False
+        mock_request.headers = {}
 
         # Execute the function and handle the exception
         with pytest.raises(HTTPError) as e:
@@ -369,7 +409,7 @@ async def test_sse_subscribe_stream_with_fields_exception(
 async def test_sse_subscribe_stream_with_fields_success(
     configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
     mock_request,  # pylint: disable=redefined-outer-name
-    patch_yield_lines_with_disconnect_check,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
     group_id: Optional[str],
     look_back: float,
 ):
@@ -397,8 +437,8 @@ async def test_sse_subscribe_stream_with_fields_success(
 
         # Verify the collected lines
         assert results == lines_list
-        # Ensure the patched yield_lines_with_disconnect_check was called
-        patch_yield_lines_with_disconnect_check.assert_called()
+        # Ensure the patched yield_chunks was called
+        patch_yield_chunks.assert_called()
 
         # Additionally, assert that the stream was opened with the correct parameters
         configured_async_context_manager_mock.__aenter__.assert_called()
@@ -406,6 +446,8 @@ async def test_sse_subscribe_stream_with_fields_success(
             "GET",
             f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}",
             params=expected_params,
+            headers={},
+            timeout=default_timeout,
         )
 
 
@@ -420,7 +462,7 @@ async def test_sse_subscribe_event_with_field_and_state_exception(
         return_value=exception_async_context_manager_mock,
     ):
         mock_request = AsyncMock(spec=Request)
-        mock_request.is_disconnected.return_value = False
+        mock_request.headers = {}
 
         # Execute the function and handle the exception
         with pytest.raises(HTTPError) as e:
@@ -445,7 +487,7 @@ async def test_sse_subscribe_event_with_field_and_state_exception(
 async def test_sse_subscribe_event_with_field_and_state_success(
     configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
     mock_request,  # pylint: disable=redefined-outer-name
-    patch_yield_lines_with_disconnect_check,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
     group_id: Optional[str],
     look_back: float,
 ):
@@ -474,8 +516,8 @@ async def test_sse_subscribe_event_with_field_and_state_success(
 
         # Verify the collected lines
         assert results == lines_list
-        # Ensure the patched yield_lines_with_disconnect_check was called
-        patch_yield_lines_with_disconnect_check.assert_called()
+        # Ensure the patched yield_chunks was called
+        patch_yield_chunks.assert_called()
 
         # Additionally, assert that the stream was opened with the correct parameters
         configured_async_context_manager_mock.__aenter__.assert_called()
@@ -484,4 +526,65 @@ async def test_sse_subscribe_event_with_field_and_state_success(
             "GET",
             f"{WEBHOOKS_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{state}",
             params=expected_params,
+            headers={},
+            timeout=event_timeout,
         )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "group_id, wallet_ids", [("some_group", None), (None, ["wallet1", "wallet2"])]
+)
+async def test_sse_subscribe_wallets_success(
+    configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
+    mock_request,  # pylint: disable=redefined-outer-name
+    patch_yield_chunks,  # pylint: disable=redefined-outer-name
+    group_id: Optional[str],
+    wallet_ids: Optional[list],
+):
+    expected_params = {"look_back": MAX_EVENT_AGE_SECONDS, "desired_state": state}
+    if group_id:
+        expected_params["group_id"] = group_id
+    if wallet_ids:
+        expected_params["wallet_ids"] = wallet_ids
+
+    with patch.object(
+        RichAsyncClient,
+        "stream",
+        return_value=configured_async_context_manager_mock,
+    ) as mock_stream:
+        results = []
+        async for line in sse_subscribe_wallets(
+            request=mock_request,
+            group_id=group_id,
+            wallet_ids=wallet_ids,
+            desired_state=state,
+        ):
+            results.append(line)
+
+        assert results == lines_list
+        patch_yield_chunks.assert_called()
+        mock_stream.assert_called_with(
+            "GET",
+            f"{WEBHOOKS_URL}/sse/wallets",
+            params=expected_params,
+            headers={},
+            timeout=event_timeout,
+        )
+
+
+@pytest.mark.anyio
+async def test_sse_subscribe_wallets_exception(
+    exception_async_context_manager_mock,  # pylint: disable=redefined-outer-name
+    mock_request,  # pylint: disable=redefined-outer-name
+):
+    with patch.object(
+        RichAsyncClient, "stream", return_value=exception_async_context_manager_mock
+    ):
+        with pytest.raises(HTTPError) as e:
+            async for _ in sse_subscribe_wallets(
+                request=mock_request, group_id="some_group"
+            ):
+                pass
+
+        assert str(e.value) == stream_exception_msg
@@ -1,13 +1,19 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi import WebSocket
 
 from app.services.event_handling.websocket_manager import (
+    RoutingClientMethods,
     WebsocketManager,
+    WebsocketTimeout,
     convert_url_to_websocket,
 )
 
+# pylint: disable=protected-access
+# because we are testing protected methods
+
 
 @pytest.fixture(autouse=True)
 def mock_pubsub_client():
@@ -19,9 +25,24 @@ def mock_pubsub_client():
         yield mock_client
 
 
+@pytest.fixture
+def channel():
+    mock_channel = Mock()
+    mock_channel.other.subscribe = AsyncMock(return_value=True)
+    return mock_channel
+
+
+@pytest.fixture
+async def reset_websocket_manager():
+    yield
+    await WebsocketManager.disconnect_all()
+
+
 @pytest.mark.anyio
 async def test_subscribe_wallet_id_and_topic(
     mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
 ):
     websocket = AsyncMock(spec=WebSocket)
     wallet_id = "test_wallet_id"
@@ -32,19 +53,179 @@ async def test_subscribe_wallet_id_and_topic(
         websocket, group_id=group_id, wallet_id=wallet_id, topic=topic
     )
 
-    # Ensure `subscribe` was called once
+    # The shared client was started, and subscribes to the topic once connected
     mock_pubsub_client.assert_called_once()
-    mock_pubsub_client.return_value.subscribe.assert_called_once()
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+    channel.other.subscribe.assert_awaited_once_with(
+        topics=[f"{group_id}:{wallet_id}:{topic}"]
+    )
 
-    # Check that the callback is working as expected
-    callback_func = mock_pubsub_client.return_value.subscribe.call_args[0][1]
+    # Check that events on the topic are sent to the websocket
     dummy_data = "dummy_data"
-    await callback_func(dummy_data, "dummy_topic")
+    methods = RoutingClientMethods(mock_pubsub_client.return_value)
+    await methods.notify(
+        subscription={"topic": f"{group_id}:{wallet_id}:{topic}"}, data=dummy_data
+    )
+    await methods.notify(subscription={"topic": "other_topic"}, data="other_data")
+    await asyncio.sleep(0)  # Let the sender task run
 
-    # Check that the websocket's `send_text` method was called with the correct argument
     websocket.send_text.assert_called_once_with(dummy_data)
 
 
+@pytest.mark.anyio
+async def test_subscribe_shares_client_and_topic(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+    websocket1 = AsyncMock(spec=WebSocket)
+    websocket2 = AsyncMock(spec=WebSocket)
+
+    uuid1 = await WebsocketManager.subscribe(websocket1, group_id="group")
+    uuid2 = await WebsocketManager.subscribe(websocket2, group_id="group")
+
+    # One client, subscribed to the topic once
+    mock_pubsub_client.assert_called_once()
+    channel.other.subscribe.assert_awaited_once_with(topics=["group"])
+
+    await WebsocketManager.route_event("group", "data")
+    await asyncio.sleep(0)
+    websocket1.send_text.assert_awaited_once_with("data")
+    websocket2.send_text.assert_awaited_once_with("data")
+
+    # The route is kept until the last websocket unsubscribes
+    await WebsocketManager.unsubscribe(uuid1)
+    assert WebsocketManager._routes == {"group": {uuid2}}
+    await WebsocketManager.unsubscribe(uuid2)
+    assert not WebsocketManager._routes
+    assert not WebsocketManager._subscribers
+
+
+@pytest.mark.anyio
+async def test_on_connect_resubscribes_topics(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="group1")
+    await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="group2")
+
+    # E.g. after the webhooks service restarted
+    await WebsocketManager._on_disconnect(channel)
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+
+    channel.other.subscribe.assert_awaited_once()
+    topics = channel.other.subscribe.call_args.kwargs["topics"]
+    assert sorted(topics) == ["group1", "group2"]
+
+
+@pytest.mark.anyio
+async def test_unsubscribe_restarts_client_with_stale_topics(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+    uuid1 = await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="g1")
+    await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="g2")
+
+    with patch(
+        "app.services.event_handling.websocket_manager.WEBSOCKET_MAX_STALE_TOPICS", 0
+    ):
+        await WebsocketManager.unsubscribe(uuid1)
+
+    # The old client was disconnected, and a new one started for the remaining topic
+    mock_pubsub_client.return_value.disconnect.assert_awaited_once()
+    assert mock_pubsub_client.call_count == 2
+    assert WebsocketManager._client is not None
+
+
+@pytest.mark.anyio
+async def test_route_event_evicts_slow_websocket(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+
+    async def never_sent(_):
+        await asyncio.Event().wait()
+
+    slow_websocket = AsyncMock(spec=WebSocket)
+    slow_websocket.send_text.side_effect = never_sent
+    websocket = AsyncMock(spec=WebSocket)
+    with patch(
+        "app.services.event_handling.websocket_manager.WEBSOCKET_MAX_QUEUE_SIZE", 1
+    ):
+        slow_uuid = await WebsocketManager.subscribe(slow_websocket, group_id="group")
+    await WebsocketManager.subscribe(websocket, group_id="group")
+
+    for i in range(3):
+        await WebsocketManager.route_event("group", f"data{i}")
+        await asyncio.sleep(0)
+
+    # The slow websocket is disconnected, without holding up the other one
+    slow_websocket.close.assert_awaited_once_with(code=1013)
+    assert websocket.send_text.await_count == 3
+    assert slow_uuid not in WebsocketManager._routes["group"]
+
+    metrics = WebsocketManager.get_metrics()
+    assert metrics["websockets"] == 2
+    assert metrics["evicted_websockets"] == 1
+
+    # Its session then unsubscribes it
+    await WebsocketManager.unsubscribe(slow_uuid)
+    assert WebsocketManager.get_metrics()["websockets"] == 1
+
+
+@pytest.mark.anyio
+async def test_subscribe_timeout(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    mock_pubsub_client.return_value.wait_until_ready = AsyncMock(
+        side_effect=asyncio.TimeoutError
+    )
+
+    with pytest.raises(WebsocketTimeout):
+        await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="group")
+
+    assert WebsocketManager._client is None
+    assert not WebsocketManager._subscribers
+
+
+@pytest.mark.anyio
+async def test_subscribe_upstream_error(
+    mock_pubsub_client,  # pylint: disable=redefined-outer-name
+    channel,  # pylint: disable=redefined-outer-name
+    reset_websocket_manager,  # pylint: disable=redefined-outer-name,unused-argument
+):
+    await WebsocketManager._ensure_client()
+    await WebsocketManager._on_connect(mock_pubsub_client.return_value, channel)
+    channel.other.subscribe = AsyncMock(side_effect=ConnectionError("closed"))
+    tasks_before = asyncio.all_tasks()
+
+    with pytest.raises(ConnectionError):
+        await WebsocketManager.subscribe(AsyncMock(spec=WebSocket), group_id="group")
+
+    # The subscription is undone, as no uuid was returned to unsubscribe with
+    assert not WebsocketManager._subscribers
+    assert not WebsocketManager._routes
+    await asyncio.sleep(0)  # Let the sender task be cancelled
+    assert asyncio.all_tasks() == tasks_before
+
+
+def test_lock_per_event_loop():
+    async def get_lock():
+        return WebsocketManager._get_lock(), WebsocketManager._get_lock()
+
+    lock, same_lock = asyncio.run(get_lock())
+    other_loop_lock, _ = asyncio.run(get_lock())
+    assert lock is same_lock
+    assert lock is not other_loop_lock
+
+
 def test_convert_url_to_websocket():
     assert convert_url_to_websocket("http://example.com") == "ws://example.com"
     assert convert_url_to_websocket("https://example.com") == "wss://example.com"
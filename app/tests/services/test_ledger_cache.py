@@ -0,0 +1,158 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aries_cloudcontroller import (
+    AcaPyClient,
+    ApiException,
+    CredentialDefinition,
+    CredentialDefinitionGetResult,
+    ModelSchema,
+    SchemaGetResult,
+)
+from mockito import verify, when
+
+from app.exceptions import CloudApiException
+from app.services import ledger_cache
+from app.tests.util.mock import to_async
+
+schema_id = "Ehx3RZSV38pn3MYvxtHhbQ:2:schema_name:1.0.1"
+seq_no = "58278"
+cred_def_id = "Ehx3RZSV38pn3MYvxtHhbQ:3:CL:58278:tag"
+
+
+@pytest.mark.anyio
+async def test_get_schema_is_cached_by_id_and_seq_no(
+    mock_agent_controller: AcaPyClient,
+):
+    schema = SchemaGetResult(var_schema=ModelSchema(id=schema_id, seq_no=int(seq_no)))
+    when(mock_agent_controller.schema).get_schema(schema_id=seq_no).thenReturn(
+        to_async(schema)
+    )
+    metrics_before = ledger_cache.ledger_cache.get_metrics()
+
+    assert await ledger_cache.get_schema(mock_agent_controller, seq_no) == schema
+    assert await ledger_cache.get_schema(mock_agent_controller, seq_no) == schema
+    assert await ledger_cache.get_schema(mock_agent_controller, schema_id) == schema
+
+    # Fetched from the ledger only once
+    verify(mock_agent_controller.schema, times=1).get_schema(...)
+    metrics = ledger_cache.ledger_cache.get_metrics()
+    assert metrics["hits"] - metrics_before["hits"] == 2
+    assert metrics["misses"] - metrics_before["misses"] == 1
+
+
+@pytest.mark.anyio
+async def test_get_schema_not_found_is_cached_briefly(
+    mock_agent_controller: AcaPyClient,
+):
+    when(mock_agent_controller.schema).get_schema(schema_id=schema_id).thenReturn(
+        to_async(SchemaGetResult())
+    )
+
+    result = await ledger_cache.get_schema(mock_agent_controller, schema_id)
+    assert result.var_schema is None
+    result = await ledger_cache.get_schema(mock_agent_controller, schema_id)
+    assert result.var_schema is None
+    verify(mock_agent_controller.schema, times=1).get_schema(...)
+
+    # Once expired, the schema is fetched again
+    when(mock_agent_controller.schema).get_schema(schema_id=schema_id).thenReturn(
+        to_async(SchemaGetResult())
+    )
+    with patch.object(ledger_cache.ledger_cache, "negative_ttl", -1):
+        ledger_cache.ledger_cache.set_not_found((ledger_cache.SCHEMA, schema_id))
+    await ledger_cache.get_schema(mock_agent_controller, schema_id)
+    verify(mock_agent_controller.schema, times=2).get_schema(...)
+
+
+@pytest.mark.anyio
+async def test_get_credential_definition_not_found_error_is_cached(
+    mock_agent_controller: AcaPyClient,
+):
+    when(mock_agent_controller.credential_definition).get_cred_def(
+        cred_def_id=cred_def_id
+    ).thenRaise(ApiException(status=404, reason="Not found"))
+
+    for _ in range(2):
+        with pytest.raises(CloudApiException) as exc:
+            await ledger_cache.get_credential_definition(
+                mock_agent_controller, cred_def_id
+            )
+        assert exc.value.status_code == 404
+    verify(mock_agent_controller.credential_definition, times=1).get_cred_def(...)
+
+    # Until it is discarded, e.g. after writing the credential definition
+    cred_def = CredentialDefinitionGetResult(
+        credential_definition=CredentialDefinition(id=cred_def_id, schema_id=seq_no)
+    )
+    when(mock_agent_controller.credential_definition).get_cred_def(
+        cred_def_id=cred_def_id
+    ).thenReturn(to_async(cred_def))
+    ledger_cache.discard_credential_definition_not_found(cred_def_id)
+
+    result = await ledger_cache.get_credential_definition(
+        mock_agent_controller, cred_def_id
+    )
+    assert result == cred_def
+
+
+@pytest.mark.anyio
+async def test_get_credential_definition_errors_are_not_cached(
+    mock_agent_controller: AcaPyClient,
+):
+    when(mock_agent_controller.credential_definition).get_cred_def(
+        cred_def_id=cred_def_id
+    ).thenRaise(ApiException(status=500))
+
+    for _ in range(2):
+        with pytest.raises(CloudApiException):
+            await ledger_cache.get_credential_definition(
+                mock_agent_controller, cred_def_id
+            )
+    verify(mock_agent_controller.credential_definition, times=2).get_cred_def(...)
+
+
+@pytest.mark.anyio
+async def test_get_credential_definition_shares_only_result_or_not_found():
+    cred_def = CredentialDefinitionGetResult(
+        credential_definition=CredentialDefinition(id=cred_def_id, schema_id=seq_no)
+    )
+
+    def controller_raising(status: int) -> Mock:
+        async def get_cred_def(**_):
+            await asyncio.sleep(0)  # let the other caller join the call
+            raise ApiException(status=status)
+
+        controller = Mock()
+        controller.credential_definition.get_cred_def = AsyncMock(
+            side_effect=get_cred_def
+        )
+        return controller
+
+    other_controller = Mock()
+    other_controller.credential_definition.get_cred_def = AsyncMock(
+        return_value=cred_def
+    )
+
+    # An error of the controller that made the shared call is not shared
+    unauthorized, result = await asyncio.gather(
+        ledger_cache.get_credential_definition(controller_raising(401), cred_def_id),
+        ledger_cache.get_credential_definition(other_controller, cred_def_id),
+        return_exceptions=True,
+    )
+    assert isinstance(unauthorized, CloudApiException)
+    assert unauthorized.status_code == 401
+    assert result == cred_def
+    other_controller.credential_definition.get_cred_def.assert_awaited_once()
+
+    # But that the object was not found is
+    ledger_cache.ledger_cache.clear()
+    other_controller.credential_definition.get_cred_def.reset_mock()
+    results = await asyncio.gather(
+        ledger_cache.get_credential_definition(controller_raising(404), cred_def_id),
+        ledger_cache.get_credential_definition(other_controller, cred_def_id),
+        return_exceptions=True,
+    )
+    assert [e.status_code for e in results] == [404, 404]
+    other_controller.credential_definition.get_cred_def.assert_not_awaited()
@@ -25,8 +25,12 @@ from app.services.trust_registry.schemas import register_schema, remove_schema_b
 from app.services.trust_registry.util.actor import actor_has_role, assert_actor_name
 from app.services.trust_registry.util.issuer import assert_valid_issuer
 from app.services.trust_registry.util.schema import registry_has_schema
-from shared.constants import TRUST_REGISTRY_URL
+from shared.constants import TRUST_REGISTRY_CLIENT_TIMEOUT, TRUST_REGISTRY_URL
 from shared.models.trustregistry import Actor
+from shared.util.rich_async_client import (
+    close_rich_async_clients,
+    get_rich_async_client,
+)
 
 
 @pytest.mark.anyio
@@ -37,8 +41,8 @@ async def test_assert_valid_issuer(
     actors_path = f"{service_path}.actors"
     schema_path = f"{service_path}.util.schema"
 
-    patch_client_actors = mocker.patch(f"{actors_path}.RichAsyncClient")
-    patch_client_schema = mocker.patch(f"{schema_path}.RichAsyncClient")
+    patch_client_actors = mocker.patch(f"{actors_path}.get_rich_async_client")
+    patch_client_schema = mocker.patch(f"{schema_path}.get_rich_async_client")
 
     did = "did:sov:xxxx"
     actor = Actor(id="actor-id", roles=["issuer"], did=did, name="abc")
@@ -48,7 +52,7 @@ async def test_assert_valid_issuer(
     mocked_client_get_did = Mock()
     response_actor_by_did = Response(200, json=actor.model_dump())
     mocked_client_get_did.get = AsyncMock(return_value=response_actor_by_did)
-    patch_client_actors.return_value.__aenter__.return_value = mocked_client_get_did
+    patch_client_actors.return_value = mocked_client_get_did
 
     mocked_client_get_schema = Mock()
     response_schema = Response(
@@ -56,7 +60,7 @@ async def test_assert_valid_issuer(
         json={"id": schema_id, "did": did, "version": "1.0", "name": "name"},
     )
     mocked_client_get_schema.get = AsyncMock(return_value=response_schema)
-    patch_client_schema.return_value.__aenter__.return_value = mocked_client_get_schema
+    patch_client_schema.return_value = mocked_client_get_schema
 
     await assert_valid_issuer(did=did, schema_id=schema_id)
 
@@ -566,3 +570,24 @@ async def test_get_verifiers(
     mock_async_client.get.assert_called_once_with(
         f"{TRUST_REGISTRY_URL}/registry/actors"
     )
+
+
+@pytest.mark.anyio
+async def test_get_rich_async_client_shares_pool():
+    client = get_rich_async_client("TrustRegistry")
+    assert get_rich_async_client("TrustRegistry") is client
+    assert client.timeout.read == TRUST_REGISTRY_CLIENT_TIMEOUT
+
+    # Clients with other error handling use the same connection pool
+    lenient_client = get_rich_async_client("TrustRegistry", raise_status_error=False)
+    assert lenient_client is not client
+    assert not lenient_client.raise_status_error
+    assert lenient_client._transport is client._transport
+
+    # Other upstreams have their own pool
+    assert get_rich_async_client("Webhooks")._transport is not client._transport
+
+    await close_rich_async_clients()
+    assert client.is_closed and lenient_client.is_closed
+    assert get_rich_async_client("TrustRegistry") is not client
+    await close_rich_async_clients()
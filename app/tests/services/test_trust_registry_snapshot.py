@@ -0,0 +1,150 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from httpx import Response
+from pytest_mock import MockerFixture
+
+from app.exceptions import TrustRegistryException
+from app.services.trust_registry.snapshot import TrustRegistrySnapshot
+from app.services.trust_registry.util.issuer import assert_valid_issuer
+from shared.constants import TRUST_REGISTRY_URL
+from shared.models.trustregistry import Actor
+
+did = "did:sov:xxxx"
+actor = Actor(id="actor-id", name="abc", roles=["issuer"], did=did)
+schema_id = "xxxx:2:name:1.0"
+schema = {"id": schema_id, "did": "xxxx", "name": "name", "version": "1.0"}
+
+
+@pytest.fixture
+def mock_registry_client(mocker: MockerFixture) -> Mock:
+    responses = {
+        f"{TRUST_REGISTRY_URL}/registry/actors": Response(
+            200, json=[actor.model_dump()]
+        ),
+        f"{TRUST_REGISTRY_URL}/registry/schemas": Response(200, json=[schema]),
+    }
+    client = Mock()
+    client.get = AsyncMock(side_effect=responses.get)
+    mocker.patch(
+        "app.services.trust_registry.snapshot.get_rich_async_client",
+        return_value=client,
+    )
+    return client
+
+
+@pytest.mark.anyio
+async def test_refresh(mock_registry_client: Mock):  # pylint: disable=W0621
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+
+    # Nothing is looked up in the snapshot before it is refreshed
+    assert snapshot.get_actor_by_did(did) is None
+    assert snapshot.get_schema_ids() is None
+    assert snapshot.has_schema(schema_id) is False
+
+    await snapshot.refresh()
+
+    assert snapshot.is_fresh()
+    assert snapshot.get_actor_by_id(actor.id) == actor
+    assert snapshot.get_actor_by_did(did) == actor
+    assert snapshot.get_actor_by_name(actor.name) == actor
+    assert snapshot.get_actor_by_did("did:sov:yyyy") is None
+    assert snapshot.has_schema(schema_id) is True
+    assert snapshot.get_schema_ids() == {schema_id}
+    assert mock_registry_client.get.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_refresh_error(mock_registry_client: Mock):  # pylint: disable=W0621
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+    mock_registry_client.get = AsyncMock(return_value=Response(500, text="error"))
+
+    with pytest.raises(TrustRegistryException):
+        await snapshot.refresh()
+    assert not snapshot.is_fresh()
+
+
+@pytest.mark.anyio
+async def test_stale_snapshot_is_not_used(
+    mock_registry_client: Mock,  # pylint: disable=W0621
+):
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+    await snapshot.refresh()
+
+    snapshot.max_staleness = -1
+    assert snapshot.get_actor_by_did(did) is None
+    assert snapshot.get_schema_ids() is None
+
+
+@pytest.mark.anyio
+async def test_invalidate(mock_registry_client: Mock):  # pylint: disable=W0621
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+    await snapshot.refresh()
+
+    snapshot.invalidate()
+    assert snapshot.get_actor_by_did(did) is None
+
+    # A refresh that was in flight when the snapshot was invalidated leaves it stale
+    fetch_actors = mock_registry_client.get.side_effect
+
+    def invalidate_while_fetching(url: str) -> Response:
+        snapshot.invalidate()
+        return fetch_actors(url)
+
+    mock_registry_client.get.side_effect = invalidate_while_fetching
+    await snapshot.refresh()
+    assert not snapshot.is_fresh()
+
+    mock_registry_client.get.side_effect = fetch_actors
+    await snapshot.refresh()
+    assert snapshot.is_fresh()
+
+
+@pytest.mark.anyio
+async def test_start_and_stop(mock_registry_client: Mock):  # pylint: disable=W0621
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+    snapshot.start()
+    await asyncio.sleep(0.01)
+    assert snapshot.is_fresh()
+
+    # An invalidation triggers a refresh without waiting for the refresh interval
+    snapshot.invalidate()
+    await asyncio.sleep(0.01)
+    assert snapshot.is_fresh()
+    assert mock_registry_client.get.await_count == 4
+
+    await snapshot.stop()
+    assert not snapshot.is_fresh()
+
+    # Disabled with a max staleness of 0
+    disabled_snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=0)
+    disabled_snapshot.start()
+    await asyncio.sleep(0.01)
+    assert not disabled_snapshot.is_fresh()
+    await disabled_snapshot.stop()
+
+
+@pytest.mark.anyio
+async def test_assert_valid_issuer_uses_snapshot(
+    mocker: MockerFixture,
+    mock_registry_client: Mock,  # pylint: disable=W0621
+):
+    snapshot = TrustRegistrySnapshot(refresh_interval=10, max_staleness=30)
+    await snapshot.refresh()
+
+    issuer_path = "app.services.trust_registry.util.issuer"
+    mocker.patch(f"{issuer_path}.trust_registry_snapshot", snapshot)
+    fetch_actor_by_did = mocker.patch(f"{issuer_path}.fetch_actor_by_did")
+    registry_has_schema = mocker.patch(f"{issuer_path}.registry_has_schema")
+
+    await assert_valid_issuer(did=did, schema_id=schema_id)
+    fetch_actor_by_did.assert_not_called()
+    registry_has_schema.assert_not_called()
+
+    # Falls back to the trust registry API when the snapshot doesn't have the actor
+    fetch_actor_by_did.return_value = Actor(
+        id="other-id", name="other", roles=["issuer"], did="did:sov:yyyy"
+    )
+    await assert_valid_issuer(did="did:sov:yyyy")
+    fetch_actor_by_did.assert_awaited_once_with("did:sov:yyyy")
@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import WebSocket
+
+from app.services.websocket import handle_websocket, wait_for_disconnect
+
+
+@pytest.mark.anyio
+async def test_wait_for_disconnect():
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.receive.side_effect = [
+        {"type": "websocket.receive", "text": "hello"},
+        {"type": "websocket.disconnect", "code": 1000},
+    ]
+
+    await wait_for_disconnect(websocket)
+
+    assert websocket.receive.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_handle_websocket_unsubscribes_on_disconnect():
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.receive.return_value = {"type": "websocket.disconnect", "code": 1000}
+
+    with patch("app.services.websocket.WebsocketManager") as websocket_manager:
+        websocket_manager.subscribe = AsyncMock(return_value="uuid")
+        websocket_manager.unsubscribe = AsyncMock()
+
+        await handle_websocket(
+            websocket,
+            group_id="group",
+            wallet_id="wallet",
+            topic="",
+            auth=Mock(wallet_id="wallet"),
+        )
+
+    websocket_manager.subscribe.assert_awaited_once_with(
+        websocket, group_id="group", wallet_id="wallet", topic=""
+    )
+    websocket_manager.unsubscribe.assert_awaited_once_with("uuid")
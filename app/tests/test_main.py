@@ -42,13 +42,24 @@ async def test_app_lifespan():
     # Use AsyncMock to mock the disconnect_all class method
     with patch(
         "app.main.WebsocketManager.disconnect_all", new_callable=AsyncMock
-    ) as mock_disconnect:
+    ) as mock_disconnect, patch(
+        "app.main.close_rich_async_clients", new_callable=AsyncMock
+    ) as mock_close_rich_async_clients, patch(
+        "app.main.close_acapy_clients", new_callable=AsyncMock
+    ) as mock_close_acapy_clients, patch(
+        "app.main.trust_registry_snapshot"
+    ) as mock_trust_registry_snapshot:
+        mock_trust_registry_snapshot.stop = AsyncMock()
+
         # Run the app_lifespan context manager
         async with lifespan(FastAPI()):
-            pass
+            mock_trust_registry_snapshot.start.assert_called_once()
 
-        # Assert that disconnect_all was awaited once
+        # Assert that the websockets and client connections were closed once
         mock_disconnect.assert_awaited_once()
+        mock_close_rich_async_clients.assert_awaited_once()
+        mock_close_acapy_clients.assert_awaited_once()
+        mock_trust_registry_snapshot.stop.assert_awaited_once()
 
 
 @pytest.mark.parametrize(
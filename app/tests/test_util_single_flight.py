@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.exceptions import CloudApiException
+from app.util.single_flight import SingleFlight, coalesce, handle_acapy_read
+
+
+@pytest.mark.anyio
+async def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight("test")
+    num_calls = 0
+    release = asyncio.Event()
+
+    async def read(value: str) -> str:
+        nonlocal num_calls
+        num_calls += 1
+        await release.wait()
+        return value
+
+    tasks = [asyncio.create_task(single_flight.run("key", read, "a")) for _ in range(3)]
+    other_task = asyncio.create_task(single_flight.run("other", read, "b"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["a", "a", "a"]
+    assert await other_task == "b"
+    assert num_calls == 2
+
+    metrics = single_flight.get_metrics()
+    assert metrics["calls"] == 4
+    assert metrics["coalesced"] == 2
+    assert metrics["coalesce_rate"] == 0.5
+    assert metrics["in_flight"] == 0
+
+    # Calls that are not concurrent are not coalesced
+    await single_flight.run("key", read, "c")
+    assert num_calls == 3
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_exception_and_survives_cancellation():
+    single_flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def read() -> None:
+        await release.wait()
+        raise CloudApiException("Not found", 404)
+
+    first = asyncio.create_task(single_flight.run("key", read))
+    second = asyncio.create_task(single_flight.run("key", read))
+    await asyncio.sleep(0)
+
+    # The caller that started the call is cancelled, but the other still gets the result
+    first.cancel()
+    release.set()
+    with pytest.raises(CloudApiException) as exc:
+        await second
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_coalesce():
+    num_calls = 0
+
+    @coalesce
+    async def read(value) -> str:
+        nonlocal num_calls
+        num_calls += 1
+        await asyncio.sleep(0)
+        return value
+
+    assert await asyncio.gather(read("a"), read("a"), read(value="a")) == ["a"] * 3
+    # Keyword and positional arguments are coalesced separately
+    assert num_calls == 2
+
+    # Unhashable arguments are not coalesced
+    assert await asyncio.gather(read(["a"]), read(["a"])) == [["a"], ["a"]]
+    assert num_calls == 4
+
+
+@pytest.mark.anyio
+async def test_handle_acapy_read_coalesces_per_wallet():
+    num_calls = 0
+
+    class WalletApi:
+        def __init__(self, api_key: str) -> None:
+            self.api_client = Mock(default_headers={"x-api-key": api_key})
+
+        async def get_public_did(self) -> str:
+            nonlocal num_calls
+            num_calls += 1
+            await asyncio.sleep(0)
+            return "did"
+
+    wallet_api = WalletApi("wallet-1")
+    other_wallet_api = WalletApi("wallet-2")
+
+    await asyncio.gather(
+        handle_acapy_read(logger=Mock(), acapy_call=wallet_api.get_public_did),
+        handle_acapy_read(logger=Mock(), acapy_call=wallet_api.get_public_did),
+        handle_acapy_read(logger=Mock(), acapy_call=other_wallet_api.get_public_did),
+    )
+
+    assert num_calls == 2
@@ -8,6 +8,7 @@ from app.models.verifier import AcceptProofRequest, ProofRequestType, SendProofR
 from app.services.acapy_wallet import assert_public_did
 from app.services.trust_registry.actors import fetch_actor_by_did, fetch_actor_by_name
 from app.services.trust_registry.schemas import fetch_schemas
+from app.services.trust_registry.snapshot import trust_registry_snapshot
 from app.services.verifier.acapy_verifier import Verifier
 from app.services.verifier.acapy_verifier_v1 import VerifierV1
 from app.services.verifier.acapy_verifier_v2 import VerifierV2
@@ -206,6 +207,10 @@ async def are_valid_schemas(schema_ids: List[str]) -> bool:
     if not schema_ids:
         return False
 
+    snapshot_schema_ids = trust_registry_snapshot.get_schema_ids()
+    if snapshot_schema_ids is not None and snapshot_schema_ids.issuperset(schema_ids):
+        return True
+
     schemas_from_tr = await fetch_schemas()
     schemas_ids_from_tr = [schema.id for schema in schemas_from_tr]
     schemas_valid_list = [id in schemas_ids_from_tr for id in schema_ids]
@@ -218,7 +223,9 @@ def is_verifier(actor: Actor) -> bool:
 
 
 async def get_actor(did: str) -> Actor:
-    actor = await fetch_actor_by_did(did)
+    actor = trust_registry_snapshot.get_actor_by_did(did)
+    if not actor:
+        actor = await fetch_actor_by_did(did)
     # Verify actor was in TR
     if not actor:
         raise CloudApiException(f"No verifier with DID `{did}`.", 404)
@@ -226,7 +233,9 @@ async def get_actor(did: str) -> Actor:
 
 
 async def get_actor_by_name(name: str) -> Actor:
-    actor = await fetch_actor_by_name(name)
+    actor = trust_registry_snapshot.get_actor_by_name(name)
+    if not actor:
+        actor = await fetch_actor_by_name(name)
     # Verify actor was in TR
     if not actor:
         raise CloudApiException(f"No verifier with name `{name}`.", 404)
@@ -0,0 +1,147 @@
+import asyncio
+from functools import wraps
+from logging import Logger
+from typing import Any, Callable, Coroutine, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.exceptions import handle_acapy_call
+from shared.log_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T", bound=Any)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call with a given key is in flight, other
+    calls with the same key await its result, rather than making the call again.
+
+    The call runs in its own task, so that it completes for the waiting callers even if the
+    caller that started it is cancelled. All callers get the same result (or exception), so
+    it is only to be used for reads, and callers must not modify the result.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._num_calls = 0
+        self._num_coalesced = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        coroutine_func: Callable[..., Coroutine[Any, Any, T]],
+        *args,
+        **kwargs,
+    ) -> T:
+        self._num_calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(coroutine_func(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self._num_coalesced += 1
+            logger.trace("Coalescing {} call with in-flight call", self.name)
+
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved, in case all callers were cancelled
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the number of calls, and the number and rate of calls that were coalesced
+        with an in-flight call, since startup.
+        """
+        return {
+            "calls": self._num_calls,
+            "coalesced": self._num_coalesced,
+            "coalesce_rate": (
+                self._num_coalesced / self._num_calls if self._num_calls else 0.0
+            ),
+            "in_flight": len(self._in_flight),
+        }
+
+
+# All SingleFlight instances, by name, to report their metrics
+_single_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    single_flight = _single_flights.get(name)
+    if single_flight is None:
+        single_flight = _single_flights[name] = SingleFlight(name)
+    return single_flight
+
+
+def get_single_flight_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        name: single_flight.get_metrics()
+        for name, single_flight in _single_flights.items()
+    }
+
+
+def coalesce(
+    func: Callable[..., Coroutine[Any, Any, T]]
+) -> Callable[..., Coroutine[Any, Any, T]]:
+    """
+    Decorate a read-only coroutine function, so that concurrent calls with the same arguments
+    share one call. Calls whose arguments are not hashable are not coalesced.
+    """
+    single_flight = get_single_flight(func.__qualname__)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> T:
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return await func(*args, **kwargs)
+        return await single_flight.run(key, func, *args, **kwargs)
+
+    return wrapper
+
+
+def _caller_identity(acapy_call: Callable) -> Optional[Tuple[Hashable, ...]]:
+    # The agent and credentials that an ACA-Py call is made with, from its API's client
+    api_client = getattr(getattr(acapy_call, "__self__", None), "api_client", None)
+    headers = getattr(api_client, "default_headers", None)
+    if not isinstance(headers, dict):
+        return None
+    return (
+        api_client.configuration.host,
+        headers.get("x-api-key"),
+        headers.get("Authorization"),
+    )
+
+
+async def handle_acapy_read(
+    logger: Logger,  # pylint: disable=redefined-outer-name
+    acapy_call: Callable[..., Coroutine[Any, Any, T]],
+    **kwargs,
+) -> T:
+    """
+    Like handle_acapy_call, but for reads: concurrent calls to the same ACA-Py method with
+    the same arguments, by the same agent and wallet, share one call.
+
+    Calls whose arguments are not hashable, or whose client is unknown, are not coalesced.
+    """
+    identity = _caller_identity(acapy_call)
+    key: Optional[Tuple[Hashable, ...]] = None
+    if identity is not None:
+        key = (identity, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+
+    if key is None:
+        return await handle_acapy_call(logger=logger, acapy_call=acapy_call, **kwargs)
+
+    single_flight = get_single_flight(f"acapy.{acapy_call.__qualname__}")
+    return await single_flight.run(
+        key, handle_acapy_call, logger=logger, acapy_call=acapy_call, **kwargs
+    )
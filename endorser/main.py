@@ -8,6 +8,7 @@ from endorser.services.dependency_injection.container import Container
 from endorser.services.endorsement_processor import EndorsementProcessor
 from shared.constants import PROJECT_VERSION
 from shared.log_config import get_logger
+from shared.util.rich_async_client import close_rich_async_clients
 
 logger = get_logger(__name__)
 
@@ -21,16 +22,17 @@ async def app_lifespan(_: FastAPI):
     container.wire(modules=[__name__])
 
     # Start singleton services
-    container.redis_service()
+    await container.redis_service()
 
-    endorsement_processor = container.endorsement_processor()
+    endorsement_processor = await container.endorsement_processor()
     endorsement_processor.start()
 
     yield
 
     logger.info("Shutting down Endorser services ...")
     await endorsement_processor.stop()
-    container.shutdown_resources()  # shutdown redis instance
+    await close_rich_async_clients()
+    await container.shutdown_resources()  # shutdown redis instance
     logger.info("Shutdown Endorser services.")
 
 
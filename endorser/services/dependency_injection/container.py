@@ -2,7 +2,7 @@ import os
 from typing import List
 
 from dependency_injector import containers, providers
-from redis.cluster import ClusterNode
+from redis.asyncio.cluster import ClusterNode
 
 from endorser.services.endorsement_processor import EndorsementProcessor
 from shared.services.redis_service import (
@@ -23,7 +23,8 @@ class Container(containers.DeclarativeContainer):
     redis_nodes = os.getenv("REDIS_NODES", "localhost:6379")
     nodes: List[ClusterNode] = parse_redis_nodes(redis_nodes)
 
-    # Resource provider for the Redis connection pool
+    # Async resource provider for the Redis connection pool. As a result, the providers
+    # that depend on it are async too, and must be awaited
     redis_cluster = providers.Resource(
         init_redis_cluster_pool,
         nodes=nodes,
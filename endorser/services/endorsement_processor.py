@@ -32,7 +32,7 @@ class EndorsementProcessor:
         self.endorse_prefix = self.redis_service.endorsement_redis_prefix
 
         self._pubsub = None  # for managing redis pubsub connection
-        self._pubsub_thread = None
+        self._pubsub_task = None
 
         self._tasks: List[asyncio.Task] = []  # To keep track of running tasks
 
@@ -60,13 +60,12 @@ class EndorsementProcessor:
                 pass  # Expected error upon cancellation, can be ignored
         self._tasks.clear()  # Clear the list of tasks
 
-        if self._pubsub_thread:
-            self._pubsub_thread.stop()
-            logger.info("Stopped Endorsement pubsub thread")
+        if self._pubsub_task:
+            self._pubsub_task.cancel()
+            logger.info("Stopped Endorsement pubsub task")
 
         if self._pubsub:
-            await asyncio.sleep(0.1)  # allow thread to stop before disconnecting
-            self._pubsub.disconnect()
+            await self._pubsub.aclose()
             logger.info("Disconnected Endorsement pubsub instance")
         logger.info("Endorsement processing stopped.")
 
@@ -79,22 +78,20 @@ class EndorsementProcessor:
         """
         logger.debug("Checking if all tasks are running")
 
-        # todo: disabling pubsub thread check as it's currently unused and disconnects periodically on test env
-        pubsub_thread_running = (
-            True  # self._pubsub_thread and self._pubsub_thread.is_alive()
-        )
+        # todo: disabling pubsub task check as it's currently unused and disconnects periodically on test env
+        pubsub_task_running = True  # self._pubsub_task and not self._pubsub_task.done()
 
         tasks_running = self._tasks and all(not task.done() for task in self._tasks)
 
-        if not pubsub_thread_running:
-            logger.error("Pubsub thread is not running")
+        if not pubsub_task_running:
+            logger.error("Pubsub task is not running")
 
         if not tasks_running:
             for task in self._tasks:
                 if task.done():
                     logger.error("Task `{}` is not running", task.get_name())
 
-        all_running = tasks_running and pubsub_thread_running
+        all_running = tasks_running and pubsub_task_running
 
         logger.debug("All tasks running: {}", all_running)
         return all_running
@@ -107,18 +104,20 @@ class EndorsementProcessor:
             logger.trace("Received endorse set notification: {}", msg)
             self._new_event_notification.set()
 
-    def _start_notification_listener(self) -> None:
+    async def _start_notification_listener(self) -> None:
         """
         Listens for keyspace notifications related to endorsements and sets an event to resume processing.
         """
-        self._pubsub = self.redis_service.redis.pubsub()
+        self._pubsub = await self.redis_service.pubsub()
 
         # Subscribe this pubsub channel to the notification pattern (set may represent endorsement events)
         notification_pattern = "__keyevent@0__:set"
-        self._pubsub.psubscribe(
+        await self._pubsub.psubscribe(
             **{notification_pattern: self._set_notification_handler}
         )
-        self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=0.01)
+        self._pubsub_task = asyncio.create_task(
+            self._pubsub.run(), name="Listen for keyspace notifications"
+        )
 
         logger.info("Notification listener subscribed to redis keyspace notifications")
 
@@ -137,7 +136,7 @@ class EndorsementProcessor:
 
         while True:
             try:
-                batch_keys = self.redis_service.scan_keys(
+                batch_keys = await self.redis_service.scan_keys(
                     match_pattern=f"{self.endorse_prefix}:*", count=10000
                 )
                 if batch_keys:
@@ -185,12 +184,12 @@ class EndorsementProcessor:
 
         lock_duration = 1  # second
 
-        if self.redis_service.set_lock(
+        if await self.redis_service.set_lock(
             key=lock_key,
             px=lock_duration * 1000,  # to milliseconds
         ):
             logger.trace("Successfully set lock for {}", event_key)
-            event_json = self.redis_service.get(event_key)
+            event_json = await self.redis_service.get(event_key)
             if not event_json:
                 logger.warning(
                     "Tried to read an event from key {}, but event has been deleted:",
@@ -205,7 +204,7 @@ class EndorsementProcessor:
                 )
 
                 await self._process_endorsement_event(event_json)
-                if self.redis_service.delete_key(event_key):
+                if await self.redis_service.delete_key(event_key):
                     logger.info("Deleted processed endorsement event: {}", event_key)
                 else:
                     logger.warning(
@@ -214,7 +213,7 @@ class EndorsementProcessor:
             except Exception as e:  # pylint: disable=W0718
                 # if this particular event is unprocessable, we should remove it from the inputs, to avoid deadlocking
                 logger.error("Processing {} raised an exception: {}", event_key, e)
-                self._handle_unprocessable_endorse_event(event_key, event_json, e)
+                await self._handle_unprocessable_endorse_event(event_key, event_json, e)
             finally:
                 # Cancel the lock extension task if it's still running
                 if extend_lock_task:
@@ -260,7 +259,7 @@ class EndorsementProcessor:
             )
             await accept_endorsement(client, endorsement)
 
-    def _handle_unprocessable_endorse_event(
+    async def _handle_unprocessable_endorse_event(
         self, key: str, event_json: str, error: Exception
     ) -> None:
         """
@@ -282,8 +281,8 @@ class EndorsementProcessor:
             unprocessable_key,
             error_message,
         )
-        self.redis_service.set(key=unprocessable_key, value=error_message)
+        await self.redis_service.set(key=unprocessable_key, value=error_message)
 
         bound_logger.info("Deleting original problematic event")
-        self.redis_service.delete_key(key=key)
+        await self.redis_service.delete_key(key=key)
         bound_logger.info("Successfully handled unprocessable event.")
@@ -4,8 +4,7 @@ import unittest
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-from redis.client import PubSubWorkerThread
-from redis.cluster import ClusterPubSub
+from redis.asyncio.client import PubSub
 
 from endorser.services.endorsement_processor import EndorsementProcessor
 from shared.constants import GOVERNANCE_LABEL
@@ -18,10 +17,11 @@ from shared.constants import GOVERNANCE_LABEL
 
 @pytest.fixture
 def redis_service_mock():
-    redis_service = MagicMock()
+    redis_service = AsyncMock()
     redis_service.endorsement_redis_prefix = "endorse:"
-    redis_service.scan_keys = Mock(return_value=["endorse:key1", "endorse:key2"])
-    redis_service.get = Mock(side_effect=["event_json1", "event_json2"])
+    redis_service.scan_keys = AsyncMock(return_value=["endorse:key1", "endorse:key2"])
+    redis_service.get = AsyncMock(side_effect=["event_json1", "event_json2"])
+    redis_service.extend_lock_task = Mock()
     return redis_service
 
 
@@ -29,9 +29,9 @@ def redis_service_mock():
 def endorsement_processor_mock(redis_service_mock):
     processor = EndorsementProcessor(redis_service=redis_service_mock)
     # Mock pubsub
-    processor._pubsub_thread = Mock(spec=PubSubWorkerThread)
-    processor._pubsub_thread.is_alive.return_value = True
-    processor._pubsub = Mock(spec=ClusterPubSub)
+    processor._pubsub_task = Mock(spec=asyncio.Task)
+    processor._pubsub_task.done.return_value = False
+    processor._pubsub = AsyncMock(spec=PubSub)
 
     processor.endorse_prefix = "endorse"
     return processor
@@ -53,9 +53,8 @@ async def test_stop(endorsement_processor_mock):
     dummy_task = asyncio.create_task(asyncio.sleep(1))
     endorsement_processor_mock._tasks.append(dummy_task)
 
-    # Simulate an existing pubsub_thread and pubsub instance
-    # endorsement_processor_mock._pubsub_thread = Mock(spec=PubSubWorkerThread)
-    endorsement_processor_mock._pubsub = Mock()
+    # Simulate an existing pubsub instance
+    endorsement_processor_mock._pubsub = AsyncMock()
 
     await endorsement_processor_mock.stop()
 
@@ -65,9 +64,9 @@ async def test_stop(endorsement_processor_mock):
     # Ensure tasks list is cleared
     assert len(endorsement_processor_mock._tasks) == 0
 
-    # Verify that pubsub_thread stop and pubsub disconnect methods were called
-    endorsement_processor_mock._pubsub_thread.stop.assert_called_once()
-    endorsement_processor_mock._pubsub.disconnect.assert_called_once()
+    # Verify that pubsub task was cancelled and pubsub connection closed
+    endorsement_processor_mock._pubsub_task.cancel.assert_called_once()
+    endorsement_processor_mock._pubsub.aclose.assert_awaited_once()
 
 
 @pytest.mark.anyio
@@ -84,13 +83,13 @@ async def test_are_tasks_running_x(endorsement_processor_mock):
     # Task has been cancelled, it should be considered not running
     assert not endorsement_processor_mock.are_tasks_running()
 
-    # Now reset task to appear as still running, to test pubsub thread case
+    # Now reset task to appear as still running, to test pubsub task case
     dummy_done_task.done.return_value = False
     endorsement_processor_mock._tasks = [dummy_done_task]
-    # when pubsub thread stops, tasks should be not running
+    # when pubsub task stops, tasks should be not running
 
     # todo: uncomment these tests after reimplemented:
-    # endorsement_processor_mock._pubsub_thread.is_alive.return_value = False
+    # endorsement_processor_mock._pubsub_task.done.return_value = True
     # assert not endorsement_processor_mock.are_tasks_running()
 
 
@@ -122,16 +121,19 @@ async def test_set_notification_handler(endorsement_processor_mock):
     endorsement_processor_mock._new_event_notification.set.assert_called_once()
 
 
-def test_start_notification_listener(endorsement_processor_mock):
-    endorsement_processor_mock._pubsub.psubscribe = Mock()
-    endorsement_processor_mock._pubsub.run_in_thread = Mock()
+@pytest.mark.anyio
+async def test_start_notification_listener(endorsement_processor_mock):
+    pubsub = AsyncMock(spec=PubSub)
+    endorsement_processor_mock.redis_service.pubsub = AsyncMock(return_value=pubsub)
 
     # Call the method
-    endorsement_processor_mock._start_notification_listener()
+    await endorsement_processor_mock._start_notification_listener()
+    await asyncio.sleep(0)  # let the listener task start
 
-    # Verify psubscribe and run_in_thread was called correctly
-    endorsement_processor_mock._pubsub.psubscribe.assert_called_once()
-    endorsement_processor_mock._pubsub.run_in_thread.assert_called_once()
+    # Verify psubscribe was awaited and the listener task runs the pubsub
+    pubsub.psubscribe.assert_awaited_once()
+    pubsub.run.assert_awaited_once()
+    assert endorsement_processor_mock._pubsub_task.done()
 
 
 @pytest.mark.anyio
@@ -144,8 +146,8 @@ async def test_process_endorsement_requests(endorsement_processor_mock):
             "Force inf loop to stop"
         ),  # force loop to exit after processing available keys
     ]
-    redis_service = Mock()
-    redis_service.scan_keys = Mock(side_effect=scan_results)
+    redis_service = AsyncMock()
+    redis_service.scan_keys = AsyncMock(side_effect=scan_results)
     endorsement_processor_mock.redis_service = redis_service
 
     # Store processed keys for assertion
@@ -194,7 +196,7 @@ async def test_attempt_process_endorsement_no_event(endorsement_processor_mock):
     endorsement_processor_mock.redis_service.set_lock.return_value = True
     endorsement_processor_mock._process_endorsement_event = AsyncMock()
 
-    endorsement_processor_mock.redis_service.get = Mock(return_value=[])
+    endorsement_processor_mock.redis_service.get = AsyncMock(return_value=[])
 
     await endorsement_processor_mock._attempt_process_endorsement(event_key)
 
@@ -212,7 +214,7 @@ async def test_attempt_process_endorsement_delete_failure(endorsement_processor_
     endorsement_processor_mock.redis_service.set_lock.return_value = True
     endorsement_processor_mock._process_endorsement_event = AsyncMock()
 
-    endorsement_processor_mock.redis_service.delete_key = Mock(return_value=False)
+    endorsement_processor_mock.redis_service.delete_key = AsyncMock(return_value=False)
 
     await endorsement_processor_mock._attempt_process_endorsement(event_key)
 
@@ -232,7 +234,7 @@ async def test_attempt_process_endorsement_key_locked(endorsement_processor_mock
     endorsement_processor_mock.redis_service.set_lock.return_value = False
     endorsement_processor_mock._process_endorsement_event = AsyncMock()
 
-    endorsement_processor_mock.redis_service.delete_key = Mock(return_value=False)
+    endorsement_processor_mock.redis_service.delete_key = AsyncMock(return_value=False)
 
     await endorsement_processor_mock._attempt_process_endorsement(event_key)
 
@@ -245,7 +247,7 @@ async def test_attempt_process_endorsement_key_locked(endorsement_processor_mock
 
 @pytest.mark.anyio
 async def test_attempt_process_endorsement_x(endorsement_processor_mock):
-    endorsement_processor_mock._handle_unprocessable_endorse_event = Mock()
+    endorsement_processor_mock._handle_unprocessable_endorse_event = AsyncMock()
     endorsement_processor_mock._process_endorsement_event = AsyncMock(
         side_effect=Exception("Test")
     )
@@ -339,7 +341,7 @@ async def test_handle_unprocessable_endorse_event(endorsement_processor_mock):
     event_json = "event_json"
     error = Exception("Processing error")
 
-    endorsement_processor_mock._handle_unprocessable_endorse_event(
+    await endorsement_processor_mock._handle_unprocessable_endorse_event(
         key, event_json, error
     )
 
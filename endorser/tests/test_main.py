@@ -23,9 +23,10 @@ async def test_app_lifespan():
     # Mocks for services and container
     endorsement_processor_mock = MagicMock(start=Mock(), stop=AsyncMock())
     container_mock = MagicMock(
-        endorsement_processor=MagicMock(return_value=endorsement_processor_mock),
+        redis_service=AsyncMock(),
+        endorsement_processor=AsyncMock(return_value=endorsement_processor_mock),
         wire=MagicMock(),
-        shutdown_resources=Mock(),
+        shutdown_resources=AsyncMock(),
     )
 
     # Patch the Container to return the mocked container
@@ -42,7 +43,7 @@ async def test_app_lifespan():
 
         # Assert the shutdown logic was called correctly
         endorsement_processor_mock.stop.assert_awaited_once()
-        container_mock.shutdown_resources.assert_called_once()
+        container_mock.shutdown_resources.assert_awaited_once()
 
 
 @pytest.mark.anyio
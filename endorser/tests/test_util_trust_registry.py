@@ -14,7 +14,7 @@ async def test_is_valid_issuer_success():
     schema_response = {"id": "test-schema-id"}
 
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get", new_callable=AsyncMock
+        "shared.util.rich_async_client.RichAsyncClient.get", new_callable=AsyncMock
     ) as mock_get:
         # Simulate successful responses for both actor and schema checks
         mock_get.side_effect = [
@@ -31,7 +31,7 @@ async def test_is_valid_issuer_success():
 async def test_is_valid_issuer_did_not_found():
     # Simulate a 404 response for the DID check
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get",
+        "shared.util.rich_async_client.RichAsyncClient.get",
         side_effect=HTTPException(status_code=404, detail="Not Found"),
     ) as mock_get:
         result = await is_valid_issuer("did:sov:xxxx", "test-schema-id")
@@ -46,7 +46,7 @@ async def test_is_valid_issuer_actor_not_issuer(roles):
     actor_response = {"roles": roles}
 
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get",
+        "shared.util.rich_async_client.RichAsyncClient.get",
         return_value=Response(200, json=actor_response),
     ) as mock_get:
         result = await is_valid_issuer("did:sov:xxxx", "test-schema-id")
@@ -61,7 +61,7 @@ async def test_is_valid_issuer_schema_not_registered():
     actor_response = {"roles": ["issuer"]}
 
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get", new_callable=AsyncMock
+        "shared.util.rich_async_client.RichAsyncClient.get", new_callable=AsyncMock
     ) as mock_get:
         mock_get.side_effect = [
             Response(200, json=actor_response),  # Successful response for actor check
@@ -78,7 +78,7 @@ async def test_is_valid_issuer_schema_not_registered():
 async def test_is_valid_issuer_http_error_on_actor():
     # Simulate an HTTP error during the actor fetch
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get",
+        "shared.util.rich_async_client.RichAsyncClient.get",
         side_effect=HTTPException(status_code=500, detail="Server Error"),
     ) as mock_get:
         with pytest.raises(HTTPException):
@@ -92,7 +92,7 @@ async def test_is_valid_issuer_http_error_on_schema():
     # Simulate an HTTP error during the schema fetch
     actor_response = {"roles": ["issuer"]}
     with patch(
-        "endorser.util.trust_registry.RichAsyncClient.get",
+        "shared.util.rich_async_client.RichAsyncClient.get",
         side_effect=[
             Response(200, json=actor_response),
             HTTPException(status_code=500, detail="Server Error"),
@@ -2,7 +2,7 @@ from fastapi import HTTPException
 
 from shared import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
-from shared.util.rich_async_client import RichAsyncClient
+from shared.util.rich_async_client import get_rich_async_client
 
 logger = get_logger(__name__)
 
@@ -28,12 +28,10 @@ async def is_valid_issuer(did: str, schema_id: str) -> bool:
     """
     bound_logger = logger.bind(body={"did": did, "schema_id": schema_id})
     bound_logger.debug("Assert that did is registered as issuer")
+    client = get_rich_async_client("TrustRegistry")
     try:
-        async with RichAsyncClient() as client:
-            bound_logger.debug("Fetch actor with did `{}` from trust registry", did)
-            actor_res = await client.get(
-                f"{TRUST_REGISTRY_URL}/registry/actors/did/{did}"
-            )
+        bound_logger.debug("Fetch actor with did `{}` from trust registry", did)
+        actor_res = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors/did/{did}")
     except HTTPException as http_err:
         if http_err.status_code == 404:
             bound_logger.info("Not valid issuer; DID not found on trust registry.")
@@ -52,9 +50,8 @@ async def is_valid_issuer(did: str, schema_id: str) -> bool:
         return False
 
     try:
-        async with RichAsyncClient() as client:
-            bound_logger.debug("Fetch schema from trust registry")
-            await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
+        bound_logger.debug("Fetch schema from trust registry")
+        await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
     except HTTPException as http_err:
         if http_err.status_code == 404:
             bound_logger.info("Schema id not registered in trust registry.")
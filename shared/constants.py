@@ -44,23 +44,122 @@ ACAPY_ENDORSER_ALIAS = os.getenv("ACAPY_ENDORSER_ALIAS", "endorser")
 
 ACAPY_TAILS_SERVER_BASE_URL = os.getenv("ACAPY_TAILS_SERVER_BASE_URL", f"{url}:6543")
 
+# AcaPyClient connection pools, per agent
+# max number of connections to an agent per pool
+ACAPY_CLIENT_POOL_SIZE = int(os.getenv("ACAPY_CLIENT_POOL_SIZE", "100"))
+# how long to keep idle connections to an agent open, in seconds
+ACAPY_CLIENT_KEEPALIVE_SECONDS = float(
+    os.getenv("ACAPY_CLIENT_KEEPALIVE_SECONDS", "30")
+)
+
+# Ledger cache of schemas and credential definitions, in the app
+# max number of ledger objects cached in-process
+LEDGER_CACHE_SIZE = int(os.getenv("LEDGER_CACHE_SIZE", "10000"))
+# how long to cache that a ledger object was not found, in seconds
+LEDGER_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv("LEDGER_CACHE_NEGATIVE_TTL_SECONDS", "5")
+)
+
+# Trust registry snapshot, in the app
+# how often to refresh the snapshot of the trust registry, in seconds
+TRUST_REGISTRY_SNAPSHOT_REFRESH_SECONDS = float(
+    os.getenv("TRUST_REGISTRY_SNAPSHOT_REFRESH_SECONDS", "10")
+)
+# max age of the snapshot to use it, in seconds. 0 disables the snapshot. Defaults to the
+# refresh interval. An actor or schema found in the snapshot is authorized without asking
+# the trust registry, and only writes by this process invalidate the snapshot: one removed
+# elsewhere (e.g. by another replica) stays authorized for up to this many seconds
+TRUST_REGISTRY_SNAPSHOT_MAX_STALENESS_SECONDS = float(
+    os.getenv(
+        "TRUST_REGISTRY_SNAPSHOT_MAX_STALENESS_SECONDS",
+        str(TRUST_REGISTRY_SNAPSHOT_REFRESH_SECONDS),
+    )
+)
+
+# Shared clients to upstream services (trust registry, webhooks, Lago), per upstream
+SHARED_CLIENT_MAX_CONNECTIONS = int(os.getenv("SHARED_CLIENT_MAX_CONNECTIONS", "100"))
+SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+# request timeouts per upstream, in seconds
+TRUST_REGISTRY_CLIENT_TIMEOUT = float(os.getenv("TRUST_REGISTRY_CLIENT_TIMEOUT", "5"))
+WEBHOOKS_CLIENT_TIMEOUT = float(os.getenv("WEBHOOKS_CLIENT_TIMEOUT", "5"))
+LAGO_CLIENT_TIMEOUT = float(os.getenv("LAGO_CLIENT_TIMEOUT", "10"))
+
 # For testing ledger
 LEDGER_TYPE: str = "von"
 LEDGER_REGISTRATION_URL = os.getenv("LEDGER_REGISTRATION_URL", f"{url}:9000/register")
 
+# ACA-Py events processor
+# max number of events to read from an ACA-Py event list in one call. 1 processes events one by one
+ACAPY_EVENTS_BATCH_SIZE = int(os.getenv("ACAPY_EVENTS_BATCH_SIZE", "1"))
+# max number of ACA-Py event lists that are drained concurrently
+ACAPY_EVENTS_MAX_CONCURRENT_LISTS = int(
+    os.getenv("ACAPY_EVENTS_MAX_CONCURRENT_LISTS", "10")
+)
+# "list" scans for the acapy-record-* lists; "stream" reads a stream with a consumer group
+ACAPY_EVENTS_BACKEND = os.getenv("ACAPY_EVENTS_BACKEND", "list").lower()
+ACAPY_EVENTS_STREAM_KEY = os.getenv("ACAPY_EVENTS_STREAM_KEY", "acapy-events")
+ACAPY_EVENTS_STREAM_GROUP = os.getenv("ACAPY_EVENTS_STREAM_GROUP", "cloudapi-webhooks")
+ACAPY_EVENTS_STREAM_READ_COUNT = int(os.getenv("ACAPY_EVENTS_STREAM_READ_COUNT", "100"))
+# pending entries of a consumer that are idle for longer than this are claimed by another
+ACAPY_EVENTS_STREAM_CLAIM_IDLE_MS = int(
+    os.getenv("ACAPY_EVENTS_STREAM_CLAIM_IDLE_MS", "30000")
+)
+
+# Webhooks redis service
+# max number of wallet to group mappings cached in-process
+WALLET_GROUP_CACHE_SIZE = int(os.getenv("WALLET_GROUP_CACHE_SIZE", "10000"))
+
+# Retention manager
+# how often to trim stored webhook and billing events, in seconds
+RETENTION_INTERVAL_SECONDS = float(os.getenv("RETENTION_INTERVAL_SECONDS", "300"))
+# max age and max number of events to keep per key. 0 (the default) disables the limit, so
+# no events are removed unless these are set. Retention deletes events from Redis for good:
+# - CLOUDAPI_EVENTS_*: the stored webhook events (`cloudapi:*`) and their topic index
+# - BILLING_EVENTS_*: the billing events (`billing:*`), which may not have been posted yet
+CLOUDAPI_EVENTS_MAX_AGE_SECONDS = float(
+    os.getenv("CLOUDAPI_EVENTS_MAX_AGE_SECONDS", "0")
+)
+CLOUDAPI_EVENTS_MAX_COUNT = int(os.getenv("CLOUDAPI_EVENTS_MAX_COUNT", "0"))
+BILLING_EVENTS_MAX_AGE_SECONDS = float(os.getenv("BILLING_EVENTS_MAX_AGE_SECONDS", "0"))
+BILLING_EVENTS_MAX_COUNT = int(os.getenv("BILLING_EVENTS_MAX_COUNT", "0"))
+
 # Sse manager
 MAX_EVENT_AGE_SECONDS = float(os.getenv("MAX_EVENT_AGE_SECONDS", "30"))
 MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", "200"))
 QUEUE_CLEANUP_PERIOD = int(os.getenv("QUEUE_CLEANUP_PERIOD", "60"))
-CLIENT_QUEUE_POLL_PERIOD = float(os.getenv("CLIENT_QUEUE_POLL_PERIOD", "0.2"))
+# memory budget of the cache of recent events. The least recently used wallets are evicted
+# when it is exceeded. 0 disables the limit
+SSE_CACHE_MAX_WALLETS = int(os.getenv("SSE_CACHE_MAX_WALLETS", "50000"))
+SSE_CACHE_MAX_EVENTS = int(os.getenv("SSE_CACHE_MAX_EVENTS", "500000"))
+SSE_CACHE_MAX_BYTES = int(os.getenv("SSE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# number of wallet keys whose events are read per pipeline when backfilling on startup
+SSE_BACKFILL_BATCH_SIZE = int(os.getenv("SSE_BACKFILL_BATCH_SIZE", "500"))
+# max number of backfill pipelines in flight
+SSE_BACKFILL_MAX_CONCURRENCY = int(os.getenv("SSE_BACKFILL_MAX_CONCURRENCY", "8"))
+# max time to spend backfilling, in seconds. Events not backfilled by then are skipped
+SSE_BACKFILL_TIME_BUDGET_SECONDS = float(
+    os.getenv("SSE_BACKFILL_TIME_BUDGET_SECONDS", "10")
+)
+# max number of stored events replayed when a stream resumes from its Last-Event-ID. Only
+# events from the last MAX_EVENT_AGE_SECONDS are replayed
+SSE_REPLAY_MAX_EVENTS = int(os.getenv("SSE_REPLAY_MAX_EVENTS", "1000"))
 
 # Sse
 SSE_TIMEOUT = int(
     os.getenv("SSE_TIMEOUT", "150")
 )  # maximum duration of an SSE connection
-DISCONNECT_CHECK_PERIOD = float(
-    os.getenv("DISCONNECT_CHECK_PERIOD", "0.2")
-)  # period in seconds to check for disconnection
+SSE_PROXY_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("SSE_PROXY_MAX_KEEPALIVE_CONNECTIONS", "100")
+)  # idle connections from the app to the webhooks service to keep open for SSE streams
+
+# Websocket manager
+# max number of events queued for a websocket. Slower websockets are disconnected
+WEBSOCKET_MAX_QUEUE_SIZE = int(os.getenv("WEBSOCKET_MAX_QUEUE_SIZE", "200"))
+# max number of pubsub topics that no websocket subscribes to anymore, before the upstream
+# pubsub client reconnects to drop them
+WEBSOCKET_MAX_STALE_TOPICS = int(os.getenv("WEBSOCKET_MAX_STALE_TOPICS", "1000"))
 
 # client.py
 TEST_CLIENT_TIMEOUT = int(os.getenv("TEST_CLIENT_TIMEOUT", "300"))
@@ -72,3 +171,7 @@ REGISTRY_CREATION_TIMEOUT = int(os.getenv("REGISTRY_CREATION_TIMEOUT", "60"))
 # Billing Service
 LAGO_URL = os.getenv("LAGO_URL", "")
 LAGO_API_KEY = os.getenv("LAGO_API_KEY", "")
+# max number of events posted to LAGO that are remembered, to not post duplicates again
+BILLING_POSTED_EVENTS_CACHE_SIZE = int(
+    os.getenv("BILLING_POSTED_EVENTS_CACHE_SIZE", "10000")
+)
@@ -1,9 +1,22 @@
 import asyncio
 import datetime
 import os
-from typing import Any, Generator, List, Optional, Set
-
-from redis.cluster import ClusterNode, RedisCluster
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.exceptions import ResponseError
 
 from shared.log_config import get_logger
 
@@ -40,29 +53,45 @@ def parse_redis_nodes(env_var_value: str) -> List[ClusterNode]:
     return nodes
 
 
-def init_redis_cluster_pool(
+async def init_redis_cluster_pool(
     nodes: List[ClusterNode], logger_name: str
-) -> Generator[RedisCluster, Any, None]:
+) -> AsyncGenerator[RedisCluster, Any]:
     """
-    Initialize a connection pool to the Redis Cluster.
+    Initialize an asyncio connection pool to the Redis Cluster.
 
     :param nodes: List of nodes from which initial bootstrapping can be done
     """
     logger = get_logger(logger_name)
     logger.info("Initialising Redis Cluster with nodes: {}", nodes)
     cluster = RedisCluster(startup_nodes=nodes, **REDIS_CONNECTION_PARAMS)
+    await cluster.initialize()
 
     logger.info("Connected to Redis Cluster")
     yield cluster
 
     logger.info("Closing Redis connection")
-    cluster.close()
+    await cluster.aclose()
     logger.info("Closed Redis connection.")
 
 
+class NodePubSub(PubSub):
+    """
+    A PubSub instance that owns the client of the cluster node it is connected to, and closes the
+    client, along with its connection pool, when it is closed.
+    """
+
+    def __init__(self, client: Redis, **kwargs) -> None:
+        super().__init__(client.connection_pool, **kwargs)
+        self.client = client
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        await self.client.aclose()
+
+
 class RedisService:
     """
-    A service for interacting with Redis.
+    A service for interacting with Redis. All calls are awaitable, so that they do not block the event loop.
     """
 
     def __init__(self, redis: RedisCluster, logger_name: str) -> None:
@@ -80,7 +109,7 @@ class RedisService:
         self.logger = get_logger(logger_name)
         self.logger.info("RedisService initialised")
 
-    def set(self, key: str, value: str) -> Optional[bool]:
+    async def set(self, key: str, value: str) -> Optional[bool]:
         """
         Set a key and value on redis
 
@@ -92,9 +121,9 @@ class RedisService:
             A boolean indicating that the value was successfully set.
         """
         self.logger.trace("Setting key: {}, with value: {}", key, value)
-        return self.redis.set(key, value=value)
+        return await self.redis.set(key, value=value)
 
-    def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[str]:
         """
         Get a value from redis
 
@@ -105,11 +134,11 @@ class RedisService:
             The value from redis, if the key exists
         """
         self.logger.trace("Getting key: {}", key)
-        value = self.redis.get(key)
+        value = await self.redis.get(key)
         self.logger.trace("Got value: {}", value)
         return value
 
-    def set_lock(self, key: str, px: int = 1000) -> Optional[bool]:
+    async def set_lock(self, key: str, px: int = 1000) -> Optional[bool]:
         """
         Attempts to acquire a distributed lock by setting a key in Redis with an expiration time,
         if and only if the key does not already exist.
@@ -123,9 +152,9 @@ class RedisService:
             None if the key already exists and the lock could not be acquired.
         """
         self.logger.trace("Setting lock for key: {}; timeout: {} milliseconds", key, px)
-        return self.redis.set(key, value="1", px=px, nx=True)
+        return await self.redis.set(key, value="1", px=px, nx=True)
 
-    def delete_key(self, key: str) -> bool:
+    async def delete_key(self, key: str) -> bool:
         """
         Deletes a key from Redis.
 
@@ -137,9 +166,9 @@ class RedisService:
         """
         self.logger.trace("Deleting key: {}", key)
         # Deleting the key and returning True if the command was successful
-        return self.redis.delete(key) == 1
+        return await self.redis.delete(key) == 1
 
-    def lindex(self, key: str, n: int = 0) -> Optional[str]:
+    async def lindex(self, key: str, n: int = 0) -> Optional[str]:
         """
         Fetch the element at index `n` from a list at `key`.
 
@@ -151,9 +180,9 @@ class RedisService:
             The element at the specified index in the list, or None if the index is out of range.
         """
         self.logger.trace("Reading index {} from {}", n, key)
-        return self.redis.lindex(key, index=n)
+        return await self.redis.lindex(key, index=n)
 
-    def pop_first_list_element(self, key: str):
+    async def pop_first_list_element(self, key: str):
         """
         Pops the first element from a list in Redis.
 
@@ -166,9 +195,182 @@ class RedisService:
         """
         self.logger.trace("Pop first element from list: {}", key)
         # Using LPOP to remove and return the first element of the list
-        return self.redis.lpop(key)
+        return await self.redis.lpop(key)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[bytes]:
+        """
+        Fetch the elements between index `start` and `end` (inclusive) from a list at `key`.
+
+        Args:
+            key: The Redis key of the list.
+            start: The index of the first element to fetch.
+            end: The index of the last element to fetch. -1 represents the end of the list.
+
+        Returns:
+            The list of elements in the range, or an empty list if the key does not exist.
+        """
+        self.logger.trace("Reading range {} to {} from {}", start, end, key)
+        return await self.redis.lrange(key, start, end)
 
-    def scan_keys(self, match_pattern: str, count: int) -> Set[str]:
+    async def trim_first_list_elements(self, key: str, count: int) -> bool:
+        """
+        Atomically removes the first `count` elements from a list in Redis.
+
+        Parameters:
+        - key: str - The Redis key of the list.
+        - count: int - The number of elements to remove from the head of the list.
+
+        Returns:
+        - bool: True if the command was successful.
+        """
+        self.logger.trace("Trim first {} elements from list: {}", count, key)
+        # LTRIM keeps the elements from index `count` onwards. Elements appended
+        # to the tail of the list in the meantime are retained
+        return await self.redis.ltrim(key, count, -1)
+
+    async def create_consumer_group(self, stream_key: str, group_name: str) -> bool:
+        """
+        Creates a consumer group for a stream, creating the stream if it does not exist.
+        The group starts reading from the first entry in the stream.
+
+        Args:
+            stream_key: The Redis key of the stream.
+            group_name: The name of the consumer group.
+
+        Returns:
+            True if the group was created, False if it already existed.
+        """
+        self.logger.trace(
+            "Creating consumer group {} for stream {}", group_name, stream_key
+        )
+        try:
+            await self.redis.xgroup_create(
+                stream_key, group_name, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+            self.logger.debug(
+                "Consumer group {} already exists for stream {}", group_name, stream_key
+            )
+            return False
+        self.logger.info(
+            "Created consumer group {} for stream {}", group_name, stream_key
+        )
+        return True
+
+    async def read_stream_group(
+        self,
+        stream_key: str,
+        group_name: str,
+        consumer_name: str,
+        count: int,
+        block_ms: Optional[int] = None,
+    ) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        """
+        Reads new entries from a stream as part of a consumer group. The entries are added to the
+        consumer's pending entries list, until they are acknowledged.
+
+        Args:
+            stream_key: The Redis key of the stream.
+            group_name: The name of the consumer group.
+            consumer_name: The name of this consumer within the group.
+            count: The max number of entries to read.
+            block_ms: How long to block for new entries, in milliseconds. None doesn't block.
+
+        Returns:
+            A list of (entry id, fields) tuples. Empty if no new entries were available.
+        """
+        self.logger.trace("Reading up to {} entries from stream {}", count, stream_key)
+        response = await self.redis.xreadgroup(
+            groupname=group_name,
+            consumername=consumer_name,
+            streams={stream_key: ">"},
+            count=count,
+            block=block_ms,
+        )
+        if not response:
+            return []
+
+        _, entries = response[0]  # Only one stream is read
+        return entries
+
+    async def autoclaim_stream_entries(
+        self,
+        stream_key: str,
+        group_name: str,
+        consumer_name: str,
+        min_idle_time_ms: int,
+        count: int,
+        start_id: Union[str, bytes] = "0-0",
+    ) -> Tuple[Union[str, bytes], List[Tuple[bytes, Dict[bytes, bytes]]]]:
+        """
+        Claims entries that have been pending for another consumer for longer than `min_idle_time_ms`,
+        e.g. because that consumer crashed before acknowledging them.
+
+        The pending entries are scanned from `start_id`. The returned cursor is to be passed as the
+        `start_id` of the next call, to continue the scan, until it returns "0-0" when the scan is done.
+
+        Args:
+            stream_key: The Redis key of the stream.
+            group_name: The name of the consumer group.
+            consumer_name: The name of the consumer to transfer the entries to.
+            min_idle_time_ms: Only claim entries that are idle for at least this long.
+            count: The max number of entries to claim.
+            start_id: The entry id to start scanning the pending entries from.
+
+        Returns:
+            The cursor to continue the scan from, and a list of the (entry id, fields) tuples
+            that were claimed.
+        """
+        self.logger.trace(
+            "Auto-claiming idle pending entries from stream {}", stream_key
+        )
+        response = await self.redis.xautoclaim(
+            name=stream_key,
+            groupname=group_name,
+            consumername=consumer_name,
+            min_idle_time=min_idle_time_ms,
+            start_id=start_id,
+            count=count,
+        )
+        # Response is [next start id, claimed entries, (redis >= 7) deleted entry ids]
+        next_start_id, entries = response[0], response[1]
+        if entries:
+            self.logger.info(
+                "Claimed {} idle pending entries from stream {}",
+                len(entries),
+                stream_key,
+            )
+        return next_start_id, entries
+
+    async def ack_stream_entries(
+        self, stream_key: str, group_name: str, entry_ids: List[bytes]
+    ) -> int:
+        """
+        Acknowledges processed stream entries for a consumer group, and deletes them from the stream.
+
+        Args:
+            stream_key: The Redis key of the stream.
+            group_name: The name of the consumer group.
+            entry_ids: The ids of the processed entries.
+
+        Returns:
+            The number of entries that were acknowledged.
+        """
+        if not entry_ids:
+            return 0
+
+        self.logger.trace(
+            "Acknowledging {} entries on stream {}", len(entry_ids), stream_key
+        )
+        pipeline = self.redis.pipeline()
+        pipeline.xack(stream_key, group_name, *entry_ids)
+        pipeline.xdel(stream_key, *entry_ids)
+        num_acked, _ = await pipeline.execute()
+        return num_acked
+
+    async def scan_keys(self, match_pattern: str, count: int) -> Set[str]:
         """
         Scans Redis for keys matching the pattern. Performs one scan for max `count` keys.
 
@@ -183,7 +385,7 @@ class RedisService:
         self.logger.trace("Starting SCAN to fetch keys matching: {}", match_pattern)
 
         try:
-            _, keys = self.redis.scan(
+            _, keys = await self.redis.scan(
                 cursor=0,
                 match=match_pattern,
                 count=count,
@@ -203,7 +405,7 @@ class RedisService:
 
         return collected_keys
 
-    def match_keys(self, match_pattern: str = "*") -> List[bytes]:
+    async def match_keys(self, match_pattern: str = "*") -> List[bytes]:
         """
         Fetches keys from all Redis cluster nodes matching the pattern.
 
@@ -214,7 +416,157 @@ class RedisService:
             A set of Redis keys that match the input pattern.
         """
 
-        return self.redis.keys(match_pattern, target_nodes=RedisCluster.PRIMARIES)
+        return await self.redis.keys(match_pattern, target_nodes=RedisCluster.PRIMARIES)
+
+    async def iterate_keys(
+        self, match_pattern: str, count: int = 1000
+    ) -> AsyncIterator[str]:
+        """
+        Incrementally iterates over the keys matching the pattern on all Redis cluster primaries,
+        using SCAN. Unlike `match_keys`, this does not block Redis for large keyspaces.
+
+        Parameters:
+        - match_pattern: str - The pattern to match against, e.g.: cloudapi:*
+        - count: int - The number of keys to scan per call to SCAN
+
+        Yields:
+            The Redis keys that match the input pattern.
+        """
+        async for key in self.redis.scan_iter(
+            match=match_pattern, count=count, target_nodes=RedisCluster.PRIMARIES
+        ):
+            yield key.decode()
+
+    async def iterate_key_batches(
+        self, match_pattern: str, count: int = 1000
+    ) -> AsyncIterator[List[str]]:
+        """
+        Scans all Redis cluster primaries concurrently for the keys matching the pattern, using
+        SCAN. Unlike `iterate_keys`, which scans the primaries one after another, the scan of
+        a large keyspace takes about as long as that of the largest node.
+
+        Parameters:
+        - match_pattern: str - The pattern to match against, e.g.: cloudapi:*
+        - count: int - The number of keys to scan per call to SCAN
+
+        Yields:
+            The keys matching the pattern found by one call to SCAN on one of the primaries,
+            in the order they are found. Empty batches are skipped.
+        """
+        await self.redis.initialize()  # no-op if cluster nodes are already discovered
+        primaries = self.redis.get_primaries()
+        batches: asyncio.Queue = asyncio.Queue()
+
+        async def scan_node(node) -> None:
+            cursor = 0
+            try:
+                while True:
+                    cursors, keys = await self.redis.scan(
+                        cursor=cursor,
+                        match=match_pattern,
+                        count=count,
+                        target_nodes=node,
+                    )
+                    if keys:
+                        await batches.put([key.decode() for key in keys])
+                    cursor = cursors[node.name]
+                    if cursor == 0:
+                        break
+            except Exception:  # pylint: disable=W0718
+                self.logger.exception(
+                    "An exception occurred when scanning node {}. Continuing...",
+                    node.name,
+                )
+            finally:
+                await batches.put(None)  # Signal that this node is done
+
+        tasks = [asyncio.create_task(scan_node(node)) for node in primaries]
+        try:
+            num_scanning = len(tasks)
+            while num_scanning:
+                batch = await batches.get()
+                if batch is None:
+                    num_scanning -= 1
+                else:
+                    yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_sorted_set_score_at_rank(
+        self, key: str, rank: int
+    ) -> Optional[float]:
+        """
+        Fetch the score of the member at `rank` in a sorted set, ordered from lowest score.
+
+        Args:
+            key: The Redis key of the sorted set.
+            rank: The rank of the member. Negative ranks count from the highest score.
+
+        Returns:
+            The score, or None if there is no member at the rank.
+        """
+        members = await self.redis.zrange(key, rank, rank, withscores=True)
+        return members[0][1] if members else None
+
+    async def remove_sorted_set_members_below_score(
+        self, key: str, score: float
+    ) -> int:
+        """
+        Remove all members of a sorted set with a score lower than `score`.
+
+        Args:
+            key: The Redis key of the sorted set.
+            score: The exclusive maximum score of the members to remove.
+
+        Returns:
+            The number of members removed.
+        """
+        self.logger.trace("Removing members of {} with score below {}", key, score)
+        return await self.redis.zremrangebyscore(key, "-inf", f"({score}")
+
+    async def remove_sorted_set_members_by_rank(self, key: str, keep: int) -> int:
+        """
+        Remove the members of a sorted set with the lowest scores, keeping the `keep` highest.
+
+        Args:
+            key: The Redis key of the sorted set.
+            keep: The number of members to keep.
+
+        Returns:
+            The number of members removed.
+        """
+        self.logger.trace("Removing all but {} highest members of {}", keep, key)
+        return await self.redis.zremrangebyrank(key, 0, -(keep + 1))
+
+    async def memory_usage(self, key: str) -> int:
+        """
+        Fetch the (approximate) number of bytes that a key and its value use in Redis.
+
+        Args:
+            key: The Redis key.
+
+        Returns:
+            The number of bytes, or 0 if the key does not exist.
+        """
+        return await self.redis.memory_usage(key) or 0
+
+    async def pubsub(self) -> PubSub:
+        """
+        Create a pub/sub instance, connected to a node of the Redis Cluster.
+
+        The asyncio cluster client has no pub/sub support. Because messages published with PUBLISH
+        are propagated to all nodes in a cluster, subscribing on a single node receives all messages.
+
+        Returns:
+            A PubSub instance, to be closed with `aclose` when no longer needed. This also closes
+            the client of the node it is connected to.
+        """
+        await self.redis.initialize()  # no-op if cluster nodes are already discovered
+        node = self.redis.get_random_node()
+        self.logger.debug("Creating pubsub instance on node: {}", node.name)
+        client = Redis(host=node.host, port=node.port, **REDIS_CONNECTION_PARAMS)
+        return NodePubSub(client)
 
     async def _extend_lock(self, lock_key: str, interval: datetime.timedelta) -> None:
         """
@@ -230,7 +582,7 @@ class RedisService:
                 await asyncio.sleep(retry_interval)
                 # Attempt to extend the lock by resetting its expiration time
                 self.logger.debug(f"Extending expiry for lock {lock_key}")
-                lock_extended = self.redis.expire(lock_key, interval)
+                lock_extended = await self.redis.expire(lock_key, interval)
                 if not lock_extended:
                     self.logger.warning(
                         f"Failed to extend lock: {lock_key}. Lock might have been lost."
@@ -2,6 +2,7 @@ import pytest
 from aries_cloudcontroller import (
     AcaPyClient,
     ConnectionApi,
+    CredentialDefinitionApi,
     CredentialsApi,
     EndorseTransactionApi,
     IssueCredentialV10Api,
@@ -29,6 +30,7 @@ def get_mock_agent_controller() -> AcaPyClient:
     controller = mock(AcaPyClient)
     controller.__aexit__ = noop
     controller.connection = mock(ConnectionApi)
+    controller.credential_definition = mock(CredentialDefinitionApi)
     controller.credentials = mock(CredentialsApi)
     controller.endorse_transaction = mock(EndorseTransactionApi)
     controller.issue_credential_v1_0 = mock(IssueCredentialV10Api)
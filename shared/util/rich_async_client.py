@@ -1,9 +1,16 @@
 import logging
 import ssl
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from fastapi import HTTPException
-from httpx import AsyncClient, HTTPStatusError, Response
+from httpx import AsyncClient, AsyncHTTPTransport, HTTPStatusError, Limits, Response
+
+from shared.constants import (
+    SHARED_CLIENT_MAX_CONNECTIONS,
+    SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+    TRUST_REGISTRY_CLIENT_TIMEOUT,
+    WEBHOOKS_CLIENT_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -81,3 +88,73 @@ class RichAsyncClient(AsyncClient):
 
             raise HTTPException(status_code=code, detail=message) from e
         return response
+
+
+# Timeouts (in seconds) of the shared clients per upstream service, by client name.
+# Other upstreams use the httpx default, unless a timeout is passed on first use
+UPSTREAM_TIMEOUTS: Dict[str, float] = {
+    "TrustRegistry": TRUST_REGISTRY_CLIENT_TIMEOUT,
+    "Webhooks": WEBHOOKS_CLIENT_TIMEOUT,
+}
+
+# The connection pool per upstream, and the clients using it, by name and raise_status_error
+_transports: Dict[str, AsyncHTTPTransport] = {}
+_clients: Dict[Tuple[str, bool], RichAsyncClient] = {}
+
+
+def get_rich_async_client(
+    name: str, *, raise_status_error: bool = True, **kwargs
+) -> RichAsyncClient:
+    """
+    Get the shared client for an upstream service, e.g. "TrustRegistry".
+
+    The clients are kept for the lifetime of the service, so that connections to the
+    upstream are kept alive and reused, rather than set up for each request. All clients of
+    an upstream share one connection pool, whether they raise on error status codes or not.
+
+    Args:
+        name: The name of the upstream, prepended to error messages.
+        raise_status_error: Whether to raise an HTTPException on 4xx and 5xx responses.
+        kwargs: Options for the client, e.g. `timeout`, used when it is first created.
+            `limits` applies to the upstream's connection pool.
+    """
+    key = (name, raise_status_error)
+    client = _clients.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    transport = _transports.get(name)
+    limits = kwargs.pop(
+        "limits",
+        Limits(
+            max_connections=SHARED_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    if transport is None or client is not None:  # the upstream's clients were closed
+        transport = _transports[name] = AsyncHTTPTransport(
+            verify=ssl_context, limits=limits
+        )
+    if name in UPSTREAM_TIMEOUTS:
+        kwargs.setdefault("timeout", UPSTREAM_TIMEOUTS[name])
+
+    client = _clients[key] = RichAsyncClient(
+        name=name, raise_status_error=raise_status_error, transport=transport, **kwargs
+    )
+    return client
+
+
+async def close_rich_async_clients() -> None:
+    """
+    Close the shared clients, and their connections to the upstream services.
+    """
+    clients = list(_clients.values())
+    transports = list(_transports.values())
+    _clients.clear()
+    _transports.clear()
+
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+    for transport in transports:
+        await transport.aclose()
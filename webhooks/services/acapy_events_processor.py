@@ -1,13 +1,25 @@
 import asyncio
 import datetime
+import os
+import socket
 import sys
-from typing import Any, Dict, List, NoReturn
+import time
+from typing import Any, Dict, List, NoReturn, Optional, Set, Tuple, Union
 from uuid import uuid4
 
 import orjson
 
 from shared import APIRouter
-from shared.constants import GOVERNANCE_LABEL
+from shared.constants import (
+    ACAPY_EVENTS_BACKEND,
+    ACAPY_EVENTS_BATCH_SIZE,
+    ACAPY_EVENTS_MAX_CONCURRENT_LISTS,
+    ACAPY_EVENTS_STREAM_CLAIM_IDLE_MS,
+    ACAPY_EVENTS_STREAM_GROUP,
+    ACAPY_EVENTS_STREAM_KEY,
+    ACAPY_EVENTS_STREAM_READ_COUNT,
+    GOVERNANCE_LABEL,
+)
 from shared.log_config import get_logger
 from shared.models.endorsement import (
     obfuscate_primary_data_in_payload,
@@ -18,21 +30,63 @@ from webhooks.models import AcaPyWebhookEvent, topic_mapping
 from webhooks.models.conversions import acapy_to_cloudapi_event
 from webhooks.models.redis_payloads import AcaPyRedisEvent
 from webhooks.services.billing_manager import is_applicable_for_billing
-from webhooks.services.webhooks_redis_service import WebhooksRedisService
+from webhooks.services.webhooks_redis_service import (
+    WebhooksRedisBatch,
+    WebhooksRedisService,
+)
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
 
+class BatchWriteError(Exception):
+    """Exception raised when the writes for a batch of processed events could not be stored."""
+
+
 class AcaPyEventsProcessor:
     """
     Class to process ACA-Py webhook events that the plugin writes to redis.
+
+    Events are ingested from one of two backends:
+    - "list": the `acapy-record-*` lists are scanned for, and processed under a lock per list.
+      Up to `max_concurrent_lists` lists are drained concurrently, so that a wallet with a long
+      backlog does not hold up the events of other wallets. Events within a list stay ordered,
+      as each list is only drained by one worker at a time.
+    - "stream": events are read from a redis stream with a consumer group, which shares the
+      entries between replicas without locks. Entries are expected to have an `event` field,
+      containing the same JSON that is written to the lists.
     """
 
-    def __init__(self, redis_service: WebhooksRedisService) -> None:
+    def __init__(
+        self,
+        redis_service: WebhooksRedisService,
+        batch_size: int = ACAPY_EVENTS_BATCH_SIZE,
+        backend: str = ACAPY_EVENTS_BACKEND,
+        max_concurrent_lists: int = ACAPY_EVENTS_MAX_CONCURRENT_LISTS,
+    ) -> None:
         self.redis_service = redis_service
 
+        # Max number of events to drain from a list at once. 1 processes events one by one
+        self.batch_size = batch_size
+
+        # Worker pool for draining lists concurrently
+        self.max_concurrent_lists = max_concurrent_lists
+        self._list_workers = asyncio.Semaphore(max_concurrent_lists)
+        self._lists_in_flight: Set[str] = set()  # list keys currently being drained
+        self._list_tasks: Set[asyncio.Task] = set()
+        self._max_lists_in_flight = 0  # high watermark, for metrics
+        self._lists_processed = 0
+
+        if backend not in ("list", "stream"):
+            raise ValueError(f"Unknown ACA-Py events backend: `{backend}`")
+        self.backend = backend
+
+        # Stream consumer group configuration
+        self.stream_key = ACAPY_EVENTS_STREAM_KEY
+        self.stream_group = ACAPY_EVENTS_STREAM_GROUP
+        self.stream_consumer = f"{socket.gethostname()}-{os.getpid()}"
+
         # Redis prefix for acapy events:
         self.acapy_redis_prefix = self.redis_service.acapy_redis_prefix
 
@@ -40,21 +94,34 @@ class AcaPyEventsProcessor:
         self._new_event_notification = asyncio.Event()
 
         self._pubsub = None  # for managing redis pubsub connection
-        self._pubsub_thread = None
+        self._pubsub_task = None
 
         self._tasks: List[asyncio.Task] = []  # To keep track of running tasks
 
+        # One-off task to index the groups and topics of events from before the indexes existed
+        self._index_stored_events_task: Optional[asyncio.Task] = None
+
     def start(self) -> None:
         """
         Start the background tasks as part of AcaPyEventsProcessor's lifecycle
         """
         # self._start_notification_listener()  # disable as it is currently unused
-        self._tasks.append(
-            asyncio.create_task(
-                self._process_incoming_events(), name="Process incoming events"
-            )
+        self._index_stored_events_task = asyncio.create_task(
+            self._index_stored_events(), name="Index stored events"
         )
-        logger.info("AcaPyEventsProcessor started.")
+        if self.backend == "stream":
+            self._tasks.append(
+                asyncio.create_task(
+                    self._process_stream_events(), name="Process stream events"
+                )
+            )
+        else:
+            self._tasks.append(
+                asyncio.create_task(
+                    self._process_incoming_events(), name="Process incoming events"
+                )
+            )
+        logger.info("AcaPyEventsProcessor started with `{}` backend.", self.backend)
 
     async def stop(self) -> None:
         """
@@ -68,13 +135,25 @@ class AcaPyEventsProcessor:
                 pass  # Expected error upon cancellation, can be ignored
         self._tasks.clear()  # Clear the list of tasks
 
-        if self._pubsub_thread:
-            self._pubsub_thread.stop()
-            logger.info("Stopped AcaPyEvents pubsub thread")
+        if self._index_stored_events_task:
+            self._index_stored_events_task.cancel()
+            try:
+                await self._index_stored_events_task
+            except asyncio.CancelledError:
+                pass
+            self._index_stored_events_task = None
+
+        for task in list(self._list_tasks):
+            task.cancel()  # Cancel any lists that are still being drained
+        await asyncio.gather(*self._list_tasks, return_exceptions=True)
+        self._list_tasks.clear()
+
+        if self._pubsub_task:
+            self._pubsub_task.cancel()
+            logger.info("Stopped AcaPyEvents pubsub task")
 
         if self._pubsub:
-            await asyncio.sleep(0.1)  # allow thread to stop before disconnecting
-            self._pubsub.disconnect()
+            await self._pubsub.aclose()
             logger.info("Disconnected AcaPyEvents pubsub instance")
 
         logger.info("AcaPyEventsProcessor stopped.")
@@ -88,25 +167,35 @@ class AcaPyEventsProcessor:
         """
         logger.debug("Checking if all tasks are running")
 
-        # todo: disabling pubsub thread check as it's currently unused and disconnects periodically on test env
-        pubsub_thread_running = (
-            True  # self._pubsub_thread and self._pubsub_thread.is_alive()
-        )
+        # todo: disabling pubsub task check as it's currently unused and disconnects periodically on test env
+        pubsub_task_running = True  # self._pubsub_task and not self._pubsub_task.done()
         tasks_running = self._tasks and all(not task.done() for task in self._tasks)
 
-        if not pubsub_thread_running:
-            logger.error("Pubsub thread is not running")
+        if not pubsub_task_running:
+            logger.error("Pubsub task is not running")
 
         if not tasks_running:
             for task in self._tasks:
                 if task.done():
                     logger.error("Task `{}` is not running", task.get_name())
 
-        all_running = tasks_running and pubsub_thread_running
+        all_running = tasks_running and pubsub_task_running
 
         logger.debug("All tasks running: {}", all_running)
         return all_running
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns metrics about the processing of ACA-Py event lists.
+        """
+        return {
+            "backend": self.backend,
+            "lists_in_flight": len(self._lists_in_flight),
+            "max_lists_in_flight": self._max_lists_in_flight,
+            "max_concurrent_lists": self.max_concurrent_lists,
+            "lists_processed": self._lists_processed,
+        }
+
     def _rpush_notification_handler(self, msg) -> None:
         """
         Processing handler for when rpush notifications are received
@@ -114,22 +203,60 @@ class AcaPyEventsProcessor:
         logger.trace("Received rpush notification: {}", msg)
         self._new_event_notification.set()
 
-    def _start_notification_listener(self) -> None:
+    async def _start_notification_listener(self) -> None:
         """
         Listens for keyspace notifications from Redis and sets an event to resume processing.
         """
         # Example subscription pattern for keyspace notifications. Adjust as necessary.
-        self._pubsub = self.redis_service.redis.pubsub()
+        self._pubsub = await self.redis_service.pubsub()
 
         # Subscribe this pubsub channel to the notification pattern (rpush represents ACA-Py writing to list types)
         notification_pattern = "__keyevent@0__:rpush"
-        self._pubsub.psubscribe(
+        await self._pubsub.psubscribe(
             **{notification_pattern: self._rpush_notification_handler}
         )
-        self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=0.01)
+        self._pubsub_task = asyncio.create_task(
+            self._pubsub.run(), name="Listen for keyspace notifications"
+        )
 
         logger.info("Notification listener subscribed to redis keyspace notifications")
 
+    async def _index_stored_events(self) -> None:
+        """
+        Populates the wallet group and topic indexes for events that were stored before they existed.
+        Only one replica does so at a time, under a lock.
+        """
+        lock_key = "lock:index-stored-events"
+        lock_duration = datetime.timedelta(seconds=30)
+
+        try:
+            if not await self.redis_service.set_lock(
+                lock_key, px=int(lock_duration.total_seconds() * 1000)
+            ):
+                logger.info("Stored events are being indexed by another instance.")
+                return
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Could not acquire lock to index stored events.")
+            return
+
+        # Extend the lock for as long as the keyspace is being scanned
+        extend_lock_task = self.redis_service.extend_lock_task(
+            lock_key, interval=lock_duration
+        )
+        try:
+            try:
+                await self.redis_service.index_wallet_groups()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Could not index wallet groups. Continuing...")
+
+            try:
+                await self.redis_service.index_wallet_topics()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Could not backfill wallet topic index. Continuing...")
+        finally:
+            extend_lock_task.cancel()
+            await self.redis_service.delete_key(lock_key)
+
     async def _process_incoming_events(self) -> NoReturn:
         """
         Processing handler for incoming ACA-Py redis webhooks events
@@ -145,15 +272,19 @@ class AcaPyEventsProcessor:
 
         while True:
             try:
-                batch_event_keys = self.redis_service.scan_keys(
+                batch_event_keys = await self.redis_service.scan_keys(
                     match_pattern=self.acapy_redis_prefix, count=10000
                 )
                 if batch_event_keys:
                     attempts_without_events = 0  # Reset the counter
+                    num_dispatched = 0
                     for list_key in batch_event_keys:  # the keys are of LIST type
-                        logger.debug("Attempt to process list key: {}", list_key)
-                        self._attempt_process_list_events(list_key)
+                        if await self._dispatch_list_events(list_key):
+                            num_dispatched += 1
 
+                    if not num_dispatched:
+                        # All lists are already being drained. Prevent a busy loop
+                        await asyncio.sleep(sleep_duration)
                 else:
                     attempts_without_events += 1
                     if attempts_without_events >= max_attempts_without_events:
@@ -180,7 +311,159 @@ class AcaPyEventsProcessor:
                 if exception_count >= max_exception_count:
                     raise  # exit inf loop
 
-    def _attempt_process_list_events(self, list_key: str) -> None:
+    async def _dispatch_list_events(self, list_key: str) -> bool:
+        """
+        Hands a list key to the worker pool, waiting for a free worker if all are busy.
+        Lists that are already being drained by this instance are skipped, so that a
+        list is never drained by two workers at once.
+
+        Args:
+            list_key: The Redis key of the list to process.
+
+        Returns:
+            True if the list was dispatched, False if it is already in flight.
+        """
+        if list_key in self._lists_in_flight:
+            logger.trace("List key {} is already being processed", list_key)
+            return False
+
+        await self._list_workers.acquire()
+
+        logger.debug("Attempt to process list key: {}", list_key)
+        self._lists_in_flight.add(list_key)
+        self._max_lists_in_flight = max(
+            self._max_lists_in_flight, len(self._lists_in_flight)
+        )
+
+        task = asyncio.create_task(
+            self._drain_list(list_key), name=f"Process list {list_key}"
+        )
+        self._list_tasks.add(task)
+        task.add_done_callback(self._list_tasks.discard)
+        return True
+
+    async def _drain_list(self, list_key: str) -> None:
+        """
+        Worker coroutine that processes a list, and then frees its place in the worker pool.
+
+        Args:
+            list_key: The Redis key of the list to process.
+        """
+        try:
+            await self._attempt_process_list_events(list_key)
+            self._lists_processed += 1
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Unexpected error while processing list {}", list_key)
+        finally:
+            self._lists_in_flight.discard(list_key)
+            self._list_workers.release()
+            logger.trace(
+                "Lists in flight: {}/{}",
+                len(self._lists_in_flight),
+                self.max_concurrent_lists,
+            )
+
+    async def _process_stream_events(
+        self, block_ms: int = 1000, claim_interval: float = 10
+    ) -> NoReturn:
+        """
+        Processing handler for ACA-Py events on a redis stream, read as part of a consumer group.
+
+        New entries are read with a blocking XREADGROUP, so events are processed as soon as they
+        arrive. Periodically, entries that another consumer left pending for too long (e.g. after
+        a crash) are claimed with XAUTOCLAIM, so that they are not lost. A scan of the pending
+        entries is continued from the cursor XAUTOCLAIM returns, a page per loop, until it is done.
+
+        Args:
+            block_ms: How long a read blocks while waiting for new entries, in milliseconds.
+            claim_interval: How often to claim idle pending entries, in seconds.
+        """
+        logger.info(
+            "Starting ACA-Py Events Processor on stream `{}` as consumer `{}`",
+            self.stream_key,
+            self.stream_consumer,
+        )
+        await self.redis_service.create_consumer_group(
+            self.stream_key, self.stream_group
+        )
+
+        exception_count = 0
+        max_exception_count = 5  # break inf loop after 5 consecutive exceptions
+
+        next_claim_time = time.monotonic()  # claim idle entries on startup
+        claim_start_id = "0-0"
+        while True:
+            try:
+                if time.monotonic() >= next_claim_time:
+                    claim_start_id, claimed_entries = (
+                        await self.redis_service.autoclaim_stream_entries(
+                            stream_key=self.stream_key,
+                            group_name=self.stream_group,
+                            consumer_name=self.stream_consumer,
+                            min_idle_time_ms=ACAPY_EVENTS_STREAM_CLAIM_IDLE_MS,
+                            count=ACAPY_EVENTS_STREAM_READ_COUNT,
+                            start_id=claim_start_id,
+                        )
+                    )
+                    if claimed_entries:
+                        await self._process_stream_entries(claimed_entries)
+                    # Continue scanning the pending entries on the next loop, until the scan is done
+                    if claim_start_id in ("0-0", b"0-0"):
+                        next_claim_time = time.monotonic() + claim_interval
+
+                entries = await self.redis_service.read_stream_group(
+                    stream_key=self.stream_key,
+                    group_name=self.stream_group,
+                    consumer_name=self.stream_consumer,
+                    count=ACAPY_EVENTS_STREAM_READ_COUNT,
+                    block_ms=block_ms,
+                )
+                if entries:
+                    await self._process_stream_entries(entries)
+                exception_count = 0  # reset exception count after successful loop
+            except Exception:  # pylint: disable=W0718
+                exception_count += 1
+                logger.exception(
+                    "Something went wrong while processing stream events. Continuing..."
+                )
+                if exception_count >= max_exception_count:
+                    raise  # exit inf loop
+
+    async def _process_stream_entries(
+        self, entries: List[Tuple[bytes, Optional[Dict[bytes, bytes]]]]
+    ) -> None:
+        """
+        Processes a batch of stream entries, writing the results to redis in one pipeline, and then
+        acknowledging the entries. Entries that cannot be processed are saved as unprocessable and
+        acknowledged, so that they are not redelivered.
+
+        Args:
+            entries: The (entry id, fields) tuples read from the stream.
+        """
+        batch = self.redis_service.batch()
+        entry_ids = []
+        for entry_id, fields in entries:
+            event_data = fields.get(b"event") if fields else None
+            try:
+                if not event_data:
+                    raise ValueError("Stream entry has no `event` field")
+                await self._process_event(event_data.decode(), writer=batch)
+            except Exception as e:  # pylint: disable=W0718
+                logger.error(
+                    "Processing stream entry {} raised an exception: {}", entry_id, e
+                )
+                await self._save_unprocessable_event(
+                    key=self.stream_key, event=event_data, error=e
+                )
+            entry_ids.append(entry_id)
+
+        await batch.execute()
+        await self.redis_service.ack_stream_entries(
+            self.stream_key, self.stream_group, entry_ids
+        )
+        logger.debug("Processed {} entries from stream", len(entry_ids))
+
+    async def _attempt_process_list_events(self, list_key: str) -> None:
         """
         Attempts to process a list-based event in Redis, ensuring that only one instance processes
         the event at a time by acquiring a lock.
@@ -193,7 +476,7 @@ class AcaPyEventsProcessor:
 
         lock_duration = 500  # milliseconds
 
-        if self.redis_service.set_lock(lock_key, px=lock_duration):
+        if await self.redis_service.set_lock(lock_key, px=lock_duration):
             try:
                 # Start a background task to extend the lock periodically
                 # This is just to ensure that on the off chance that 500ms isn't enough to process all the
@@ -202,18 +485,24 @@ class AcaPyEventsProcessor:
                     lock_key, interval=datetime.timedelta(milliseconds=lock_duration)
                 )
 
-                self._process_list_events(list_key)
+                if self.batch_size > 1:
+                    await self._process_list_events_batched(list_key)
+                else:
+                    await self._process_list_events(list_key)
+            except BatchWriteError as e:
+                # Not caused by an unprocessable event, so the list is left to be retried
+                logger.error("Processing {} raised an exception: {}", list_key, e)
             except Exception as e:  # pylint: disable=W0718
                 # if this particular event is unprocessable, we should remove it from the inputs, to avoid deadlocking
                 logger.error("Processing {} raised an exception: {}", list_key, e)
-                self._handle_unprocessable_event(list_key, e)
+                await self._handle_unprocessable_event(list_key, e)
             finally:
                 # Cancel the lock extension task if it's still running
                 if extend_lock_task:
                     extend_lock_task.cancel()
 
                 # Delete lock after processing list, whether it completed or errored:
-                if self.redis_service.delete_key(lock_key):
+                if await self.redis_service.delete_key(lock_key):
                     logger.debug("Deleted lock key: {}", lock_key)
                 else:
                     logger.warning(
@@ -224,7 +513,7 @@ class AcaPyEventsProcessor:
                 "Event {} is currently being processed by another instance.", list_key
             )
 
-    def _process_list_events(self, list_key) -> None:
+    async def _process_list_events(self, list_key) -> None:
         """
         Processes all events in a Redis list until the list is empty. Each event is processed individually,
         and upon successful processing, it's removed from the list.
@@ -238,12 +527,12 @@ class AcaPyEventsProcessor:
         try:
             while True:  # Keep processing until no elements are left
                 # Read 0th index of list:
-                event_data = self.redis_service.lindex(list_key)
+                event_data = await self.redis_service.lindex(list_key)
                 if event_data:
-                    self._process_event(event_data.decode())
+                    await self._process_event(event_data.decode())
 
                     # Cleanup: remove the element from the list and delete the lock if successfully processed
-                    if self.redis_service.pop_first_list_element(list_key):
+                    if await self.redis_service.pop_first_list_element(list_key):
                         logger.debug(
                             "Removed processed element from list: {}", list_key
                         )
@@ -262,13 +551,86 @@ class AcaPyEventsProcessor:
             logger.exception("Could not process list key {}", list_key)
             raise
 
-    def _process_event(self, event_json: str) -> None:
+    async def _process_list_events_batched(self, list_key: str) -> None:
+        """
+        Processes all events in a Redis list until the list is empty, reading up to `batch_size` events
+        at a time. The resulting writes for a batch are sent to redis in one pipeline, after which the
+        processed events are trimmed from the head of the list.
+
+        If an event cannot be processed, the events preceding it are still written and trimmed, and the
+        exception is raised, so that the unprocessable event is at the head of the list to be handled.
+        If the writes fail, no events are trimmed, and a BatchWriteError is raised instead. The batch is
+        then retried, so events are written at least once: see WebhooksRedisBatch.
+
+        Args:
+            list_key: The Redis key of the list to process.
+        """
+        try:
+            while True:  # Keep processing until no elements are left
+                events_data = await self.redis_service.lrange(
+                    list_key, start=0, end=self.batch_size - 1
+                )
+                if not events_data:
+                    # If no data is found, the list is empty, exit the loop
+                    logger.debug(
+                        "No more data found for event key: {}, exiting.", list_key
+                    )
+                    break
+
+                batch = self.redis_service.batch()
+                num_processed = 0
+                processing_error: Optional[Exception] = None
+                for event_data in events_data:
+                    try:
+                        await self._process_event(event_data.decode(), writer=batch)
+                    except Exception as e:  # pylint: disable=W0718
+                        processing_error = e
+                        break
+                    num_processed += 1
+
+                # Write and remove the events that were processed before any exception
+                if num_processed:
+                    try:
+                        await batch.execute()
+                    except Exception as e:
+                        # The pipeline is not transactional, so some events may have been
+                        # written. All stay in the list to be retried: rewriting an event is
+                        # a no-op, and it is not published again
+                        raise BatchWriteError(
+                            f"Could not write {num_processed} processed events of list "
+                            f"`{list_key}`: {e}. Processing error: {processing_error}"
+                        ) from e
+                    # Only trimmed once written, leaving any unprocessable event at the head
+                    await self.redis_service.trim_first_list_elements(
+                        list_key, num_processed
+                    )
+                    logger.debug(
+                        "Removed {} processed elements from list: {}",
+                        num_processed,
+                        list_key,
+                    )
+
+                if processing_error:
+                    raise processing_error
+        except Exception:
+            logger.exception("Could not process list key {}", list_key)
+            raise
+
+    async def _process_event(
+        self,
+        event_json: str,
+        writer: Optional[Union[WebhooksRedisService, WebhooksRedisBatch]] = None,
+    ) -> None:
         """
         Processes an individual ACA-Py event, transforming it to our CloudAPI format and saving/broadcasting to redis
 
         Args:
             event_json: The JSON string representation of the ACA-Py event.
+            writer: Where to write the resulting events. Defaults to writing to redis directly.
         """
+        if writer is None:
+            writer = self.redis_service
+
         event = parse_json_with_error_handling(AcaPyRedisEvent, event_json, logger)
 
         metadata_origin = event.metadata.origin
@@ -337,7 +699,7 @@ class AcaPyEventsProcessor:
         ):
             logger.info("Forwarding endorsement event for Endorser service")
             transaction_id = payload["transaction_id"]  # check has asserted key exists
-            self.redis_service.add_endorsement_event(
+            await writer.add_endorsement_event(
                 event_json=webhook_event_json, transaction_id=transaction_id
             )
 
@@ -359,12 +721,12 @@ class AcaPyEventsProcessor:
                 # Simplifies the billing service's logic for determining the operation type
                 endorse_event: Dict[str, Any] = orjson.loads(webhook_event_json)
                 endorse_event["payload"]["type"] = operation_type
-                webhook_event_for_billing = orjson.dumps(endorse_event)
+                webhook_event_for_billing = orjson.dumps(endorse_event).decode()
 
             else:
                 webhook_event_for_billing = webhook_event_json
 
-            self.redis_service.add_billing_event(
+            await writer.add_billing_event(
                 event_json=webhook_event_for_billing,
                 group_id=group_id,
                 wallet_id=wallet_id,
@@ -372,16 +734,17 @@ class AcaPyEventsProcessor:
             )
 
         # Add data to redis, which publishes to a redis pubsub channel that SseManager listens to
-        self.redis_service.add_cloudapi_webhook_event(
+        await writer.add_cloudapi_webhook_event(
             event_json=webhook_event_json,
             group_id=group_id,
             wallet_id=wallet_id,
             timestamp_ns=event.metadata.time_ns,
+            topic=cloudapi_topic,
         )
 
         bound_logger.trace("Successfully processed ACA-Py Redis webhook event.")
 
-    def _handle_unprocessable_event(self, key: str, error: Exception) -> None:
+    async def _handle_unprocessable_event(self, key: str, error: Exception) -> None:
         """
         Handles an event that could not be processed successfully. The unprocessable event is persisted
         to a separate key for further investigation.
@@ -391,17 +754,32 @@ class AcaPyEventsProcessor:
             error: The exception that occurred during event processing.
         """
         logger.warning("Handling problematic event at key: {}", key)
-        problematic_event = self.redis_service.pop_first_list_element(key)
+        problematic_event = await self.redis_service.pop_first_list_element(key)
 
+        await self._save_unprocessable_event(
+            key=key, event=problematic_event, error=error
+        )
+
+    async def _save_unprocessable_event(
+        self, key: str, event: Optional[bytes], error: Exception
+    ) -> None:
+        """
+        Persists an event that could not be processed to a separate key for further investigation.
+
+        Args:
+            key: The Redis key where the problematic event was found.
+            event: The problematic event.
+            error: The exception that occurred during event processing.
+        """
         unprocessable_key = f"unprocessable:{key}:{uuid4().hex}"
-        error_message = f"Could not process: {problematic_event}. Error: {error}"
+        error_message = f"Could not process: {event}. Error: {error}"
 
         logger.warning(
             "Saving record of problematic event at key: {}. Error: `{}`",
             unprocessable_key,
             error_message,
         )
-        self.redis_service.set(key=unprocessable_key, value=error_message)
+        await self.redis_service.set(key=unprocessable_key, value=error_message)
 
     def _obfuscate_sensitive_data(
         self, acapy_topic: str, payload: Dict[str, Any]
@@ -4,14 +4,24 @@ from typing import Any, Dict, List, NoReturn, Optional, Tuple
 
 import orjson
 from fastapi import HTTPException
-
-from shared.constants import GOVERNANCE_LABEL, LAGO_API_KEY, LAGO_URL
+from httpx import Limits
+
+from shared.constants import (
+    BILLING_POSTED_EVENTS_CACHE_SIZE,
+    GOVERNANCE_LABEL,
+    LAGO_API_KEY,
+    LAGO_CLIENT_TIMEOUT,
+    LAGO_URL,
+    SHARED_CLIENT_MAX_CONNECTIONS,
+    SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+)
 from shared.log_config import get_logger
 from shared.models.endorsement import TransactionTypes
 from shared.models.endorsement import (
     extract_operation_type_from_endorsement_payload as get_operation_type,
 )
 from shared.models.endorsement import valid_operation_types
+from shared.util.lru_cache import LRUCache
 from shared.util.rich_async_client import RichAsyncClient
 from webhooks.models.billing_payloads import (
     AttribBillingEvent,
@@ -43,9 +53,20 @@ class BillingManager:
 
         self._pubsub = None
 
+        # The LAGO events posted recently. Events are carried in their notification, so the
+        # duplicate events of an exchange (e.g. two "done" events) would otherwise be posted twice
+        self._posted_events: LRUCache[str, bool] = LRUCache(
+            max_size=BILLING_POSTED_EVENTS_CACHE_SIZE
+        )
+
         self._client = RichAsyncClient(
             name="BillingManager",
             headers={"Authorization": f"Bearer {self.lago_api_key}"},
+            limits=Limits(
+                max_connections=SHARED_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=SHARED_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=LAGO_CLIENT_TIMEOUT,
         )
 
     def start(self) -> None:
@@ -74,8 +95,9 @@ class BillingManager:
             self._tasks.clear()  # Clear the list of tasks
             logger.info("Billing manager stopped")
             if self._pubsub:
-                self._pubsub.disconnect()
+                await self._pubsub.aclose()
                 logger.info("Billing pubsub disconnected")
+        await self._client.aclose()
 
     def are_tasks_running(self) -> bool:
         """
@@ -106,28 +128,34 @@ class BillingManager:
         Listen for billing events, pass them to the billing processor
         """
         retry_count = 0
-        sleep_duration = 1
+        timeout = 1  # max time to wait for a pubsub message before checking again
 
         while retry_count < max_retries:
             try:
+                if self._pubsub:
+                    # Close the instance of a previous attempt, along with its connections
+                    await self._pubsub.aclose()
                 logger.info("Creating pubsub instance")
-                self._pubsub = self.redis_service.redis.pubsub()
+                self._pubsub = await self.redis_service.pubsub()
 
                 logger.info("Subscribing to billing event channel")
-                self._pubsub.subscribe(self.redis_service.billing_event_pubsub_channel)
+                await self._pubsub.subscribe(
+                    self.redis_service.billing_event_pubsub_channel
+                )
 
                 # reset retry count. Unlikely to need to reconnect to pubsub
                 retry_count = 0
 
                 logger.info("Listening for billing events")
                 while True:
-                    message = self._pubsub.get_message(ignore_subscribe_messages=True)
+                    message = await self._pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=timeout
+                    )
                     if message:
                         logger.debug("Received billing message: >>{}<<", message)
                         await self._process_billing_event(message)
                     else:
-                        logger.trace("message is empty, retry in {}s", sleep_duration)
-                        await asyncio.sleep(sleep_duration)
+                        logger.trace("No message received in {}s", timeout)
             except ConnectionError as e:
                 logger.error("ConnectionError detected: {}.", e)
             except Exception:  # pylint: disable=W0718
@@ -147,12 +175,15 @@ class BillingManager:
         if isinstance(message_data, bytes):
             message_data = message_data.decode("utf-8")
 
-        group_id, timestamp_ns_str = message_data.split(":")
+        # The event json may itself contain colons, so only split off the prefix
+        group_id, timestamp_ns_str, *events = message_data.split(":", 2)
         timestamp_ns = int(timestamp_ns_str)
 
-        events = self.redis_service.get_billing_event(
-            group_id, timestamp_ns, timestamp_ns
-        )
+        if not events:
+            # Message published without the event; fetch it from the sorted set
+            events = await self.redis_service.get_billing_event(
+                group_id, timestamp_ns, timestamp_ns
+            )
 
         if not events:
             # there are duplicate done event bc of acapy to cloudapi conversion
@@ -234,8 +265,13 @@ class BillingManager:
 
     async def _post_billing_event(self, event: LagoEvent) -> None:
         """
-        Post billing event to LAGO
+        Post billing event to LAGO, unless it was recently posted already
         """
+        event_key = event.model_dump_json()
+        if self._posted_events.get(event_key):
+            logger.debug("Billing event already posted to LAGO: {}", event)
+            return
+
         logger.debug("Posting billing event: {}", event)
         try:
             lago_response = await self._client.post(
@@ -247,12 +283,14 @@ class BillingManager:
             logger.info(
                 "Response for event {} from LAGO: {}", event, lago_response_json
             )
+            self._posted_events.set(event_key, True)
 
         except HTTPException as e:
             if e.status_code == 422 and "value_already_exist" in e.detail:
                 logger.warning(
                     "LAGO indicating transaction already received : {}", e.detail
                 )
+                self._posted_events.set(event_key, True)
             else:
                 logger.error("Error posting billing event to LAGO: {}", e.detail)
 
@@ -2,11 +2,12 @@ import os
 from typing import List
 
 from dependency_injector import containers, providers
-from redis.cluster import ClusterNode
+from redis.asyncio.cluster import ClusterNode
 
 from shared.services.redis_service import init_redis_cluster_pool, parse_redis_nodes
 from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
 from webhooks.services.billing_manager import BillingManager
+from webhooks.services.retention_manager import RetentionManager
 from webhooks.services.sse_manager import SseManager
 from webhooks.services.webhooks_redis_service import WebhooksRedisService
 
@@ -26,7 +27,8 @@ class Container(containers.DeclarativeContainer):
     redis_nodes = os.getenv("REDIS_NODES", "localhost:6379")
     nodes: List[ClusterNode] = parse_redis_nodes(redis_nodes)
 
-    # Resource provider for the Redis connection pool
+    # Async resource provider for the Redis connection pool. As a result, the providers
+    # that depend on it are async too, and must be awaited
     redis_cluster = providers.Resource(
         init_redis_cluster_pool,
         nodes=nodes,
@@ -56,3 +58,9 @@ class Container(containers.DeclarativeContainer):
         BillingManager,
         redis_service=redis_service,
     )
+
+    # Singleton provider for the RetentionManager
+    retention_manager = providers.Singleton(
+        RetentionManager,
+        redis_service=redis_service,
+    )
@@ -0,0 +1,265 @@
+import asyncio
+import time
+from typing import Any, Dict, List, NamedTuple, NoReturn, Optional, Tuple
+
+from shared.constants import (
+    BILLING_EVENTS_MAX_AGE_SECONDS,
+    BILLING_EVENTS_MAX_COUNT,
+    CLOUDAPI_EVENTS_MAX_AGE_SECONDS,
+    CLOUDAPI_EVENTS_MAX_COUNT,
+    MAX_EVENT_AGE_SECONDS,
+    RETENTION_INTERVAL_SECONDS,
+)
+from shared.log_config import get_logger
+from webhooks.services.webhooks_redis_service import WebhooksRedisService
+
+logger = get_logger(__name__)
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    Limits for the events stored in the sorted sets matching a key pattern.
+    A limit of 0 disables it.
+    """
+
+    match_pattern: str
+    max_age_seconds: float
+    max_count: int
+
+
+class RetentionManager:
+    """
+    Class to periodically trim the sorted sets of stored webhook and billing events, so that
+    they don't grow without bound. The limits are disabled by default: events are only
+    removed once the retention limits in the constants are configured.
+
+    Events that are younger than `MAX_EVENT_AGE_SECONDS` are never removed, as they may still
+    be backfilled by the SseManager when it starts.
+    """
+
+    def __init__(
+        self,
+        redis_service: WebhooksRedisService,
+        interval_seconds: float = RETENTION_INTERVAL_SECONDS,
+        policies: Optional[List[RetentionPolicy]] = None,
+    ) -> None:
+        self.redis_service = redis_service
+        self.interval_seconds = interval_seconds
+
+        if policies is None:
+            policies = [
+                RetentionPolicy(
+                    match_pattern=f"{redis_service.cloudapi_redis_prefix}:*",
+                    max_age_seconds=CLOUDAPI_EVENTS_MAX_AGE_SECONDS,
+                    max_count=CLOUDAPI_EVENTS_MAX_COUNT,
+                ),
+                RetentionPolicy(
+                    match_pattern=f"{redis_service.cloudapi_topic_redis_prefix}:*",
+                    max_age_seconds=CLOUDAPI_EVENTS_MAX_AGE_SECONDS,
+                    max_count=CLOUDAPI_EVENTS_MAX_COUNT,
+                ),
+                RetentionPolicy(
+                    match_pattern="billing:*",
+                    max_age_seconds=BILLING_EVENTS_MAX_AGE_SECONDS,
+                    max_count=BILLING_EVENTS_MAX_COUNT,
+                ),
+            ]
+        self.policies = policies
+
+        # Only one replica trims per interval
+        self.lock_key = "lock:retention"
+
+        self._stats = {
+            "runs": 0,
+            "keys_scanned": 0,
+            "keys_trimmed": 0,
+            "events_removed": 0,
+            "bytes_reclaimed": 0,
+            "last_run_duration_seconds": None,
+        }
+
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Start the background task as part of RetentionManager's lifecycle
+        """
+        self._tasks.append(
+            asyncio.create_task(self._run_retention(), name="Trim stored events")
+        )
+        enabled_policies = [
+            policy
+            for policy in self.policies
+            if policy.max_age_seconds or policy.max_count
+        ]
+        if enabled_policies:
+            logger.info(
+                "RetentionManager started. Removing stored events per policy: {}",
+                enabled_policies,
+            )
+        else:
+            logger.info("RetentionManager started. No retention limits are set.")
+
+    async def stop(self) -> None:
+        """
+        Stops the background task gracefully.
+        """
+        for task in self._tasks:
+            task.cancel()  # Request cancellation of the task
+            try:
+                await task  # Wait for the task to be cancelled
+            except asyncio.CancelledError:
+                pass  # Expected error upon cancellation, can be ignored
+        self._tasks.clear()  # Clear the list of tasks
+        logger.info("RetentionManager stopped.")
+
+    def are_tasks_running(self) -> bool:
+        """
+        Checks if the background task is still running.
+
+        Returns:
+            True if the background task is running, False if it has stopped.
+        """
+        tasks_running = self._tasks and all(not task.done() for task in self._tasks)
+
+        if not tasks_running:
+            logger.error("RetentionManager task is not running")
+
+        return bool(tasks_running)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns cumulative statistics about the trimmed events.
+        """
+        return dict(self._stats)
+
+    async def _run_retention(self) -> NoReturn:
+        """
+        Periodically applies the retention policies, if no other replica has done so in the
+        current interval.
+        """
+        lock_duration_ms = int(self.interval_seconds * 1000)
+        while True:
+            try:
+                # The lock is left to expire, so that policies are applied once per interval
+                if await self.redis_service.set_lock(
+                    self.lock_key, px=lock_duration_ms
+                ):
+                    await self.apply_policies()
+                else:
+                    logger.debug("Retention was recently applied by another instance.")
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Something went wrong while trimming stored events.")
+
+            await asyncio.sleep(self.interval_seconds)
+
+    async def apply_policies(self) -> None:
+        """
+        Trims all sorted sets matching the retention policies. Keys are scanned incrementally,
+        so Redis is not blocked, and each key is trimmed individually.
+        """
+        start_time = time.monotonic()
+        logger.info("Applying retention policies to stored events")
+
+        now_ns = time.time_ns()
+        keys_scanned = keys_trimmed = events_removed = bytes_reclaimed = 0
+        for policy in self.policies:
+            if not policy.max_age_seconds and not policy.max_count:
+                continue
+
+            async for key in self.redis_service.iterate_keys(policy.match_pattern):
+                keys_scanned += 1
+                try:
+                    num_removed, num_bytes = await self._trim_key(key, policy, now_ns)
+                except Exception:  # pylint: disable=W0718
+                    logger.exception("Could not trim key {}. Continuing...", key)
+                    continue
+                if num_removed:
+                    keys_trimmed += 1
+                    events_removed += num_removed
+                    bytes_reclaimed += num_bytes
+
+        duration = time.monotonic() - start_time
+        self._stats["runs"] += 1
+        self._stats["keys_scanned"] += keys_scanned
+        self._stats["keys_trimmed"] += keys_trimmed
+        self._stats["events_removed"] += events_removed
+        self._stats["bytes_reclaimed"] += bytes_reclaimed
+        self._stats["last_run_duration_seconds"] = duration
+
+        logger.info(
+            "Removed {} events from {} of {} keys, reclaiming {} bytes, in {:.2f}s.",
+            events_removed,
+            keys_trimmed,
+            keys_scanned,
+            bytes_reclaimed,
+            duration,
+        )
+
+    async def _trim_key(
+        self, key: str, policy: RetentionPolicy, now_ns: int
+    ) -> Tuple[int, int]:
+        """
+        Removes the events in a sorted set that exceed the policy's limits, except for events
+        that may still be backfilled.
+
+        Args:
+            key: The Redis key of the sorted set.
+            policy: The retention policy to apply.
+            now_ns: The current time, in nanoseconds.
+
+        Returns:
+            The number of events removed, and the approximate number of bytes reclaimed.
+        """
+        # Events are scored with their timestamp in nanoseconds
+        backfill_cutoff_ns = now_ns - int(MAX_EVENT_AGE_SECONDS * 1e9)
+
+        age_cutoff_ns = None
+        if policy.max_age_seconds:
+            max_age_seconds = max(policy.max_age_seconds, MAX_EVENT_AGE_SECONDS)
+            age_cutoff_ns = now_ns - int(max_age_seconds * 1e9)
+            oldest_score = await self.redis_service.get_sorted_set_score_at_rank(key, 0)
+            if oldest_score is None or oldest_score >= age_cutoff_ns:
+                age_cutoff_ns = None  # nothing to remove by age
+
+        # Score of the newest event that exceeds the max count, if any
+        count_boundary_score = None
+        if policy.max_count:
+            count_boundary_score = (
+                await self.redis_service.get_sorted_set_score_at_rank(
+                    key, -(policy.max_count + 1)
+                )
+            )
+
+        if age_cutoff_ns is None and count_boundary_score is None:
+            return 0, 0
+
+        bytes_before = await self.redis_service.memory_usage(key)
+
+        num_removed = 0
+        if age_cutoff_ns is not None:
+            num_removed += (
+                await self.redis_service.remove_sorted_set_members_below_score(
+                    key, age_cutoff_ns
+                )
+            )
+
+        if count_boundary_score is not None:
+            if count_boundary_score < backfill_cutoff_ns:
+                num_removed += (
+                    await self.redis_service.remove_sorted_set_members_by_rank(
+                        key, keep=policy.max_count
+                    )
+                )
+            else:
+                # The excess events are too recent to remove them all. Keep the ones that may
+                # still be backfilled
+                num_removed += (
+                    await self.redis_service.remove_sorted_set_members_below_score(
+                        key, backfill_cutoff_ns
+                    )
+                )
+
+        bytes_after = await self.redis_service.memory_usage(key)
+        logger.trace("Removed {} events from {}", num_removed, key)
+        return num_removed, max(bytes_before - bytes_after, 0)
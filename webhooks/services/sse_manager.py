@@ -1,23 +1,28 @@
 import asyncio
+import heapq
 import sys
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, AsyncGenerator, Dict, List, NoReturn, Tuple
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, NoReturn, Optional, Set
 
-from pydantic import ValidationError
-from redis import ConnectionError
+from redis.exceptions import ConnectionError
 
 from shared.constants import (
-    CLIENT_QUEUE_POLL_PERIOD,
     MAX_EVENT_AGE_SECONDS,
     MAX_QUEUE_SIZE,
     QUEUE_CLEANUP_PERIOD,
+    SSE_BACKFILL_BATCH_SIZE,
+    SSE_BACKFILL_MAX_CONCURRENCY,
+    SSE_BACKFILL_TIME_BUDGET_SECONDS,
+    SSE_REPLAY_MAX_EVENTS,
 )
 from shared.log_config import get_logger
-from shared.models.webhook_events import WEBHOOK_TOPIC_ALL, CloudApiWebhookEventGeneric
+from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
 from webhooks.services.webhooks_redis_service import WebhooksRedisService
+from webhooks.util.event_cache import EventCache
 from webhooks.util.event_generator_wrapper import EventGeneratorWrapper
+from webhooks.util.serialized_event import SerializedEvent
+from webhooks.util.subscription_index import SubscriptionFilter, SubscriptionIndex
 from webhooks.web.routers.websocket import publish_event_on_websocket
 
 logger = get_logger(__name__)
@@ -35,24 +40,29 @@ class SseManager:
         # from the process of storing them in the per-wallet queues
         self.incoming_events = asyncio.Queue()
 
-        # The following nested defaultdict stores events per wallet_id, per topic
-        self.fifo_cache = defaultdict(
-            lambda: defaultdict(lambda: asyncio.Queue(maxsize=MAX_QUEUE_SIZE))
-        )
-        self.lifo_cache = defaultdict(
-            lambda: defaultdict(lambda: asyncio.LifoQueue(maxsize=MAX_QUEUE_SIZE))
-        )
-        # Last In First Out Queue is to be used for consumption, so that newest events are yielded first
-        # FIFO Queue maintains order of events and is used to repopulate LIFO queue after consumption
+        # Ring buffers of recent events per wallet_id, per topic, within a memory budget
+        self.event_cache = EventCache()
 
-        # Concurrency per wallet/topic
-        self.cache_locks = defaultdict(lambda: defaultdict(asyncio.Lock))
+        # Sequence number of the next cached event. It is shared by all ring buffers, so that
+        # a client's cursor stays valid across topics, and when a buffer is cleaned up
+        self._next_sequence = 0
 
-        # To clean up queues that are no longer used
-        self._cache_last_accessed = defaultdict(lambda: defaultdict(datetime.now))
+        # The client queues subscribed to events per wallet_id, per topic (or WEBHOOK_TOPIC_ALL),
+        # indexed by their filter. New events are pushed to the matching queues as soon as they
+        # are cached
+        self._subscribers = SubscriptionIndex()
 
         self._pubsub = None  # for managing redis pubsub connection
 
+        # Progress of backfilling the cache with recent events on startup
+        self._backfill_stats = {
+            "status": "not_started",
+            "keys_scanned": 0,
+            "keys_read": 0,
+            "events_backfilled": 0,
+            "duration_seconds": None,
+        }
+
         self._tasks: List[asyncio.Task] = []  # To keep track of running tasks
 
     def start(self):
@@ -95,7 +105,7 @@ class SseManager:
         logger.info("SSE Manager processes stopped.")
 
         if self._pubsub:
-            self._pubsub.disconnect()
+            await self._pubsub.aclose()
             logger.info("Disconnected SseManager pubsub instance")
 
     def are_tasks_running(self) -> bool:
@@ -119,6 +129,16 @@ class SseManager:
                     logger.warning("Task `{}` is not running", task.get_name())
         return self._pubsub and all_running
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns statistics about the SSE event cache and its subscribers.
+        """
+        return {
+            "backfill": dict(self._backfill_stats),
+            "cache": self.event_cache.get_metrics(),
+            "subscriptions": len(self._subscribers),
+        }
+
     async def _listen_for_new_events(
         self, max_retries=5, retry_duration=0.33
     ) -> NoReturn:
@@ -127,28 +147,34 @@ class SseManager:
         Terminates after exceeding max_retries connection attempts.
         """
         retry_count = 0
-        sleep_duration = 0.1  # time to sleep after empty pubsub message
+        timeout = 1  # max time to wait for a pubsub message before checking again
 
         while retry_count < max_retries:
             try:
+                if self._pubsub:
+                    # Close the instance of a previous attempt, along with its connections
+                    await self._pubsub.aclose()
                 logger.info("Creating pubsub instance")
-                self._pubsub = self.redis_service.redis.pubsub()
+                self._pubsub = await self.redis_service.pubsub()
 
                 logger.info("Subscribing to pubsub instance for SSE events")
-                self._pubsub.subscribe(self.redis_service.sse_event_pubsub_channel)
+                await self._pubsub.subscribe(
+                    self.redis_service.sse_event_pubsub_channel
+                )
 
                 # Reset retry_count upon successful connection
                 retry_count = 0
 
                 logger.info("Begin SSE processing pubsub messages")
                 while True:
-                    message = self._pubsub.get_message(ignore_subscribe_messages=True)
+                    message = await self._pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=timeout
+                    )
                     if message:
                         logger.debug("Got pubsub message: {}", message)
                         await self._process_redis_event(message)
                     else:
-                        logger.trace("message is empty, retry in {}s", sleep_duration)
-                        await asyncio.sleep(sleep_duration)  # Prevent a busy loop
+                        logger.trace("No message received in {}s", timeout)
             except ConnectionError as e:
                 logger.error("ConnectionError detected: {}.", e)
             except Exception:  # pylint: disable=W0718
@@ -173,27 +199,35 @@ class SseManager:
             if isinstance(message_data, bytes):
                 message_data = message_data.decode("utf-8")
 
-            group_id, wallet_id, timestamp_ns_str = message_data.split(":")
+            # The event json may itself contain colons, so only split off the prefix
+            group_id, wallet_id, timestamp_ns_str, *event_json = message_data.split(
+                ":", 3
+            )
             timestamp_ns = int(timestamp_ns_str)
+            event_id = SerializedEvent.event_id_from_score(timestamp_ns)
 
-            # Fetch the event with the exact timestamp from the sorted set
-            json_events = self.redis_service.get_json_cloudapi_events_by_timestamp(
-                group_id=group_id,
-                wallet_id=wallet_id,
-                start_timestamp=timestamp_ns,
-                end_timestamp=timestamp_ns,
-            )
+            if event_json:
+                json_events = event_json
+            else:
+                # Message published without the event; fetch it from the sorted set
+                json_events = (
+                    await self.redis_service.get_json_cloudapi_events_by_timestamp(
+                        group_id=group_id,
+                        wallet_id=wallet_id,
+                        start_timestamp=timestamp_ns,
+                        end_timestamp=timestamp_ns,
+                    )
+                )
 
             for json_event in json_events:
                 try:
-                    parsed_event = CloudApiWebhookEventGeneric.model_validate_json(
-                        json_event
-                    )
-                    topic = parsed_event.topic
+                    # The event is shared by all SSE subscribers, so it is serialized once
+                    serialized_event = SerializedEvent(json_event, event_id=event_id)
+                    topic = serialized_event.topic
 
                     # Add event to SSE queue for processing
-                    logger.trace("Put parsed event on events queue: {}", parsed_event)
-                    await self.incoming_events.put(parsed_event)
+                    logger.trace("Put event on events queue: {}", serialized_event)
+                    await self.incoming_events.put(serialized_event)
 
                     # Also publish event to websocket
                     # Doing it here makes websocket stateless as well
@@ -203,10 +237,10 @@ class SseManager:
                         wallet_id=wallet_id,
                         topic=topic,
                     )
-                except ValidationError as e:
+                except ValueError as e:
                     error_message = (
                         "Could not parse json event retrieved from redis "
-                        f"into a `CloudApiWebhookEventGeneric`. Error: `{str(e)}`."
+                        f"into a `SerializedEvent`. Error: `{str(e)}`."
                     )
                     logger.error(error_message)
 
@@ -218,72 +252,144 @@ class SseManager:
     async def _backfill_events(self) -> None:
         """
         Backfill events from Redis that were published within the MAX_EVENT_AGE window.
+
+        The wallet keys are scanned on all Redis primaries concurrently, and the events of each
+        batch of keys are read with one pipeline, with several pipelines in flight. Backfilling
+        stops when the time budget is spent, so that a new instance is soon up to date.
         """
         logger.info("Start backfilling SSE queue with recent events from redis")
-        try:
-            # Calculate the minimum timestamp for backfilling
-            current_time_ns = time.time_ns()  # Current time in nanoseconds
-            min_timestamp_ns = current_time_ns - (MAX_EVENT_AGE_SECONDS * 1e9)
-            logger.debug("Backfilling events from timestamp_ns: {}", min_timestamp_ns)
-
-            # Get all wallets to backfill events for
-            wallets = self.redis_service.get_all_cloudapi_wallet_ids()
-
-            total_events_backfilled = 0
-            for wallet_id in wallets:
-                # Fetch events within the time window from Redis for each wallet
-                events = self.redis_service.get_cloudapi_events_by_timestamp(
-                    wallet_id, min_timestamp_ns, "+inf"
-                )
+        start_time = time.monotonic()
+        self._backfill_stats["status"] = "running"
 
-                # Enqueue the fetched events
-                for event in events:
-                    await self.incoming_events.put(event)
-                    total_events_backfilled += 1
+        # Calculate the minimum timestamp for backfilling
+        min_timestamp_ns = time.time_ns() - int(MAX_EVENT_AGE_SECONDS * 1e9)
+        logger.debug("Backfilling events from timestamp_ns: {}", min_timestamp_ns)
 
-            logger.info("Backfilled a total of {} events.", total_events_backfilled)
+        try:
+            await asyncio.wait_for(
+                self._backfill_key_batches(min_timestamp_ns),
+                timeout=SSE_BACKFILL_TIME_BUDGET_SECONDS,
+            )
+            self._backfill_stats["status"] = "completed"
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Backfilling did not complete within {}s. Skipping remaining events.",
+                SSE_BACKFILL_TIME_BUDGET_SECONDS,
+            )
+            self._backfill_stats["status"] = "timed_out"
         except Exception as e:  # pylint: disable=W0718
             logger.exception("Exception caught during backfilling events: {}", e)
+            self._backfill_stats["status"] = "failed"
+
+        self._backfill_stats["duration_seconds"] = time.monotonic() - start_time
+        logger.info(
+            "Backfilled a total of {} events from {} keys in {:.2f}s.",
+            self._backfill_stats["events_backfilled"],
+            self._backfill_stats["keys_read"],
+            self._backfill_stats["duration_seconds"],
+        )
+
+    async def _backfill_key_batches(self, min_timestamp_ns: int) -> None:
+        """
+        Backfill the events of all wallet keys, reading up to SSE_BACKFILL_MAX_CONCURRENCY
+        batches of keys at a time.
+        """
+        semaphore = asyncio.Semaphore(SSE_BACKFILL_MAX_CONCURRENCY)
+        pending: Set[asyncio.Task] = set()
+
+        async def backfill_batch(keys: List[str]) -> None:
+            try:
+                await self._backfill_keys(keys, min_timestamp_ns)
+            finally:
+                semaphore.release()
+
+        key_batches = self.redis_service.iterate_cloudapi_event_key_batches(
+            count=SSE_BACKFILL_BATCH_SIZE
+        )
+        try:
+            # Closing the scan stops scanning the primaries, if the time budget is spent
+            async with aclosing(key_batches):
+                async for keys in key_batches:
+                    self._backfill_stats["keys_scanned"] += len(keys)
+                    await semaphore.acquire()
+                    task = asyncio.create_task(backfill_batch(keys))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+
+            await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _backfill_keys(self, keys: List[str], min_timestamp_ns: int) -> None:
+        """
+        Read the events since the minimum timestamp for a batch of wallet keys, and put them on
+        the incoming events queue.
+        """
+        try:
+            json_events = await self.redis_service.get_json_cloudapi_events_by_keys(
+                keys, start_timestamp=min_timestamp_ns
+            )
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Could not backfill events for {} keys", len(keys))
+            return
+
+        num_backfilled = 0
+        for json_event, score in json_events:
+            try:
+                event = SerializedEvent(
+                    json_event, event_id=SerializedEvent.event_id_from_score(score)
+                )
+            except ValueError as e:
+                logger.error("Could not parse stored event to backfill: {}", e)
+                continue
+            self.incoming_events.put_nowait(event)
+            num_backfilled += 1
+
+        self._backfill_stats["keys_read"] += len(keys)
+        self._backfill_stats["events_backfilled"] += num_backfilled
 
     async def _process_incoming_events(self) -> NoReturn:
         while True:
             # Wait for an event to be added to the incoming events queue
-            event: CloudApiWebhookEventGeneric = await self.incoming_events.get()
-            wallet = event.wallet_id
-            topic = event.topic
-
-            # Process the event into the per-wallet queues
-            async with self.cache_locks[wallet][topic]:
-                # Check if queue is full and make room before adding events
-                if self.fifo_cache[wallet][topic].full():
-                    logger.warning(
-                        "SSE Manager: fifo_cache is full for wallet `{}` and topic `{}` with max queue length `{}`",
-                        wallet,
-                        topic,
-                        MAX_QUEUE_SIZE,
-                    )
+            event: SerializedEvent = await self.incoming_events.get()
+            self._add_to_cache(event)
+
+    def _add_to_cache(self, event: SerializedEvent) -> None:
+        """
+        Add an event to the ring buffer for its wallet and topic. If the buffer is full, its
+        oldest event is dropped. If the cache exceeds its memory budget, the least recently
+        used wallets are evicted.
+        """
+        wallet = event.wallet_id
+        topic = event.topic
 
-                    await self.fifo_cache[wallet][topic].get()
+        logger.trace(
+            "Putting event on cache for wallet `{}`, topic `{}`: {}",
+            wallet,
+            topic,
+            event,
+        )
+        dropped = self.event_cache.append(self._next_sequence, event, time.time())
+        self._next_sequence += 1
+        if dropped:
+            logger.debug(
+                "SSE Manager: event cache is full for wallet `{}` and topic `{}` with max "
+                "length `{}`. Dropped oldest event",
+                wallet,
+                topic,
+                MAX_QUEUE_SIZE,
+            )
 
-                    # cannot pop from lifo queue; rebuild from fifo queue
-                    lifo_queue, fifo_queue = await _copy_queue(
-                        self.fifo_cache[wallet][topic]
-                    )
-                    self.fifo_cache[wallet][topic] = fifo_queue
-                    self.lifo_cache[wallet][topic] = lifo_queue
+        self._push_to_subscribers(event)
 
-                timestamped_event: Tuple(float, CloudApiWebhookEventGeneric) = (  # type: ignore
-                    time.time(),
-                    event,
-                )
-                logger.trace(
-                    "Putting event on cache for wallet `{}`, topic `{}`: {}",
-                    wallet,
-                    topic,
-                    event,
-                )
-                await self.lifo_cache[wallet][topic].put(timestamped_event)
-                await self.fifo_cache[wallet][topic].put(timestamped_event)
+    def _push_to_subscribers(self, event: SerializedEvent) -> None:
+        """
+        Put an event on the queues of the clients subscribed to its wallet and topic, waking
+        up the clients waiting on them.
+        """
+        for client_queue in self._subscribers.match(event):
+            client_queue.put_nowait(event)
 
     async def sse_event_stream(
         self,
@@ -293,6 +399,10 @@ class SseManager:
         stop_event: asyncio.Event,
         look_back: float = MAX_EVENT_AGE_SECONDS,
         duration: int = 0,
+        field: Optional[str] = None,
+        field_id: Optional[str] = None,
+        desired_state: Optional[str] = None,
+        last_event_id: Optional[int] = None,
     ) -> EventGeneratorWrapper:
         """
         Create a SSE stream of events for a wallet_id on a specific topic
@@ -303,6 +413,11 @@ class SseManager:
             stop_event: An asyncio.Event to signal a stop request
             look_back: Duration (s) to look back for older events. 0 means from now
             duration: Timeout duration in seconds. 0 means no timeout.
+            field: Only stream events with this payload field equal to `field_id`.
+            field_id: The value that the payload `field` must have.
+            desired_state: Only stream events with this payload state.
+            last_event_id: The id of the last event the client received, when resuming a
+                stream. The events stored since are replayed, instead of looking back.
         """
         client_queue = asyncio.Queue()
 
@@ -312,43 +427,123 @@ class SseManager:
                 topic=topic,
                 client_queue=client_queue,
                 look_back=look_back,
+                subscription_filter=SubscriptionFilter.create(
+                    field=field, field_id=field_id, desired_state=desired_state
+                ),
+                last_event_id=last_event_id,
             )
         )
 
-        async def event_generator() -> AsyncGenerator[CloudApiWebhookEventGeneric, Any]:
-            bound_logger = logger.bind(body={"wallet": wallet, "topic": topic})
-            bound_logger.debug("SSE Manager: Starting event_generator")
-            end_time = time.time() + duration if duration > 0 else None
-            remaining_time = None
-            while not stop_event.is_set():
-                try:
-                    if end_time:
-                        remaining_time = end_time - time.time()
-                        if remaining_time <= 0:
-                            bound_logger.debug(
-                                "Event generator timeout: remaining_time < 0"
-                            )
-                            stop_event.set()
-                            break
-                    event = await asyncio.wait_for(
-                        client_queue.get(), timeout=remaining_time
-                    )
-                    yield event
-                except asyncio.TimeoutError:
-                    bound_logger.debug(
-                        "Event generator timeout: waiting for event on queue"
-                    )
-                    stop_event.set()
-                except asyncio.CancelledError:
-                    bound_logger.debug("Task cancelled")
-                    stop_event.set()
+        return EventGeneratorWrapper(
+            generator=self._client_event_generator(
+                client_queue=client_queue,
+                populate_task=populate_task,
+                stop_event=stop_event,
+                duration=duration,
+                log_body={"wallet": wallet, "topic": topic},
+            ),
+            populate_task=populate_task,
+        )
 
-            populate_task.cancel()  # After stop_event is set
+    async def sse_multi_event_stream(
+        self,
+        *,
+        wallets: Optional[List[str]] = None,
+        group_id: Optional[str] = None,
+        topic: str,
+        stop_event: asyncio.Event,
+        look_back: float = MAX_EVENT_AGE_SECONDS,
+        duration: int = 0,
+        field: Optional[str] = None,
+        field_id: Optional[str] = None,
+        desired_state: Optional[str] = None,
+    ) -> EventGeneratorWrapper:
+        """
+        Create one SSE stream of the events of multiple wallets on a specific topic: either the
+        given wallets, or all wallets in a group, including wallets that join it later.
+
+        Args:
+            wallets: The IDs of the wallets whose events to stream.
+            group_id: The group whose events to stream, if no wallets are given.
+            topic: The topic for which to create the event stream.
+            stop_event: An asyncio.Event to signal a stop request
+            look_back: Duration (s) to look back for older events. 0 means from now
+            duration: Timeout duration in seconds. 0 means no timeout.
+            field: Only stream events with this payload field equal to `field_id`.
+            field_id: The value that the payload `field` must have.
+            desired_state: Only stream events with this payload state.
+        """
+        if bool(wallets) == bool(group_id):
+            raise ValueError("Stream the events of either a list of wallets or a group")
+
+        client_queue = asyncio.Queue()
+
+        populate_task = asyncio.create_task(
+            self._populate_multi_client_queue(
+                wallets=wallets or [],
+                group_id=group_id,
+                topic=topic,
+                client_queue=client_queue,
+                look_back=look_back,
+                subscription_filter=SubscriptionFilter.create(
+                    field=field, field_id=field_id, desired_state=desired_state
+                ),
+            )
+        )
 
         return EventGeneratorWrapper(
-            generator=event_generator(), populate_task=populate_task
+            generator=self._client_event_generator(
+                client_queue=client_queue,
+                populate_task=populate_task,
+                stop_event=stop_event,
+                duration=duration,
+                log_body={"wallets": wallets, "group_id": group_id, "topic": topic},
+            ),
+            populate_task=populate_task,
         )
 
+    async def _client_event_generator(
+        self,
+        *,
+        client_queue: asyncio.Queue,
+        populate_task: asyncio.Task,
+        stop_event: asyncio.Event,
+        duration: int,
+        log_body: Dict[str, Any],
+    ) -> AsyncGenerator[SerializedEvent, Any]:
+        """
+        Yield the events put on a client queue, until the stop event is set or the duration
+        has passed. The task populating the queue is then cancelled.
+        """
+        bound_logger = logger.bind(body=log_body)
+        bound_logger.debug("SSE Manager: Starting event_generator")
+        end_time = time.time() + duration if duration > 0 else None
+        remaining_time = None
+        while not stop_event.is_set():
+            try:
+                if end_time:
+                    remaining_time = end_time - time.time()
+                    if remaining_time <= 0:
+                        bound_logger.debug(
+                            "Event generator timeout: remaining_time < 0"
+                        )
+                        stop_event.set()
+                        break
+                event = await asyncio.wait_for(
+                    client_queue.get(), timeout=remaining_time
+                )
+                yield event
+            except asyncio.TimeoutError:
+                bound_logger.debug(
+                    "Event generator timeout: waiting for event on queue"
+                )
+                stop_event.set()
+            except asyncio.CancelledError:
+                bound_logger.debug("Task cancelled")
+                stop_event.set()
+
+        populate_task.cancel()  # After stop_event is set
+
     async def _populate_client_queue(
         self,
         *,
@@ -356,115 +551,253 @@ class SseManager:
         topic: str,
         client_queue: asyncio.Queue,
         look_back: float = MAX_EVENT_AGE_SECONDS,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+        last_event_id: Optional[int] = None,
     ) -> NoReturn:
+        """
+        Put the cached events within the look back window (or, when resuming a stream, the
+        events stored since the last event id) on the client queue, and then subscribe it to
+        new events until cancelled.
+        """
         logger.trace(
             "SSE Manager: start _populate_client_queue for wallet `{}` and topic `{}`",
             wallet,
             topic,
         )
-        event_log = []  # to keep track of events already added for this client queue
-
-        now = time.time()
-        since_timestamp = now - look_back
-        while True:
-            if topic == WEBHOOK_TOPIC_ALL:
-                for topic_key in self.lifo_cache[wallet].keys():
-                    event_log = await self._append_to_queue(
-                        wallet=wallet,
-                        topic=topic_key,
-                        client_queue=client_queue,
-                        event_log=event_log,
-                        since_timestamp=since_timestamp,
-                    )
-            else:
-                event_log = await self._append_to_queue(
-                    wallet=wallet,
-                    topic=topic,
-                    client_queue=client_queue,
-                    event_log=event_log,
-                    since_timestamp=since_timestamp,
-                )
+        if last_event_id is not None:
+            await self._replay_missed_events(
+                wallet=wallet,
+                topic=topic,
+                client_queue=client_queue,
+                last_event_id=last_event_id,
+                subscription_filter=subscription_filter,
+            )
+        else:
+            since_timestamp = time.time() - look_back
 
-            # Sleep for a short duration to allow sufficient release of concurrency locks
-            await asyncio.sleep(CLIENT_QUEUE_POLL_PERIOD)
+            # No events can be cached in between reading the cache and subscribing, as both
+            # are synchronous. So no events are missed or duplicated
+            self._append_to_queue(
+                wallets=[wallet],
+                topic=topic,
+                client_queue=client_queue,
+                cursor=0,
+                since_timestamp=since_timestamp,
+                subscription_filter=subscription_filter,
+            )
+            self._subscribers.add(
+                wallet=wallet,
+                topic=topic,
+                client_queue=client_queue,
+                subscription_filter=subscription_filter,
+            )
+        try:
+            # New events are pushed to the client queue; wait until the client disconnects
+            await asyncio.Future()
+        finally:
+            self._subscribers.remove(
+                wallet=wallet,
+                topic=topic,
+                client_queue=client_queue,
+                subscription_filter=subscription_filter,
+            )
 
-    async def _append_to_queue(
+    async def _replay_missed_events(
         self,
         *,
         wallet: str,
         topic: str,
         client_queue: asyncio.Queue,
-        event_log: List,
-        since_timestamp: float = 0,
-    ) -> List:
-        queue_is_read = False
-        async with self.cache_locks[wallet][topic]:
-            lifo_queue_for_topic = self.lifo_cache[wallet][topic]
+        last_event_id: int,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+    ) -> None:
+        """
+        Put the events stored in Redis after the last event id on the client queue, and
+        subscribe it to new events.
+
+        Events received while the history is being read are held on a staging queue, and
+        passed on afterwards unless they were part of the history. So no events are missed
+        or duplicated.
+
+        Like the look back of a new stream, the replay is bounded: only events from the last
+        MAX_EVENT_AGE_SECONDS are replayed, and at most the newest SSE_REPLAY_MAX_EVENTS of them.
+        """
+        min_score = time.time_ns() - int(MAX_EVENT_AGE_SECONDS * 1e9)
+        score = max(last_event_id, min_score)
+        staging_queue = asyncio.Queue()
+        self._subscribers.add(
+            wallet=wallet,
+            topic=topic,
+            client_queue=staging_queue,
+            subscription_filter=subscription_filter,
+        )
+        try:
+            history = await self.redis_service.get_json_cloudapi_events_after_score(
+                wallet_id=wallet,
+                score=score,
+                num=SSE_REPLAY_MAX_EVENTS,
+                topic=None if topic == WEBHOOK_TOPIC_ALL else topic,
+            )
+        except Exception:  # pylint: disable=W0718
+            logger.exception(
+                "Could not fetch missed events for wallet `{}` since event id `{}`",
+                wallet,
+                last_event_id,
+            )
+            history = []
+        finally:
+            self._subscribers.remove(
+                wallet=wallet,
+                topic=topic,
+                client_queue=staging_queue,
+                subscription_filter=subscription_filter,
+            )
+
+        # From here on, no events can be cached until the client queue is subscribed
+        replayed = set()
+        for json_event, score in history:
             try:
-                while True:
-                    timestamp, event = lifo_queue_for_topic.get_nowait()
-                    queue_is_read = True
-                    if (timestamp, event) not in event_log:
-                        self._cache_last_accessed[wallet][topic] = datetime.now()
-                        event_log += ((timestamp, event),)
-                        if timestamp >= since_timestamp:
-                            client_queue.put_nowait(event)
-            except asyncio.QueueEmpty:
-                # No event on lifo_queue, so we can continue
-                pass
-            except asyncio.QueueFull:
-                # Because we are using `put_nowait`. Should not happen as queue has no max size
-                logger.error(
-                    "Client Queue is full for wallet {} on topic {}",
-                    wallet,
-                    topic,
+                event = SerializedEvent(
+                    json_event, event_id=SerializedEvent.event_id_from_score(score)
                 )
+            except ValueError as e:
+                logger.error("Could not parse stored event to replay: {}", e)
+                continue
+            if topic not in (event.topic, WEBHOOK_TOPIC_ALL):
+                continue
+            if subscription_filter.matches(event):
+                client_queue.put_nowait(event)
+                replayed.add(event.event_json)
+
+        while not staging_queue.empty():
+            event = staging_queue.get_nowait()
+            if event.event_json not in replayed:
+                client_queue.put_nowait(event)
+
+        logger.debug(
+            "Replayed {} events for wallet `{}` since event id `{}`",
+            len(replayed),
+            wallet,
+            last_event_id,
+        )
+        self._subscribers.add(
+            wallet=wallet,
+            topic=topic,
+            client_queue=client_queue,
+            subscription_filter=subscription_filter,
+        )
 
-            if queue_is_read:
-                # We've consumed from the lifo_queue, so repopulate it before exiting lock:
-                lifo_queue, fifo_queue = await _copy_queue(
-                    self.fifo_cache[wallet][topic]
+    async def _populate_multi_client_queue(
+        self,
+        *,
+        wallets: List[str],
+        group_id: Optional[str],
+        topic: str,
+        client_queue: asyncio.Queue,
+        look_back: float = MAX_EVENT_AGE_SECONDS,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+    ) -> NoReturn:
+        """
+        Put the cached events of the wallets, or of the group's wallets, within the look back
+        window on the client queue, and then subscribe it to new events until cancelled.
+        """
+        logger.trace(
+            "SSE Manager: start _populate_multi_client_queue for {} wallets, group `{}` "
+            "and topic `{}`",
+            len(wallets),
+            group_id,
+            topic,
+        )
+        if group_id:
+            cached_wallets = self.event_cache.get_group_wallets(group_id)
+            scopes = [{"group_id": group_id}]
+        else:
+            cached_wallets = wallets
+            scopes = [{"wallet": wallet} for wallet in set(wallets)]
+
+        # As for a single wallet, reading the cache and subscribing is synchronous
+        self._append_to_queue(
+            wallets=cached_wallets,
+            topic=topic,
+            client_queue=client_queue,
+            cursor=0,
+            since_timestamp=time.time() - look_back,
+            subscription_filter=subscription_filter,
+        )
+        for scope in scopes:
+            self._subscribers.add(
+                **scope,
+                topic=topic,
+                client_queue=client_queue,
+                subscription_filter=subscription_filter,
+            )
+        try:
+            await asyncio.Future()
+        finally:
+            for scope in scopes:
+                self._subscribers.remove(
+                    **scope,
+                    topic=topic,
+                    client_queue=client_queue,
+                    subscription_filter=subscription_filter,
                 )
-                self.fifo_cache[wallet][topic] = fifo_queue
-                self.lifo_cache[wallet][topic] = lifo_queue
 
-        return event_log
+    def _append_to_queue(
+        self,
+        *,
+        wallets: List[str],
+        topic: str,
+        client_queue: asyncio.Queue,
+        cursor: int,
+        since_timestamp: float = 0,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+    ) -> int:
+        """
+        Put the cached events for the wallets and topic from the cursor onwards on a client
+        queue, in the order they were received.
+
+        Returns:
+            The cursor from which to continue reading.
+        """
+        ring_buffers = []
+        for wallet in set(wallets):
+            wallet_cache = self.event_cache.get(wallet)
+            if topic == WEBHOOK_TOPIC_ALL:
+                ring_buffers.extend(wallet_cache.values())
+            elif topic in wallet_cache:
+                ring_buffers.append(wallet_cache[topic])
+
+        # Events older than the max event age are no longer served
+        since_timestamp = max(since_timestamp, time.time() - MAX_EVENT_AGE_SECONDS)
+
+        # Reading is synchronous, so no events can be added in between
+        next_cursor = self._next_sequence
+        new_events = heapq.merge(
+            *(
+                ring_buffer.read_from(cursor, since_timestamp)
+                for ring_buffer in ring_buffers
+            ),
+            key=lambda buffered_event: buffered_event.sequence,
+        )
+        for buffered_event in new_events:
+            if subscription_filter.matches(buffered_event.event):
+                client_queue.put_nowait(buffered_event.event)
+
+        return next_cursor
 
     async def _cleanup_cache(self) -> NoReturn:
         while True:
             logger.debug("SSE Manager: Running periodic cleanup task")
 
-            try:
-                # Iterate over all cache queues
-                for wallet in list(self.lifo_cache.keys()):
-                    for topic in list(self.lifo_cache[wallet].keys()):
-                        if datetime.now() - self._cache_last_accessed[wallet][
-                            topic
-                        ] > timedelta(seconds=MAX_EVENT_AGE_SECONDS):
-                            async with self.cache_locks[wallet][topic]:
-                                del self.lifo_cache[wallet][topic]
-                                del self._cache_last_accessed[wallet][topic]
-
-                                if topic in self.fifo_cache[wallet]:
-                                    # We are using keys from lifo_cache, so key exists
-                                    # should be checked before trying to access in fifo_cache
-                                    del self.fifo_cache[wallet][topic]
-                                else:
-                                    logger.warning(
-                                        "SSE Manager: Avoided KeyError in `_cleanup_cache`. "
-                                        "fifo_cache keys are not synced with lifo_cache keys, "
-                                        "for wallet `{}` and topic `{}`. Maybe caused by client disconnects.",
-                                        wallet,
-                                        topic,
-                                    )
-
-                            del self.cache_locks[wallet][topic]
-            except KeyError as e:
-                logger.warning(
-                    "SSE Manager: Caught KeyError in `_cleanup_cache`: {}.", e
-                )
+            # Remove ring buffers that haven't been written to or read from in the max event
+            # age, as all their events have expired
+            expiry = time.monotonic() - MAX_EVENT_AGE_SECONDS
+            num_removed = self.event_cache.remove_expired(expiry)
 
-            logger.debug("SSE Manager: Finished cleanup task.")
+            logger.debug(
+                "SSE Manager: Finished cleanup task. Removed {} ring buffers.",
+                num_removed,
+            )
 
             # Wait for a while between cleanup operations
             await asyncio.sleep(QUEUE_CLEANUP_PERIOD)
@@ -477,7 +810,7 @@ class SseManager:
         valid_wallet_group = False
         attempt = 1
         while not valid_wallet_group and attempt <= max_checks:
-            valid_wallet_group = self.redis_service.check_wallet_belongs_to_group(
+            valid_wallet_group = await self.redis_service.check_wallet_belongs_to_group(
                 wallet_id=wallet_id, group_id=group_id
             )
             if not valid_wallet_group:
@@ -485,24 +818,3 @@ class SseManager:
                 await asyncio.sleep(delay)
 
         return valid_wallet_group
-
-
-async def _copy_queue(
-    queue: asyncio.Queue, maxsize: int = MAX_QUEUE_SIZE
-) -> Tuple[asyncio.LifoQueue, asyncio.Queue]:
-    # Consuming a queue removes its content. Therefore, we create two new queues to copy one
-    logger.trace("SSE Manager: Repopulating cache")
-    lifo_queue, fifo_queue = asyncio.LifoQueue(maxsize), asyncio.Queue(maxsize)
-    while True:
-        try:
-            timestamp, item = queue.get_nowait()
-            if (
-                time.time() - timestamp <= MAX_EVENT_AGE_SECONDS
-            ):  # only copy events that are less than our max event age
-                await lifo_queue.put((timestamp, item))
-                await fifo_queue.put((timestamp, item))
-        except asyncio.QueueEmpty:
-            break
-    logger.trace("SSE Manager: Finished repopulating cache.")
-
-    return lifo_queue, fifo_queue
@@ -1,9 +1,13 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from redis import RedisCluster
+import orjson
+from redis.asyncio.cluster import RedisCluster
 
+from shared.constants import WALLET_GROUP_CACHE_SIZE
 from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
 from shared.services.redis_service import RedisService
+from shared.util.lru_cache import LRUCache
 from shared.util.rich_parsing import parse_json_with_error_handling
 
 
@@ -31,6 +35,25 @@ class WebhooksRedisService(RedisService):
 
         self.cloudapi_redis_prefix = "cloudapi"  # redis prefix for CloudAPI events
 
+        # redis prefix for the index of CloudAPI events by wallet and topic. Kept separate
+        # from `cloudapi:*`, so that scans for the wallet event keys don't match it. The index
+        # holds the timestamps of the events, which reference them in the wallet's sorted set
+        self.cloudapi_topic_redis_prefix = "cloudapi-topic"
+        # redis key marking that the events from before the topic index have been indexed
+        self.cloudapi_topic_backfilled_key = "cloudapi-topic-backfilled"
+        self._topic_index_backfilled = False  # set once the marker is seen
+
+        # redis prefix for the index of wallet id to group id. An empty group id
+        # indicates that the wallet has no group
+        self.wallet_group_redis_prefix = "cloudapi-wallet-group"
+        # redis key marking that the wallets from before the group index have been indexed
+        self.wallet_group_backfilled_key = "cloudapi-wallet-group-backfilled"
+
+        # in-process cache of the wallet group index
+        self._wallet_group_cache: LRUCache[str, str] = LRUCache(
+            max_size=WALLET_GROUP_CACHE_SIZE
+        )
+
         self.logger.info("WebhooksRedisService initialised")
 
     def get_cloudapi_event_redis_key(
@@ -47,7 +70,98 @@ class WebhooksRedisService(RedisService):
 
         return f"{self.cloudapi_redis_prefix}:{group_and_wallet_id}"
 
-    def get_cloudapi_event_redis_key_unknown_group(
+    def get_cloudapi_topic_index_redis_key(self, wallet_id: str, topic: str) -> str:
+        """
+        Define redis key for the index of CloudAPI webhook events by wallet and topic
+
+        Args:
+            wallet_id: The relevant wallet id
+            topic: The CloudAPI topic of the events
+        """
+        return f"{self.cloudapi_topic_redis_prefix}:{wallet_id}:{topic}"
+
+    def get_wallet_group_index_redis_key(self, wallet_id: str) -> str:
+        """
+        Define redis key for the index entry of a wallet's group id
+
+        Args:
+            wallet_id: The relevant wallet id
+        """
+        return f"{self.wallet_group_redis_prefix}:{wallet_id}"
+
+    async def get_wallet_group_id(self, wallet_id: str) -> Optional[str]:
+        """
+        Fetch the group id of a wallet from the wallet group index, which is populated when
+        events for the wallet are stored.
+
+        Args:
+            wallet_id: The relevant wallet id
+
+        Returns:
+            The group id, an empty string if the wallet has no group, or None if no events
+            have been stored for the wallet.
+        """
+        group_id = self._wallet_group_cache.get(wallet_id)
+        if group_id is not None:
+            return group_id
+
+        value = await self.redis.get(self.get_wallet_group_index_redis_key(wallet_id))
+        if value is None:
+            self.logger.debug("No group index entry found for wallet: {}.", wallet_id)
+            return None
+
+        group_id = value.decode()
+        self._wallet_group_cache.set(wallet_id, group_id)
+        return group_id
+
+    def is_wallet_group_cached(self, wallet_id: str, group_id: str) -> bool:
+        """
+        Whether the wallet's group is known to be in the index, so that writing it can be skipped.
+        """
+        return self._wallet_group_cache.get(wallet_id) == group_id
+
+    def cache_wallet_group(self, wallet_id: str, group_id: str) -> None:
+        """
+        Cache a wallet's group after it has been written to the index.
+        """
+        self._wallet_group_cache.set(wallet_id, group_id)
+
+    async def index_wallet_groups(self, count: int = 1000) -> int:
+        """
+        Populate the wallet group index from the existing CloudAPI event keys, for events that
+        were stored before the index existed. Existing index entries are not overwritten. This
+        is done once: when complete, it is marked as done, and later calls return without scanning.
+
+        Args:
+            count: The number of keys to scan and index per pipeline.
+
+        Returns:
+            The number of event keys that were indexed.
+        """
+        if await self.redis.exists(self.wallet_group_backfilled_key):
+            self.logger.debug("Wallet group index has already been backfilled.")
+            return 0
+
+        self.logger.info("Starting SCAN to index wallet groups.")
+        num_indexed = 0
+        async for keys in self.iterate_cloudapi_event_key_batches(count=count):
+            pipeline = self.redis.pipeline()
+            for key in keys:
+                parts = key.split(":")  # cloudapi:wallet or cloudapi:group:g:wallet
+                group_id = parts[2] if len(parts) == 4 and parts[1] == "group" else ""
+                wallet_id = parts[-1]
+                pipeline.set(
+                    self.get_wallet_group_index_redis_key(wallet_id), group_id, nx=True
+                )
+            # Written per batch of keys, so writes are not buffered for the whole keyspace
+            await pipeline.execute()
+            num_indexed += len(keys)
+
+        await self.redis.set(self.wallet_group_backfilled_key, "1")
+        self.logger.info("Indexed wallet groups for {} event keys.", num_indexed)
+        return num_indexed
+
+    async def get_cloudapi_event_redis_key_unknown_group(
         self, wallet_id: str
     ) -> Optional[str]:
         """
@@ -56,40 +170,35 @@ class WebhooksRedisService(RedisService):
         Args:
             wallet_id: The relevant wallet id
         """
-        wildcard_key = f"{self.cloudapi_redis_prefix}:*{wallet_id}"
-        self.logger.debug("Fetching redis keys matching pattern: {}", wildcard_key)
-        list_keys = self.match_keys(wildcard_key)
+        group_id = await self.get_wallet_group_id(wallet_id)
 
-        if not list_keys:
-            self.logger.debug(
-                "No redis keys found matching the pattern for wallet: {}.", wallet_id
-            )
+        if group_id is None:
+            self.logger.debug("No redis key found for wallet: {}.", wallet_id)
             return None
 
-        if len(list_keys) > 1:
-            self.logger.warning(
-                "More than one redis key found for wallet: {}", wallet_id
-            )
-
-        result = list_keys[0].decode()
-        self.logger.debug("Returning matched key: {}.", result)
+        result = self.get_cloudapi_event_redis_key(wallet_id, group_id)
+        self.logger.debug("Returning key: {}.", result)
         return result
 
-    def add_cloudapi_webhook_event(
+    async def add_cloudapi_webhook_event(
         self,
         event_json: str,
         group_id: Optional[str],
         wallet_id: str,
         timestamp_ns: int,
+        topic: Optional[str] = None,
     ) -> None:
         """
         Add a CloudAPI webhook event JSON string to Redis and publish a notification.
+        The notification carries the event: `group_id:wallet_id:timestamp_ns:event_json`.
 
         Args:
             event_json: The JSON string representation of the webhook event.
             group_id: The group_id to which this wallet_id belongs.
             wallet_id: The identifier of the wallet associated with the event.
             timestamp_ns: The timestamp (in nanoseconds) of when the event was saved.
+            topic: The CloudAPI topic of the event. If given, the event's timestamp is also
+                added to the wallet and topic index.
         """
         bound_logger = self.logger.bind(
             body={"wallet_id": wallet_id, "group_id": group_id, "event": event_json}
@@ -98,18 +207,28 @@ class WebhooksRedisService(RedisService):
 
         # Use the current timestamp as the score for the sorted set
         redis_key = self.get_cloudapi_event_redis_key(wallet_id, group_id)
-        self.redis.zadd(redis_key, {event_json: timestamp_ns})
+        await self.redis.zadd(redis_key, {event_json: timestamp_ns})
+
+        if topic:
+            topic_key = self.get_cloudapi_topic_index_redis_key(wallet_id, topic)
+            await self.redis.zadd(topic_key, {str(timestamp_ns): timestamp_ns})
 
         group_id = "" if not group_id else group_id  # convert None to ""
 
-        broadcast_message = f"{group_id}:{wallet_id}:{timestamp_ns}"
+        if not self.is_wallet_group_cached(wallet_id, group_id):
+            wallet_group_key = self.get_wallet_group_index_redis_key(wallet_id)
+            await self.redis.set(wallet_group_key, group_id)
+            self.cache_wallet_group(wallet_id, group_id)
+
+        # The event itself is part of the message, so subscribers don't need to fetch it
+        broadcast_message = f"{group_id}:{wallet_id}:{timestamp_ns}:{event_json}"
         # publish that a new event has been added
         bound_logger.trace("Publish message on pubsub channel: {}", broadcast_message)
-        self.redis.publish(self.sse_event_pubsub_channel, broadcast_message)
+        await self.redis.publish(self.sse_event_pubsub_channel, broadcast_message)
 
         bound_logger.trace("Successfully wrote entry to redis.")
 
-    def get_json_cloudapi_events_by_wallet(
+    async def get_json_cloudapi_events_by_wallet(
         self, wallet_id: str, num: Optional[int] = 100
     ) -> List[str]:
         """
@@ -129,13 +248,13 @@ class WebhooksRedisService(RedisService):
         bound_logger = self.logger.bind(body={"wallet_id": wallet_id})
         bound_logger.trace("Fetching entries from redis by wallet id")
 
-        redis_key = self.get_cloudapi_event_redis_key_unknown_group(wallet_id)
+        redis_key = await self.get_cloudapi_event_redis_key_unknown_group(wallet_id)
         if not redis_key:
             bound_logger.debug("No entries found for wallet without matching redis key")
             return []
 
         # Fetch all entries using the full range of scores
-        entries: List[bytes] = self.redis.zrevrangebyscore(
+        entries: List[bytes] = await self.redis.zrevrangebyscore(
             name=redis_key, max="+inf", min="-inf", start=0, num=num
         )
         entries_str: List[str] = [entry.decode() for entry in entries]
@@ -143,7 +262,7 @@ class WebhooksRedisService(RedisService):
         bound_logger.trace("Successfully fetched redis entries.")
         return entries_str
 
-    def get_cloudapi_events_by_wallet(
+    async def get_cloudapi_events_by_wallet(
         self, wallet_id: str, num: Optional[int] = 100
     ) -> List[CloudApiWebhookEventGeneric]:
         """
@@ -157,7 +276,7 @@ class WebhooksRedisService(RedisService):
         Returns:
             A list of CloudApiWebhookEventGeneric instances.
         """
-        entries = self.get_json_cloudapi_events_by_wallet(wallet_id, num=num)
+        entries = await self.get_json_cloudapi_events_by_wallet(wallet_id, num=num)
         parsed_entries = [
             parse_json_with_error_handling(
                 CloudApiWebhookEventGeneric, entry, self.logger
@@ -166,7 +285,7 @@ class WebhooksRedisService(RedisService):
         ]
         return parsed_entries
 
-    def get_json_cloudapi_events_by_wallet_and_topic(
+    async def get_json_cloudapi_events_by_wallet_and_topic(
         self, wallet_id: str, topic: str, num: Optional[int] = 100
     ) -> List[str]:
         """
@@ -180,15 +299,137 @@ class WebhooksRedisService(RedisService):
         Returns:
             A list of event JSON strings that match the specified topic.
         """
+        max = 10000  # Set to some large number to limit maximum number of webhooks returned
+        if not num:
+            num = max
+
+        bound_logger = self.logger.bind(body={"wallet_id": wallet_id, "topic": topic})
+        bound_logger.trace("Fetching entries from redis by wallet id and topic")
+
+        topic_key = self.get_cloudapi_topic_index_redis_key(wallet_id, topic)
+        references: List[Tuple[bytes, float]] = await self.redis.zrevrangebyscore(
+            name=topic_key, max="+inf", min="-inf", start=0, num=num, withscores=True
+        )
+        if references:
+            entries = await self._get_json_cloudapi_events_by_scores(
+                wallet_id, topic, [score for _, score in references]
+            )
+            bound_logger.trace("Successfully fetched redis entries from topic index.")
+            return [entry for entry, _ in entries[:num]]
+
+        if await self.is_topic_index_backfilled():
+            # The index has all events of the topic: there are none
+            return []
+
+        # Until the backfill is done, events that were stored before the topic index existed
+        # are only in the wallet's sorted set, so fall back to filtering those
+        bound_logger.trace("No topic index found. Filtering events for wallet by topic")
         # Fetch maximum because we must post-filter to return `num` relevant topic entries
-        entries = self.get_json_cloudapi_events_by_wallet(wallet_id, num=None)
+        entries_str = await self.get_json_cloudapi_events_by_wallet(wallet_id, num=None)
         # Filter the json entry for our requested topic without deserializing
         topic_str = f'"topic":"{topic}"'
-        filtered_by_topic = [entry for entry in entries if topic_str in entry]
-        result = filtered_by_topic[:num] if num else filtered_by_topic
-        return result
+        filtered_by_topic = [entry for entry in entries_str if topic_str in entry]
+        return filtered_by_topic[:num]
+
+    async def _get_json_cloudapi_events_by_scores(
+        self, wallet_id: str, topic: str, scores: List[float]
+    ) -> List[Tuple[str, float]]:
+        """
+        Resolve the references of the topic index to the events in the wallet's sorted set,
+        by pipelining a read per score.
+
+        Args:
+            wallet_id: The identifier of the wallet for which events are retrieved.
+            topic: The topic of the events, as other events may have the same score.
+            scores: The scores (timestamps) of the events, in the order to return them.
+
+        Returns:
+            A list of (event JSON string, score) pairs of the events of the topic.
+        """
+        redis_key = await self.get_cloudapi_event_redis_key_unknown_group(wallet_id)
+        if not redis_key:
+            return []
 
-    def get_cloudapi_events_by_wallet_and_topic(
+        # Timestamps that are rounded to the same score reference the same events
+        scores = list(dict.fromkeys(scores))
+        pipeline = self.redis.pipeline()
+        for score in scores:
+            pipeline.zrangebyscore(redis_key, min=score, max=score)
+        results: List[List[bytes]] = await pipeline.execute()
+
+        # Events that were trimmed from the wallet's sorted set are no longer found
+        topic_bytes = f'"topic":"{topic}"'.encode()
+        return [
+            (entry.decode(), score)
+            for score, entries in zip(scores, results)
+            for entry in entries
+            if topic_bytes in entry
+        ]
+
+    async def is_topic_index_backfilled(self) -> bool:
+        """
+        Whether the wallet topic index has been backfilled, i.e. whether it has all events.
+        Once it is, that is remembered, so that later calls don't read the marker.
+        """
+        if not self._topic_index_backfilled:
+            self._topic_index_backfilled = bool(
+                await self.redis.exists(self.cloudapi_topic_backfilled_key)
+            )
+        return self._topic_index_backfilled
+
+    async def index_wallet_topics(self, count: int = 1000) -> int:
+        """
+        Populate the wallet and topic index from the existing CloudAPI events, for events that
+        were stored before the index existed. This is done once: when complete, it is marked
+        as done, and later calls return without scanning.
+
+        Args:
+            count: The number of keys to scan and index per pipeline.
+
+        Returns:
+            The number of events that were indexed.
+        """
+        if await self.redis.exists(self.cloudapi_topic_backfilled_key):
+            self.logger.debug("Wallet topic index has already been backfilled.")
+            return 0
+
+        self.logger.info("Starting SCAN to backfill the wallet topic index.")
+        num_indexed = 0
+        async for keys in self.iterate_cloudapi_event_key_batches(count=count):
+            read_pipeline = self.redis.pipeline()
+            for key in keys:
+                read_pipeline.zrange(key, 0, -1, withscores=True)
+            results: List[List[Tuple[bytes, float]]] = await read_pipeline.execute()
+
+            write_pipeline = self.redis.pipeline()
+            num_writes = 0
+            for key, entries in zip(keys, results):
+                wallet_id = key.split(":")[
+                    -1
+                ]  # cloudapi:wallet or cloudapi:group:g:wallet
+                for entry, score in entries:
+                    try:
+                        topic = orjson.loads(entry).get("topic")
+                    except orjson.JSONDecodeError:
+                        continue
+                    if not topic:
+                        continue
+                    topic_key = self.get_cloudapi_topic_index_redis_key(
+                        wallet_id, topic
+                    )
+                    write_pipeline.zadd(topic_key, {str(int(score)): score})
+                    num_writes += 1
+
+            if num_writes:
+                await write_pipeline.execute()
+                num_indexed += num_writes
+
+        await self.redis.set(self.cloudapi_topic_backfilled_key, "1")
+        self._topic_index_backfilled = True
+        self.logger.info("Backfilled wallet topic index with {} events.", num_indexed)
+        return num_indexed
+
+    async def get_cloudapi_events_by_wallet_and_topic(
         self, wallet_id: str, topic: str, num: int = 100
     ) -> List[CloudApiWebhookEventGeneric]:
         """
@@ -203,13 +444,19 @@ class WebhooksRedisService(RedisService):
         Returns:
             A list of CloudApiWebhookEventGeneric instances that match the specified topic.
         """
-        # Fetch maximum because we must post-filter to return `num` relevant topic entries
-        entries = self.get_cloudapi_events_by_wallet(wallet_id, num=None)
-        filtered_by_topic = [entry for entry in entries if topic == entry.topic]
-        result = filtered_by_topic[:num] if num else filtered_by_topic
-        return result
+        # Only the events for the topic are parsed, as they are filtered before deserializing
+        entries = await self.get_json_cloudapi_events_by_wallet_and_topic(
+            wallet_id, topic, num=num
+        )
+        parsed_entries = [
+            parse_json_with_error_handling(
+                CloudApiWebhookEventGeneric, entry, self.logger
+            )
+            for entry in entries
+        ]
+        return parsed_entries
 
-    def get_json_cloudapi_events_by_timestamp(
+    async def get_json_cloudapi_events_by_timestamp(
         self,
         group_id: str,
         wallet_id: str,
@@ -237,14 +484,14 @@ class WebhooksRedisService(RedisService):
             bound_logger.debug("No entries found for wallet without matching redis key")
             return []
 
-        entries: List[bytes] = self.redis.zrangebyscore(
+        entries: List[bytes] = await self.redis.zrangebyscore(
             redis_key, min=start_timestamp, max=end_timestamp
         )
         entries_str: List[str] = [entry.decode() for entry in entries]
         bound_logger.trace("Fetched entries: {}", entries_str)
         return entries_str
 
-    def get_cloudapi_events_by_timestamp(
+    async def get_cloudapi_events_by_timestamp(
         self, wallet_id: str, start_timestamp: float, end_timestamp: float = "+inf"
     ) -> List[CloudApiWebhookEventGeneric]:
         """
@@ -259,8 +506,16 @@ class WebhooksRedisService(RedisService):
         Returns:
             A list of CloudApiWebhookEventGeneric instances that fall within the specified timestamp range.
         """
-        entries = self.get_json_cloudapi_events_by_timestamp(
-            wallet_id, start_timestamp, end_timestamp
+        group_id = await self.get_wallet_group_id(wallet_id)
+        if group_id is None:
+            self.logger.debug("No redis key found for wallet: {}.", wallet_id)
+            return []
+
+        entries = await self.get_json_cloudapi_events_by_timestamp(
+            group_id=group_id,
+            wallet_id=wallet_id,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
         )
         parsed_entries = [
             parse_json_with_error_handling(
@@ -270,7 +525,114 @@ class WebhooksRedisService(RedisService):
         ]
         return parsed_entries
 
-    def get_all_cloudapi_wallet_ids(self) -> List[str]:
+    async def get_json_cloudapi_events_after_score(
+        self,
+        wallet_id: str,
+        score: float,
+        num: int,
+        topic: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Retrieve the newest CloudAPI webhook event JSON strings for a wallet that were stored
+        with a score (timestamp) greater than the given one, e.g. to replay the events a client
+        missed.
+
+        Args:
+            wallet_id: The identifier of the wallet for which events are retrieved.
+            score: The exclusive lower bound of the scores of the events.
+            num: The maximum number of events to return. Older events are left out.
+            topic: If given, only the events of this topic are read, from the topic index.
+
+        Returns:
+            A list of (event JSON string, score) pairs, ordered by score.
+        """
+        bound_logger = self.logger.bind(
+            body={"wallet_id": wallet_id, "score": score, "topic": topic}
+        )
+        bound_logger.debug("Fetching entries from redis after score for wallet")
+
+        if topic:
+            topic_key = self.get_cloudapi_topic_index_redis_key(wallet_id, topic)
+            references: List[Tuple[bytes, float]] = await self.redis.zrevrangebyscore(
+                topic_key,
+                max="+inf",
+                min=f"({score}",
+                start=0,
+                num=num,
+                withscores=True,
+            )
+            if references:
+                entries = await self._get_json_cloudapi_events_by_scores(
+                    wallet_id, topic, [ref_score for _, ref_score in references]
+                )
+                bound_logger.trace("Fetched {} entries from topic index", len(entries))
+                return entries[:num][::-1]
+            if await self.is_topic_index_backfilled():
+                return []
+            # Until the backfill is done, events stored before the topic index existed are
+            # read from the wallet's set
+
+        redis_key = await self.get_cloudapi_event_redis_key_unknown_group(wallet_id)
+        if not redis_key:
+            bound_logger.debug("No entries found for wallet without matching redis key")
+            return []
+
+        entries: List[Tuple[bytes, float]] = await self.redis.zrevrangebyscore(
+            redis_key, max="+inf", min=f"({score}", start=0, num=num, withscores=True
+        )
+        bound_logger.trace("Fetched {} entries", len(entries))
+        return [(entry.decode(), entry_score) for entry, entry_score in entries[::-1]]
+
+    def iterate_cloudapi_event_key_batches(
+        self, count: int = 1000
+    ) -> AsyncIterator[List[str]]:
+        """
+        Scan the Redis cluster primaries concurrently for the keys of the sorted sets of
+        CloudAPI webhook events, i.e. one key per wallet.
+
+        Args:
+            count: The number of keys to scan per call to SCAN.
+
+        Yields:
+            Batches of keys, of up to about `count` keys each.
+        """
+        return self.iterate_key_batches(f"{self.cloudapi_redis_prefix}:*", count=count)
+
+    async def get_json_cloudapi_events_by_keys(
+        self,
+        redis_keys: List[str],
+        start_timestamp: float,
+        end_timestamp: float = "+inf",
+    ) -> List[Tuple[str, float]]:
+        """
+        Retrieve the CloudAPI webhook event JSON strings within a timestamp range from many
+        wallets at once, by pipelining the range reads of their sorted sets.
+
+        Args:
+            redis_keys: The keys of the sorted sets of events, e.g. from
+                `iterate_cloudapi_event_key_batches`.
+            start_timestamp: The start of the timestamp range.
+            end_timestamp: The end of the timestamp range (defaults to "+inf" for no upper limit).
+
+        Returns:
+            A list of (event JSON string, score) pairs, ordered by score per key.
+        """
+        if not redis_keys:
+            return []
+
+        self.logger.trace("Fetching entries by timestamp for {} keys", len(redis_keys))
+        pipeline = self.redis.pipeline()
+        for redis_key in redis_keys:
+            pipeline.zrangebyscore(
+                redis_key, min=start_timestamp, max=end_timestamp, withscores=True
+            )
+        results: List[List[Tuple[bytes, float]]] = await pipeline.execute()
+
+        return [
+            (entry.decode(), score) for entries in results for entry, score in entries
+        ]
+
+    async def get_all_cloudapi_wallet_ids(self) -> List[str]:
         """
         Fetch all wallet IDs that have CloudAPI webhook events stored in Redis.
         """
@@ -280,7 +642,7 @@ class WebhooksRedisService(RedisService):
 
         try:
             while True:  # Loop until the cursor returned by SCAN is '0'
-                next_cursor, keys = self.redis.scan(
+                next_cursor, keys = await self.redis.scan(
                     cursor=cursor,
                     match=f"{self.cloudapi_redis_prefix}:*",
                     count=10000,
@@ -311,7 +673,7 @@ class WebhooksRedisService(RedisService):
         self.logger.info("Total wallet IDs fetched: {}.", len(wallet_ids))
         return list(wallet_ids)
 
-    def add_endorsement_event(self, event_json: str, transaction_id: str) -> None:
+    async def add_endorsement_event(self, event_json: str, transaction_id: str) -> None:
         """
         Add an endorsement event to bespoke prefix for the endorsement service.
 
@@ -325,7 +687,7 @@ class WebhooksRedisService(RedisService):
 
         # Define key for this transaction, using transaction_id to ensure uniqueness
         redis_key = f"{self.endorsement_redis_prefix}:{transaction_id}"
-        result = self.set(key=redis_key, value=event_json)
+        result = await self.set(key=redis_key, value=event_json)
 
         if result:
             bound_logger.debug("Successfully wrote endorsement entry to redis.")
@@ -334,33 +696,30 @@ class WebhooksRedisService(RedisService):
 
         self.logger.trace("Successfully wrote endorsement entry to redis.")
 
-    def check_wallet_belongs_to_group(self, wallet_id: str, group_id: str) -> bool:
+    async def check_wallet_belongs_to_group(
+        self, wallet_id: str, group_id: str
+    ) -> bool:
         """
         Return a boolean indicating that the wallet_id belongs to the group_id or not
         """
-        self.logger.trace("Checking if wallet belongs to group, based on redis keys")
+        self.logger.trace("Checking if wallet belongs to group, based on group index")
 
-        wallet_group_key = self.get_cloudapi_event_redis_key(wallet_id, group_id)
-        self.logger.debug("Fetching redis keys matching pattern: {}", wallet_group_key)
-        list_keys = self.match_keys(wallet_group_key)
+        wallet_group_id = await self.get_wallet_group_id(wallet_id)
 
-        if not list_keys:
+        if wallet_group_id != group_id:
             self.logger.debug(
-                "No redis keys found matching the pattern: {}.", wallet_group_key
+                "Wallet {} is not indexed as belonging to group {}.",
+                wallet_id,
+                group_id,
             )
             return False
 
-        if len(list_keys) > 1:
-            self.logger.warning(
-                "More than one redis key found for pattern: {}", wallet_group_key
-            )
-
         self.logger.debug(
             "Validated that wallet {} belongs to group {}.", wallet_id, group_id
         )
         return True
 
-    def add_billing_event(
+    async def add_billing_event(
         self,
         event_json: str,
         group_id: str,
@@ -369,6 +728,7 @@ class WebhooksRedisService(RedisService):
     ) -> None:
         """
         Add a billing event to Redis and publish a notification.
+        The notification carries the event: `group_id:timestamp_ns:event_json`.
         Args:
             event_json: The JSON string representation of the billing event.
             group_id: The group_id to which this wallet_id belongs. Used as redis key.
@@ -386,18 +746,18 @@ class WebhooksRedisService(RedisService):
 
         # Use the current timestamp as the score for the sorted set
         redis_key = f"billing:{group_id}"
-        self.redis.zadd(name=redis_key, mapping={event_json: timestamp_ns})
+        await self.redis.zadd(name=redis_key, mapping={event_json: timestamp_ns})
 
-        broadcast_message = f"{group_id}:{timestamp_ns}"
+        broadcast_message = f"{group_id}:{timestamp_ns}:{event_json}"
 
         bound_logger.trace(
             "Publish billing message on pubsub channel: {}", broadcast_message
         )
-        self.redis.publish(self.billing_event_pubsub_channel, broadcast_message)
+        await self.redis.publish(self.billing_event_pubsub_channel, broadcast_message)
 
         bound_logger.info("Successfully wrote billing entry to redis.")
 
-    def get_billing_event(
+    async def get_billing_event(
         self, group_id: str, start_timestamp: int, stop_timestamp: int
     ) -> List[str]:
         """
@@ -413,10 +773,187 @@ class WebhooksRedisService(RedisService):
 
         redis_key = f"billing:{group_id}"
 
-        entries: List[bytes] = self.redis.zrangebyscore(
+        entries: List[bytes] = await self.redis.zrangebyscore(
             redis_key, min=start_timestamp, max=stop_timestamp
         )
         entries_str: List[str] = [entry.decode() for entry in entries]
 
         bound_logger.trace("Successfully fetched billing entries.")
         return entries_str
+
+    def batch(self) -> "WebhooksRedisBatch":
+        """
+        Create a batch for writing multiple webhook events to Redis in one pipeline.
+        """
+        return WebhooksRedisBatch(self)
+
+
+class WebhooksRedisBatch:
+    """
+    Collects the writes for multiple webhook events and sends them to Redis in one
+    cluster pipeline. It exposes the same `add_*` methods as WebhooksRedisService,
+    so that event processing logic can write to either of them.
+
+    Pub/sub notifications are published after the pipeline has executed, as PUBLISH
+    is not supported in a cluster pipeline. Subscribers will therefore always find
+    the event on redis when they are notified.
+
+    A cluster pipeline is not transactional, so a batch is written at least once: when
+    it fails, some of its writes may have been applied, and the batch is retried. The
+    writes are idempotent, as an event is stored with its ACA-Py timestamp as score, and
+    the same event JSON as member. An event is only published when its ZADD added it, so
+    that an event that was already stored is not published again when it is replayed.
+    """
+
+    def __init__(self, redis_service: WebhooksRedisService) -> None:
+        """
+        Initialize the batch with a pipeline on the redis service's cluster instance.
+
+        Args:
+            redis_service: The WebhooksRedisService to write events for.
+        """
+        self.redis_service = redis_service
+        self.logger = redis_service.logger
+
+        self._pipeline = redis_service.redis.pipeline()
+        self._num_commands = 0  # commands queued on the pipeline
+        # (index of the ZADD of the event in the pipeline, channel, message)
+        self._broadcasts: List[Tuple[int, str, str]] = []
+        self._wallet_groups: Dict[str, str] = {}  # group index entries to be cached
+        self._num_writes = 0
+
+    def __len__(self) -> int:
+        return self._num_writes
+
+    async def add_cloudapi_webhook_event(
+        self,
+        event_json: str,
+        group_id: Optional[str],
+        wallet_id: str,
+        timestamp_ns: int,
+        topic: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a CloudAPI webhook event write, and its pub/sub notification.
+        """
+        redis_key = self.redis_service.get_cloudapi_event_redis_key(wallet_id, group_id)
+        zadd_index = self._queue(
+            self._pipeline.zadd, redis_key, {event_json: timestamp_ns}
+        )
+        self._num_writes += 1
+
+        if topic:
+            topic_key = self.redis_service.get_cloudapi_topic_index_redis_key(
+                wallet_id, topic
+            )
+            self._queue(
+                self._pipeline.zadd, topic_key, {str(timestamp_ns): timestamp_ns}
+            )
+
+        group_id = "" if not group_id else group_id  # convert None to ""
+
+        queued_group_id = self._wallet_groups.get(wallet_id)
+        if (
+            queued_group_id != group_id
+            and not self.redis_service.is_wallet_group_cached(wallet_id, group_id)
+        ):
+            wallet_group_key = self.redis_service.get_wallet_group_index_redis_key(
+                wallet_id
+            )
+            self._queue(self._pipeline.set, wallet_group_key, group_id)
+            self._wallet_groups[wallet_id] = group_id
+
+        self._broadcasts.append(
+            (
+                zadd_index,
+                self.redis_service.sse_event_pubsub_channel,
+                f"{group_id}:{wallet_id}:{timestamp_ns}:{event_json}",
+            )
+        )
+
+    async def add_billing_event(
+        self,
+        event_json: str,
+        group_id: str,
+        wallet_id: str,  # pylint: disable=unused-argument
+        timestamp_ns: int,
+    ) -> None:
+        """
+        Queue a billing event write, and its pub/sub notification.
+        """
+        redis_key = f"billing:{group_id}"
+        zadd_index = self._queue(
+            self._pipeline.zadd, name=redis_key, mapping={event_json: timestamp_ns}
+        )
+        self._num_writes += 1
+
+        self._broadcasts.append(
+            (
+                zadd_index,
+                self.redis_service.billing_event_pubsub_channel,
+                f"{group_id}:{timestamp_ns}:{event_json}",
+            )
+        )
+
+    async def add_endorsement_event(self, event_json: str, transaction_id: str) -> None:
+        """
+        Queue an endorsement event write for the endorsement service.
+        """
+        redis_key = f"{self.redis_service.endorsement_redis_prefix}:{transaction_id}"
+        self._queue(self._pipeline.set, redis_key, value=event_json)
+        self._num_writes += 1
+
+    def _queue(self, command: Callable[..., Any], *args, **kwargs) -> int:
+        """
+        Queue a command on the pipeline, returning the index of its result.
+        """
+        command(*args, **kwargs)
+        self._num_commands += 1
+        return self._num_commands - 1
+
+    async def execute(self) -> None:
+        """
+        Execute the queued writes in one pipeline, and then publish the notifications of
+        the events that were added, concurrently.
+
+        Raises:
+            Exception: The first error of the writes, after the notifications of the
+                events that were written have been published.
+        """
+        if not self._num_writes:
+            self.logger.trace("No writes queued in batch")
+            return
+
+        num_writes = self._num_writes
+        self.logger.trace("Executing pipeline with {} writes", num_writes)
+        try:
+            results = await self._pipeline.execute(raise_on_error=False)
+            errors = [result for result in results if isinstance(result, Exception)]
+
+            if not errors:
+                for wallet_id, group_id in self._wallet_groups.items():
+                    self.redis_service.cache_wallet_group(wallet_id, group_id)
+
+            # An event that was already stored, i.e. a replay, was published already
+            broadcasts = [
+                (channel, message)
+                for zadd_index, channel, message in self._broadcasts
+                if results[zadd_index] == 1
+            ]
+            self.logger.trace("Publishing {} pubsub messages", len(broadcasts))
+            await asyncio.gather(
+                *(
+                    self.redis_service.redis.publish(channel, message)
+                    for channel, message in broadcasts
+                )
+            )
+        finally:
+            self._broadcasts.clear()
+            self._wallet_groups.clear()
+            self._num_writes = self._num_commands = 0
+
+        if errors:
+            raise errors[0]
+        self.logger.debug(
+            "Successfully wrote {} entries to redis in batch.", num_writes
+        )
@@ -2,23 +2,25 @@ import asyncio
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
 import pytest
-from fastapi import BackgroundTasks, Request
+from fastapi import HTTPException, Request
 from sse_starlette import EventSourceResponse
 
-from shared.constants import DISCONNECT_CHECK_PERIOD, MAX_EVENT_AGE_SECONDS, SSE_TIMEOUT
+from shared.constants import MAX_EVENT_AGE_SECONDS, SSE_TIMEOUT
 from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
 from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
 from webhooks.services.sse_manager import SseManager
 from webhooks.util.event_generator_wrapper import EventGeneratorWrapper
+from webhooks.util.serialized_event import SerializedEvent
 from webhooks.web.routers.sse import (
     BadGroupIdException,
-    check_disconnection,
+    get_last_event_id,
     sse_event_stream_generator,
     sse_subscribe_event_with_field_and_state,
     sse_subscribe_event_with_state,
     sse_subscribe_stream_with_fields,
     sse_subscribe_wallet,
     sse_subscribe_wallet_topic,
+    sse_subscribe_wallets,
 )
 
 wallet_id = "wallet123"
@@ -27,12 +29,14 @@ field = "some_field"
 field_id = "some_field_id"
 desired_state = "some_state"
 
-dummy_cloudapi_event = CloudApiWebhookEventGeneric(
-    wallet_id=wallet_id,
-    topic=topic,
-    origin="xyz",
-    group_id="some_group",
-    payload={"dummy": "data"},
+dummy_cloudapi_event = SerializedEvent.from_model(
+    CloudApiWebhookEventGeneric(
+        wallet_id=wallet_id,
+        topic=topic,
+        origin="xyz",
+        group_id="some_group",
+        payload={"dummy": "data"},
+    )
 )
 
 
@@ -46,6 +50,7 @@ def sse_manager_mock():
 def request_mock():
     mock_request = AsyncMock(spec=Request)
     mock_request.is_disconnected.return_value = False
+    mock_request.headers = {}
     return mock_request
 
 
@@ -59,114 +64,160 @@ def async_generator_mock():
 
 
 @pytest.mark.anyio
-async def test_check_disconnection_disconnects():
-    # Mock Request to simulate disconnection
-    request = AsyncMock(spec=Request)
-    request.is_disconnected.return_value = True
-
-    stop_event = asyncio.Event()
-
-    # Run check_disconnection in a background task
-    task = asyncio.create_task(check_disconnection(request, stop_event))
-
-    # Give it enough time to check for disconnection and set the stop event
-    await asyncio.sleep(DISCONNECT_CHECK_PERIOD * 1.1)
-
-    assert stop_event.is_set()  # Expect stop_event to be set upon disconnection
-    assert task.done() is True
-
-
-@pytest.mark.anyio
-async def test_check_disconnection_stop_event():
-    # Mock Request to stay connected
-    request = AsyncMock(spec=Request)
-    request.is_disconnected.return_value = False
-
-    stop_event = asyncio.Event()
+async def test_sse_event_stream_generator_wallet_id(
+    async_generator_mock,  # pylint: disable=redefined-outer-name
+    sse_manager_mock,  # pylint: disable=redefined-outer-name
+    request_mock,  # pylint: disable=redefined-outer-name
+):
+    # Configure the sse_manager mock
+    sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
+        generator=async_generator_mock([dummy_cloudapi_event]),
+        populate_task=Mock(),
+    )
 
-    # Run check_disconnection in a background task
-    task = asyncio.create_task(check_disconnection(request, stop_event))
+    # Call the method under test
+    async for event in sse_event_stream_generator(
+        sse_manager=sse_manager_mock,
+        request=request_mock,
+        wallet_id=wallet_id,
+        logger=Mock(),
+    ):
+        assert event == dummy_cloudapi_event.sse_frame
 
-    # Assert still running after one check period
-    await asyncio.sleep(DISCONNECT_CHECK_PERIOD * 1.1)
-    assert task.done() is False
+    # Assertions
+    sse_manager_mock.sse_event_stream.assert_awaited_with(
+        wallet=wallet_id,
+        topic=WEBHOOK_TOPIC_ALL,
+        look_back=MAX_EVENT_AGE_SECONDS,
+        stop_event=ANY,
+        duration=0,
+        field=None,
+        field_id=None,
+        desired_state=None,
+        last_event_id=None,
+    )
 
-    # Simulate an external event causing the stop
-    stop_event.set()
 
-    # Wait a bit more to ensure the task respects the stop event
-    await asyncio.sleep(DISCONNECT_CHECK_PERIOD)
+@pytest.mark.parametrize(
+    "headers, expected",
+    [({}, None), ({"last-event-id": "123"}, 123), ({"last-event-id": "abc"}, None)],
+)
+def test_get_last_event_id(headers, expected):
+    request = Mock(spec=Request)
+    request.headers = headers
 
-    assert stop_event.is_set()  # The stop_event should still be set
-    assert task.done() is True
+    assert get_last_event_id(request) == expected
 
 
 @pytest.mark.anyio
-async def test_sse_event_stream_generator_wallet_id(
+async def test_sse_event_stream_generator_resumes_from_last_event_id(
     async_generator_mock,  # pylint: disable=redefined-outer-name
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     request_mock,  # pylint: disable=redefined-outer-name
 ):
-    # Configure the sse_manager mock
+    request_mock.headers = {"last-event-id": "1705000000000000000"}
     sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
         generator=async_generator_mock([dummy_cloudapi_event]),
         populate_task=Mock(),
     )
 
-    # Call the method under test
     async for event in sse_event_stream_generator(
         sse_manager=sse_manager_mock,
         request=request_mock,
-        background_tasks=BackgroundTasks(),
         wallet_id=wallet_id,
         logger=Mock(),
     ):
-        assert event == dummy_cloudapi_event.model_dump_json()
+        assert event == dummy_cloudapi_event.sse_frame
 
-    # Assertions
     sse_manager_mock.sse_event_stream.assert_awaited_with(
         wallet=wallet_id,
         topic=WEBHOOK_TOPIC_ALL,
         look_back=MAX_EVENT_AGE_SECONDS,
         stop_event=ANY,
         duration=0,
+        field=None,
+        field_id=None,
+        desired_state=None,
+        last_event_id=1705000000000000000,
     )
 
 
 @pytest.mark.anyio
-async def test_sse_event_stream_generator_wallet_id_disconnect(
+async def test_sse_event_stream_generator_group(
     async_generator_mock,  # pylint: disable=redefined-outer-name
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     request_mock,  # pylint: disable=redefined-outer-name
 ):
-    request_mock.is_disconnected.return_value = AsyncMock(True)
-
-    # Configure the sse_manager mock
-    sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
+    sse_manager_mock.sse_multi_event_stream.return_value = EventGeneratorWrapper(
         generator=async_generator_mock([dummy_cloudapi_event]),
         populate_task=Mock(),
     )
 
-    background_tasks = BackgroundTasks()
+    async for event in sse_event_stream_generator(
+        sse_manager=sse_manager_mock,
+        request=request_mock,
+        group_id="some_group",
+        topic=topic,
+        logger=Mock(),
+    ):
+        assert event == dummy_cloudapi_event.sse_frame
+
+    sse_manager_mock.sse_event_stream.assert_not_awaited()
+    sse_manager_mock.sse_multi_event_stream.assert_awaited_with(
+        wallets=None,
+        group_id="some_group",
+        topic=topic,
+        look_back=MAX_EVENT_AGE_SECONDS,
+        stop_event=ANY,
+        duration=0,
+        field=None,
+        field_id=None,
+        desired_state=None,
+    )
+
 
-    # Convert generator to a list to force evaluation
-    events = [
-        event
-        async for event in sse_event_stream_generator(
+@pytest.mark.anyio
+async def test_sse_event_stream_generator_wallet_id_disconnect(
+    sse_manager_mock,  # pylint: disable=redefined-outer-name
+    request_mock,  # pylint: disable=redefined-outer-name
+):
+    event_sent = asyncio.Event()
+
+    async def _endless_gen():
+        yield dummy_cloudapi_event
+        await asyncio.Event().wait()  # No more events, until the stream is cancelled
+
+    sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
+        generator=_endless_gen(), populate_task=Mock()
+    )
+
+    # The client disconnects once it has received the first event
+    async def receive():
+        await event_sent.wait()
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+        if message.get("body"):
+            event_sent.set()
+
+    response = EventSourceResponse(
+        sse_event_stream_generator(
             sse_manager=sse_manager_mock,
             request=request_mock,
-            background_tasks=background_tasks,
             wallet_id=wallet_id,
             logger=Mock(),
         )
-    ]
+    )
+    await asyncio.wait_for(response({"type": "http"}, receive, send), timeout=1)
 
-    # Assertions
-    assert len(events) == 0, "Expected no events to be yielded after disconnection."
-    request_mock.is_disconnected.assert_awaited()
-    assert (
-        len(background_tasks.tasks) > 0
-    ), "Expected at least one background task for disconnection check."
+    # The stream was cancelled by the disconnect, without polling the request
+    assert sent[1]["body"] == dummy_cloudapi_event.sse_frame
+    stop_event = sse_manager_mock.sse_event_stream.call_args.kwargs["stop_event"]
+    assert stop_event.is_set()
+    request_mock.is_disconnected.assert_not_awaited()
 
 
 @pytest.mark.anyio
@@ -185,12 +236,11 @@ async def test_sse_event_stream_generator_wallet_id_topic(
     async for event in sse_event_stream_generator(
         sse_manager=sse_manager_mock,
         request=request_mock,
-        background_tasks=BackgroundTasks(),
         wallet_id=wallet_id,
         topic=topic,
         logger=Mock(),
     ):
-        assert event == dummy_cloudapi_event.model_dump_json()
+        assert event == dummy_cloudapi_event.sse_frame
 
     # Assertions
     sse_manager_mock.sse_event_stream.assert_awaited_with(
@@ -199,6 +249,10 @@ async def test_sse_event_stream_generator_wallet_id_topic(
         look_back=MAX_EVENT_AGE_SECONDS,
         stop_event=ANY,
         duration=0,
+        field=None,
+        field_id=None,
+        desired_state=None,
+        last_event_id=None,
     )
 
 
@@ -208,16 +262,18 @@ async def test_sse_event_stream_generator_wallet_id_topic_desired_state(
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     request_mock,  # pylint: disable=redefined-outer-name
 ):
-    expected_cloudapi_event = CloudApiWebhookEventGeneric(
-        wallet_id=wallet_id,
-        topic=topic,
-        origin="xyz",
-        group_id="some_group",
-        payload={"dummy": "data", "state": desired_state},
+    expected_cloudapi_event = SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet_id,
+            topic=topic,
+            origin="xyz",
+            group_id="some_group",
+            payload={"dummy": "data", "state": desired_state},
+        )
     )
     # Configure the sse_manager mock
     sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
-        generator=async_generator_mock([dummy_cloudapi_event, expected_cloudapi_event]),
+        generator=async_generator_mock([expected_cloudapi_event]),
         populate_task=Mock(),
     )
 
@@ -225,13 +281,12 @@ async def test_sse_event_stream_generator_wallet_id_topic_desired_state(
     async for event in sse_event_stream_generator(
         sse_manager=sse_manager_mock,
         request=request_mock,
-        background_tasks=BackgroundTasks(),
         wallet_id=wallet_id,
         topic=topic,
         desired_state=desired_state,
         logger=Mock(),
     ):
-        assert event == expected_cloudapi_event.model_dump_json()
+        assert event == expected_cloudapi_event.sse_frame
 
     # Assertions
     sse_manager_mock.sse_event_stream.assert_awaited_with(
@@ -240,6 +295,10 @@ async def test_sse_event_stream_generator_wallet_id_topic_desired_state(
         look_back=MAX_EVENT_AGE_SECONDS,
         stop_event=ANY,
         duration=SSE_TIMEOUT,
+        field=None,
+        field_id=None,
+        desired_state=desired_state,
+        last_event_id=None,
     )
 
 
@@ -249,17 +308,19 @@ async def test_sse_event_stream_generator_wallet_id_topic_field(
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     request_mock,  # pylint: disable=redefined-outer-name
 ):
-    expected_cloudapi_event = CloudApiWebhookEventGeneric(
-        wallet_id=wallet_id,
-        topic=topic,
-        origin="xyz",
-        group_id="some_group",
-        payload={"dummy": "data", field: field_id},
+    expected_cloudapi_event = SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet_id,
+            topic=topic,
+            origin="xyz",
+            group_id="some_group",
+            payload={"dummy": "data", field: field_id},
+        )
     )
 
     # Configure the sse_manager mock
     sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
-        generator=async_generator_mock([dummy_cloudapi_event, expected_cloudapi_event]),
+        generator=async_generator_mock([expected_cloudapi_event]),
         populate_task=Mock(),
     )
 
@@ -267,14 +328,13 @@ async def test_sse_event_stream_generator_wallet_id_topic_field(
     async for event in sse_event_stream_generator(
         sse_manager=sse_manager_mock,
         request=request_mock,
-        background_tasks=BackgroundTasks(),
         wallet_id=wallet_id,
         topic=topic,
         field=field,
         field_id=field_id,
         logger=Mock(),
     ):
-        assert event == expected_cloudapi_event.model_dump_json()
+        assert event == expected_cloudapi_event.sse_frame
 
     # Assertions
     sse_manager_mock.sse_event_stream.assert_awaited_with(
@@ -283,6 +343,10 @@ async def test_sse_event_stream_generator_wallet_id_topic_field(
         look_back=MAX_EVENT_AGE_SECONDS,
         stop_event=ANY,
         duration=0,
+        field=field,
+        field_id=field_id,
+        desired_state=None,
+        last_event_id=None,
     )
 
 
@@ -292,17 +356,19 @@ async def test_sse_event_stream_generator_wallet_id_topic_field_desired_state(
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     request_mock,  # pylint: disable=redefined-outer-name
 ):
-    expected_cloudapi_event = CloudApiWebhookEventGeneric(
-        wallet_id=wallet_id,
-        topic=topic,
-        origin="xyz",
-        group_id="some_group",
-        payload={"dummy": "data", field: field_id, "state": desired_state},
+    expected_cloudapi_event = SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet_id,
+            topic=topic,
+            origin="xyz",
+            group_id="some_group",
+            payload={"dummy": "data", field: field_id, "state": desired_state},
+        )
     )
 
     # Configure the sse_manager mock
     sse_manager_mock.sse_event_stream.return_value = EventGeneratorWrapper(
-        generator=async_generator_mock([dummy_cloudapi_event, expected_cloudapi_event]),
+        generator=async_generator_mock([expected_cloudapi_event]),
         populate_task=Mock(),
     )
 
@@ -310,7 +376,6 @@ async def test_sse_event_stream_generator_wallet_id_topic_field_desired_state(
     async for event in sse_event_stream_generator(
         sse_manager=sse_manager_mock,
         request=request_mock,
-        background_tasks=BackgroundTasks(),
         wallet_id=wallet_id,
         topic=topic,
         field=field,
@@ -318,7 +383,7 @@ async def test_sse_event_stream_generator_wallet_id_topic_field_desired_state(
         desired_state=desired_state,
         logger=Mock(),
     ):
-        assert event == expected_cloudapi_event.model_dump_json()
+        assert event == expected_cloudapi_event.sse_frame
 
     # Assertions
     sse_manager_mock.sse_event_stream.assert_awaited_with(
@@ -327,6 +392,10 @@ async def test_sse_event_stream_generator_wallet_id_topic_field_desired_state(
         look_back=MAX_EVENT_AGE_SECONDS,
         stop_event=ANY,
         duration=SSE_TIMEOUT,
+        field=field,
+        field_id=field_id,
+        desired_state=desired_state,
+        last_event_id=None,
     )
 
 
@@ -343,16 +412,14 @@ async def test_sse_subscribe_wallet(
     else:
         sse_manager_mock.check_wallet_belongs_to_group.return_value = True
 
-    # Prepare the Request and BackgroundTasks objects
+    # Prepare the Request object
     request = Request(scope={"type": "http"})
-    background_tasks = BackgroundTasks()
 
-    # Call the sse_subscribe_wallet function with the mocked request and background tasks
+    # Call the sse_subscribe_wallet function with the mocked request
     if group_id == "wrong_group":
         with pytest.raises(BadGroupIdException) as exc:
             response = await sse_subscribe_wallet(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 look_back=look_back,
                 group_id=group_id,
@@ -367,7 +434,6 @@ async def test_sse_subscribe_wallet(
         ) as event_stream_generator:
             response = await sse_subscribe_wallet(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 look_back=look_back,
                 group_id=group_id,
@@ -381,7 +447,6 @@ async def test_sse_subscribe_wallet(
             event_stream_generator.assert_called_once_with(
                 sse_manager=sse_manager_mock,
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 look_back=look_back,
                 logger=ANY,
@@ -401,16 +466,14 @@ async def test_sse_subscribe_wallet_topic(
     else:
         sse_manager_mock.check_wallet_belongs_to_group.return_value = True
 
-    # Prepare the Request and BackgroundTasks objects
+    # Prepare the Request object
     request = Request(scope={"type": "http"})
-    background_tasks = BackgroundTasks()
 
-    # Call the sse_subscribe_wallet_topic function with the mocked request and background tasks
+    # Call the sse_subscribe_wallet_topic function with the mocked request
     if group_id == "wrong_group":
         with pytest.raises(BadGroupIdException) as exc:
             response = await sse_subscribe_wallet_topic(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 look_back=look_back,
@@ -426,7 +489,6 @@ async def test_sse_subscribe_wallet_topic(
         ) as event_stream_generator:
             response = await sse_subscribe_wallet_topic(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 look_back=look_back,
@@ -441,7 +503,6 @@ async def test_sse_subscribe_wallet_topic(
             event_stream_generator.assert_called_once_with(
                 sse_manager=sse_manager_mock,
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 look_back=look_back,
@@ -462,16 +523,14 @@ async def test_sse_subscribe_event_with_state(
     else:
         sse_manager_mock.check_wallet_belongs_to_group.return_value = True
 
-    # Prepare the Request and BackgroundTasks objects
+    # Prepare the Request object
     request = Request(scope={"type": "http"})
-    background_tasks = BackgroundTasks()
 
-    # Call the sse_subscribe_event_with_state function with the mocked request and background tasks
+    # Call the sse_subscribe_event_with_state function with the mocked request
     if group_id == "wrong_group":
         with pytest.raises(BadGroupIdException) as exc:
             response = await sse_subscribe_event_with_state(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 desired_state=desired_state,
@@ -488,7 +547,6 @@ async def test_sse_subscribe_event_with_state(
         ) as event_stream_generator:
             response = await sse_subscribe_event_with_state(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 desired_state=desired_state,
@@ -504,7 +562,6 @@ async def test_sse_subscribe_event_with_state(
             event_stream_generator.assert_called_once_with(
                 sse_manager=sse_manager_mock,
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 desired_state=desired_state,
@@ -526,16 +583,14 @@ async def test_sse_subscribe_stream_with_fields(
     else:
         sse_manager_mock.check_wallet_belongs_to_group.return_value = True
 
-    # Prepare the Request and BackgroundTasks objects
+    # Prepare the Request object
     request = Request(scope={"type": "http"})
-    background_tasks = BackgroundTasks()
 
-    # Call the sse_subscribe_stream_with_fields function with the mocked request and background tasks
+    # Call the sse_subscribe_stream_with_fields function with the mocked request
     if group_id == "wrong_group":
         with pytest.raises(BadGroupIdException) as exc:
             response = await sse_subscribe_stream_with_fields(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -553,7 +608,6 @@ async def test_sse_subscribe_stream_with_fields(
         ) as event_stream_generator:
             response = await sse_subscribe_stream_with_fields(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -570,7 +624,6 @@ async def test_sse_subscribe_stream_with_fields(
             event_stream_generator.assert_called_once_with(
                 sse_manager=sse_manager_mock,
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -593,16 +646,14 @@ async def test_sse_subscribe_event_with_field_and_state(
     else:
         sse_manager_mock.check_wallet_belongs_to_group.return_value = True
 
-    # Prepare the Request and BackgroundTasks objects
+    # Prepare the Request object
     request = Request(scope={"type": "http"})
-    background_tasks = BackgroundTasks()
 
-    # Call the sse_subscribe_event_with_field_and_state function with the mocked request and background tasks
+    # Call the sse_subscribe_event_with_field_and_state function with the mocked request
     if group_id == "wrong_group":
         with pytest.raises(BadGroupIdException) as exc:
             response = await sse_subscribe_event_with_field_and_state(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -621,7 +672,6 @@ async def test_sse_subscribe_event_with_field_and_state(
         ) as event_stream_generator:
             response = await sse_subscribe_event_with_field_and_state(
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -639,7 +689,6 @@ async def test_sse_subscribe_event_with_field_and_state(
             event_stream_generator.assert_called_once_with(
                 sse_manager=sse_manager_mock,
                 request=request,
-                background_tasks=background_tasks,
                 wallet_id=wallet_id,
                 topic=topic,
                 field=field,
@@ -648,3 +697,83 @@ async def test_sse_subscribe_event_with_field_and_state(
                 look_back=look_back,
                 logger=ANY,
             )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "wallet_ids, group_id, belongs_to_group, expected_group_id",
+    [
+        (["wallet1", "wallet2"], None, True, None),
+        (["wallet1", "wallet2"], "correct_group", True, None),
+        (["wallet1", "wallet2"], "wrong_group", False, None),
+        (None, "correct_group", True, "correct_group"),
+    ],
+)
+async def test_sse_subscribe_wallets(
+    sse_manager_mock,  # pylint: disable=redefined-outer-name
+    wallet_ids,
+    group_id,
+    belongs_to_group,
+    expected_group_id,
+):
+    sse_manager_mock.check_wallet_belongs_to_group.side_effect = [
+        True,
+        belongs_to_group,
+    ]
+    request = Request(scope={"type": "http"})
+
+    with patch(
+        "webhooks.web.routers.sse.sse_event_stream_generator"
+    ) as event_stream_generator:
+        if not belongs_to_group:
+            with pytest.raises(BadGroupIdException):
+                await sse_subscribe_wallets(
+                    request=request,
+                    wallet_ids=wallet_ids,
+                    topic=topic,
+                    look_back=MAX_EVENT_AGE_SECONDS,
+                    group_id=group_id,
+                    sse_manager=sse_manager_mock,
+                )
+            return
+
+        response = await sse_subscribe_wallets(
+            request=request,
+            wallet_ids=wallet_ids,
+            topic=topic,
+            field=None,
+            field_id=None,
+            desired_state=None,
+            look_back=MAX_EVENT_AGE_SECONDS,
+            group_id=group_id,
+            sse_manager=sse_manager_mock,
+        )
+
+    assert isinstance(response, EventSourceResponse)
+    event_stream_generator.assert_called_once_with(
+        sse_manager=sse_manager_mock,
+        request=request,
+        wallet_ids=wallet_ids,
+        group_id=expected_group_id,
+        topic=topic,
+        field=None,
+        field_id=None,
+        desired_state=None,
+        look_back=MAX_EVENT_AGE_SECONDS,
+        logger=ANY,
+    )
+
+
+@pytest.mark.anyio
+async def test_sse_subscribe_wallets_requires_wallets_or_group(
+    sse_manager_mock,  # pylint: disable=redefined-outer-name
+):
+    with pytest.raises(HTTPException) as exc:
+        await sse_subscribe_wallets(
+            request=Request(scope={"type": "http"}),
+            wallet_ids=None,
+            group_id=None,
+            sse_manager=sse_manager_mock,
+        )
+
+    assert exc.value.status_code == 400
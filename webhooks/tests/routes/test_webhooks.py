@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -21,7 +21,7 @@ cloud_api_event = CloudApiWebhookEventGeneric(
 
 @pytest.mark.anyio
 async def test_get_webhooks_by_wallet():
-    redis_service_mock = Mock()
+    redis_service_mock = AsyncMock()
 
     redis_service_mock.get_cloudapi_events_by_wallet.return_value = [cloud_api_event]
 
@@ -38,7 +38,7 @@ async def test_get_webhooks_by_wallet():
 
 @pytest.mark.anyio
 async def test_get_webhooks_by_wallet_empty():
-    redis_service_mock = Mock()
+    redis_service_mock = AsyncMock()
 
     redis_service_mock.get_cloudapi_events_by_wallet.return_value = []
 
@@ -54,7 +54,7 @@ async def test_get_webhooks_by_wallet_empty():
 
 @pytest.mark.anyio
 async def test_get_webhooks_by_wallet_and_topic():
-    redis_service_mock = Mock()
+    redis_service_mock = AsyncMock()
 
     redis_service_mock.get_cloudapi_events_by_wallet_and_topic.return_value = [
         cloud_api_event
@@ -73,7 +73,7 @@ async def test_get_webhooks_by_wallet_and_topic():
 
 @pytest.mark.anyio
 async def test_get_webhooks_by_wallet_and_topic_empty():
-    redis_service_mock = Mock()
+    redis_service_mock = AsyncMock()
 
     redis_service_mock.get_cloudapi_events_by_wallet_and_topic.return_value = []
 
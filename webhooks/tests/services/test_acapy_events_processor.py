@@ -4,11 +4,13 @@ import unittest
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
-from redis.client import PubSubWorkerThread
-from redis.cluster import ClusterPubSub
+from redis.asyncio.client import PubSub
 
 from shared.constants import GOVERNANCE_LABEL
-from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
+from webhooks.services.acapy_events_processor import (
+    AcaPyEventsProcessor,
+    BatchWriteError,
+)
 
 # pylint: disable=redefined-outer-name
 # because re-using fixtures in same module
@@ -18,10 +20,10 @@ from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
 
 @pytest.fixture
 def redis_service_mock():
-    redis_service = MagicMock()
+    redis_service = AsyncMock()
     redis_service.acapy_redis_prefix = "acapy-record-*"
-    redis_service.add_cloudapi_webhook_event = Mock()
-    redis_service.add_endorsement_event = Mock()
+    redis_service.batch = Mock()
+    redis_service.extend_lock_task = Mock()
     return redis_service
 
 
@@ -29,9 +31,9 @@ def redis_service_mock():
 def acapy_events_processor_mock(redis_service_mock):
     processor = AcaPyEventsProcessor(redis_service=redis_service_mock)
     # Mock pubsub
-    processor._pubsub_thread = Mock(spec=PubSubWorkerThread)
-    processor._pubsub_thread.is_alive.return_value = True
-    processor._pubsub = Mock(spec=ClusterPubSub)
+    processor._pubsub_task = Mock(spec=asyncio.Task)
+    processor._pubsub_task.done.return_value = False
+    processor._pubsub = AsyncMock(spec=PubSub)
 
     return processor
 
@@ -52,21 +54,51 @@ async def test_stop(acapy_events_processor_mock):
     dummy_task = asyncio.create_task(asyncio.sleep(1))
     acapy_events_processor_mock._tasks.append(dummy_task)
 
-    # Simulate an existing pubsub_thread and pubsub instance
-    # acapy_events_processor_mock._pubsub_thread = Mock(spec=PubSubWorkerThread)
-    acapy_events_processor_mock._pubsub = Mock()
+    index_task = asyncio.create_task(asyncio.sleep(1))
+    acapy_events_processor_mock._index_stored_events_task = index_task
+
+    # Simulate an existing pubsub instance
+    acapy_events_processor_mock._pubsub = AsyncMock()
 
     await acapy_events_processor_mock.stop()
 
     # Check that all tasks were attempted to be cancelled
     assert dummy_task.cancelled()
+    assert index_task.cancelled()
+    assert acapy_events_processor_mock._index_stored_events_task is None
 
     # Ensure tasks list is cleared
     assert len(acapy_events_processor_mock._tasks) == 0
 
-    # Verify that pubsub_thread stop and pubsub disconnect methods were called
-    acapy_events_processor_mock._pubsub_thread.stop.assert_called_once()
-    acapy_events_processor_mock._pubsub.disconnect.assert_called_once()
+    # Verify that pubsub task was cancelled and pubsub connection closed
+    acapy_events_processor_mock._pubsub_task.cancel.assert_called_once()
+    acapy_events_processor_mock._pubsub.aclose.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_index_stored_events(acapy_events_processor_mock):
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.set_lock.return_value = True
+
+    await acapy_events_processor_mock._index_stored_events()
+
+    redis_service.index_wallet_groups.assert_awaited_once()
+    redis_service.index_wallet_topics.assert_awaited_once()
+    redis_service.extend_lock_task.return_value.cancel.assert_called_once()
+    redis_service.delete_key.assert_awaited_once_with("lock:index-stored-events")
+
+
+@pytest.mark.anyio
+async def test_index_stored_events_locked(acapy_events_processor_mock):
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.set_lock.return_value = None
+
+    await acapy_events_processor_mock._index_stored_events()
+
+    # Another replica is indexing the stored events
+    redis_service.index_wallet_groups.assert_not_called()
+    redis_service.index_wallet_topics.assert_not_called()
+    redis_service.delete_key.assert_not_called()
 
 
 @pytest.mark.anyio
@@ -83,13 +115,13 @@ async def test_are_tasks_running_x(acapy_events_processor_mock):
     # Task has been cancelled, it should be considered not running
     assert not acapy_events_processor_mock.are_tasks_running()
 
-    # Now reset task to appear as still running, to test pubsub thread case
+    # Now reset task to appear as still running, to test pubsub task case
     dummy_done_task.done.return_value = False
     acapy_events_processor_mock._tasks = [dummy_done_task]
-    # when pubsub thread stops, tasks should be not running
+    # when pubsub task stops, tasks should be not running
 
     # todo: uncomment these tests after reimplemented:
-    # acapy_events_processor_mock._pubsub_thread.is_alive.return_value = False
+    # acapy_events_processor_mock._pubsub_task.done.return_value = True
     # assert not acapy_events_processor_mock.are_tasks_running()
 
 
@@ -104,16 +136,19 @@ async def test_rpush_notification_handler(acapy_events_processor_mock):
     acapy_events_processor_mock._new_event_notification.set.assert_called_once_with()
 
 
-def test_start_notification_listener(acapy_events_processor_mock):
-    acapy_events_processor_mock._pubsub.psubscribe = Mock()
-    acapy_events_processor_mock._pubsub.run_in_thread = Mock()
+@pytest.mark.anyio
+async def test_start_notification_listener(acapy_events_processor_mock):
+    pubsub = AsyncMock(spec=PubSub)
+    acapy_events_processor_mock.redis_service.pubsub = AsyncMock(return_value=pubsub)
 
     # Call the method
-    acapy_events_processor_mock._start_notification_listener()
+    await acapy_events_processor_mock._start_notification_listener()
+    await asyncio.sleep(0)  # let the listener task start
 
-    # Verify psubscribe and run_in_thread was called correctly
-    acapy_events_processor_mock._pubsub.psubscribe.assert_called_once()
-    acapy_events_processor_mock._pubsub.run_in_thread.assert_called_once()
+    # Verify psubscribe was awaited and the listener task runs the pubsub
+    pubsub.psubscribe.assert_awaited_once()
+    pubsub.run.assert_awaited_once()
+    assert acapy_events_processor_mock._pubsub_task.done()
 
 
 @pytest.mark.anyio
@@ -126,15 +161,15 @@ async def test_process_incoming_events(acapy_events_processor_mock):
             "Force inf loop to stop"
         ),  # force loop to exit after processing available keys
     ]
-    redis_service = Mock()
-    redis_service.scan_keys = Mock(side_effect=scan_results)
+    redis_service = AsyncMock()
+    redis_service.scan_keys = AsyncMock(side_effect=scan_results)
     acapy_events_processor_mock.redis_service = redis_service
 
     # Store processed keys for assertion
     processed_keys = []
 
     # Override _attempt_process_list_events to track keys and then set the done_event
-    def mock_attempt_process_list_events(key):
+    async def mock_attempt_process_list_events(key):
         processed_keys.append(key)
 
     acapy_events_processor_mock._attempt_process_list_events = (
@@ -144,6 +179,8 @@ async def test_process_incoming_events(acapy_events_processor_mock):
     # Exception is to force the NoReturn function to exit
     with pytest.raises(Exception):
         await acapy_events_processor_mock._process_incoming_events()
+    # Wait for the dispatched lists to be processed
+    await asyncio.gather(*acapy_events_processor_mock._list_tasks)
 
     # Assert that the keys were processed
     assert len(processed_keys) == 3
@@ -152,6 +189,168 @@ async def test_process_incoming_events(acapy_events_processor_mock):
         "acapy-record-wallet2",
         "acapy-record-wallet3",
     ]
+    assert acapy_events_processor_mock.get_metrics()["lists_processed"] == 3
+
+
+@pytest.mark.anyio
+async def test_dispatch_list_events_concurrently(redis_service_mock):
+    processor = AcaPyEventsProcessor(
+        redis_service=redis_service_mock, max_concurrent_lists=2
+    )
+    busy_list_released = asyncio.Event()
+    processed_keys = []
+
+    async def mock_attempt_process_list_events(key):
+        if key == "busy":
+            await busy_list_released.wait()
+        processed_keys.append(key)
+
+    processor._attempt_process_list_events = mock_attempt_process_list_events
+
+    assert await processor._dispatch_list_events("busy")
+    # A list that is already in flight is not dispatched again
+    assert not await processor._dispatch_list_events("busy")
+
+    # Other lists are processed while the busy list is still being drained
+    assert await processor._dispatch_list_events("quiet1")
+    assert await processor._dispatch_list_events("quiet2")
+    assert processed_keys == ["quiet1"]
+
+    metrics = processor.get_metrics()
+    assert metrics["lists_in_flight"] == 2
+    assert metrics["max_lists_in_flight"] == 2
+
+    busy_list_released.set()
+    await asyncio.gather(*processor._list_tasks)
+
+    assert sorted(processed_keys) == ["busy", "quiet1", "quiet2"]
+    assert processor.get_metrics()["lists_in_flight"] == 0
+    assert processor.get_metrics()["lists_processed"] == 3
+
+
+@pytest.mark.anyio
+async def test_stop_cancels_lists_in_flight(acapy_events_processor_mock):
+    acapy_events_processor_mock._attempt_process_list_events = AsyncMock(
+        side_effect=asyncio.Event().wait
+    )
+    await acapy_events_processor_mock._dispatch_list_events("key")
+    await asyncio.sleep(0)  # let the worker start
+
+    await acapy_events_processor_mock.stop()
+
+    assert not acapy_events_processor_mock._list_tasks
+    assert acapy_events_processor_mock.get_metrics()["lists_in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_start_stream_backend(redis_service_mock):
+    processor = AcaPyEventsProcessor(redis_service=redis_service_mock, backend="stream")
+    processor._process_stream_events = AsyncMock()
+    processor._process_incoming_events = AsyncMock()
+
+    processor.start()
+
+    assert processor.are_tasks_running()
+    await processor.stop()
+    processor._process_stream_events.assert_called_once()
+    processor._process_incoming_events.assert_not_called()
+
+
+def test_unknown_backend(redis_service_mock):
+    with pytest.raises(ValueError, match="Unknown ACA-Py events backend"):
+        AcaPyEventsProcessor(redis_service=redis_service_mock, backend="unknown")
+
+
+@pytest.mark.anyio
+async def test_process_stream_events(acapy_events_processor_mock):
+    claimed = [(b"1-0", {b"event": b'{"claimed":"event"}'})]
+    new_entries = [(b"2-0", {b"event": b'{"new":"event"}'})]
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.autoclaim_stream_entries = AsyncMock(return_value=(b"0-0", claimed))
+    redis_service.read_stream_group = AsyncMock(
+        side_effect=[
+            [],  # block timed out without new entries
+            new_entries,
+            Exception("Force inf loop to stop"),
+            Exception("Force inf loop to stop"),
+            Exception("Force inf loop to stop"),
+            Exception("Force inf loop to stop"),
+            Exception("Force inf loop to stop"),
+        ]
+    )
+    processed_entries = []
+    acapy_events_processor_mock._process_stream_entries = AsyncMock(
+        side_effect=processed_entries.append
+    )
+
+    with pytest.raises(Exception, match="Force inf loop to stop"):
+        await acapy_events_processor_mock._process_stream_events(
+            block_ms=1, claim_interval=3600
+        )
+
+    redis_service.create_consumer_group.assert_called_once_with(
+        acapy_events_processor_mock.stream_key,
+        acapy_events_processor_mock.stream_group,
+    )
+    # Idle entries are claimed once (long claim interval), then new entries are read
+    redis_service.autoclaim_stream_entries.assert_called_once()
+    assert processed_entries == [claimed, new_entries]
+
+
+@pytest.mark.anyio
+async def test_process_stream_events_continues_claim_scan(acapy_events_processor_mock):
+    first_page = [(b"1-0", {b"event": b'{"claimed":"event"}'})]
+    second_page = [(b"5-0", {b"event": b'{"claimed":"event"}'})]
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.autoclaim_stream_entries = AsyncMock(
+        side_effect=[(b"5-0", first_page), (b"0-0", second_page)]
+    )
+    redis_service.read_stream_group = AsyncMock(
+        side_effect=[[], []] + [Exception("Force inf loop to stop")] * 5
+    )
+    acapy_events_processor_mock._process_stream_entries = AsyncMock()
+
+    with pytest.raises(Exception, match="Force inf loop to stop"):
+        await acapy_events_processor_mock._process_stream_events(
+            block_ms=1, claim_interval=3600
+        )
+
+    # The second claim continues from the cursor of the first, and the scan then ends
+    assert redis_service.autoclaim_stream_entries.call_count == 2
+    start_ids = [
+        call.kwargs["start_id"]
+        for call in redis_service.autoclaim_stream_entries.call_args_list
+    ]
+    assert start_ids == ["0-0", b"5-0"]
+
+
+@pytest.mark.anyio
+async def test_process_stream_entries(acapy_events_processor_mock):
+    entries = [
+        (b"1-0", {b"event": b'{"some":"data"}'}),
+        (b"2-0", {b"event": b'{"bad":"data"}'}),
+        (b"3-0", None),  # entry deleted while pending
+    ]
+    redis_service = acapy_events_processor_mock.redis_service
+    batch = AsyncMock()
+    redis_service.batch = Mock(return_value=batch)
+    acapy_events_processor_mock._process_event = AsyncMock(
+        side_effect=[None, Exception("Test error")]
+    )
+
+    await acapy_events_processor_mock._process_stream_entries(entries)
+
+    acapy_events_processor_mock._process_event.assert_any_call(
+        '{"some":"data"}', writer=batch
+    )
+    batch.execute.assert_awaited_once()
+    # Unprocessable entries are saved, and all entries are acknowledged
+    assert redis_service.set.call_count == 2
+    redis_service.ack_stream_entries.assert_called_once_with(
+        acapy_events_processor_mock.stream_key,
+        acapy_events_processor_mock.stream_group,
+        [b"1-0", b"2-0", b"3-0"],
+    )
 
 
 @pytest.mark.anyio
@@ -159,9 +358,9 @@ async def test_attempt_process_list_events(acapy_events_processor_mock):
     event_key = "acapy-record-wallet1"
     lock_key = f"lock:{event_key}"
     acapy_events_processor_mock.redis_service.set_lock.return_value = True
-    acapy_events_processor_mock._process_list_events = Mock()
+    acapy_events_processor_mock._process_list_events = AsyncMock()
 
-    acapy_events_processor_mock._attempt_process_list_events(event_key)
+    await acapy_events_processor_mock._attempt_process_list_events(event_key)
 
     acapy_events_processor_mock.redis_service.set_lock.assert_called_with(
         lock_key, px=500
@@ -172,11 +371,11 @@ async def test_attempt_process_list_events(acapy_events_processor_mock):
 
 @pytest.mark.anyio
 async def test_attempt_process_list_events_x(acapy_events_processor_mock):
-    acapy_events_processor_mock._handle_unprocessable_event = Mock()
-    acapy_events_processor_mock._process_list_events = Mock(
+    acapy_events_processor_mock._handle_unprocessable_event = AsyncMock()
+    acapy_events_processor_mock._process_list_events = AsyncMock(
         side_effect=Exception("Test")
     )
-    acapy_events_processor_mock._attempt_process_list_events("key")
+    await acapy_events_processor_mock._attempt_process_list_events("key")
 
     # Assert _handle_unprocessable_event is called when exception was raised
     acapy_events_processor_mock._handle_unprocessable_event.assert_called_once()
@@ -185,17 +384,17 @@ async def test_attempt_process_list_events_x(acapy_events_processor_mock):
 @pytest.mark.anyio
 async def test_process_list_events_with_data(acapy_events_processor_mock):
     # Mock `lindex` to return a JSON string, and then None (signalling end of list)
-    acapy_events_processor_mock.redis_service.lindex = Mock(
+    acapy_events_processor_mock.redis_service.lindex = AsyncMock(
         side_effect=[b'{"some":"data"}', None]
     )
     # and `pop_first_list_element` to return True
     acapy_events_processor_mock.redis_service.pop_first_list_element.return_value = True
 
     # Mock `_process_event` to simply pass
-    acapy_events_processor_mock._process_event = Mock()
+    acapy_events_processor_mock._process_event = AsyncMock()
 
     list_key = "acapy-record-wallet1"
-    acapy_events_processor_mock._process_list_events(list_key)
+    await acapy_events_processor_mock._process_list_events(list_key)
 
     # Verify lindex and pop_first_list_element were called with the list_key
     acapy_events_processor_mock.redis_service.lindex.assert_called_with(list_key)
@@ -215,7 +414,7 @@ async def test_process_list_events_empty_list(acapy_events_processor_mock):
     acapy_events_processor_mock.redis_service.lindex.return_value = None
 
     list_key = "acapy-record-empty"
-    acapy_events_processor_mock._process_list_events(list_key)
+    await acapy_events_processor_mock._process_list_events(list_key)
 
     # Verify lindex was called with the list_key, and verify pop_first_list_element was never called
     acapy_events_processor_mock.redis_service.lindex.assert_called_once_with(list_key)
@@ -231,7 +430,135 @@ async def test_process_list_events_raises_exception(acapy_events_processor_mock)
 
     list_key = "acapy-record-error"
     with pytest.raises(Exception, match="Test error"):
-        acapy_events_processor_mock._process_list_events(list_key)
+        await acapy_events_processor_mock._process_list_events(list_key)
+
+
+@pytest.mark.anyio
+async def test_attempt_process_list_events_batched(acapy_events_processor_mock):
+    event_key = "acapy-record-wallet1"
+    acapy_events_processor_mock.batch_size = 10
+    acapy_events_processor_mock.redis_service.set_lock.return_value = True
+    acapy_events_processor_mock._process_list_events = AsyncMock()
+    acapy_events_processor_mock._process_list_events_batched = AsyncMock()
+
+    await acapy_events_processor_mock._attempt_process_list_events(event_key)
+
+    acapy_events_processor_mock._process_list_events_batched.assert_called_with(
+        event_key
+    )
+    acapy_events_processor_mock._process_list_events.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_process_list_events_batched(acapy_events_processor_mock):
+    acapy_events_processor_mock.batch_size = 2
+    redis_service = acapy_events_processor_mock.redis_service
+    # Two full batches, then an empty list
+    redis_service.lrange = AsyncMock(
+        side_effect=[[b'{"event":"1"}', b'{"event":"2"}'], [b'{"event":"3"}'], []]
+    )
+    batch = AsyncMock()
+    redis_service.batch = Mock(return_value=batch)
+    acapy_events_processor_mock._process_event = AsyncMock()
+
+    list_key = "acapy-record-wallet1"
+    await acapy_events_processor_mock._process_list_events_batched(list_key)
+
+    redis_service.lrange.assert_called_with(list_key, start=0, end=1)
+    assert redis_service.lrange.call_count == 3
+    assert acapy_events_processor_mock._process_event.call_count == 3
+    acapy_events_processor_mock._process_event.assert_called_with(
+        '{"event":"3"}', writer=batch
+    )
+    assert batch.execute.call_count == 2
+    redis_service.trim_first_list_elements.assert_any_call(list_key, 2)
+    redis_service.trim_first_list_elements.assert_called_with(list_key, 1)
+    redis_service.lindex.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_process_list_events_batched_partial_failure(
+    acapy_events_processor_mock,
+):
+    acapy_events_processor_mock.batch_size = 10
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.lrange = AsyncMock(
+        return_value=[b'{"event":"1"}', b'{"event":"bad"}', b'{"event":"3"}']
+    )
+    batch = AsyncMock()
+    redis_service.batch = Mock(return_value=batch)
+    acapy_events_processor_mock._process_event = AsyncMock(
+        side_effect=[None, Exception("Test error")]
+    )
+
+    list_key = "acapy-record-wallet1"
+    with pytest.raises(Exception, match="Test error"):
+        await acapy_events_processor_mock._process_list_events_batched(list_key)
+
+    # The event preceding the failure is written and trimmed; failing event remains at head
+    batch.execute.assert_awaited_once()
+    redis_service.trim_first_list_elements.assert_called_once_with(list_key, 1)
+
+
+@pytest.mark.anyio
+async def test_process_list_events_batched_first_event_fails(
+    acapy_events_processor_mock,
+):
+    acapy_events_processor_mock.batch_size = 10
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.lrange = AsyncMock(return_value=[b'{"event":"bad"}'])
+    batch = AsyncMock()
+    redis_service.batch = Mock(return_value=batch)
+    acapy_events_processor_mock._process_event = AsyncMock(
+        side_effect=Exception("Test error")
+    )
+
+    with pytest.raises(Exception, match="Test error"):
+        await acapy_events_processor_mock._process_list_events_batched("key")
+
+    batch.execute.assert_not_called()
+    redis_service.trim_first_list_elements.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_process_list_events_batched_write_fails(acapy_events_processor_mock):
+    acapy_events_processor_mock.batch_size = 10
+    redis_service = acapy_events_processor_mock.redis_service
+    redis_service.lrange = AsyncMock(
+        return_value=[b'{"event":"1"}', b'{"event":"bad"}']
+    )
+    batch = AsyncMock()
+    batch.execute.side_effect = Exception("Write error")
+    redis_service.batch = Mock(return_value=batch)
+    acapy_events_processor_mock._process_event = AsyncMock(
+        side_effect=[None, Exception("Test error")]
+    )
+
+    with pytest.raises(BatchWriteError) as exc:
+        await acapy_events_processor_mock._process_list_events_batched("key")
+
+    # Both errors are reported, and no events are removed from the list
+    assert "Write error" in str(exc.value)
+    assert "Test error" in str(exc.value)
+    redis_service.trim_first_list_elements.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_attempt_process_list_events_batch_write_error(
+    acapy_events_processor_mock,
+):
+    acapy_events_processor_mock.batch_size = 10
+    acapy_events_processor_mock.redis_service.set_lock.return_value = True
+    acapy_events_processor_mock._handle_unprocessable_event = AsyncMock()
+    acapy_events_processor_mock._process_list_events_batched = AsyncMock(
+        side_effect=BatchWriteError("Write error")
+    )
+
+    await acapy_events_processor_mock._attempt_process_list_events("key")
+
+    # The events stay in the list to be retried, rather than being handled as unprocessable
+    acapy_events_processor_mock._handle_unprocessable_event.assert_not_called()
+    acapy_events_processor_mock.redis_service.delete_key.assert_called_with("lock:key")
 
 
 @pytest.mark.anyio
@@ -261,7 +588,7 @@ async def test_process_event_valid_data(acapy_events_processor_mock):
     }
     event_json = json.dumps(event_dict)
 
-    acapy_events_processor_mock._process_event(event_json)
+    await acapy_events_processor_mock._process_event(event_json)
 
     # Assert that add_cloudapi_webhook_event was called with the mock event
     acapy_events_processor_mock.redis_service.add_cloudapi_webhook_event.assert_called()
@@ -289,12 +616,43 @@ async def test_process_event_with_applicable_endorsement(
         return_value=True,
     )
 
-    acapy_events_processor_mock._process_event(event_json)
+    await acapy_events_processor_mock._process_event(event_json)
 
     # Verify that add_endorsement_event was called with the mock event JSON
     acapy_events_processor_mock.redis_service.add_endorsement_event.assert_called_once()
 
 
+@pytest.mark.anyio
+async def test_process_event_with_writer(acapy_events_processor_mock):
+    event_dict = {
+        "payload": {
+            "wallet_id": "base",
+            "topic": "acapy::record::connections::invitation",
+            "category": "connections",
+            "payload": {
+                "state": "invitation",
+                "connection_id": "f5fda7d3-8beb-4d83-8ded-136397229767",
+                "connection_protocol": "didexchange/1.0",
+                "their_role": "invitee",
+            },
+        },
+        "metadata": {"time_ns": 1709804040410284107, "origin": "Governance"},
+    }
+    writer = AsyncMock()
+
+    await acapy_events_processor_mock._process_event(
+        json.dumps(event_dict), writer=writer
+    )
+
+    # Events are written to the given writer instead of directly to redis
+    writer.add_cloudapi_webhook_event.assert_called_once()
+    assert (
+        writer.add_cloudapi_webhook_event.call_args.kwargs["timestamp_ns"]
+        == 1709804040410284107
+    )
+    acapy_events_processor_mock.redis_service.add_cloudapi_webhook_event.assert_not_called()
+
+
 @pytest.mark.anyio
 async def test_handle_unprocessable_event(acapy_events_processor_mock):
     key = "acapy-record-key"
@@ -305,7 +663,7 @@ async def test_handle_unprocessable_event(acapy_events_processor_mock):
         event_json
     )
 
-    acapy_events_processor_mock._handle_unprocessable_event(key, error)
+    await acapy_events_processor_mock._handle_unprocessable_event(key, error)
 
     expected_error_message = f"Could not process: {event_json}. Error: {error}"
 
@@ -0,0 +1,212 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from shared.constants import MAX_EVENT_AGE_SECONDS
+from webhooks.services.retention_manager import RetentionManager, RetentionPolicy
+
+# pylint: disable=protected-access
+# because we are testing protected methods
+
+now_ns = 1_000_000 * 10**9
+key = "cloudapi:wallet1"
+
+
+@pytest.fixture
+def redis_service_mock():
+    redis_service = AsyncMock()
+    redis_service.cloudapi_redis_prefix = "cloudapi"
+    redis_service.cloudapi_topic_redis_prefix = "cloudapi-topic"
+    redis_service.memory_usage.side_effect = [1000, 400]
+    return redis_service
+
+
+@pytest.fixture
+def retention_manager(redis_service_mock):  # pylint: disable=redefined-outer-name
+    return RetentionManager(redis_service_mock, interval_seconds=0.01)
+
+
+def test_default_policies(retention_manager):  # pylint: disable=redefined-outer-name
+    patterns = [policy.match_pattern for policy in retention_manager.policies]
+    assert patterns == ["cloudapi:*", "cloudapi-topic:*", "billing:*"]
+
+    # Retention is opt-in: no events are removed unless limits are configured
+    assert all(
+        not policy.max_age_seconds and not policy.max_count
+        for policy in retention_manager.policies
+    )
+
+
+@pytest.mark.anyio
+async def test_trim_key_by_age(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    policy = RetentionPolicy(key, max_age_seconds=3600, max_count=0)
+    redis_service_mock.get_sorted_set_score_at_rank.return_value = 1
+    redis_service_mock.remove_sorted_set_members_below_score.return_value = 5
+
+    result = await retention_manager._trim_key(key, policy, now_ns)
+
+    assert result == (5, 600)
+    redis_service_mock.remove_sorted_set_members_below_score.assert_awaited_once_with(
+        key, now_ns - 3600 * 10**9
+    )
+    redis_service_mock.remove_sorted_set_members_by_rank.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_trim_key_nothing_to_remove(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    policy = RetentionPolicy(key, max_age_seconds=3600, max_count=10)
+    # Oldest event is recent, and there are no more than 10 events
+    redis_service_mock.get_sorted_set_score_at_rank.side_effect = [now_ns, None]
+
+    result = await retention_manager._trim_key(key, policy, now_ns)
+
+    assert result == (0, 0)
+    redis_service_mock.memory_usage.assert_not_awaited()
+    redis_service_mock.remove_sorted_set_members_below_score.assert_not_awaited()
+    redis_service_mock.remove_sorted_set_members_by_rank.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_trim_key_by_count(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    policy = RetentionPolicy(key, max_age_seconds=0, max_count=10)
+    redis_service_mock.get_sorted_set_score_at_rank.return_value = 1
+    redis_service_mock.remove_sorted_set_members_by_rank.return_value = 3
+
+    result = await retention_manager._trim_key(key, policy, now_ns)
+
+    assert result == (3, 600)
+    redis_service_mock.get_sorted_set_score_at_rank.assert_awaited_once_with(key, -11)
+    redis_service_mock.remove_sorted_set_members_by_rank.assert_awaited_once_with(
+        key, keep=10
+    )
+
+
+@pytest.mark.anyio
+async def test_trim_key_by_count_keeps_recent_events(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    policy = RetentionPolicy(key, max_age_seconds=0, max_count=10)
+    # The events exceeding the max count are still within the backfill window
+    redis_service_mock.get_sorted_set_score_at_rank.return_value = now_ns - 1
+    redis_service_mock.remove_sorted_set_members_below_score.return_value = 2
+
+    result = await retention_manager._trim_key(key, policy, now_ns)
+
+    assert result == (2, 600)
+    redis_service_mock.remove_sorted_set_members_by_rank.assert_not_awaited()
+    redis_service_mock.remove_sorted_set_members_below_score.assert_awaited_once_with(
+        key, now_ns - int(MAX_EVENT_AGE_SECONDS * 1e9)
+    )
+
+
+@pytest.mark.anyio
+async def test_trim_key_max_age_below_backfill_window(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    policy = RetentionPolicy(key, max_age_seconds=1, max_count=0)
+    redis_service_mock.get_sorted_set_score_at_rank.return_value = 1
+    redis_service_mock.remove_sorted_set_members_below_score.return_value = 1
+
+    await retention_manager._trim_key(key, policy, now_ns)
+
+    redis_service_mock.remove_sorted_set_members_below_score.assert_awaited_once_with(
+        key, now_ns - int(MAX_EVENT_AGE_SECONDS * 1e9)
+    )
+
+
+@pytest.mark.anyio
+async def test_apply_policies(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    async def iterate_keys(match_pattern):
+        for k in (f"{match_pattern}1", f"{match_pattern}2"):
+            yield k
+
+    redis_service_mock.iterate_keys = iterate_keys
+    retention_manager.policies = [
+        RetentionPolicy("cloudapi:*", max_age_seconds=3600, max_count=0),
+        RetentionPolicy("billing:*", max_age_seconds=0, max_count=0),  # disabled
+    ]
+    retention_manager._trim_key = AsyncMock(side_effect=[(3, 100), (0, 0)])
+
+    await retention_manager.apply_policies()
+
+    assert retention_manager._trim_key.await_count == 2
+    metrics = retention_manager.get_metrics()
+    assert metrics["runs"] == 1
+    assert metrics["keys_scanned"] == 2
+    assert metrics["keys_trimmed"] == 1
+    assert metrics["events_removed"] == 3
+    assert metrics["bytes_reclaimed"] == 100
+    assert metrics["last_run_duration_seconds"] is not None
+
+
+@pytest.mark.anyio
+async def test_apply_policies_continues_after_error(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    async def iterate_keys(_):
+        for k in ("cloudapi:1", "cloudapi:2"):
+            yield k
+
+    redis_service_mock.iterate_keys = iterate_keys
+    retention_manager.policies = [
+        RetentionPolicy("cloudapi:*", max_age_seconds=3600, max_count=0)
+    ]
+    retention_manager._trim_key = AsyncMock(side_effect=[Exception("Error"), (1, 10)])
+
+    await retention_manager.apply_policies()
+
+    assert retention_manager.get_metrics()["events_removed"] == 1
+
+
+@pytest.mark.anyio
+async def test_run_retention_skips_when_locked(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    redis_service_mock.set_lock.return_value = False
+    retention_manager.apply_policies = AsyncMock()
+
+    with patch("asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError)):
+        with pytest.raises(asyncio.CancelledError):
+            await retention_manager._run_retention()
+
+    redis_service_mock.set_lock.assert_awaited_once_with(
+        retention_manager.lock_key, px=10
+    )
+    retention_manager.apply_policies.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_run_retention_applies_policies(
+    retention_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    redis_service_mock.set_lock.return_value = True
+    retention_manager.apply_policies = AsyncMock()
+
+    with patch("asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError)):
+        with pytest.raises(asyncio.CancelledError):
+            await retention_manager._run_retention()
+
+    retention_manager.apply_policies.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_start_and_stop(
+    retention_manager,
+):  # pylint: disable=redefined-outer-name
+    retention_manager._run_retention = lambda: asyncio.sleep(1)
+
+    retention_manager.start()
+    assert retention_manager.are_tasks_running()
+
+    await retention_manager.stop()
+    assert not retention_manager._tasks
+    assert not retention_manager.are_tasks_running()
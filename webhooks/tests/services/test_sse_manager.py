@@ -1,32 +1,36 @@
 import asyncio
 import time
-from datetime import datetime, timedelta
 from itertools import chain, repeat
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from shared.constants import MAX_EVENT_AGE_SECONDS
+from shared.constants import MAX_EVENT_AGE_SECONDS, SSE_REPLAY_MAX_EVENTS
+from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
 from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
-from webhooks.services.sse_manager import SseManager, _copy_queue
+from webhooks.services.sse_manager import SseManager
+from webhooks.util.serialized_event import SerializedEvent
+from webhooks.util.subscription_index import SubscriptionFilter
 
 # pylint: disable=protected-access
 # because we are testing protected methods
 
 wallet = "wallet1"
 topic = "topic1"
-test_event = CloudApiWebhookEventGeneric(
-    wallet_id=wallet, topic=topic, origin="multitenant", payload={"some": "data"}
+test_event = SerializedEvent.from_model(
+    CloudApiWebhookEventGeneric(
+        wallet_id=wallet, topic=topic, origin="multitenant", payload={"some": "data"}
+    )
 )
 
 
 @pytest.fixture
 def redis_service_mock():
     # Setup WebhooksRedisService mock
-    redis_service = MagicMock()
-    redis_service.redis.pubsub.return_value = Mock()
-    redis_service.get_json_cloudapi_events_by_timestamp = Mock(
-        return_value=[MagicMock()]
+    redis_service = AsyncMock()
+    redis_service.pubsub.return_value = AsyncMock()
+    redis_service.get_json_cloudapi_events_by_timestamp = AsyncMock(
+        return_value=[test_event.event_json]
     )
     return redis_service
 
@@ -63,7 +67,7 @@ async def test_stop(sse_manager):  # pylint: disable=redefined-outer-name
     sse_manager._tasks.append(dummy_task2)
 
     # Simulate an existing pubsub instance
-    sse_manager._pubsub = Mock()
+    sse_manager._pubsub = AsyncMock()
 
     await sse_manager.stop()
 
@@ -74,8 +78,8 @@ async def test_stop(sse_manager):  # pylint: disable=redefined-outer-name
     # Ensure tasks list is cleared
     assert len(sse_manager._tasks) == 0
 
-    # Verify that pubsub_thread stop and pubsub disconnect methods were called
-    sse_manager._pubsub.disconnect.assert_called_once()
+    # Verify that pubsub connection was closed
+    sse_manager._pubsub.aclose.assert_awaited_once()
 
 
 @pytest.mark.anyio
@@ -104,28 +108,22 @@ async def test_are_tasks_running_x(sse_manager):  # pylint: disable=redefined-ou
 
 
 @pytest.mark.anyio
-@patch(
-    "shared.models.webhook_events.payloads.CloudApiWebhookEventGeneric.model_validate_json"
-)
 async def test_listen_for_new_events(
-    mock_model_validate_json,
     sse_manager,  # pylint: disable=redefined-outer-name
     redis_service_mock,  # pylint: disable=redefined-outer-name
 ):
     # Configure specific mocks for this test
-    pubsub_mock = redis_service_mock.redis.pubsub.return_value
-    pubsub_mock.subscribe = Mock()
-    pubsub_mock.get_message = Mock(
-        side_effect=chain(
-            [{"data": b"group:wallet1:123456789"}],  # First message
-            repeat(None),  # Keep returning None indefinitely
-        )
+    pubsub_mock = redis_service_mock.pubsub.return_value
+    messages = chain(
+        [{"data": b"group:wallet1:123456789"}],  # First message
+        repeat(None),  # Keep returning None indefinitely
     )
 
-    # Mock for CloudApiWebhookEventGeneric.model_validate_json
-    mock_model_validate_json.return_value = CloudApiWebhookEventGeneric(
-        wallet_id="test_wallet", topic="test_topic", origin="abc", payload={}
-    )
+    async def get_message(**_):
+        await asyncio.sleep(0.01)  # get_message waits for up to a timeout
+        return next(messages)
+
+    pubsub_mock.get_message = AsyncMock(side_effect=get_message)
 
     # Use asyncio.wait_for to prevent the test from hanging indefinitely
     try:
@@ -134,38 +132,102 @@ async def test_listen_for_new_events(
         pass  # Timeout is expected due to the infinite loop
 
     # Assertions to verify that messages were received and processed
-    pubsub_mock.subscribe.assert_called_once_with(
+    pubsub_mock.subscribe.assert_awaited_once_with(
         sse_manager.redis_service.sse_event_pubsub_channel
     )
     assert pubsub_mock.get_message.call_count >= 1
     redis_service_mock.get_json_cloudapi_events_by_timestamp.assert_called_once()
 
     # Check if the event was added to the incoming_events queue
-    assert not sse_manager.incoming_events.empty()
+    assert sse_manager.incoming_events.get_nowait() == test_event
 
 
 @pytest.mark.anyio
-async def test_backfill_events(
+async def test_process_redis_event_invalid_event(
     sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
 ):
-    # Configure the mock for get_all_wallet_ids and get_events_by_timestamp
-    redis_service_mock.get_all_cloudapi_wallet_ids = Mock(
-        return_value=["wallet1", "wallet2"]
-    )
-    mock_event = MagicMock()  # Mocked event object
-    redis_service_mock.get_cloudapi_events_by_timestamp = Mock(
-        return_value=[mock_event]
+    redis_service_mock.get_json_cloudapi_events_by_timestamp.return_value = [
+        '{"not": "an event"}'
+    ]
+
+    await sse_manager._process_redis_event({"data": b"group:wallet1:123456789"})
+
+    assert sse_manager.incoming_events.empty()
+
+
+@pytest.mark.anyio
+async def test_process_redis_event_with_event_in_message(
+    sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    event_json = test_event.event_json
+    message = {"data": f"group:{wallet}:123456789:{event_json}".encode()}
+
+    with patch(
+        "webhooks.services.sse_manager.publish_event_on_websocket"
+    ) as publish_mock:
+        await sse_manager._process_redis_event(message)
+
+    # The event is not fetched from redis again
+    redis_service_mock.get_json_cloudapi_events_by_timestamp.assert_not_called()
+    event = await sse_manager.incoming_events.get()
+    assert event == test_event
+    assert event.event_id == 123456789  # the event's score in redis
+    publish_mock.assert_awaited_once_with(
+        event_json=event_json, group_id="group", wallet_id=wallet, topic=topic
     )
 
-    # Call the _backfill_events method
+
+@pytest.mark.anyio
+async def test_backfill_events(
+    sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    async def iterate_key_batches(count):
+        yield ["cloudapi:wallet1", "cloudapi:wallet2"]
+        yield ["cloudapi:group:group1:wallet3"]
+
+    redis_service_mock.iterate_cloudapi_event_key_batches = iterate_key_batches
+    redis_service_mock.get_json_cloudapi_events_by_keys.side_effect = [
+        [(test_event.event_json, 101.0), (test_event.event_json, 102.0)],
+        [("not an event", 103.0)],
+    ]
+
     await sse_manager._backfill_events()
 
-    # Assertions to check if the events are fetched and added to the queue correctly
-    assert redis_service_mock.get_all_cloudapi_wallet_ids.call_count == 1
-    assert (
-        redis_service_mock.get_cloudapi_events_by_timestamp.call_count == 2
-    )  # Called for each wallet
-    assert sse_manager.incoming_events.qsize() == 2  # One event for each wallet
+    # One pipelined read per batch of keys
+    assert redis_service_mock.get_json_cloudapi_events_by_keys.await_count == 2
+    assert sse_manager.incoming_events.qsize() == 2
+    event = sse_manager.incoming_events.get_nowait()
+    assert event == test_event
+    assert event.event_id == 101
+
+    metrics = sse_manager.get_metrics()["backfill"]
+    assert metrics["status"] == "completed"
+    assert metrics["keys_scanned"] == 3
+    assert metrics["keys_read"] == 3
+    assert metrics["events_backfilled"] == 2
+    assert metrics["duration_seconds"] is not None
+
+
+@pytest.mark.anyio
+async def test_backfill_events_time_budget(
+    sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    async def iterate_key_batches(count):
+        while True:
+            yield ["cloudapi:wallet1"]
+
+    async def get_events(*_, **__):
+        await asyncio.sleep(1)
+
+    redis_service_mock.iterate_cloudapi_event_key_batches = iterate_key_batches
+    redis_service_mock.get_json_cloudapi_events_by_keys.side_effect = get_events
+
+    with patch("webhooks.services.sse_manager.SSE_BACKFILL_TIME_BUDGET_SECONDS", 0.05):
+        await sse_manager._backfill_events()
+
+    metrics = sse_manager.get_metrics()["backfill"]
+    assert metrics["status"] == "timed_out"
+    assert metrics["events_backfilled"] == 0
 
 
 @pytest.mark.anyio
@@ -179,9 +241,21 @@ async def test_process_incoming_events(
     except asyncio.TimeoutError:
         pass  # Timeout is expected due to the infinite loop
 
-    # Assertions to verify that the event is processed and added to the FIFO and LIFO caches
-    assert not sse_manager.fifo_cache[wallet][topic].empty()
-    assert not sse_manager.lifo_cache[wallet][topic].empty()
+    # Assertions to verify that the event is processed and added to the ring buffer
+    assert len(sse_manager.event_cache.get(wallet)[topic]) == 1
+    assert sse_manager._next_sequence == 1
+
+
+def test_add_to_cache_drops_oldest_event(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    sse_manager.event_cache.buffer_size = 2
+    for _ in range(3):
+        sse_manager._add_to_cache(test_event)
+
+    ring_buffer = sse_manager.event_cache.get(wallet)[topic]
+    assert len(ring_buffer) == 2
+    assert [e.sequence for e in ring_buffer.read_from(0)] == [1, 2]
 
 
 @pytest.mark.anyio
@@ -224,9 +298,8 @@ async def test_populate_client_queue(
 ):
     client_queue = asyncio.Queue()
 
-    # Simulate adding an event to the LIFO cache
-    timestamp = time.time()
-    await sse_manager.lifo_cache[wallet][topic].put((timestamp, test_event))
+    # Simulate adding an event to the cache
+    sse_manager._add_to_cache(test_event)
 
     # Run _populate_client_queue in a background task
     populate_task = asyncio.create_task(
@@ -245,37 +318,309 @@ async def test_populate_client_queue(
     except asyncio.CancelledError:
         pass
 
-    # Check if the event was added to the client queue
+    # Check if the event was added to the client queue, only once
     event_in_client_queue = await client_queue.get()
     assert event_in_client_queue == test_event
+    assert client_queue.empty()
+
+    # The client queue is unsubscribed when the task is cancelled
+    assert not sse_manager._subscribers
 
 
 @pytest.mark.anyio
-async def test_append_to_queue(sse_manager):  # pylint: disable=redefined-outer-name
+async def test_populate_client_queue_pushes_new_events(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    topic_queue, all_topics_queue, other_topic_queue = (
+        asyncio.Queue(),
+        asyncio.Queue(),
+        asyncio.Queue(),
+    )
+    populate_tasks = [
+        asyncio.create_task(
+            sse_manager._populate_client_queue(
+                wallet=wallet, topic=client_topic, client_queue=client_queue
+            )
+        )
+        for client_topic, client_queue in [
+            (topic, topic_queue),
+            (WEBHOOK_TOPIC_ALL, all_topics_queue),
+            ("other_topic", other_topic_queue),
+        ]
+    ]
+    await asyncio.sleep(0)  # let the tasks subscribe
+
+    # A new event is pushed to the subscribed clients, without polling
+    sse_manager._add_to_cache(test_event)
+    assert await asyncio.wait_for(topic_queue.get(), timeout=0.1) == test_event
+    assert await asyncio.wait_for(all_topics_queue.get(), timeout=0.1) == test_event
+    assert other_topic_queue.empty()
+
+    for populate_task in populate_tasks:
+        populate_task.cancel()
+    await asyncio.gather(*populate_tasks, return_exceptions=True)
+    assert not sse_manager._subscribers
+
+
+@pytest.mark.anyio
+async def test_populate_client_queue_with_filter(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    matching_event = SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet,
+            topic=topic,
+            origin="multitenant",
+            payload={"connection_id": "abc", "state": "done"},
+        )
+    )
+    sse_manager._add_to_cache(test_event)
+    sse_manager._add_to_cache(matching_event)
+
     client_queue = asyncio.Queue()
-    event_log = []
+    populate_task = asyncio.create_task(
+        sse_manager._populate_client_queue(
+            wallet=wallet,
+            topic=topic,
+            client_queue=client_queue,
+            subscription_filter=SubscriptionFilter.create(
+                field="connection_id", field_id="abc", desired_state="done"
+            ),
+        )
+    )
+    await asyncio.sleep(0)  # let the task read the cache and subscribe
+
+    # Only the matching event is put on the queue, from the cache and when pushed
+    sse_manager._add_to_cache(test_event)
+    sse_manager._add_to_cache(matching_event)
+    assert client_queue.qsize() == 2
+    assert client_queue.get_nowait() == matching_event
+    assert client_queue.get_nowait() == matching_event
+
+    populate_task.cancel()
+
+
+@pytest.mark.anyio
+async def test_populate_client_queue_resumes_from_last_event_id(
+    sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    missed_event, other_topic_event, in_flight_event, new_event = (
+        SerializedEvent.from_model(
+            CloudApiWebhookEventGeneric(
+                wallet_id=wallet,
+                topic=event_topic,
+                origin="multitenant",
+                payload={"event": i},
+            )
+        )
+        for i, event_topic in enumerate([topic, "other_topic", topic, topic])
+    )
+
+    async def get_history(**_):
+        # Events published while the history is fetched are pushed to the staging queue,
+        # whether or not they made it into the history
+        sse_manager._add_to_cache(in_flight_event)
+        sse_manager._add_to_cache(new_event)
+        return [
+            (missed_event.event_json, 101.0),
+            (other_topic_event.event_json, 102.0),
+            (in_flight_event.event_json, 103.0),
+        ]
 
-    # Add an event to the LIFO queue
-    timestamp = time.time()
-    await sse_manager.lifo_cache[wallet][topic].put((timestamp, test_event))
+    redis_service_mock.get_json_cloudapi_events_after_score.side_effect = get_history
+    sse_manager._add_to_cache(test_event)  # cached, but not after the last event id
+
+    client_queue = asyncio.Queue()
+    populate_task = asyncio.create_task(
+        sse_manager._populate_client_queue(
+            wallet=wallet, topic=topic, client_queue=client_queue, last_event_id=100
+        )
+    )
+    await asyncio.sleep(0)  # let the task replay the history and subscribe
+
+    # The replay is bounded by the max event age and count
+    history_call = redis_service_mock.get_json_cloudapi_events_after_score.call_args
+    assert history_call.kwargs["wallet_id"] == wallet
+    assert history_call.kwargs["topic"] == topic
+    assert history_call.kwargs["num"] == SSE_REPLAY_MAX_EVENTS
+    min_score = time.time_ns() - int(MAX_EVENT_AGE_SECONDS * 1e9)
+    assert min_score - 1e9 < history_call.kwargs["score"] <= min_score
+    replayed = [client_queue.get_nowait() for _ in range(client_queue.qsize())]
+    assert replayed == [missed_event, in_flight_event, new_event]
+    assert [event.event_id for event in replayed[:2]] == [101, 103]
+
+    # The client queue is subscribed to new events
+    sse_manager._add_to_cache(test_event)
+    assert client_queue.get_nowait() == test_event
+
+    populate_task.cancel()
+    await asyncio.gather(populate_task, return_exceptions=True)
+    assert not sse_manager._subscribers
+
+
+@pytest.mark.anyio
+async def test_replay_missed_events_recent_last_event_id(
+    sse_manager, redis_service_mock  # pylint: disable=redefined-outer-name
+):
+    redis_service_mock.get_json_cloudapi_events_after_score.return_value = []
+    last_event_id = time.time_ns()
+    client_queue = asyncio.Queue()
+
+    await sse_manager._replay_missed_events(
+        wallet=wallet,
+        topic=WEBHOOK_TOPIC_ALL,
+        client_queue=client_queue,
+        last_event_id=last_event_id,
+    )
+
+    # A last event id within the max event age is replayed from, across all topics
+    redis_service_mock.get_json_cloudapi_events_after_score.assert_awaited_once_with(
+        wallet_id=wallet, score=last_event_id, num=SSE_REPLAY_MAX_EVENTS, topic=None
+    )
+    sse_manager._subscribers.remove(
+        wallet=wallet, topic=WEBHOOK_TOPIC_ALL, client_queue=client_queue
+    )
+
+
+@pytest.mark.anyio
+async def test_populate_multi_client_queue(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    def create_event(wallet_id, group_id=None):
+        return SerializedEvent.from_model(
+            CloudApiWebhookEventGeneric(
+                wallet_id=wallet_id,
+                group_id=group_id,
+                topic=topic,
+                origin="multitenant",
+                payload={},
+            )
+        )
+
+    group_events = [create_event(f"wallet{i}", "group1") for i in range(3)]
+    other_event = create_event("wallet9", "group2")
+    for event in [group_events[0], other_event, group_events[1]]:
+        sse_manager._add_to_cache(event)
+
+    group_queue, wallets_queue = asyncio.Queue(), asyncio.Queue()
+    populate_tasks = [
+        asyncio.create_task(
+            sse_manager._populate_multi_client_queue(
+                wallets=[], group_id="group1", topic=topic, client_queue=group_queue
+            )
+        ),
+        asyncio.create_task(
+            sse_manager._populate_multi_client_queue(
+                wallets=["wallet1", "wallet9"],
+                group_id=None,
+                topic=WEBHOOK_TOPIC_ALL,
+                client_queue=wallets_queue,
+            )
+        ),
+    ]
+    await asyncio.sleep(0)  # let the tasks read the cache and subscribe
+
+    # Cached events are read across wallets in the order they were received
+    assert [group_queue.get_nowait() for _ in range(2)] == group_events[:2]
+    assert [wallets_queue.get_nowait() for _ in range(2)] == [
+        other_event,
+        group_events[1],
+    ]
+
+    # Wallets that are new to the group are streamed as well
+    sse_manager._add_to_cache(group_events[2])
+    assert group_queue.get_nowait() == group_events[2]
+    assert wallets_queue.empty()
+
+    for populate_task in populate_tasks:
+        populate_task.cancel()
+    await asyncio.gather(*populate_tasks, return_exceptions=True)
+    assert not sse_manager._subscribers
+
+
+@pytest.mark.anyio
+async def test_sse_multi_event_stream_requires_wallets_or_group(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    with pytest.raises(ValueError):
+        await sse_manager.sse_multi_event_stream(
+            topic=topic, stop_event=asyncio.Event()
+        )
+
+
+def test_append_to_queue(sse_manager):  # pylint: disable=redefined-outer-name
+    client_queue = asyncio.Queue()
+
+    # Add an event to the cache
+    sse_manager._add_to_cache(test_event)
 
     # Call _append_to_queue
-    event_log = await sse_manager._append_to_queue(
-        wallet=wallet, topic=topic, client_queue=client_queue, event_log=event_log
+    cursor = sse_manager._append_to_queue(
+        wallets=[wallet], topic=topic, client_queue=client_queue, cursor=0
+    )
+
+    # Check if the event was added to the client queue, and the cursor moved past it
+    assert client_queue.get_nowait() == test_event
+    assert cursor == 1
+
+    # Reading again from the cursor yields no events
+    assert (
+        sse_manager._append_to_queue(
+            wallets=[wallet], topic=topic, client_queue=client_queue, cursor=cursor
+        )
+        == cursor
+    )
+    assert client_queue.empty()
+
+
+def test_append_to_queue_all_topics(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    client_queue = asyncio.Queue()
+    events = [
+        SerializedEvent.from_model(
+            CloudApiWebhookEventGeneric(
+                wallet_id=wallet, topic=event_topic, origin="multitenant", payload={}
+            )
+        )
+        for event_topic in ["topic1", "topic2", "topic1"]
+    ]
+    for event in events:
+        sse_manager._add_to_cache(event)
+
+    cursor = sse_manager._append_to_queue(
+        wallets=[wallet], topic=WEBHOOK_TOPIC_ALL, client_queue=client_queue, cursor=0
     )
 
-    # Check if the event was added to the client queue and event log
-    assert await client_queue.get() == test_event
-    assert (timestamp, test_event) in event_log
+    # Events of all topics are merged in the order they were received
+    assert [client_queue.get_nowait() for _ in range(3)] == events
+    assert cursor == 3
+
+
+def test_append_to_queue_since_timestamp(
+    sse_manager,  # pylint: disable=redefined-outer-name
+):
+    client_queue = asyncio.Queue()
+    sse_manager._add_to_cache(test_event)
+
+    cursor = sse_manager._append_to_queue(
+        wallets=[wallet],
+        topic=topic,
+        client_queue=client_queue,
+        cursor=0,
+        since_timestamp=time.time() + 1,
+    )
+
+    assert client_queue.empty()
+    assert cursor == 1
 
 
 @pytest.mark.anyio
 async def test_cleanup_cache(sse_manager):  # pylint: disable=redefined-outer-name
     # Add an old event to the cache
-    timestamp = time.time() - (MAX_EVENT_AGE_SECONDS + 1)
-    await sse_manager.lifo_cache[wallet][topic].put((timestamp, test_event))
-    sse_manager._cache_last_accessed[wallet][topic] = datetime.now() - timedelta(
-        seconds=MAX_EVENT_AGE_SECONDS + 1
+    sse_manager._add_to_cache(test_event)
+    sse_manager.event_cache.get(wallet)[topic].last_accessed = time.monotonic() - (
+        MAX_EVENT_AGE_SECONDS + 1
     )
 
     # Run cleanup task
@@ -288,17 +633,16 @@ async def test_cleanup_cache(sse_manager):  # pylint: disable=redefined-outer-na
         pass
 
     # Check if the cache has been cleaned
-    assert topic not in sse_manager.lifo_cache[wallet]
-    assert topic not in sse_manager.fifo_cache[wallet]
-    assert topic not in sse_manager.cache_locks[wallet]
-    assert topic not in sse_manager._cache_last_accessed[wallet]
+    assert wallet not in sse_manager.event_cache
 
 
 @pytest.mark.anyio
 async def test_check_wallet_belongs_to_group_immediate_success(
     sse_manager,  # pylint: disable=redefined-outer-name
 ):
-    sse_manager.redis_service.check_wallet_belongs_to_group = Mock(return_value=True)
+    sse_manager.redis_service.check_wallet_belongs_to_group = AsyncMock(
+        return_value=True
+    )
 
     result = await sse_manager.check_wallet_belongs_to_group(
         wallet_id="wallet123", group_id="group456"
@@ -315,7 +659,7 @@ async def test_check_wallet_belongs_to_group_eventual_success(
     sse_manager,  # pylint: disable=redefined-outer-name
 ):
     side_effects = [False] * 3 + [True]  # Fails 3 times, then succeeds
-    sse_manager.redis_service.check_wallet_belongs_to_group = Mock(
+    sse_manager.redis_service.check_wallet_belongs_to_group = AsyncMock(
         side_effect=side_effects
     )
 
@@ -331,7 +675,9 @@ async def test_check_wallet_belongs_to_group_eventual_success(
 async def test_check_wallet_belongs_to_group_failure(
     sse_manager,  # pylint: disable=redefined-outer-name
 ):
-    sse_manager.redis_service.check_wallet_belongs_to_group = Mock(return_value=False)
+    sse_manager.redis_service.check_wallet_belongs_to_group = AsyncMock(
+        return_value=False
+    )
 
     result = await sse_manager.check_wallet_belongs_to_group(
         wallet_id="wallet123", group_id="group456", delay=0.01
@@ -339,31 +685,3 @@ async def test_check_wallet_belongs_to_group_failure(
 
     assert sse_manager.redis_service.check_wallet_belongs_to_group.call_count == 10
     assert result is False
-
-
-@pytest.mark.anyio
-async def test_copy_queue():
-    # Create a queue with some items
-    original_queue = asyncio.Queue()
-    test_event2 = CloudApiWebhookEventGeneric(
-        wallet_id="wallet2",
-        topic="topic2",
-        origin="origin2",
-        payload={"data": "value2"},
-    )
-    timestamp1 = time.time()
-    timestamp2 = time.time() - MAX_EVENT_AGE_SECONDS / 2  # Event within max age
-    await original_queue.put((timestamp1, test_event))
-    await original_queue.put((timestamp2, test_event2))
-
-    # Call _copy_queue
-    lifo_queue, fifo_queue = await _copy_queue(original_queue)
-
-    # Check if the queues have been copied correctly
-    assert await fifo_queue.get() == (timestamp1, test_event)
-    assert await fifo_queue.get() == (timestamp2, test_event2)
-    assert await lifo_queue.get() == (timestamp2, test_event2)
-    assert await lifo_queue.get() == (timestamp1, test_event)
-
-    # Check if the original queue is empty
-    assert original_queue.empty()
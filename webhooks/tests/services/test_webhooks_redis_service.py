@@ -1,10 +1,12 @@
 import time
 from itertools import chain
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
+from redis.exceptions import ResponseError
 
 from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
+from shared.services.redis_service import NodePubSub
 from webhooks.services.webhooks_redis_service import WebhooksRedisService
 
 group_id = "group"
@@ -31,15 +33,15 @@ async def test_add_cloudapi_webhook_event():
     event_json = json_entries[0]
 
     # Create a mock Redis client with the methods you want to test
-    redis_client = Mock()
-    redis_client.zadd = Mock()
-    redis_client.publish = Mock()
+    redis_client = AsyncMock()
+    redis_client.zadd = AsyncMock()
+    redis_client.publish = AsyncMock()
 
     # Initialize WebhooksRedisService with the mocked Redis client
     redis_service = WebhooksRedisService(redis_client)
 
     # Call the method you want to test
-    redis_service.add_cloudapi_webhook_event(
+    await redis_service.add_cloudapi_webhook_event(
         event_json, group_id=group_id, wallet_id=wallet_id, timestamp_ns=time.time_ns
     )
 
@@ -48,16 +50,143 @@ async def test_add_cloudapi_webhook_event():
     redis_client.publish.assert_called_once()
 
 
+@pytest.mark.anyio
+async def test_add_cloudapi_webhook_event_with_topic():
+    redis_client = AsyncMock()
+    redis_service = WebhooksRedisService(redis_client)
+
+    await redis_service.add_cloudapi_webhook_event(
+        json_entries[0],
+        group_id=group_id,
+        wallet_id=wallet_id,
+        timestamp_ns=1,
+        topic=topic,
+    )
+
+    # Event is written to the wallet's sorted set and to the topic index
+    redis_client.zadd.assert_any_await(
+        f"cloudapi:group:{group_id}:{wallet_id}", {json_entries[0]: 1}
+    )
+    # The topic index only references the event by its timestamp
+    redis_client.zadd.assert_any_await(f"cloudapi-topic:{wallet_id}:{topic}", {"1": 1})
+    # The notification carries the event
+    redis_client.publish.assert_awaited_once_with(
+        redis_service.sse_event_pubsub_channel,
+        f"{group_id}:{wallet_id}:1:{json_entries[0]}",
+    )
+
+
+@pytest.mark.anyio
+async def test_batch_execute():
+    redis_client = AsyncMock()
+    pipeline = Mock()
+    # Results of the ZADDs and SETs, in the order they are queued
+    pipeline.execute = AsyncMock(return_value=[1, 1, True, 1, True, 1, True])
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+
+    batch = redis_service.batch()
+    await batch.add_cloudapi_webhook_event(
+        json_entries[0],
+        group_id=group_id,
+        wallet_id=wallet_id,
+        timestamp_ns=1,
+        topic=topic,
+    )
+    await batch.add_cloudapi_webhook_event(
+        json_entries[1], group_id=None, wallet_id=wallet_id, timestamp_ns=2
+    )
+    await batch.add_billing_event(
+        json_entries[0], group_id=group_id, wallet_id=wallet_id, timestamp_ns=1
+    )
+    await batch.add_endorsement_event(json_entries[0], transaction_id="txn1")
+    assert len(batch) == 4
+
+    # Nothing is written before execute
+    pipeline.execute.assert_not_called()
+    redis_client.publish.assert_not_called()
+
+    await batch.execute()
+
+    assert pipeline.zadd.call_count == 4  # including the topic index
+    pipeline.zadd.assert_any_call(f"cloudapi-topic:{wallet_id}:{topic}", {"1": 1})
+    pipeline.set.assert_any_call(
+        f"{redis_service.endorsement_redis_prefix}:txn1", value=json_entries[0]
+    )
+    pipeline.set.assert_any_call(f"cloudapi-wallet-group:{wallet_id}", group_id)
+    pipeline.set.assert_any_call(f"cloudapi-wallet-group:{wallet_id}", "")
+    pipeline.execute.assert_called_once_with(raise_on_error=False)
+    assert redis_service.is_wallet_group_cached(wallet_id, "")
+    redis_client.publish.assert_any_call(
+        redis_service.sse_event_pubsub_channel,
+        f"{group_id}:{wallet_id}:1:{json_entries[0]}",
+    )
+    redis_client.publish.assert_any_call(
+        redis_service.sse_event_pubsub_channel, f":{wallet_id}:2:{json_entries[1]}"
+    )
+    redis_client.publish.assert_any_call(
+        redis_service.billing_event_pubsub_channel, f"{group_id}:1:{json_entries[0]}"
+    )
+    assert redis_client.publish.call_count == 3
+    assert len(batch) == 0
+
+
+@pytest.mark.anyio
+async def test_batch_execute_replay_and_error():
+    redis_client = AsyncMock()
+    pipeline = Mock()
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+    write_error = ConnectionError("Connection lost")
+    # The first event was stored by an earlier, failed attempt, and the billing write fails
+    pipeline.execute = AsyncMock(return_value=[0, True, 1, 0, write_error])
+
+    batch = redis_service.batch()
+    for i in range(2):
+        await batch.add_cloudapi_webhook_event(
+            json_entries[i], group_id=group_id, wallet_id=wallet_id, timestamp_ns=i + 1
+        )
+    await batch.add_billing_event(
+        json_entries[0], group_id=group_id, wallet_id=wallet_id, timestamp_ns=1
+    )
+    await batch.add_billing_event(
+        json_entries[1], group_id=group_id, wallet_id=wallet_id, timestamp_ns=2
+    )
+
+    with pytest.raises(ConnectionError):
+        await batch.execute()
+
+    # Only the event that was added by this attempt is published
+    redis_client.publish.assert_awaited_once_with(
+        redis_service.sse_event_pubsub_channel,
+        f"{group_id}:{wallet_id}:2:{json_entries[1]}",
+    )
+    assert not redis_service.is_wallet_group_cached(wallet_id, group_id)
+    assert len(batch) == 0
+
+
+@pytest.mark.anyio
+async def test_batch_execute_empty():
+    redis_client = AsyncMock()
+    redis_client.pipeline = Mock()
+    redis_service = WebhooksRedisService(redis_client)
+
+    await redis_service.batch().execute()
+
+    redis_client.pipeline.return_value.execute.assert_not_called()
+    redis_client.publish.assert_not_called()
+
+
 @pytest.mark.anyio
 async def test_get_json_cloudapi_events_by_wallet():
-    redis_client = Mock()
-    redis_client.zrevrangebyscore = Mock(
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(
         return_value=[e.encode() for e in json_entries]
     )
+    redis_client.get = AsyncMock(return_value=b"")
     redis_service = WebhooksRedisService(redis_client)
-    redis_service.match_keys = Mock(return_value=[b"dummy_key"])
 
-    events = redis_service.get_json_cloudapi_events_by_wallet(wallet_id)
+    events = await redis_service.get_json_cloudapi_events_by_wallet(wallet_id)
 
     assert events == json_entries
     redis_client.zrevrangebyscore.assert_called_once()
@@ -65,14 +194,14 @@ async def test_get_json_cloudapi_events_by_wallet():
 
 @pytest.mark.anyio
 async def test_get_json_cloudapi_events_by_wallet_no_events():
-    redis_client = Mock()
-    redis_client.zrevrangebyscore = Mock(
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(
         return_value=[e.encode() for e in json_entries]
     )
+    redis_client.get = AsyncMock(return_value=None)  # wallet not in group index
     redis_service = WebhooksRedisService(redis_client)
-    redis_service.match_keys = Mock(return_value=[])
 
-    events = redis_service.get_json_cloudapi_events_by_wallet(wallet_id)
+    events = await redis_service.get_json_cloudapi_events_by_wallet(wallet_id)
 
     assert events == []
     redis_client.zrevrangebyscore.assert_not_called()
@@ -80,17 +209,21 @@ async def test_get_json_cloudapi_events_by_wallet_no_events():
 
 @pytest.mark.anyio
 async def test_get_json_cloudapi_events_by_wallet_defaults_max():
-    redis_client = Mock()
-    redis_client.zrevrangebyscore = Mock(
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(
         return_value=[e.encode() for e in json_entries]
     )
+    redis_client.get = AsyncMock(return_value=group_id.encode())
     redis_service = WebhooksRedisService(redis_client)
-    redis_service.match_keys = Mock(return_value=[b"dummy_key"])
 
-    redis_service.get_json_cloudapi_events_by_wallet(wallet_id, num=None)
+    await redis_service.get_json_cloudapi_events_by_wallet(wallet_id, num=None)
 
     redis_client.zrevrangebyscore.assert_called_once_with(
-        name="dummy_key", max="+inf", min="-inf", start=0, num=10000  # default max num
+        name=f"cloudapi:group:{group_id}:{wallet_id}",
+        max="+inf",
+        min="-inf",
+        start=0,
+        num=10000,  # default max num
     )
 
 
@@ -98,7 +231,7 @@ async def test_get_json_cloudapi_events_by_wallet_defaults_max():
 async def test_get_cloudapi_events_by_wallet(mocker):
     expected_events = cloudapi_entries
 
-    redis_service = WebhooksRedisService(Mock())
+    redis_service = WebhooksRedisService(AsyncMock())
     mocker.patch.object(
         redis_service, "get_json_cloudapi_events_by_wallet", return_value=json_entries
     )
@@ -107,25 +240,109 @@ async def test_get_cloudapi_events_by_wallet(mocker):
         side_effect=expected_events,
     )
 
-    events = redis_service.get_cloudapi_events_by_wallet(wallet_id)
+    events = await redis_service.get_cloudapi_events_by_wallet(wallet_id)
 
     assert events == expected_events
 
 
 @pytest.mark.anyio
 async def test_get_json_cloudapi_events_by_wallet_and_topic(mocker):
+    topic_event = '{"wallet_id":"test_wallet","topic":"test_topic","payload":{}}'
+    other_event = '{"wallet_id":"test_wallet","topic":"other_topic","payload":{}}'
+
+    redis_client = AsyncMock()
+    # The index references events by their scores, newest first
+    redis_client.zrevrangebyscore = AsyncMock(
+        return_value=[(b"3", 3.0), (b"2", 2.0), (b"2", 2.0)]
+    )
+    pipeline = Mock()
+    pipeline.execute = AsyncMock(
+        return_value=[[topic_event.encode()], [other_event.encode()]]
+    )
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+    redis_service.cache_wallet_group(wallet_id, group_id)
+    get_by_wallet = mocker.patch.object(
+        redis_service, "get_json_cloudapi_events_by_wallet"
+    )
+
+    events = await redis_service.get_json_cloudapi_events_by_wallet_and_topic(
+        wallet_id=wallet_id, topic=topic, num=50
+    )
+
+    # Events of other topics with the same score are left out
+    assert events == [topic_event]
+    # Single bounded read of the topic index
+    redis_client.zrevrangebyscore.assert_called_once_with(
+        name=f"cloudapi-topic:{wallet_id}:{topic}",
+        max="+inf",
+        min="-inf",
+        start=0,
+        num=50,
+        withscores=True,
+    )
+    # A pipelined read of the wallet's sorted set per distinct score
+    assert pipeline.zrangebyscore.call_count == 2
+    pipeline.zrangebyscore.assert_any_call(
+        f"cloudapi:group:{group_id}:{wallet_id}", min=3.0, max=3.0
+    )
+    get_by_wallet.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_by_wallet_and_topic_empty_index(mocker):
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(return_value=[])
+    redis_client.exists = AsyncMock(return_value=1)
+    redis_service = WebhooksRedisService(redis_client)
+    get_by_wallet = mocker.patch.object(
+        redis_service, "get_json_cloudapi_events_by_wallet"
+    )
+
+    # Once the topic index is backfilled, an empty topic has no events
+    for _ in range(2):
+        events = await redis_service.get_json_cloudapi_events_by_wallet_and_topic(
+            wallet_id=wallet_id, topic=topic
+        )
+        assert events == []
+    get_by_wallet.assert_not_called()
+    redis_client.exists.assert_awaited_once_with(
+        redis_service.cloudapi_topic_backfilled_key
+    )
+
+    # Nor are the events after a score read from the wallet's events
+    events = await redis_service.get_json_cloudapi_events_after_score(
+        wallet_id=wallet_id, score=100, num=10, topic=topic
+    )
+    assert events == []
+    redis_client.zrevrangebyscore.assert_awaited_with(
+        f"cloudapi-topic:{wallet_id}:{topic}",
+        max="+inf",
+        min="(100",
+        start=0,
+        num=10,
+        withscores=True,
+    )
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_by_wallet_and_topic_no_index(mocker):
     different_json = [
         '{"payload":{"test":"1"},"topic":"test_topic"}',
         '{"payload":{"test":"2"},"topic":"other_topic"}',
     ]
     expected_events = ['{"payload":{"test":"1"},"topic":"test_topic"}']
 
-    redis_service = WebhooksRedisService(Mock())
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(return_value=[])
+    redis_client.exists = AsyncMock(return_value=0)
+    redis_service = WebhooksRedisService(redis_client)
     mocker.patch.object(
         redis_service, "get_json_cloudapi_events_by_wallet", return_value=different_json
     )
 
-    events = redis_service.get_json_cloudapi_events_by_wallet_and_topic(
+    # Falls back to filtering the wallet's events until the topic index is backfilled
+    events = await redis_service.get_json_cloudapi_events_by_wallet_and_topic(
         wallet_id="test_wallet_id", topic=topic
     )
 
@@ -134,24 +351,21 @@ async def test_get_json_cloudapi_events_by_wallet_and_topic(mocker):
 
 @pytest.mark.anyio
 async def test_get_cloudapi_events_by_wallet_and_topic(mocker):
-    event_instances = [
-        CloudApiWebhookEventGeneric(
-            wallet_id=wallet_id, topic=topic, origin="a", payload={"test": "1"}
-        ),
-        CloudApiWebhookEventGeneric(
-            wallet_id=wallet_id, topic="other", origin="a", payload={"test": "2"}
-        ),
-    ]
-    expected_events = [event_instances[0]]
-
-    redis_service = WebhooksRedisService(Mock())
+    redis_service = WebhooksRedisService(AsyncMock())
     mocker.patch.object(
-        redis_service, "get_cloudapi_events_by_wallet", return_value=event_instances
+        redis_service,
+        "get_json_cloudapi_events_by_wallet_and_topic",
+        return_value=json_entries,
     )
 
-    events = redis_service.get_cloudapi_events_by_wallet_and_topic(wallet_id, topic)
+    events = await redis_service.get_cloudapi_events_by_wallet_and_topic(
+        wallet_id, topic
+    )
 
-    assert events == expected_events
+    assert events == cloudapi_entries
+    redis_service.get_json_cloudapi_events_by_wallet_and_topic.assert_called_once_with(
+        wallet_id, topic, num=100
+    )
 
 
 @pytest.mark.anyio
@@ -159,15 +373,17 @@ async def test_get_json_cloudapi_events_by_timestamp():
     start_timestamp = 1609459200
     end_timestamp = 1609545600
 
-    redis_client = Mock()
-    redis_client.zrangebyscore = Mock(return_value=[e.encode() for e in json_entries])
+    redis_client = AsyncMock()
+    redis_client.zrangebyscore = AsyncMock(
+        return_value=[e.encode() for e in json_entries]
+    )
 
     redis_service = WebhooksRedisService(redis_client)
     expected_key = f"{redis_service.cloudapi_redis_prefix}:group:{group_id}:{wallet_id}"
 
-    redis_service.match_keys = Mock(return_value=[expected_key.encode()])
+    redis_service.match_keys = AsyncMock(return_value=[expected_key.encode()])
 
-    events = redis_service.get_json_cloudapi_events_by_timestamp(
+    events = await redis_service.get_json_cloudapi_events_by_timestamp(
         group_id=group_id,
         wallet_id=wallet_id,
         start_timestamp=start_timestamp,
@@ -187,13 +403,13 @@ async def test_get_json_cloudapi_events_by_timestamp_no_events():
     start_timestamp = 1609459200
     end_timestamp = 1609545600
 
-    redis_client = Mock()
-    redis_client.zrangebyscore = Mock(return_value=[])
+    redis_client = AsyncMock()
+    redis_client.zrangebyscore = AsyncMock(return_value=[])
     redis_service = WebhooksRedisService(redis_client)
 
-    redis_service.match_keys = Mock(return_value=[])
+    redis_service.match_keys = AsyncMock(return_value=[])
 
-    events = redis_service.get_json_cloudapi_events_by_timestamp(
+    events = await redis_service.get_json_cloudapi_events_by_timestamp(
         group_id=group_id,
         wallet_id=wallet_id,
         start_timestamp=start_timestamp,
@@ -208,8 +424,9 @@ async def test_get_cloudapi_events_by_timestamp(mocker):
     start_timestamp = 1609459200
     end_timestamp = 1609545600
 
-    redis_service = WebhooksRedisService(Mock())
-    mocker.patch.object(
+    redis_service = WebhooksRedisService(AsyncMock())
+    redis_service.get_wallet_group_id = AsyncMock(return_value=group_id)
+    get_json_events = mocker.patch.object(
         redis_service,
         "get_json_cloudapi_events_by_timestamp",
         return_value=json_entries,
@@ -219,11 +436,119 @@ async def test_get_cloudapi_events_by_timestamp(mocker):
         side_effect=cloudapi_entries,
     )
 
-    events = redis_service.get_cloudapi_events_by_timestamp(
+    events = await redis_service.get_cloudapi_events_by_timestamp(
         wallet_id, start_timestamp, end_timestamp
     )
 
     assert events == cloudapi_entries
+    get_json_events.assert_awaited_once_with(
+        group_id=group_id,
+        wallet_id=wallet_id,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+    )
+
+
+@pytest.mark.anyio
+async def test_get_cloudapi_events_by_timestamp_unknown_wallet():
+    redis_service = WebhooksRedisService(AsyncMock())
+    redis_service.get_wallet_group_id = AsyncMock(return_value=None)
+
+    assert await redis_service.get_cloudapi_events_by_timestamp(wallet_id, 0) == []
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_by_keys():
+    redis_client = AsyncMock()
+    pipeline = Mock()
+    pipeline.execute = AsyncMock(
+        return_value=[[(json_entries[0].encode(), 101.0)], [], [(b"event", 102.0)]]
+    )
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+
+    events = await redis_service.get_json_cloudapi_events_by_keys(
+        ["cloudapi:1", "cloudapi:2", "cloudapi:3"], start_timestamp=100
+    )
+
+    assert events == [(json_entries[0], 101.0), ("event", 102.0)]
+    assert pipeline.zrangebyscore.call_count == 3
+    pipeline.zrangebyscore.assert_called_with(
+        "cloudapi:3", min=100, max="+inf", withscores=True
+    )
+
+    assert await redis_service.get_json_cloudapi_events_by_keys([], 100) == []
+    pipeline.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_after_score():
+    redis_client = AsyncMock()
+    # Newest first
+    redis_client.zrevrangebyscore = AsyncMock(
+        return_value=[(e.encode(), 102.0 - i) for i, e in enumerate(json_entries)]
+    )
+    redis_service = WebhooksRedisService(redis_client)
+    redis_key = f"{redis_service.cloudapi_redis_prefix}:group:{group_id}:{wallet_id}"
+    redis_service.get_cloudapi_event_redis_key_unknown_group = AsyncMock(
+        return_value=redis_key
+    )
+
+    events = await redis_service.get_json_cloudapi_events_after_score(
+        wallet_id=wallet_id, score=100, num=10
+    )
+
+    # The newest `num` events are read, and returned in order of score
+    assert events == [(e, 101.0 + i) for i, e in enumerate(reversed(json_entries))]
+    redis_client.zrevrangebyscore.assert_awaited_once_with(
+        redis_key, max="+inf", min="(100", start=0, num=10, withscores=True
+    )
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_after_score_by_topic():
+    topic_event = '{"wallet_id":"test_wallet","topic":"test_topic","payload":{}}'
+    redis_client = AsyncMock()
+    redis_client.zrevrangebyscore = AsyncMock(return_value=[(b"102", 102.0)])
+    pipeline = Mock()
+    pipeline.execute = AsyncMock(return_value=[[topic_event.encode()]])
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+    redis_service.cache_wallet_group(wallet_id, group_id)
+
+    events = await redis_service.get_json_cloudapi_events_after_score(
+        wallet_id=wallet_id, score=100, num=10, topic=topic
+    )
+
+    # Only the events of the topic are read, from the topic index
+    assert events == [(topic_event, 102.0)]
+    redis_client.zrevrangebyscore.assert_awaited_once_with(
+        f"cloudapi-topic:{wallet_id}:{topic}",
+        max="+inf",
+        min="(100",
+        start=0,
+        num=10,
+        withscores=True,
+    )
+    pipeline.zrangebyscore.assert_called_once_with(
+        f"cloudapi:group:{group_id}:{wallet_id}", min=102.0, max=102.0
+    )
+
+
+@pytest.mark.anyio
+async def test_get_json_cloudapi_events_after_score_no_key():
+    redis_client = AsyncMock()
+    redis_service = WebhooksRedisService(redis_client)
+    redis_service.get_cloudapi_event_redis_key_unknown_group = AsyncMock(
+        return_value=None
+    )
+
+    events = await redis_service.get_json_cloudapi_events_after_score(
+        wallet_id=wallet_id, score=100, num=10
+    )
+
+    assert events == []
+    redis_client.zrevrangebyscore.assert_not_awaited()
 
 
 @pytest.mark.anyio
@@ -237,12 +562,12 @@ async def test_get_all_cloudapi_wallet_ids():
         ({"localhost:6379": 0}, [f"cloudapi:{expected_wallet_ids[2]}".encode()]),
     ]
 
-    redis_client = Mock()
-    redis_client.scan = Mock(side_effect=scan_results)
+    redis_client = AsyncMock()
+    redis_client.scan = AsyncMock(side_effect=scan_results)
 
     redis_service = WebhooksRedisService(redis_client)
 
-    wallet_ids = redis_service.get_all_cloudapi_wallet_ids()
+    wallet_ids = await redis_service.get_all_cloudapi_wallet_ids()
 
     assert set(wallet_ids) == set(expected_wallet_ids)
     assert redis_client.scan.call_count == 2
@@ -252,12 +577,12 @@ async def test_get_all_cloudapi_wallet_ids():
 async def test_get_all_cloudapi_wallet_ids_no_wallets():
     scan_results = [({"localhost:6379": 1}, []), ({"localhost:6379": 0}, [])]
 
-    redis_client = Mock()
-    redis_client.scan = Mock(side_effect=scan_results)
+    redis_client = AsyncMock()
+    redis_client.scan = AsyncMock(side_effect=scan_results)
 
     redis_service = WebhooksRedisService(redis_client)
 
-    wallet_ids = redis_service.get_all_cloudapi_wallet_ids()
+    wallet_ids = await redis_service.get_all_cloudapi_wallet_ids()
 
     assert not wallet_ids
     assert redis_client.scan.call_count == 2
@@ -268,7 +593,7 @@ async def test_get_all_cloudapi_wallet_ids_handles_exception():
     expected_wallet_ids = ["wallet1", "wallet2"]
 
     # Adjust the mock to raise an Exception on the first call
-    redis_client = Mock()
+    redis_client = AsyncMock()
     redis_client.scan.side_effect = chain(
         [
             (
@@ -281,7 +606,7 @@ async def test_get_all_cloudapi_wallet_ids_handles_exception():
 
     redis_service = WebhooksRedisService(redis_client)
 
-    wallet_ids = redis_service.get_all_cloudapi_wallet_ids()
+    wallet_ids = await redis_service.get_all_cloudapi_wallet_ids()
 
     assert set(wallet_ids) == set(expected_wallet_ids)
 
@@ -292,13 +617,13 @@ async def test_add_endorsement_event():
     transaction_id = "transaction123"
 
     # Mock the Redis client
-    redis_client = Mock()
+    redis_client = AsyncMock()
     redis_service = WebhooksRedisService(redis_client)
 
     # Mock Redis 'set' operation to return True to simulate a successful operation
-    redis_client.set = Mock(return_value=True)
+    redis_client.set = AsyncMock(return_value=True)
 
-    redis_service.add_endorsement_event(event_json, transaction_id)
+    await redis_service.add_endorsement_event(event_json, transaction_id)
 
     # Verify Redis 'set' was called correctly
     redis_client.set.assert_called_once_with(
@@ -313,13 +638,13 @@ async def test_add_endorsement_event_key_exists():
     transaction_id = "transaction123"
 
     # Mock the Redis client
-    redis_client = Mock()
+    redis_client = AsyncMock()
     redis_service = WebhooksRedisService(redis_client)
 
     # Mock Redis 'set' operation to return False to simulate a key already exists
-    redis_client.set = Mock(return_value=False)
+    redis_client.set = AsyncMock(return_value=False)
 
-    redis_service.add_endorsement_event(event_json, transaction_id)
+    await redis_service.add_endorsement_event(event_json, transaction_id)
 
     # Verify Redis 'set' was called correctly
     redis_client.set.assert_called_once_with(
@@ -331,22 +656,283 @@ async def test_add_endorsement_event_key_exists():
 @pytest.mark.anyio
 async def test_check_wallet_belongs_to_group():
     valid_group_id = "abc"
-    match_keys_result = [f"cloudapi:group:{valid_group_id}:{wallet_id}".encode()]
 
-    redis_client = Mock()
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(return_value=valid_group_id.encode())
 
     redis_service = WebhooksRedisService(redis_client)
-    redis_service.match_keys = Mock(return_value=match_keys_result)
 
-    valid = redis_service.check_wallet_belongs_to_group(
+    valid = await redis_service.check_wallet_belongs_to_group(
         wallet_id=wallet_id, group_id=valid_group_id
     )
 
     assert valid is True
+    redis_client.get.assert_awaited_once_with(f"cloudapi-wallet-group:{wallet_id}")
 
-    redis_service.match_keys = Mock(return_value=[])
-    valid = redis_service.check_wallet_belongs_to_group(
+    valid = await redis_service.check_wallet_belongs_to_group(
         wallet_id=wallet_id, group_id="invalid_group_id"
     )
 
     assert valid is False
+    # The wallet's group is cached in-process after the first lookup
+    redis_client.get.assert_awaited_once()
+
+    redis_client.get = AsyncMock(return_value=None)
+    valid = await redis_service.check_wallet_belongs_to_group(
+        wallet_id="unknown_wallet", group_id=valid_group_id
+    )
+
+    assert valid is False
+
+
+@pytest.mark.anyio
+async def test_get_wallet_group_id():
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(side_effect=[None, b"", b"group"])
+    redis_service = WebhooksRedisService(redis_client)
+
+    # Unknown wallets are not cached, as their events may not be stored yet
+    assert await redis_service.get_wallet_group_id("wallet") is None
+    assert await redis_service.get_wallet_group_id("wallet") == ""
+    assert await redis_service.get_wallet_group_id("wallet") == ""
+    assert await redis_service.get_wallet_group_id("other_wallet") == "group"
+    assert redis_client.get.await_count == 3
+
+
+@pytest.mark.anyio
+async def test_add_cloudapi_webhook_event_indexes_wallet_group():
+    redis_client = AsyncMock()
+    redis_service = WebhooksRedisService(redis_client)
+
+    for timestamp_ns in (1, 2):
+        await redis_service.add_cloudapi_webhook_event(
+            json_entries[0],
+            group_id=group_id,
+            wallet_id=wallet_id,
+            timestamp_ns=timestamp_ns,
+        )
+
+    # Index is only written once, and the wallet's group is then cached
+    redis_client.set.assert_awaited_once_with(
+        f"cloudapi-wallet-group:{wallet_id}", group_id
+    )
+    assert await redis_service.get_wallet_group_id(wallet_id) == group_id
+    redis_client.get.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_index_wallet_groups():
+    async def iterate_key_batches(**_):
+        yield [f"cloudapi:group:{group_id}:wallet1", "cloudapi:wallet2"]
+        yield ["cloudapi:wallet3"]
+
+    redis_client = AsyncMock()
+    redis_client.exists = AsyncMock(return_value=0)
+    pipelines = [Mock(), Mock()]
+    for pipeline in pipelines:
+        pipeline.execute = AsyncMock()
+    redis_client.pipeline = Mock(side_effect=pipelines)
+    redis_service = WebhooksRedisService(redis_client)
+    redis_service.iterate_cloudapi_event_key_batches = iterate_key_batches
+
+    num_indexed = await redis_service.index_wallet_groups()
+
+    assert num_indexed == 3
+    # A pipeline is written per batch of scanned keys
+    pipelines[0].set.assert_any_call("cloudapi-wallet-group:wallet1", group_id, nx=True)
+    pipelines[0].set.assert_any_call("cloudapi-wallet-group:wallet2", "", nx=True)
+    pipelines[1].set.assert_called_once_with(
+        "cloudapi-wallet-group:wallet3", "", nx=True
+    )
+    for pipeline in pipelines:
+        pipeline.execute.assert_awaited_once()
+    redis_client.set.assert_awaited_once_with("cloudapi-wallet-group-backfilled", "1")
+
+    # Once backfilled, the keys are not scanned again
+    redis_client.exists = AsyncMock(return_value=1)
+    assert await redis_service.index_wallet_groups() == 0
+    assert redis_client.pipeline.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_index_wallet_topics():
+    async def iterate_key_batches(**_):
+        yield [f"cloudapi:group:{group_id}:wallet1", "cloudapi:wallet2"]
+
+    redis_client = AsyncMock()
+    redis_client.exists = AsyncMock(return_value=0)
+    read_pipeline, write_pipeline = Mock(), Mock()
+    read_pipeline.execute = AsyncMock(
+        return_value=[
+            [(b'{"topic":"connections"}', 1.0), (b"not json", 2.0)],
+            [(b'{"topic":"proofs"}', 3.0)],
+        ]
+    )
+    write_pipeline.execute = AsyncMock()
+    redis_client.pipeline = Mock(side_effect=[read_pipeline, write_pipeline])
+    redis_service = WebhooksRedisService(redis_client)
+    redis_service.iterate_cloudapi_event_key_batches = iterate_key_batches
+
+    num_indexed = await redis_service.index_wallet_topics()
+
+    assert num_indexed == 2
+    write_pipeline.zadd.assert_any_call(
+        "cloudapi-topic:wallet1:connections", {"1": 1.0}
+    )
+    write_pipeline.zadd.assert_any_call("cloudapi-topic:wallet2:proofs", {"3": 3.0})
+    redis_client.set.assert_awaited_once_with("cloudapi-topic-backfilled", "1")
+
+    # Once backfilled, the events are not indexed again
+    redis_client.exists = AsyncMock(return_value=1)
+    assert await redis_service.index_wallet_topics() == 0
+    assert redis_client.pipeline.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_create_consumer_group():
+    redis_client = AsyncMock()
+    redis_service = WebhooksRedisService(redis_client)
+
+    assert await redis_service.create_consumer_group("stream", "group") is True
+    redis_client.xgroup_create.assert_called_once_with(
+        "stream", "group", id="0", mkstream=True
+    )
+
+    redis_client.xgroup_create.side_effect = ResponseError(
+        "BUSYGROUP Consumer Group name already exists"
+    )
+    assert await redis_service.create_consumer_group("stream", "group") is False
+
+    redis_client.xgroup_create.side_effect = ResponseError("Other error")
+    with pytest.raises(ResponseError):
+        await redis_service.create_consumer_group("stream", "group")
+
+
+@pytest.mark.anyio
+async def test_read_stream_group():
+    entries = [(b"1-0", {b"event": b"data"})]
+    redis_client = AsyncMock()
+    redis_client.xreadgroup = AsyncMock(return_value=[[b"stream", entries]])
+    redis_service = WebhooksRedisService(redis_client)
+
+    result = await redis_service.read_stream_group(
+        "stream", "group", "consumer", count=10, block_ms=100
+    )
+
+    assert result == entries
+    redis_client.xreadgroup.assert_called_once_with(
+        groupname="group",
+        consumername="consumer",
+        streams={"stream": ">"},
+        count=10,
+        block=100,
+    )
+
+    redis_client.xreadgroup = AsyncMock(return_value=[])
+    assert not await redis_service.read_stream_group(
+        "stream", "group", "consumer", count=10
+    )
+
+
+@pytest.mark.anyio
+async def test_autoclaim_stream_entries():
+    entries = [(b"1-0", {b"event": b"data"})]
+    redis_client = AsyncMock()
+    redis_client.xautoclaim = AsyncMock(return_value=[b"2-0", entries, []])
+    redis_service = WebhooksRedisService(redis_client)
+
+    next_start_id, result = await redis_service.autoclaim_stream_entries(
+        "stream", "group", "consumer", min_idle_time_ms=1000, count=10, start_id=b"1-0"
+    )
+
+    assert result == entries
+    assert next_start_id == b"2-0"
+    assert redis_client.xautoclaim.call_args.kwargs["start_id"] == b"1-0"
+
+
+@pytest.mark.anyio
+async def test_ack_stream_entries():
+    redis_client = AsyncMock()
+    pipeline = Mock()
+    pipeline.execute = AsyncMock(return_value=[2, 2])
+    redis_client.pipeline = Mock(return_value=pipeline)
+    redis_service = WebhooksRedisService(redis_client)
+
+    num_acked = await redis_service.ack_stream_entries(
+        "stream", "group", [b"1-0", b"2-0"]
+    )
+
+    assert num_acked == 2
+    pipeline.xack.assert_called_once_with("stream", "group", b"1-0", b"2-0")
+    pipeline.xdel.assert_called_once_with("stream", b"1-0", b"2-0")
+
+    assert await redis_service.ack_stream_entries("stream", "group", []) == 0
+
+
+@pytest.mark.anyio
+async def test_get_sorted_set_score_at_rank():
+    redis_client = AsyncMock()
+    redis_client.zrange = AsyncMock(side_effect=[[(b"event", 123.0)], []])
+    redis_service = WebhooksRedisService(redis_client)
+
+    assert await redis_service.get_sorted_set_score_at_rank("key", 0) == 123.0
+    assert await redis_service.get_sorted_set_score_at_rank("key", -11) is None
+
+    redis_client.zrange.assert_any_await("key", -11, -11, withscores=True)
+
+
+@pytest.mark.anyio
+async def test_remove_sorted_set_members():
+    redis_client = AsyncMock()
+    redis_client.zremrangebyscore = AsyncMock(return_value=2)
+    redis_client.zremrangebyrank = AsyncMock(return_value=3)
+    redis_service = WebhooksRedisService(redis_client)
+
+    assert await redis_service.remove_sorted_set_members_below_score("key", 100) == 2
+    redis_client.zremrangebyscore.assert_awaited_once_with("key", "-inf", "(100")
+
+    assert await redis_service.remove_sorted_set_members_by_rank("key", keep=10) == 3
+    redis_client.zremrangebyrank.assert_awaited_once_with("key", 0, -11)
+
+
+@pytest.mark.anyio
+async def test_iterate_key_batches():
+    node1, node2 = Mock(), Mock()
+    node1.name, node2.name = "node1", "node2"
+
+    async def scan(cursor, match, count, target_nodes):
+        if target_nodes is node1:
+            return ({"node1": 0}, [b"cloudapi:1"]) if cursor else ({"node1": 5}, [])
+        return {"node2": 0}, [b"cloudapi:2", b"cloudapi:3"]
+
+    redis_client = AsyncMock()
+    redis_client.get_primaries = Mock(return_value=[node1, node2])
+    redis_client.scan = AsyncMock(side_effect=scan)
+    redis_service = WebhooksRedisService(redis_client)
+
+    batches = [
+        batch
+        async for batch in redis_service.iterate_cloudapi_event_key_batches(count=10)
+    ]
+
+    assert sorted(batches) == [["cloudapi:1"], ["cloudapi:2", "cloudapi:3"]]
+    assert redis_client.scan.await_count == 3
+    redis_client.scan.assert_any_await(
+        cursor=5, match="cloudapi:*", count=10, target_nodes=node1
+    )
+
+
+@pytest.mark.anyio
+async def test_pubsub_closes_node_client():
+    redis_client = AsyncMock()
+    redis_client.get_random_node = Mock(return_value=Mock(host="localhost", port=6379))
+    redis_service = WebhooksRedisService(redis_client)
+
+    pubsub = await redis_service.pubsub()
+    assert isinstance(pubsub, NodePubSub)
+    assert pubsub.connection_pool is pubsub.client.connection_pool
+
+    # Closing the pubsub instance also closes the client of the node, and its connection pool
+    pubsub.client.aclose = AsyncMock()
+    await pubsub.aclose()
+    pubsub.client.aclose.assert_awaited_once()
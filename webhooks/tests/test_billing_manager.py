@@ -2,10 +2,11 @@ import asyncio
 from itertools import chain, repeat
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import orjson
 import pytest
 from fastapi import HTTPException
 from httpx import Response
-from redis.cluster import ClusterPubSub
+from redis.asyncio.client import PubSub
 
 from shared.constants import GOVERNANCE_LABEL, LAGO_URL
 from webhooks.models.billing_payloads import (
@@ -18,22 +19,24 @@ from webhooks.models.billing_payloads import (
     RevRegDefBillingEvent,
     RevRegEntryBillingEvent,
 )
+from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
 from webhooks.services.billing_manager import BillingManager, is_applicable_for_billing
+from webhooks.services.webhooks_redis_service import WebhooksRedisService
 
 # pylint: disable=protected-access
 
 
 @pytest.fixture
 def redis_service_mock():
-    redis_service = MagicMock()
-    redis_service.get_billing_event = Mock()
+    redis_service = AsyncMock()
+    redis_service.get_billing_event = AsyncMock()
     return redis_service
 
 
 @pytest.fixture
 def billing_manager_mock(redis_service_mock):  # pylint: disable=redefined-outer-name
     billing_manager = BillingManager(redis_service=redis_service_mock)
-    billing_manager._pubsub = Mock(spec=ClusterPubSub)
+    billing_manager._pubsub = AsyncMock(spec=PubSub)
     billing_manager._client.post = AsyncMock(return_value=Response(200, json="Success"))
     return billing_manager
 
@@ -63,14 +66,14 @@ async def test_stop(billing_manager_mock):  # pylint: disable=redefined-outer-na
     mock_task = asyncio.create_task(asyncio.sleep(0.1))
     billing_manager_mock._tasks.append(mock_task)
 
-    billing_manager_mock._pubsub = Mock()
+    billing_manager_mock._pubsub = AsyncMock()
 
     await billing_manager_mock.stop()
 
     assert mock_task.cancelled()
     assert len(billing_manager_mock._tasks) == 0
 
-    billing_manager_mock._pubsub.disconnect.assert_called_once()
+    billing_manager_mock._pubsub.aclose.assert_awaited_once()
 
 
 @pytest.mark.anyio
@@ -99,9 +102,16 @@ async def test_are_tasks_running_x(
 async def test_listen_for_billing_events(
     billing_manager_mock, message  # pylint: disable=redefined-outer-name
 ):
-    pubsub_mock = billing_manager_mock.redis_service.redis.pubsub.return_value
-    pubsub_mock.subscribe = Mock()
-    pubsub_mock.get_message = Mock(side_effect=chain([message], repeat(None)))
+    pubsub_mock = billing_manager_mock.redis_service.pubsub.return_value
+    messages = chain([message], repeat(None))
+
+    async def get_message(timeout, **_):
+        message = next(messages)
+        if not message:
+            await asyncio.sleep(timeout)  # no message within timeout
+        return message
+
+    pubsub_mock.get_message = AsyncMock(side_effect=get_message)
 
     try:
         await asyncio.wait_for(
@@ -110,12 +120,12 @@ async def test_listen_for_billing_events(
     except asyncio.TimeoutError:
         pass
 
-    billing_manager_mock.redis_service.redis.pubsub.assert_called_once()
-    billing_manager_mock._pubsub.subscribe.assert_called_once_with(
+    billing_manager_mock.redis_service.pubsub.assert_awaited_once()
+    billing_manager_mock._pubsub.subscribe.assert_awaited_once_with(
         billing_manager_mock.redis_service.billing_event_pubsub_channel
     )
-    billing_manager_mock._pubsub.get_message.assert_called_once_with(
-        ignore_subscribe_messages=True
+    billing_manager_mock._pubsub.get_message.assert_any_await(
+        ignore_subscribe_messages=True, timeout=1
     )
     assert billing_manager_mock._pubsub.get_message.call_count >= 1
 
@@ -183,6 +193,25 @@ async def test_process_billing_event(
         billing_manager_mock._post_billing_event.assert_not_called()
 
 
+@pytest.mark.anyio
+async def test_process_billing_event_with_event_in_message(
+    billing_manager_mock,  # pylint: disable=redefined-outer-name
+):
+    billing_manager_mock._post_billing_event = AsyncMock()
+    event_json = '{"topic": "credentials","payload": {"thread_id": "123456789"}}'
+    dummy_message = {"data": f"GroupA:123456789:{event_json}".encode()}
+
+    await billing_manager_mock._process_billing_event(dummy_message)
+
+    # The event is not fetched from redis again
+    billing_manager_mock.redis_service.get_billing_event.assert_not_called()
+    billing_manager_mock._post_billing_event.assert_called_once_with(
+        CredentialBillingEvent(
+            transaction_id="123456789", external_customer_id="GroupA"
+        )
+    )
+
+
 @pytest.mark.anyio
 async def test_process_billing_event_x(
     billing_manager_mock,  # pylint: disable=redefined-outer-name
@@ -273,6 +302,63 @@ async def test_process_endorsements_event(
     billing_manager_mock._post_billing_event.assert_called_once_with(dummy_lago)
 
 
+@pytest.mark.anyio
+@patch("webhooks.services.billing_manager.LAGO_API_KEY", "NOT_EMPTY")
+@patch("webhooks.services.billing_manager.LAGO_URL", "NOT_EMPTY")
+async def test_endorsement_event_from_processor_to_billing_manager():
+    redis_client = AsyncMock()
+    redis_service = WebhooksRedisService(redis_client)
+    processor = AcaPyEventsProcessor(redis_service=redis_service)
+    billing_manager = BillingManager(redis_service=redis_service)
+    billing_manager._client.post = AsyncMock(return_value=Response(200, json="Success"))
+
+    operation = '{"operation": {"type": "102"}}'
+    payload = {
+        "state": "transaction_acked",
+        "transaction_id": "txn1",
+        "messages_attach": [{"data": {"json": operation}}],
+    }
+
+    # ACA-Py emits the "done" event of an endorsement twice
+    for time_ns in (1, 2):
+        event = {
+            "payload": {
+                "wallet_id": "issuer-wallet",
+                "topic": "acapy::record::endorse_transaction",
+                "category": "endorse_transaction",
+                "payload": payload,
+            },
+            "metadata": {
+                "time_ns": time_ns,
+                "origin": "tenant",
+                "x-wallet-id": "issuer-wallet",
+                "group_id": "GroupA",
+            },
+        }
+        await processor._process_event(orjson.dumps(event).decode())
+
+    billing_messages = [
+        call.args[1]
+        for call in redis_client.publish.call_args_list
+        if call.args[0] == redis_service.billing_event_pubsub_channel
+    ]
+    assert len(billing_messages) == 2
+    for message in billing_messages:
+        assert isinstance(message, str)
+        await billing_manager._process_billing_event({"data": message.encode()})
+
+    # The event is parsed from the message, and only posted to LAGO once
+    redis_client.zrangebyscore.assert_not_called()
+    billing_manager._client.post.assert_awaited_once_with(
+        url=billing_manager.lago_url,
+        json={
+            "event": CredDefBillingEvent(
+                transaction_id="txn1", external_customer_id="GroupA"
+            ).model_dump()
+        },
+    )
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "group_id, endorsement_type, transaction_id, expected_event_type",
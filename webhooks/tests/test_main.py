@@ -1,12 +1,13 @@
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import FastAPI, HTTPException
 
 from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
 from webhooks.services.billing_manager import BillingManager
+from webhooks.services.retention_manager import RetentionManager
 from webhooks.services.sse_manager import SseManager
-from webhooks.web.main import app, app_lifespan, health_check
+from webhooks.web.main import app, app_lifespan, health_check, stats
 from webhooks.web.routers import sse, webhooks, websocket
 
 
@@ -45,18 +46,28 @@ def billing_manager_mock():
     return mock
 
 
+@pytest.fixture
+def retention_manager_mock():
+    mock = AsyncMock(spec=RetentionManager)
+    mock.are_tasks_running.return_value = True
+    return mock
+
+
 @pytest.mark.anyio
 async def test_app_lifespan(
     acapy_events_processor_mock,  # pylint: disable=redefined-outer-name
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     billing_manager_mock,  # pylint: disable=redefined-outer-name
+    retention_manager_mock,  # pylint: disable=redefined-outer-name
 ):
     container_mock = MagicMock(
-        acapy_events_processor=MagicMock(return_value=acapy_events_processor_mock),
-        sse_manager=MagicMock(return_value=sse_manager_mock),
-        billing_manager=MagicMock(return_value=billing_manager_mock),
+        redis_service=AsyncMock(),
+        acapy_events_processor=AsyncMock(return_value=acapy_events_processor_mock),
+        sse_manager=AsyncMock(return_value=sse_manager_mock),
+        billing_manager=AsyncMock(return_value=billing_manager_mock),
+        retention_manager=AsyncMock(return_value=retention_manager_mock),
         wire=MagicMock(),
-        shutdown_resources=Mock(),
+        shutdown_resources=AsyncMock(),
     )
 
     # Patch the Container to return the mocked container
@@ -72,13 +83,15 @@ async def test_app_lifespan(
         sse_manager_mock.start.assert_called_once()
         acapy_events_processor_mock.start.assert_called_once()
         billing_manager_mock.start.assert_called_once()
+        retention_manager_mock.start.assert_called_once()
 
         # Assert the shutdown logic was called correctly
         acapy_events_processor_mock.stop.assert_awaited_once()
         sse_manager_mock.stop.assert_awaited_once()
         billing_manager_mock.stop.assert_called_once()
+        retention_manager_mock.stop.assert_awaited_once()
 
-        container_mock.shutdown_resources.assert_called_once()
+        container_mock.shutdown_resources.assert_awaited_once()
 
 
 @pytest.mark.anyio
@@ -86,6 +99,7 @@ async def test_health_check_healthy(
     acapy_events_processor_mock,  # pylint: disable=redefined-outer-name
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     billing_manager_mock,  # pylint: disable=redefined-outer-name
+    retention_manager_mock,  # pylint: disable=redefined-outer-name
 ):
     acapy_events_processor_mock.are_tasks_running.return_value = True
     sse_manager_mock.are_tasks_running.return_value = True
@@ -95,6 +109,7 @@ async def test_health_check_healthy(
         acapy_events_processor=acapy_events_processor_mock,
         sse_manager=sse_manager_mock,
         billing_manager=billing_manager_mock,
+        retention_manager=retention_manager_mock,
     )
     assert response == {"status": "healthy"}
 
@@ -104,6 +119,7 @@ async def test_health_check_unhealthy(
     acapy_events_processor_mock,  # pylint: disable=redefined-outer-name
     sse_manager_mock,  # pylint: disable=redefined-outer-name
     billing_manager_mock,  # pylint: disable=redefined-outer-name
+    retention_manager_mock,  # pylint: disable=redefined-outer-name
 ):
     acapy_events_processor_mock.are_tasks_running.return_value = False
     sse_manager_mock.are_tasks_running.return_value = True
@@ -114,6 +130,7 @@ async def test_health_check_unhealthy(
             acapy_events_processor=acapy_events_processor_mock,
             sse_manager=sse_manager_mock,
             billing_manager=billing_manager_mock,
+            retention_manager=retention_manager_mock,
         )
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == "One or more background tasks are not running."
@@ -127,6 +144,7 @@ async def test_health_check_unhealthy(
             acapy_events_processor=acapy_events_processor_mock,
             sse_manager=sse_manager_mock,
             billing_manager=billing_manager_mock,
+            retention_manager=retention_manager_mock,
         )
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == "One or more background tasks are not running."
@@ -140,6 +158,42 @@ async def test_health_check_unhealthy(
             acapy_events_processor=acapy_events_processor_mock,
             sse_manager=sse_manager_mock,
             billing_manager=billing_manager_mock,
+            retention_manager=retention_manager_mock,
         )
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == "One or more background tasks are not running."
+
+    billing_manager_mock.are_tasks_running.return_value = True
+    retention_manager_mock.are_tasks_running.return_value = False
+
+    with pytest.raises(HTTPException) as exc_info:
+        await health_check(
+            acapy_events_processor=acapy_events_processor_mock,
+            sse_manager=sse_manager_mock,
+            billing_manager=billing_manager_mock,
+            retention_manager=retention_manager_mock,
+        )
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == "One or more background tasks are not running."
+
+
+@pytest.mark.anyio
+async def test_stats(
+    acapy_events_processor_mock,  # pylint: disable=redefined-outer-name
+    sse_manager_mock,  # pylint: disable=redefined-outer-name
+    retention_manager_mock,  # pylint: disable=redefined-outer-name
+):
+    acapy_events_processor_mock.get_metrics.return_value = {"lists_in_flight": 1}
+    sse_manager_mock.get_metrics.return_value = {"subscriptions": 3}
+    retention_manager_mock.get_metrics.return_value = {"events_removed": 2}
+
+    response = await stats(
+        acapy_events_processor=acapy_events_processor_mock,
+        sse_manager=sse_manager_mock,
+        retention_manager=retention_manager_mock,
+    )
+    assert response == {
+        "acapy_events_processor": {"lists_in_flight": 1},
+        "sse_manager": {"subscriptions": 3},
+        "retention_manager": {"events_removed": 2},
+    }
@@ -0,0 +1,123 @@
+import time
+
+from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
+from webhooks.util.event_cache import EventCache
+from webhooks.util.serialized_event import SerializedEvent
+
+
+def make_event(wallet_id: str, topic: str = "topic1") -> SerializedEvent:
+    return SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet_id, topic=topic, origin="multitenant", payload={}
+        )
+    )
+
+
+def test_append_and_get():
+    cache = EventCache(max_wallets=0, max_events=0, max_bytes=0)
+    event = make_event("wallet1")
+
+    assert cache.append(0, event, time.time()) is None
+    cache.append(1, make_event("wallet1", "topic2"), time.time())
+
+    assert "wallet1" in cache
+    assert set(cache.get("wallet1")) == {"topic1", "topic2"}
+    assert not cache.get("wallet2")
+    assert cache.get_metrics() == {
+        "wallets": 1,
+        "events": 2,
+        "bytes": 2 * event.nbytes,
+        "evicted_wallets": 0,
+    }
+
+
+def test_append_when_buffer_full():
+    cache = EventCache(buffer_size=1)
+    event = make_event("wallet1")
+
+    cache.append(0, event, time.time())
+    dropped = cache.append(1, event, time.time())
+
+    assert dropped.sequence == 0
+    assert cache.get_metrics()["events"] == 1
+    assert cache.get_metrics()["bytes"] == event.nbytes
+
+
+def test_evicts_least_recently_used_wallet():
+    cache = EventCache(max_wallets=2)
+    cache.append(0, make_event("wallet1"), time.time())
+    cache.append(1, make_event("wallet2"), time.time())
+    cache.get("wallet1")  # wallet2 is now the least recently used
+
+    cache.append(2, make_event("wallet3"), time.time())
+
+    assert "wallet1" in cache and "wallet3" in cache
+    assert "wallet2" not in cache
+    assert cache.get_metrics()["evicted_wallets"] == 1
+    assert cache.get_metrics()["events"] == 2
+
+
+def test_evicts_within_event_and_byte_budget():
+    event = make_event("wallet1")
+    cache = EventCache(max_events=3, max_bytes=0)
+    for sequence, wallet in enumerate(["wallet1", "wallet1", "wallet2", "wallet3"]):
+        cache.append(sequence, make_event(wallet), time.time())
+    assert "wallet1" not in cache
+    assert cache.get_metrics()["events"] == 2
+
+    cache = EventCache(max_events=0, max_bytes=2 * event.nbytes)
+    for sequence, wallet in enumerate(["wallet1", "wallet2", "wallet3"]):
+        cache.append(sequence, make_event(wallet), time.time())
+    assert len(cache) == 2
+    assert cache.get_metrics()["bytes"] <= cache.max_bytes
+
+
+def test_never_evicts_own_wallet():
+    cache = EventCache(max_events=1)
+    for sequence in range(3):
+        cache.append(sequence, make_event("wallet1"), time.time())
+
+    assert "wallet1" in cache
+    assert cache.get_metrics()["events"] == 3
+
+
+def test_remove_expired():
+    cache = EventCache()
+    cache.append(0, make_event("wallet1"), time.time())
+    cache.append(1, make_event("wallet1", "topic2"), time.time())
+    cache.append(2, make_event("wallet2"), time.time())
+    cache.get("wallet1")["topic1"].last_accessed = 0
+    cache.get("wallet2")["topic1"].last_accessed = 0
+
+    assert cache.remove_expired(expiry=1) == 2
+
+    assert set(cache.get("wallet1")) == {"topic2"}
+    assert "wallet2" not in cache
+    assert cache.get_metrics()["events"] == 1
+
+
+def test_get_group_wallets():
+    cache = EventCache(max_wallets=2)
+
+    def make_group_event(wallet_id):
+        return SerializedEvent.from_model(
+            CloudApiWebhookEventGeneric(
+                wallet_id=wallet_id,
+                group_id="group1",
+                topic="topic1",
+                origin="multitenant",
+                payload={},
+            )
+        )
+
+    cache.append(0, make_group_event("wallet1"), time.time())
+    cache.append(1, make_group_event("wallet2"), time.time())
+    assert sorted(cache.get_group_wallets("group1")) == ["wallet1", "wallet2"]
+
+    cache.append(2, make_event("wallet3"), time.time())  # evicts wallet1
+    assert cache.get_group_wallets("group1") == ["wallet2"]
+
+    cache.get("wallet2")["topic1"].last_accessed = 0
+    cache.remove_expired(expiry=1)
+    assert not cache.get_group_wallets("group1")
+    assert not cache.get_group_wallets("group2")
@@ -0,0 +1,54 @@
+import pytest
+
+from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
+from webhooks.util.event_ring_buffer import EventRingBuffer
+from webhooks.util.serialized_event import SerializedEvent
+
+events = [
+    SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id="wallet1", topic="topic1", origin="multitenant", payload={"n": n}
+        )
+    )
+    for n in range(5)
+]
+
+
+@pytest.fixture
+def ring_buffer():
+    buffer = EventRingBuffer(maxsize=3)
+    for sequence, event in enumerate(events[:3]):
+        buffer.append(sequence * 2, event, timestamp=float(sequence))
+    return buffer
+
+
+def test_read_from(ring_buffer):  # pylint: disable=redefined-outer-name
+    assert [e.event for e in ring_buffer.read_from(0)] == events[:3]
+    # Sequence numbers need not be consecutive
+    assert [e.sequence for e in ring_buffer.read_from(1)] == [2, 4]
+    assert not ring_buffer.read_from(5)
+
+
+def test_read_from_since_timestamp(ring_buffer):  # pylint: disable=redefined-outer-name
+    assert [e.event for e in ring_buffer.read_from(0, since_timestamp=1)] == events[1:3]
+
+
+def test_append_when_full(ring_buffer):  # pylint: disable=redefined-outer-name
+    assert ring_buffer.is_full()
+
+    dropped = ring_buffer.append(6, events[3], timestamp=3.0)
+
+    assert dropped.event == events[0]
+    assert len(ring_buffer) == ring_buffer.maxsize == 3
+    assert [e.event for e in ring_buffer.read_from(0)] == events[1:4]
+    assert ring_buffer.nbytes == sum(event.nbytes for event in events[1:4])
+
+
+def test_last_accessed(ring_buffer):  # pylint: disable=redefined-outer-name
+    ring_buffer.last_accessed = 0
+
+    ring_buffer.read_from(5)  # no new events
+    assert ring_buffer.last_accessed == 0
+
+    ring_buffer.read_from(0)
+    assert ring_buffer.last_accessed > 0
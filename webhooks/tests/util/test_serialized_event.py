@@ -0,0 +1,46 @@
+import pytest
+
+from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
+from webhooks.util.serialized_event import SerializedEvent
+
+event_json = (
+    '{"wallet_id":"wallet1","topic":"connections","origin":"multitenant",'
+    '"group_id":null,"payload":{"state":"done"}}'
+)
+
+
+def test_serialized_event():
+    event = SerializedEvent(event_json.encode())
+
+    assert event.event_json == event_json
+    assert event.wallet_id == "wallet1"
+    assert event.topic == "connections"
+    assert event.payload == {"state": "done"}
+    assert event == SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric.model_validate_json(event_json)
+    )
+
+
+def test_sse_frame_is_cached():
+    event = SerializedEvent(event_json)
+
+    assert event.sse_frame == f"data: {event_json}\r\n\r\n".encode()
+    assert event.sse_frame is event.sse_frame
+
+
+def test_sse_frame_with_event_id():
+    # Scores are doubles in redis, so the nanosecond timestamp is rounded
+    event_id = SerializedEvent.event_id_from_score(1_705_000_000_123_456_789)
+    assert event_id == 1_705_000_000_123_456_768
+
+    event = SerializedEvent(event_json, event_id=event_id)
+
+    assert event.sse_frame == f"id: {event_id}\r\ndata: {event_json}\r\n\r\n".encode()
+
+
+@pytest.mark.parametrize(
+    "invalid_json", ["not json", "[]", '{"wallet_id": "wallet1", "payload": {}}']
+)
+def test_invalid_event(invalid_json):
+    with pytest.raises(ValueError):
+        SerializedEvent(invalid_json)
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
+from shared.models.webhook_events.payloads import CloudApiWebhookEventGeneric
+from webhooks.util.serialized_event import SerializedEvent
+from webhooks.util.subscription_index import SubscriptionFilter, SubscriptionIndex
+
+wallet = "wallet1"
+topic = "connections"
+
+
+def create_event(payload, event_topic=topic):
+    return SerializedEvent.from_model(
+        CloudApiWebhookEventGeneric(
+            wallet_id=wallet, topic=event_topic, origin="multitenant", payload=payload
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ({"connection_id": "abc", "state": "done"}, True),
+        ({"connection_id": "abc", "state": "request"}, False),
+        ({"connection_id": "def", "state": "done"}, False),
+        ({"state": "done"}, False),
+    ],
+)
+def test_subscription_filter_matches(payload, expected):
+    subscription_filter = SubscriptionFilter.create(
+        field="connection_id", field_id="abc", desired_state="done"
+    )
+    assert subscription_filter.matches(create_event(payload)) is expected
+
+
+def test_subscription_filter_create_ignores_field_without_id():
+    assert SubscriptionFilter.create(field="connection_id") == SubscriptionFilter()
+
+
+def test_match():
+    index = SubscriptionIndex()
+    queues = {
+        name: asyncio.Queue()
+        for name in ["all", "topic", "field", "state", "field_state", "other"]
+    }
+    filters = {
+        "all": (WEBHOOK_TOPIC_ALL, SubscriptionFilter()),
+        "topic": (topic, SubscriptionFilter()),
+        "field": (topic, SubscriptionFilter.create("connection_id", "abc")),
+        "state": (topic, SubscriptionFilter.create(desired_state="done")),
+        "field_state": (
+            topic,
+            SubscriptionFilter.create("connection_id", "abc", "done"),
+        ),
+        "other": (topic, SubscriptionFilter.create("connection_id", "def", "done")),
+    }
+    for name, (subscribed_topic, subscription_filter) in filters.items():
+        index.add(
+            wallet=wallet,
+            topic=subscribed_topic,
+            client_queue=queues[name],
+            subscription_filter=subscription_filter,
+        )
+    assert len(index) == 6
+
+    def matched_names(event):
+        matched = index.match(event)
+        return sorted(name for name, queue in queues.items() if queue in matched)
+
+    assert matched_names(create_event({"connection_id": "abc", "state": "done"})) == [
+        "all",
+        "field",
+        "field_state",
+        "state",
+        "topic",
+    ]
+    assert matched_names(create_event({"connection_id": "abc"})) == [
+        "all",
+        "field",
+        "topic",
+    ]
+    assert matched_names(create_event({"connection_id": {"unhashable": 1}})) == [
+        "all",
+        "topic",
+    ]
+    assert matched_names(create_event({"state": "done"}, event_topic="proofs")) == [
+        "all"
+    ]
+
+
+def test_remove():
+    index = SubscriptionIndex()
+    client_queue = asyncio.Queue()
+    subscription_filter = SubscriptionFilter.create("connection_id", "abc", "done")
+    event = create_event({"connection_id": "abc", "state": "done"})
+
+    index.add(
+        wallet=wallet,
+        topic=topic,
+        client_queue=client_queue,
+        subscription_filter=subscription_filter,
+    )
+    assert index.match(event) == [client_queue]
+
+    # Removing with another filter has no effect
+    index.remove(wallet=wallet, topic=topic, client_queue=client_queue)
+    assert len(index) == 1
+
+    index.remove(
+        wallet=wallet,
+        topic=topic,
+        client_queue=client_queue,
+        subscription_filter=subscription_filter,
+    )
+    assert len(index) == 0
+    assert not index.match(event)
+    assert not index._index  # pylint: disable=protected-access
+
+
+def test_match_group():
+    index = SubscriptionIndex()
+    group_queue, wallet_queue = asyncio.Queue(), asyncio.Queue()
+    index.add(group_id="group1", topic=WEBHOOK_TOPIC_ALL, client_queue=group_queue)
+    index.add(wallet="wallet2", topic=topic, client_queue=wallet_queue)
+
+    def create_group_event(wallet_id, group_id):
+        return SerializedEvent.from_model(
+            CloudApiWebhookEventGeneric(
+                wallet_id=wallet_id,
+                group_id=group_id,
+                topic=topic,
+                origin="multitenant",
+                payload={},
+            )
+        )
+
+    assert index.match(create_group_event("wallet1", "group1")) == [group_queue]
+    assert index.match(create_group_event("wallet2", "group1")) == [
+        wallet_queue,
+        group_queue,
+    ]
+    assert not index.match(create_group_event("wallet1", "group2"))
+    assert not index.match(create_group_event("wallet1", None))
+
+    index.remove(group_id="group1", topic=WEBHOOK_TOPIC_ALL, client_queue=group_queue)
+    assert not index.match(create_group_event("wallet1", "group1"))
+
+
+def test_add_requires_wallet_or_group():
+    index = SubscriptionIndex()
+    with pytest.raises(ValueError):
+        index.add(topic=topic, client_queue=asyncio.Queue())
+    with pytest.raises(ValueError):
+        index.add(
+            wallet=wallet, group_id="group1", topic=topic, client_queue=asyncio.Queue()
+        )
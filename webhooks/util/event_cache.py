@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from shared.constants import (
+    MAX_QUEUE_SIZE,
+    SSE_CACHE_MAX_BYTES,
+    SSE_CACHE_MAX_EVENTS,
+    SSE_CACHE_MAX_WALLETS,
+)
+from webhooks.util.event_ring_buffer import BufferedEvent, EventRingBuffer
+from webhooks.util.serialized_event import SerializedEvent
+
+EMPTY_WALLET_CACHE: Dict[str, EventRingBuffer] = {}
+
+
+class EventCache:
+    """
+    The ring buffers of recent events per wallet, per topic, kept within a memory budget.
+
+    The budget limits the number of wallets, the total number of events and the approximate
+    number of bytes they use. When an event is added that exceeds a limit, the least recently
+    used wallets (those whose events were least recently added or read) are evicted, until
+    the cache is within budget again. A limit of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        max_wallets: int = SSE_CACHE_MAX_WALLETS,
+        max_events: int = SSE_CACHE_MAX_EVENTS,
+        max_bytes: int = SSE_CACHE_MAX_BYTES,
+        buffer_size: int = MAX_QUEUE_SIZE,
+    ) -> None:
+        self.max_wallets = max_wallets
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+
+        # Ordered from least to most recently used
+        self._wallets: OrderedDict[str, Dict[str, EventRingBuffer]] = OrderedDict()
+
+        # The cached wallets per group, to read the events of a group
+        self._wallet_groups: Dict[str, str] = {}
+        self._group_wallets: Dict[str, Set[str]] = {}
+        self._num_events = 0
+        self._num_bytes = 0
+        self._num_evicted_wallets = 0
+
+    def __len__(self) -> int:
+        return len(self._wallets)
+
+    def __contains__(self, wallet: str) -> bool:
+        return wallet in self._wallets
+
+    def get(self, wallet: str) -> Dict[str, EventRingBuffer]:
+        """
+        Get the ring buffers per topic for a wallet, marking it as most recently used.
+        The returned dict is not to be modified.
+        """
+        wallet_cache = self._wallets.get(wallet)
+        if wallet_cache is None:
+            return EMPTY_WALLET_CACHE
+        self._wallets.move_to_end(wallet)
+        return wallet_cache
+
+    def get_group_wallets(self, group_id: str) -> List[str]:
+        """
+        Get the ids of the cached wallets that belong to a group.
+        """
+        return list(self._group_wallets.get(group_id, ()))
+
+    def append(
+        self, sequence: int, event: SerializedEvent, timestamp: float
+    ) -> Optional[BufferedEvent]:
+        """
+        Add an event to the ring buffer for its wallet and topic, and evict the least recently
+        used wallets if the cache exceeds its budget. The event's own wallet is never evicted.
+
+        Args:
+            sequence: The sequence number of the event. See EventRingBuffer.
+            event: The event to add.
+            timestamp: The time (in seconds since the epoch) at which the event was received.
+
+        Returns:
+            The event that was dropped from the ring buffer because it was full, if any.
+        """
+        wallet = event.wallet_id
+        wallet_cache = self._wallets.get(wallet)
+        if wallet_cache is None:
+            wallet_cache = self._wallets[wallet] = {}
+            if event.group_id:
+                self._wallet_groups[wallet] = event.group_id
+                self._group_wallets.setdefault(event.group_id, set()).add(wallet)
+        else:
+            self._wallets.move_to_end(wallet)
+
+        ring_buffer = wallet_cache.get(event.topic)
+        if ring_buffer is None:
+            ring_buffer = wallet_cache[event.topic] = EventRingBuffer(
+                maxsize=self.buffer_size
+            )
+
+        nbytes_before = ring_buffer.nbytes
+        dropped = ring_buffer.append(sequence, event, timestamp)
+        self._num_events += 0 if dropped else 1
+        self._num_bytes += ring_buffer.nbytes - nbytes_before
+
+        while len(self._wallets) > 1 and self._is_over_budget():
+            self._evict_wallet(next(iter(self._wallets)))
+
+        return dropped
+
+    def remove_expired(self, expiry: float) -> int:
+        """
+        Remove the ring buffers that were last accessed before the expiry time, and the wallets
+        that are left without ring buffers.
+
+        Args:
+            expiry: The monotonic time before which ring buffers are expired.
+
+        Returns:
+            The number of ring buffers removed.
+        """
+        num_removed = 0
+        for wallet, wallet_cache in list(self._wallets.items()):
+            for topic, ring_buffer in list(wallet_cache.items()):
+                if ring_buffer.last_accessed < expiry:
+                    self._num_events -= len(ring_buffer)
+                    self._num_bytes -= ring_buffer.nbytes
+                    del wallet_cache[topic]
+                    num_removed += 1
+
+            if not wallet_cache:
+                self._remove_wallet(wallet)
+        return num_removed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the current size of the cache and the number of evicted wallets.
+        """
+        return {
+            "wallets": len(self._wallets),
+            "events": self._num_events,
+            "bytes": self._num_bytes,
+            "evicted_wallets": self._num_evicted_wallets,
+        }
+
+    def _is_over_budget(self) -> bool:
+        return bool(
+            (self.max_wallets and len(self._wallets) > self.max_wallets)
+            or (self.max_events and self._num_events > self.max_events)
+            or (self.max_bytes and self._num_bytes > self.max_bytes)
+        )
+
+    def _evict_wallet(self, wallet: str) -> None:
+        for ring_buffer in self._wallets[wallet].values():
+            self._num_events -= len(ring_buffer)
+            self._num_bytes -= ring_buffer.nbytes
+        self._remove_wallet(wallet)
+        self._num_evicted_wallets += 1
+
+    def _remove_wallet(self, wallet: str) -> None:
+        del self._wallets[wallet]
+
+        group_id = self._wallet_groups.pop(wallet, None)
+        if group_id:
+            group_wallets = self._group_wallets[group_id]
+            group_wallets.discard(wallet)
+            if not group_wallets:
+                del self._group_wallets[group_id]
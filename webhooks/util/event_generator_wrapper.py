@@ -1,7 +1,7 @@
 import asyncio
 from typing import Any, AsyncGenerator
 
-from shared.models.webhook_events import CloudApiWebhookEventGeneric
+from webhooks.util.serialized_event import SerializedEvent
 
 
 class EventGeneratorWrapper:
@@ -13,20 +13,20 @@ class EventGeneratorWrapper:
     and SSE routes.
 
     Attributes:
-        generator: An asynchronous generator yielding CloudApiWebhookEventGeneric objects.
+        generator: An asynchronous generator yielding SerializedEvent objects.
         populate_task: An asyncio.Task object that populates the generator.
     """
 
     def __init__(
         self,
-        generator: AsyncGenerator[CloudApiWebhookEventGeneric, Any],
+        generator: AsyncGenerator[SerializedEvent, Any],
         populate_task: asyncio.Task,
     ):
         """
         Initializes the EventGeneratorWrapper with an async generator and a populate task.
 
         Args:
-            generator: An asynchronous generator yielding CloudApiWebhookEventGeneric objects.
+            generator: An asynchronous generator yielding SerializedEvent objects.
             populate_task: An asyncio.Task object responsible for populating the generator.
         """
         self.generator = generator
@@ -0,0 +1,94 @@
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+from shared.constants import MAX_QUEUE_SIZE
+from webhooks.util.serialized_event import SerializedEvent
+
+
+class BufferedEvent(NamedTuple):
+    """
+    An event in an EventRingBuffer, with the sequence number and time it was added at.
+    """
+
+    sequence: int
+    timestamp: float
+    event: SerializedEvent
+
+
+class EventRingBuffer:
+    """
+    A bounded buffer of the most recent events for a wallet and topic.
+
+    Each event is stored with a sequence number. Sequence numbers increase monotonically, but
+    they need not be consecutive, so that one sequence can be shared by multiple buffers.
+    Readers keep a cursor (the next sequence number they want to read) and read forward from
+    it, without consuming the events for other readers. When the buffer is full, the oldest
+    event is dropped.
+    """
+
+    def __init__(self, maxsize: int = MAX_QUEUE_SIZE) -> None:
+        self._events: Deque[BufferedEvent] = deque(maxlen=maxsize)
+        self.last_accessed = time.monotonic()
+        self.nbytes = 0  # approximate memory used by the buffered events
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def maxsize(self) -> int:
+        return self._events.maxlen
+
+    def is_full(self) -> bool:
+        return len(self._events) == self._events.maxlen
+
+    def append(
+        self, sequence: int, event: SerializedEvent, timestamp: float
+    ) -> Optional[BufferedEvent]:
+        """
+        Add an event to the buffer, dropping the oldest event if the buffer is full.
+
+        Args:
+            sequence: The sequence number of the event. Must be greater than that of the
+                previously added event.
+            event: The event to add.
+            timestamp: The time (in seconds since the epoch) at which the event was received.
+
+        Returns:
+            The event that was dropped, if any.
+        """
+        dropped = self._events[0] if self.is_full() else None
+        self._events.append(BufferedEvent(sequence, timestamp, event))
+        self.last_accessed = time.monotonic()
+
+        self.nbytes += event.nbytes
+        if dropped:
+            self.nbytes -= dropped.event.nbytes
+        return dropped
+
+    def read_from(self, cursor: int, since_timestamp: float = 0) -> List[BufferedEvent]:
+        """
+        Get the events from the cursor onwards, in the order they were added.
+
+        Only the new events are iterated over, so the cost of a read does not depend on the
+        number of events that were read before.
+
+        Args:
+            cursor: The lowest sequence number to return.
+            since_timestamp: Events received before this time are not returned.
+
+        Returns:
+            The events with a sequence number of at least `cursor`.
+        """
+        new_events = []
+        for buffered_event in reversed(self._events):
+            if buffered_event.sequence < cursor:
+                break
+            if buffered_event.timestamp >= since_timestamp:
+                new_events.append(buffered_event)
+
+        if new_events:
+            self.last_accessed = time.monotonic()
+
+        new_events.reverse()
+        return new_events
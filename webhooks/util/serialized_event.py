@@ -0,0 +1,112 @@
+from typing import Any, Dict, Optional, Union
+
+import orjson
+from sse_starlette import ServerSentEvent
+
+from shared.models.webhook_events import CloudApiWebhookEventGeneric
+
+
+class SerializedEvent:
+    """
+    A CloudAPI webhook event, kept as the JSON string it was stored as.
+
+    The JSON is only parsed (without pydantic validation) as far as needed to route and filter
+    the event, and the SSE frame is built on first use. As one instance is shared by all the
+    subscribers of an event, it is serialized once, however many clients receive it.
+
+    The event id is the score of the event in the wallet's sorted set in Redis, so that a
+    client resuming a stream with `Last-Event-ID` can be sent exactly the events it missed.
+    """
+
+    __slots__ = ("event_json", "event_id", "_data", "_sse_frame")
+
+    def __init__(
+        self, event_json: Union[str, bytes], event_id: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            event_json: The JSON string representation of a CloudApiWebhookEventGeneric.
+            event_id: The id of the event, if known. See `event_id_from_score`.
+
+        Raises:
+            ValueError: If the JSON is invalid, or is not a webhook event.
+        """
+        if isinstance(event_json, bytes):
+            event_json = event_json.decode()
+        self.event_json: str = event_json
+        self.event_id: Optional[int] = event_id
+
+        data = orjson.loads(event_json)
+        if not (
+            isinstance(data, dict)
+            and isinstance(data.get("wallet_id"), str)
+            and isinstance(data.get("topic"), str)
+            and isinstance(data.get("payload"), dict)
+        ):
+            raise ValueError("JSON is not a CloudAPI webhook event")
+        self._data: Dict[str, Any] = data
+
+        self._sse_frame: Optional[bytes] = None
+
+    @classmethod
+    def from_model(
+        cls, event: CloudApiWebhookEventGeneric, event_id: Optional[int] = None
+    ) -> "SerializedEvent":
+        return cls(event.model_dump_json(), event_id=event_id)
+
+    @staticmethod
+    def event_id_from_score(score: Union[int, float]) -> int:
+        """
+        Get the event id for an event stored in Redis with the given score.
+
+        Events are scored with their timestamp in nanoseconds, but Redis stores scores as
+        doubles, so the timestamp is rounded the same way here. This way, the id of an event
+        received over pub/sub matches the score it is read back with.
+        """
+        return int(float(score))
+
+    @property
+    def wallet_id(self) -> str:
+        return self._data["wallet_id"]
+
+    @property
+    def group_id(self) -> Optional[str]:
+        return self._data.get("group_id")
+
+    @property
+    def topic(self) -> str:
+        return self._data["topic"]
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self._data["payload"]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The approximate memory used by the event. This is dominated by the JSON string, which
+        is held about three times: as is, parsed, and rendered as an SSE frame.
+        """
+        return 3 * len(self.event_json)
+
+    @property
+    def sse_frame(self) -> bytes:
+        """
+        The event encoded as a server-sent event, to be written to the response as is.
+        """
+        if self._sse_frame is None:
+            self._sse_frame = ServerSentEvent(
+                data=self.event_json, id=self.event_id
+            ).encode()
+        return self._sse_frame
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SerializedEvent):
+            return self.event_json == other.event_json
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.event_json)
+
+    def __repr__(self) -> str:
+        return f"SerializedEvent({self.event_json})"
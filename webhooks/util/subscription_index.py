@@ -0,0 +1,173 @@
+import asyncio
+from collections import defaultdict
+from itertools import product
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
+from webhooks.util.serialized_event import SerializedEvent
+
+
+class SubscriptionFilter(NamedTuple):
+    """
+    Criteria that an event's payload must match for an SSE subscription. A criterion that
+    is None matches all events.
+
+    Attributes:
+        field: The payload field to match, e.g. `connection_id`. Only used with `field_id`.
+        field_id: The value that the payload field must have.
+        desired_state: The `state` that the payload must have.
+    """
+
+    field: Optional[str] = None
+    field_id: Optional[str] = None
+    desired_state: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        field: Optional[str] = None,
+        field_id: Optional[str] = None,
+        desired_state: Optional[str] = None,
+    ) -> "SubscriptionFilter":
+        """
+        Create a filter, ignoring a field without a field_id and vice versa.
+        """
+        if not (field and field_id):
+            field = field_id = None
+        return cls(field=field, field_id=field_id, desired_state=desired_state or None)
+
+    def matches(self, event: SerializedEvent) -> bool:
+        payload = event.payload
+        if self.field and payload.get(self.field) != self.field_id:
+            return False
+        if self.desired_state and payload.get("state") != self.desired_state:
+            return False
+        return True
+
+
+# Client queues per desired_state, per field_id, per field
+FilterIndex = Dict[
+    Optional[str], Dict[Optional[str], Dict[Optional[str], Set[asyncio.Queue]]]
+]
+
+
+class SubscriptionIndex:
+    """
+    Registry of the SSE client queues subscribed to events, per wallet (or group of wallets)
+    and topic, indexed by their SubscriptionFilter.
+
+    Matching an event costs a few hash lookups per distinct subscribed `field`, rather than a
+    check per subscriber, so that many single-event subscriptions on one wallet stay cheap.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[Tuple[str, str], FilterIndex] = {}
+        self._num_subscriptions = 0
+
+    def __len__(self) -> int:
+        return self._num_subscriptions
+
+    def add(
+        self,
+        *,
+        wallet: Optional[str] = None,
+        group_id: Optional[str] = None,
+        topic: str,
+        client_queue: asyncio.Queue,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+    ) -> None:
+        """
+        Subscribe a client queue to the events of a wallet, or of all wallets in a group, and
+        topic (or WEBHOOK_TOPIC_ALL) that match the filter.
+        """
+        filter_index = self._index.setdefault(
+            (_scope(wallet, group_id), topic),
+            defaultdict(lambda: defaultdict(lambda: defaultdict(set))),
+        )
+        field, field_id, desired_state = subscription_filter
+        client_queues = filter_index[field][field_id][desired_state]
+        if client_queue not in client_queues:
+            client_queues.add(client_queue)
+            self._num_subscriptions += 1
+
+    def remove(
+        self,
+        *,
+        wallet: Optional[str] = None,
+        group_id: Optional[str] = None,
+        topic: str,
+        client_queue: asyncio.Queue,
+        subscription_filter: SubscriptionFilter = SubscriptionFilter(),
+    ) -> None:
+        """
+        Unsubscribe a client queue, removing index entries that are no longer used.
+        """
+        key = (_scope(wallet, group_id), topic)
+        filter_index = self._index.get(key)
+        if filter_index is None:
+            return
+
+        field, field_id, desired_state = subscription_filter
+        field_ids = filter_index.get(field, {})
+        states = field_ids.get(field_id, {})
+        client_queues = states.get(desired_state)
+        if client_queues is None or client_queue not in client_queues:
+            return
+
+        client_queues.discard(client_queue)
+        self._num_subscriptions -= 1
+
+        if not client_queues:
+            del states[desired_state]
+            if not states:
+                del field_ids[field_id]
+                if not field_ids:
+                    del filter_index[field]
+                    if not filter_index:
+                        del self._index[key]
+
+    def match(self, event: SerializedEvent) -> List[asyncio.Queue]:
+        """
+        Get the client queues subscribed to an event.
+        """
+        payload = event.payload
+        state = _hashable(payload.get("state"))
+
+        scopes = [event.wallet_id]
+        if event.group_id:
+            scopes.append(_scope(group_id=event.group_id))
+
+        matched = []
+        for scope, topic in product(scopes, (event.topic, WEBHOOK_TOPIC_ALL)):
+            filter_index = self._index.get((scope, topic))
+            if not filter_index:
+                continue
+
+            for field, field_ids in filter_index.items():
+                field_id = _hashable(payload.get(field)) if field else None
+                states = field_ids.get(field_id) if field_id or not field else None
+                if not states:
+                    continue
+
+                matched.extend(states.get(None, ()))
+                if state:
+                    matched.extend(states.get(state, ()))
+
+        return matched
+
+
+def _scope(wallet: Optional[str] = None, group_id: Optional[str] = None) -> str:
+    # Subscriptions to a group are indexed alongside those to wallets, under a key that no
+    # wallet id can take
+    if bool(wallet) == bool(group_id):
+        raise ValueError("Subscribe to either a wallet or a group")
+    return wallet or f"group:{group_id}"
+
+
+def _hashable(value: Any) -> Optional[Any]:
+    # Payload values that can't be dict keys can't match a (string) filter value either
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
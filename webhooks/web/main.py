@@ -9,6 +9,7 @@ from shared.log_config import get_logger
 from webhooks.services.acapy_events_processor import AcaPyEventsProcessor
 from webhooks.services.billing_manager import BillingManager
 from webhooks.services.dependency_injection.container import Container
+from webhooks.services.retention_manager import RetentionManager
 from webhooks.services.sse_manager import SseManager
 from webhooks.web.routers import sse, webhooks, websocket
 
@@ -24,14 +25,16 @@ async def app_lifespan(_: FastAPI):
     container.wire(modules=[__name__, sse, webhooks])
 
     # Start singleton services
-    container.redis_service()
-    sse_manager = container.sse_manager()
-    events_processor = container.acapy_events_processor()
-    billing_manager = container.billing_manager()
+    await container.redis_service()
+    sse_manager = await container.sse_manager()
+    events_processor = await container.acapy_events_processor()
+    billing_manager = await container.billing_manager()
+    retention_manager = await container.retention_manager()
 
     sse_manager.start()
     events_processor.start()  # should start after SSE Manager is listening
     billing_manager.start()
+    retention_manager.start()
 
     yield
 
@@ -39,7 +42,8 @@ async def app_lifespan(_: FastAPI):
     await events_processor.stop()
     await sse_manager.stop()
     await billing_manager.stop()
-    container.shutdown_resources()  # shutdown redis instance
+    await retention_manager.stop()
+    await container.shutdown_resources()  # shutdown redis instance
     logger.info("Shut down Webhooks services.")
 
 
@@ -79,14 +83,32 @@ async def health_check(
     ),
     sse_manager: SseManager = Depends(Provide[Container.sse_manager]),
     billing_manager: BillingManager = Depends(Provide[Container.billing_manager]),
+    retention_manager: RetentionManager = Depends(Provide[Container.retention_manager]),
 ):
     if (
         acapy_events_processor.are_tasks_running()
         and sse_manager.are_tasks_running()
         and billing_manager.are_tasks_running()
+        and retention_manager.are_tasks_running()
     ):
         return {"status": "healthy"}
     else:
         raise HTTPException(
             status_code=503, detail="One or more background tasks are not running."
         )
+
+
+@app.get("/stats")
+@inject
+async def stats(
+    acapy_events_processor: AcaPyEventsProcessor = Depends(
+        Provide[Container.acapy_events_processor]
+    ),
+    sse_manager: SseManager = Depends(Provide[Container.sse_manager]),
+    retention_manager: RetentionManager = Depends(Provide[Container.retention_manager]),
+):
+    return {
+        "acapy_events_processor": acapy_events_processor.get_metrics(),
+        "sse_manager": sse_manager.get_metrics(),
+        "retention_manager": retention_manager.get_metrics(),
+    }
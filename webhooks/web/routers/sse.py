@@ -1,12 +1,12 @@
 import asyncio
 from logging import Logger
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, List, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi import Depends, HTTPException, Query, Request
 from sse_starlette.sse import EventSourceResponse
 
-from shared import DISCONNECT_CHECK_PERIOD, SSE_TIMEOUT, APIRouter
+from shared import SSE_TIMEOUT, APIRouter
 from shared.constants import MAX_EVENT_AGE_SECONDS
 from shared.log_config import get_logger
 from shared.models.webhook_events import WEBHOOK_TOPIC_ALL
@@ -47,54 +47,51 @@ class BadGroupIdException(HTTPException):
         )
 
 
-async def check_disconnection(request: Request, stop_event: asyncio.Event) -> None:
+def get_last_event_id(request: Request) -> Optional[int]:
     """
-    Periodically checks if the client connected to the SSE stream has disconnected.
+    Get the id of the last event received by a client that is resuming an SSE stream, from
+    the `Last-Event-ID` header that EventSource clients send when they reconnect.
 
-    Args:
-        request (Request): The FastAPI request object from which the client's connection
-                           status can be determined.
-        stop_event (asyncio.Event): An event that, when set, indicates that the client
-                                    has disconnected and the stream should be stopped.
-
-    This function is typically run as a background task during the lifespan of an SSE
-    stream. It allows the server to gracefully terminate the event stream and clean up
-    resources when the client disconnects.
-
-    Note:
-        DISCONNECT_CHECK_PERIOD is a constant that defines how often (in seconds) the
-        function checks for client disconnection. Adjust this value based on the desired
-        balance between responsiveness and resource usage.
+    Returns:
+        The last event id, or None if the header is absent or not a valid event id.
     """
-    while not stop_event.is_set():
-        if await request.is_disconnected():
-            logger.debug("SSE check_disconnection: request has disconnected.")
-            stop_event.set()
-        await asyncio.sleep(DISCONNECT_CHECK_PERIOD)
+    last_event_id = request.headers.get("last-event-id")
+    if not last_event_id:
+        return None
+    try:
+        return int(last_event_id)
+    except ValueError:
+        logger.warning("Ignoring invalid Last-Event-ID header: `{}`", last_event_id)
+        return None
 
 
 async def sse_event_stream_generator(
     *,
     sse_manager: SseManager,
     request: Request,
-    background_tasks: BackgroundTasks,
-    wallet_id: str,
+    wallet_id: Optional[str] = None,
+    wallet_ids: Optional[List[str]] = None,
+    group_id: Optional[str] = None,
     topic: Optional[str] = None,
     field: Optional[str] = None,
     field_id: Optional[str] = None,
     desired_state: Optional[str] = None,
     look_back: float = MAX_EVENT_AGE_SECONDS,
     logger: Logger,  # pylint: disable=redefined-outer-name
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
-    Asynchronously generates a stream of Server-Sent Events (SSE) for a specific wallet,
-    optionally filtered by topic, field, field ID, and/or desired state.
+    Asynchronously generates a stream of Server-Sent Events (SSE) for a specific wallet, for
+    a list of wallets, or for all wallets in a group, optionally filtered by topic, field,
+    field ID, and/or desired state.
 
     Args:
         sse_manager (SseManager): The SSE manager instance managing events.
-        request (Request): The incoming request object, to detect client disconnects.
-        background_tasks (BackgroundTasks): Background tasks dependency for adding new tasks.
-        wallet_id (str): The wallet ID for which to generate event stream.
+        request (Request): The incoming request object, to read the `Last-Event-ID` from.
+        wallet_id (Optional[str]): The wallet ID for which to generate event stream.
+        wallet_ids (Optional[List[str]]): The wallet IDs for which to generate one event
+            stream, if no wallet_id is given.
+        group_id (Optional[str]): The group for whose wallets to generate one event stream,
+            if neither wallet_id nor wallet_ids are given.
         topic (Optional[str]): The specific topic to subscribe to. Defaults to all topics.
         field (Optional[str]): The specific field to filter events by.
         field_id (Optional[str]): The ID of the field to match for filtering.
@@ -103,14 +100,19 @@ async def sse_event_stream_generator(
         logger (Logger): The logger for logging information about the event stream.
 
     Yields:
-        str: A JSON string representation of the SSE event that matches the subscription criteria.
+        bytes: The SSE frame of an event that matches the subscription criteria.
 
-    This generator listens for events related to the specified wallet ID, filtering them
-    based on the provided criteria (topic, field, field ID, and desired state). It yields
-    events as they occur, formatting them into JSON strings.
+    This generator listens for events related to the specified wallet ID, that the SseManager
+    has filtered based on the provided criteria (topic, field, field ID, and desired state).
+    It yields events as they occur, as pre-rendered SSE frames that are shared by all
+    subscribers of an event.
 
-    It also monitors the request connection status, terminating the event stream if the
-    client disconnects. A background task is used to check for disconnections.
+    If the request has a `Last-Event-ID` header, the events stored since that event are
+    replayed first, instead of the events within the look back window.
+
+    Client disconnects are not polled for: the EventSourceResponse listens for the ASGI
+    `http.disconnect` message, and cancels the stream as soon as it is received. The
+    cancellation sets the stop event, which ends the subscription.
 
     Note:
         If neither topic nor desired state is specified, the generator will listen for
@@ -123,52 +125,128 @@ async def sse_event_stream_generator(
     yield_single_event = bool(desired_state)  # True if exists, False otherwise
 
     stop_event = asyncio.Event()
-    event_generator_wrapper: EventGeneratorWrapper = await sse_manager.sse_event_stream(
-        wallet=wallet_id,
-        topic=topic,
-        look_back=look_back,
-        stop_event=stop_event,
-        duration=SSE_TIMEOUT if desired_state else 0,
-    )
+    event_generator_wrapper: EventGeneratorWrapper
+    if wallet_id:
+        event_generator_wrapper = await sse_manager.sse_event_stream(
+            wallet=wallet_id,
+            topic=topic,
+            look_back=look_back,
+            stop_event=stop_event,
+            duration=SSE_TIMEOUT if desired_state else 0,
+            field=field,
+            field_id=field_id,
+            desired_state=desired_state,
+            last_event_id=get_last_event_id(request),
+        )
+    else:
+        event_generator_wrapper = await sse_manager.sse_multi_event_stream(
+            wallets=wallet_ids,
+            group_id=group_id,
+            topic=topic,
+            look_back=look_back,
+            stop_event=stop_event,
+            duration=SSE_TIMEOUT if desired_state else 0,
+            field=field,
+            field_id=field_id,
+            desired_state=desired_state,
+        )
     try:
         async with event_generator_wrapper as event_generator:
-            background_tasks.add_task(check_disconnection, request, stop_event)
-
             async for event in event_generator:
-                if await request.is_disconnected():
-                    logger.info("SSE event_stream: client disconnected.")
+                # Events are filtered by the SseManager, so all events match the subscription
+                logger.trace("Yielding SSE event: {}", event.event_json)
+                yield event.sse_frame  # Send the event, serialized once for all subscribers
+
+                if yield_single_event:
                     stop_event.set()
-                    break
+                    break  # End the generator
 
-                should_yield_event = True
-                # Determine if event matches subscription:
-                if field or desired_state:
-                    payload = dict(event.payload)  # to check if field or state exists
+    except asyncio.CancelledError:
+        # This exception is thrown when the client disconnects.
+        logger.info("SSE event stream cancelled.")
+        stop_event.set()
+
+
+@router.get(
+    "/wallets",
+    response_class=EventSourceResponse,
+    summary="Subscribe to the server-side events of multiple wallets, "
+    "or of all wallets in a group",
+)
+@inject
+async def sse_subscribe_wallets(
+    request: Request,
+    wallet_ids: Optional[List[str]] = Query(
+        default=None,
+        description="The wallet IDs to subscribe to. All wallets in the group by default",
+    ),
+    topic: Optional[str] = Query(default=None, description="The topic to filter by"),
+    field: Optional[str] = Query(
+        default=None, description="The payload field that `field_id` must match"
+    ),
+    field_id: Optional[str] = Query(
+        default=None, description="The value of the payload field to filter by"
+    ),
+    desired_state: Optional[str] = Query(
+        default=None, description="The payload state to filter by"
+    ),
+    look_back: float = look_back_field,
+    group_id: Optional[str] = group_id_query,
+    sse_manager: SseManager = Depends(Provide[Container.sse_manager]),
+) -> EventSourceResponse:
+    """
+    Subscribe to the server-side events of multiple wallets over one stream: either the
+    given wallets, or all wallets in the group.
 
-                    if (
-                        field
-                        and field_id
-                        and (field not in payload or payload[field] != field_id)
-                    ):
-                        should_yield_event = False
+    Args:
+        wallet_ids: The IDs of the wallets subscribing to the events.
+        group_id: The group to which the wallets belong.
+        sse_manager: The SSEManager instance managing the server-sent events.
+    """
+    bound_logger = logger.bind(
+        body={
+            "num_wallets": len(wallet_ids or []),
+            "group_id": group_id,
+            "topic": topic,
+            "field": field,
+            "field_id": field_id,
+            "desired_state": desired_state,
+            "look_back": look_back,
+        }
+    )
+    bound_logger.info("SSE: GET request received: Subscribe to events of many wallets")
 
-                    if desired_state and payload.get("state") != desired_state:
-                        should_yield_event = False
+    if not wallet_ids and not group_id:
+        raise HTTPException(
+            status_code=400, detail="Either wallet_ids or group_id must be specified"
+        )
 
-                if should_yield_event:
-                    # Dump event model to json:
-                    result = event.model_dump_json()
-                    logger.trace("Yielding SSE event: {}", result)
-                    yield result  # Send the event
+    if wallet_ids and group_id:
+        belongs_to_group = await asyncio.gather(
+            *(
+                sse_manager.check_wallet_belongs_to_group(
+                    wallet_id=wallet_id, group_id=group_id
+                )
+                for wallet_id in wallet_ids
+            )
+        )
+        if not all(belongs_to_group):
+            raise BadGroupIdException()
 
-                    if yield_single_event:
-                        stop_event.set()
-                        break  # End the generator
+    event_stream = sse_event_stream_generator(
+        sse_manager=sse_manager,
+        request=request,
+        wallet_ids=wallet_ids,
+        group_id=None if wallet_ids else group_id,
+        topic=topic,
+        field=field,
+        field_id=field_id,
+        desired_state=desired_state,
+        look_back=look_back,
+        logger=bound_logger,
+    )
 
-    except asyncio.CancelledError:
-        # This exception is thrown when the client disconnects.
-        logger.info("SSE event stream cancelled.")
-        stop_event.set()
+    return EventSourceResponse(event_stream)
 
 
 @router.get(
@@ -179,7 +257,6 @@ async def sse_event_stream_generator(
 @inject
 async def sse_subscribe_wallet(
     request: Request,
-    background_tasks: BackgroundTasks,
     wallet_id: str,
     look_back: float = look_back_field,
     group_id: Optional[str] = group_id_query,
@@ -211,7 +288,6 @@ async def sse_subscribe_wallet(
     event_stream = sse_event_stream_generator(
         sse_manager=sse_manager,
         request=request,
-        background_tasks=background_tasks,
         wallet_id=wallet_id,
         look_back=look_back,
         logger=bound_logger,
@@ -228,7 +304,6 @@ async def sse_subscribe_wallet(
 @inject
 async def sse_subscribe_wallet_topic(
     request: Request,
-    background_tasks: BackgroundTasks,
     wallet_id: str,
     topic: str,
     look_back: float = look_back_field,
@@ -261,7 +336,6 @@ async def sse_subscribe_wallet_topic(
     event_stream = sse_event_stream_generator(
         sse_manager=sse_manager,
         request=request,
-        background_tasks=background_tasks,
         wallet_id=wallet_id,
         topic=topic,
         look_back=look_back,
@@ -280,7 +354,6 @@ async def sse_subscribe_wallet_topic(
 @inject
 async def sse_subscribe_event_with_state(
     request: Request,
-    background_tasks: BackgroundTasks,
     wallet_id: str,
     topic: str,
     desired_state: str,
@@ -310,7 +383,6 @@ async def sse_subscribe_event_with_state(
     event_stream = sse_event_stream_generator(
         sse_manager=sse_manager,
         request=request,
-        background_tasks=background_tasks,
         wallet_id=wallet_id,
         topic=topic,
         desired_state=desired_state,
@@ -332,7 +404,6 @@ async def sse_subscribe_event_with_state(
 @inject
 async def sse_subscribe_stream_with_fields(
     request: Request,
-    background_tasks: BackgroundTasks,
     wallet_id: str,
     topic: str,
     field: str,
@@ -363,7 +434,6 @@ async def sse_subscribe_stream_with_fields(
     event_stream = sse_event_stream_generator(
         sse_manager=sse_manager,
         request=request,
-        background_tasks=background_tasks,
         wallet_id=wallet_id,
         topic=topic,
         field=field,
@@ -386,7 +456,6 @@ async def sse_subscribe_stream_with_fields(
 @inject
 async def sse_subscribe_event_with_field_and_state(
     request: Request,
-    background_tasks: BackgroundTasks,
     wallet_id: str,
     topic: str,
     field: str,
@@ -419,7 +488,6 @@ async def sse_subscribe_event_with_field_and_state(
     event_stream = sse_event_stream_generator(
         sse_manager=sse_manager,
         request=request,
-        background_tasks=background_tasks,
         wallet_id=wallet_id,
         topic=topic,
         field=field,